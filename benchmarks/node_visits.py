@@ -0,0 +1,90 @@
+""" Compare the number of nodes visited and the time spent for finding
+imports using a full AST traversal and the statement-only traversal.
+
+Usage::
+
+    $ python benchmarks/node_visits.py [n_rows]
+
+"""
+import ast
+import sys
+import timeit
+
+from packaway.rules._ast_analyzer import (  # noqa: DEP401
+    ImportAnalyzer,
+    iter_statements,
+)
+
+
+def generate_table_module(n_rows):
+    """ Return the source of a module holding a large data table, as is
+    typical for generated code.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows in the table.
+
+    Returns
+    -------
+    source : str
+    """
+    lines = [
+        "import collections",
+        "from ._internal import descriptor",
+        "",
+        "Row = collections.namedtuple('Row', 'id name values options')",
+        "",
+        "TABLE = [",
+    ]
+    for i in range(n_rows):
+        lines.append(
+            f"    Row({i}, 'name{i}', [{i}, {i} * 2, -{i}], "
+            f"{{'scale': {i} / 3, 'tags': ('a', 'b')}}),"
+        )
+    lines.append("]")
+    lines.append("")
+    lines.append("def lookup(key):")
+    lines.append("    from . import _index")
+    lines.append("    return _index.find(TABLE, key)")
+    return "\n".join(lines)
+
+
+class _CountingAnalyzer(ImportAnalyzer):
+
+    def __init__(self):
+        super().__init__()
+        self.n_visited = 0
+
+    def visit(self, node):
+        self.n_visited += 1
+        return super().visit(node)
+
+
+def main(n_rows=20000):
+    tree = ast.parse(generate_table_module(n_rows))
+
+    full = _CountingAnalyzer()
+    full.visit(tree)
+    n_statements = sum(1 for _ in iter_statements(tree))
+
+    def run_full():
+        ImportAnalyzer().visit(tree)
+
+    def run_statements():
+        ImportAnalyzer().visit_statements(tree, dynamic=False)
+
+    time_full = min(timeit.repeat(run_full, number=1, repeat=5))
+    time_statements = min(timeit.repeat(run_statements, number=1, repeat=5))
+
+    print(f"Rows in the generated table: {n_rows}")
+    print(f"{'traversal':<12} {'nodes visited':>14} {'time (ms)':>10}")
+    print(f"{'full':<12} {full.n_visited:>14} {time_full * 1000:>10.2f}")
+    print(
+        f"{'statements':<12} {n_statements:>14} "
+        f"{time_statements * 1000:>10.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,210 @@
+""" Generate a synthetic project shaped like ``examples/package``, for
+benchmarking.
+
+The project has a top level package with nested subpackages, each with an
+``api.py`` and other modules, some of which are private. Modules import
+from their siblings, parents and other packages, with relative and
+absolute imports, some of which violate the packaging rules. The
+``setup.cfg`` of the project holds ``disallowed`` patterns for DEP501.
+
+Usage::
+
+    $ python benchmarks/synthetic.py DIRECTORY [--depth 3] [--fan-out 3]
+
+"""
+import argparse
+import os
+import random
+import re
+import textwrap
+
+# Default parameters of generate_project.
+DEFAULTS = dict(
+    depth=3,
+    fan_out=3,
+    modules_per_package=4,
+    private_share=0.3,
+    imports_per_file=8,
+    n_patterns=5,
+    seed=0,
+)
+
+# Name of the top level package.
+PACKAGE_NAME = "package"
+
+
+def generate_project(
+        directory,
+        depth=DEFAULTS["depth"],
+        fan_out=DEFAULTS["fan_out"],
+        modules_per_package=DEFAULTS["modules_per_package"],
+        private_share=DEFAULTS["private_share"],
+        imports_per_file=DEFAULTS["imports_per_file"],
+        n_patterns=DEFAULTS["n_patterns"],
+        seed=DEFAULTS["seed"]):
+    """ Write a synthetic project.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the project, created if missing.
+    depth : int
+        Number of levels of packages, including the top level package.
+    fan_out : int
+        Number of subpackages of each package above the last level.
+    modules_per_package : int
+        Number of modules of each package, besides ``__init__.py`` and
+        ``api.py``.
+    private_share : float
+        Share of the modules and subpackages whose names start with an
+        underscore.
+    imports_per_file : int
+        Number of imported names in each module.
+    n_patterns : int
+        Number of disallowed patterns written in ``setup.cfg``.
+    seed : int
+        Seed of the random choices, for generating the same project again.
+
+    Returns
+    -------
+    summary : dict
+        Number of files (``n_files``) and of imported names
+        (``n_imports``) in the project, and the ``disallowed`` option
+        written in ``setup.cfg``.
+    """
+    rng = random.Random(seed)
+
+    packages = [PACKAGE_NAME]
+    for level in range(1, depth):
+        packages.extend(
+            f"{parent}.{_private_prefix(rng, private_share)}sub{index}"
+            for parent in packages
+            if parent.count(".") == level - 1
+            for index in range(fan_out)
+        )
+
+    package_modules = {
+        package: ["api"] + [
+            f"{_private_prefix(rng, private_share)}module{index}"
+            for index in range(modules_per_package)
+        ]
+        for package in packages
+    }
+    all_modules = [
+        f"{package}.{module}"
+        for package, modules in package_modules.items()
+        for module in modules
+    ]
+
+    n_files = 0
+    n_imports = 0
+    for package, modules in package_modules.items():
+        package_dir = os.path.join(directory, *package.split("."))
+        os.makedirs(package_dir, exist_ok=True)
+        _write(
+            os.path.join(package_dir, "__init__.py"),
+            "from . import api\n",
+        )
+        n_files += 1
+        n_imports += 1
+        for module in modules:
+            lines = [
+                _generate_import(rng, package, modules, all_modules)
+                for _ in range(imports_per_file)
+            ]
+            lines.append(_MODULE_BODY)
+            _write(
+                os.path.join(package_dir, module + ".py"),
+                "\n".join(lines),
+            )
+            n_files += 1
+            n_imports += imports_per_file
+
+    disallowed = "\n".join(
+        f"{rng.choice(packages).replace('.', '/')}/*: "
+        rf"{re.escape(rng.choice(packages))}\..*"
+        for _ in range(n_patterns)
+    )
+    _write(
+        os.path.join(directory, "setup.cfg"),
+        "[flake8]\n"
+        "select = DEP\n"
+        "top-level-dir = .\n"
+        "disallowed =\n" + textwrap.indent(disallowed, "    ") + "\n",
+    )
+    return dict(n_files=n_files, n_imports=n_imports, disallowed=disallowed)
+
+
+# Code following the imports of each generated module.
+_MODULE_BODY = textwrap.dedent("""
+
+    def function(value):
+        if value:
+            return [item * 2 for item in range(value)]
+        return None
+
+
+    class Class:
+
+        def method(self):
+            return function(3)
+""")
+
+
+def _private_prefix(rng, private_share):
+    """ Return the underscore prefix of a private name, randomly. """
+    return "_" if rng.random() < private_share else ""
+
+
+def _generate_import(rng, package, modules, all_modules):
+    """ Return a random import statement of a single name.
+
+    Parameters
+    ----------
+    rng : random.Random
+    package : str
+        Package of the module being generated.
+    modules : list of str
+        Names of the modules in the package.
+    all_modules : list of str
+        Absolute names of all the modules of the project.
+
+    Returns
+    -------
+    line : str
+    """
+    kind = rng.random()
+    if kind < 0.3:
+        return f"from . import {rng.choice(modules)}"
+    target = rng.choice(all_modules)
+    parent, _, name = target.rpartition(".")
+    if kind < 0.6:
+        return f"from {parent} import {name}"
+    if kind < 0.8:
+        return f"import {target}"
+    return f"from {target} import {_private_prefix(rng, 0.5)}function"
+
+
+def _write(path, content):
+    """ Write a text file. """
+    with open(path, "w") as file:
+        file.write(content)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directory", help="Directory of the project.")
+    for name, value in DEFAULTS.items():
+        parser.add_argument(
+            "--" + name.replace("_", "-"), type=type(value), default=value,
+        )
+    args = vars(parser.parse_args(argv))
+    summary = generate_project(**args)
+    print(
+        f"Generated {summary['n_files']} files with "
+        f"{summary['n_imports']} imports in {args['directory']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
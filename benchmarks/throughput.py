@@ -0,0 +1,285 @@
+""" Measure the throughput and peak memory of packaway on a synthetic
+project (see ``synthetic.py``).
+
+Each stage runs in a fresh interpreter, so that its peak resident set size
+(RSS) is measured separately:
+
+- ``underscore_rule``: ``underscore_rule.collect_errors`` on parsed files.
+- ``regex_rule``: ``regex_rule.collect_errors`` on parsed files, with the
+  disallowed patterns applying to each file.
+- ``plugin``: ``ImportChecker.run`` on parsed files, with all the options.
+- ``flake8``: ``flake8`` run on the project, end to end.
+
+Usage::
+
+    $ python benchmarks/throughput.py [--depth 4] [--fan-out 4] [--json out]
+
+"""
+import argparse
+import ast
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic import DEFAULTS, generate_project
+
+
+def peak_rss():
+    """ Return the peak resident set size of this process and its waited
+    children, in bytes.
+    """
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # The size is in kilobytes on Linux but in bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def find_files():
+    """ Return the paths of the Python files of the project in the current
+    directory.
+    """
+    return sorted(
+        os.path.join(dirpath, name)
+        for dirpath, _, names in os.walk(os.curdir)
+        for name in names
+        if name.endswith(".py")
+    )
+
+
+def module_names_of(filenames):
+    """ Return the module names of files of the project. """
+    from packaway.paths import deduce_module_name
+
+    return [deduce_module_name(filename, os.curdir) for filename in filenames]
+
+
+def parse_files(filenames):
+    """ Return the source lines and the AST of each file. """
+    parsed = []
+    for filename in filenames:
+        with open(filename) as file:
+            lines = file.readlines()
+        parsed.append((filename, lines, ast.parse("".join(lines))))
+    return parsed
+
+
+def underscore_rule_runner(filenames, disallowed):
+    """ Return a callable running DEP401 on the parsed files. """
+    from packaway.rules import underscore_rule
+
+    parsed = parse_files(filenames)
+    module_names = module_names_of(filenames)
+
+    def run():
+        for (_, _, tree), module_name in zip(parsed, module_names):
+            underscore_rule.collect_errors(tree, module_name)
+
+    return run
+
+
+def regex_rule_runner(filenames, disallowed):
+    """ Return a callable running DEP501 on the parsed files. """
+    from packaway.config import FilePatternMatcher, parse_disallowed_patterns
+    from packaway.rules import regex_rule
+
+    parsed = parse_files(filenames)
+    module_names = module_names_of(filenames)
+    matcher = FilePatternMatcher(parse_disallowed_patterns(disallowed))
+    patterns = [matcher.resolve(filename) for filename in filenames]
+
+    def run():
+        for (_, _, tree), module_name, file_patterns in zip(
+                parsed, module_names, patterns):
+            regex_rule.collect_errors(tree, module_name, file_patterns)
+
+    return run
+
+
+def plugin_runner(filenames, disallowed):
+    """ Return a callable running the flake8 plugin on the parsed files. """
+    from packaway.plugins.flake8.import_checker import ImportChecker
+
+    parsed = parse_files(filenames)
+    ImportChecker.parse_options(argparse.Namespace(
+        top_level_dir=os.curdir,
+        no_deduce_path=False,
+        find_package_roots=False,
+        source_roots=[],
+        disallowed_patterns=disallowed,
+        contracts="",
+        packaway_cache_dir=None,
+    ))
+
+    def run():
+        for filename, lines, tree in parsed:
+            list(ImportChecker(tree, filename, lines).run())
+
+    return run
+
+
+def flake8_runner(filenames, disallowed):
+    """ Return a callable running flake8 on the project. """
+    from flake8.main.cli import main as flake8_main
+
+    def run():
+        with contextlib.suppress(SystemExit):
+            flake8_main(["--output-file", os.devnull, os.curdir])
+
+    return run
+
+
+# Mapping from stage name to the callable(filenames, disallowed) returning
+# the callable to be timed.
+RUNNERS = {
+    "underscore_rule": underscore_rule_runner,
+    "regex_rule": regex_rule_runner,
+    "plugin": plugin_runner,
+    "flake8": flake8_runner,
+}
+
+
+def run_stage(stage, repeat):
+    """ Run a stage in the project in the current directory.
+
+    Parameters
+    ----------
+    stage : str
+        One of ``RUNNERS``.
+    repeat : int
+        Number of runs, of which the fastest is reported.
+
+    Returns
+    -------
+    result : dict
+        The time of the fastest run in seconds (``seconds``) and the peak
+        RSS in bytes (``peak_rss``).
+    """
+    from packaway.config import read_config
+
+    run = RUNNERS[stage](find_files(), read_config()["disallowed"])
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+    return dict(seconds=min(seconds), peak_rss=peak_rss())
+
+
+def run_benchmarks(directory, summary, stages, repeat):
+    """ Run each stage in a new interpreter and return the results.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the generated project.
+    summary : dict
+        Summary of the generated project, from ``generate_project``.
+    stages : list of str
+        Stages to run.
+    repeat : int
+        Number of runs of each stage.
+
+    Returns
+    -------
+    results : list of dict
+    """
+    results = []
+    for stage in stages:
+        output = subprocess.run(
+            [
+                sys.executable, os.path.abspath(__file__),
+                "--stage", stage, "--repeat", str(repeat),
+            ],
+            cwd=directory,
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+        result = json.loads(output)
+        result.update(
+            stage=stage,
+            files_per_second=summary["n_files"] / result["seconds"],
+            imports_per_second=summary["n_imports"] / result["seconds"],
+        )
+        results.append(result)
+    return results
+
+
+def print_results(summary, results):
+    """ Print the results as a table. """
+    print(
+        f"Project: {summary['n_files']} files, "
+        f"{summary['n_imports']} imports"
+    )
+    print(
+        f"{'stage':<16} {'time (ms)':>10} {'files/s':>10} "
+        f"{'imports/s':>11} {'peak RSS (MiB)':>15}"
+    )
+    for result in results:
+        print(
+            f"{result['stage']:<16} {result['seconds'] * 1000:>10.1f} "
+            f"{result['files_per_second']:>10.0f} "
+            f"{result['imports_per_second']:>11.0f} "
+            f"{result['peak_rss'] / 2**20:>15.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0],
+    )
+    for name, value in DEFAULTS.items():
+        parser.add_argument(
+            "--" + name.replace("_", "-"), type=type(value), default=value,
+        )
+    parser.add_argument(
+        "--stages", default=",".join(RUNNERS),
+        help="Comma separated stages to run.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Number of runs of each stage; the fastest is reported.",
+    )
+    parser.add_argument(
+        "--json", default=None, help="Path of a file to write results to.",
+    )
+    parser.add_argument("--stage", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.stage is not None:
+        print(json.dumps(run_stage(args.stage, args.repeat)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        summary = generate_project(directory, **{
+            name: getattr(args, name) for name in DEFAULTS
+        })
+        results = run_benchmarks(
+            directory, summary, args.stages.split(","), args.repeat,
+        )
+
+    print_results(summary, results)
+    if args.json is not None:
+        with open(args.json, "w") as file:
+            json.dump(
+                dict(
+                    parameters={
+                        name: getattr(args, name) for name in DEFAULTS
+                    },
+                    n_files=summary["n_files"],
+                    n_imports=summary["n_imports"],
+                    results=results,
+                ),
+                file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
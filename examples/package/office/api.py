@@ -11,3 +11,7 @@ from ._legal import api as legal_api
 
 # This is NOT allowed
 from ._legal import _compliance
+
+# This is NOT allowed if re-exports are checked: 'reading' is the private
+# module 'person._reading'.
+from ..person.api import reading
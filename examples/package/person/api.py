@@ -3,3 +3,6 @@ from . import _reading
 
 # This is not allowed
 from ._reading import _private_name
+
+# This is allowed, but re-exports the private module as a public name.
+from . import _reading as reading
@@ -0,0 +1,267 @@
+""" This module supports suppressing the violations recorded in a baseline
+file, so that the rules can be enforced before all the existing violations
+are fixed.
+
+Violations are identified by a fingerprint of the module, the error code,
+the imported name and the line of the import, with its whitespace and
+comments normalized, so that they survive changes elsewhere in the file.
+"""
+
+from array import array
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+
+#: Default path of the baseline file.
+DEFAULT_BASELINE = ".packaway_baseline"
+
+# Start of a baseline file, with the version of its layout.
+_MAGIC = b"packaway-baseline 1\n"
+
+# Header of the fingerprints of a file: the size of its path and the number
+# of fingerprints.
+_FILE_HEADER = struct.Struct("<II")
+
+# Type code and size of fingerprints in arrays.
+_FINGERPRINT_TYPE = "Q"
+_FINGERPRINT_SIZE = 8
+
+
+class Baseline:
+    """ Fingerprints of known violations, grouped by file.
+
+    Parameters
+    ----------
+    entries : dict(str, set of int), optional
+        Mapping from the path of each file, see ``baseline_path``, to the
+        fingerprints of its violations.
+    """
+
+    def __init__(self, entries=None):
+        self.entries = {} if entries is None else entries
+        # Mapping from path to the fingerprints matched by filter.
+        self._matched = {}
+
+    def __repr__(self):
+        return f"Baseline(<{len(self)} entries in {len(self.entries)} files>)"
+
+    def __len__(self):
+        return sum(len(fingerprints) for fingerprints in self.entries.values())
+
+    @classmethod
+    def from_errors(cls, errors):
+        """ Create a baseline of errors.
+
+        Parameters
+        ----------
+        errors : iterable of tuple(str, int, int, str, str, int or None)
+            Filename, line number, column offset, error code, message and
+            fingerprint of each error, as returned by a ``FileChecker``
+            created with ``fingerprints=True``. Errors without fingerprint,
+            e.g. syntax errors, are not recorded.
+
+        Returns
+        -------
+        baseline : Baseline
+        """
+        entries = {}
+        for error in errors:
+            if error[5] is not None:
+                entries.setdefault(baseline_path(error[0]), set()).add(
+                    error[5]
+                )
+        return cls(entries)
+
+    @classmethod
+    def load(cls, path):
+        """ Read a baseline file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file.
+
+        Returns
+        -------
+        baseline : Baseline
+
+        Raises
+        ------
+        OSError
+            If the file cannot be read.
+        ValueError
+            If the file is not a baseline file.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if not data.startswith(_MAGIC):
+            raise ValueError(f"{path!r} is not a packaway baseline file.")
+
+        entries = {}
+        offset = len(_MAGIC)
+        try:
+            while offset < len(data):
+                path_size, n_fingerprints = _FILE_HEADER.unpack_from(
+                    data, offset,
+                )
+                offset += _FILE_HEADER.size
+                name = os.fsdecode(data[offset:offset + path_size])
+                offset += path_size
+                size = n_fingerprints * _FINGERPRINT_SIZE
+                if offset + size > len(data):
+                    raise ValueError("Truncated fingerprints.")
+                fingerprints = array(_FINGERPRINT_TYPE)
+                fingerprints.frombytes(data[offset:offset + size])
+                offset += size
+                if sys.byteorder == "big":
+                    fingerprints.byteswap()
+                entries[name] = set(fingerprints)
+        except (struct.error, ValueError) as error:
+            raise ValueError(
+                f"{path!r} is not a valid packaway baseline file: {error}"
+            ) from None
+        return cls(entries)
+
+    def save(self, path):
+        """ Write the baseline to a file, atomically.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file.
+        """
+        chunks = [_MAGIC]
+        for name, fingerprints in sorted(self.entries.items()):
+            if not fingerprints:
+                continue
+            encoded = os.fsencode(name)
+            chunks.append(_FILE_HEADER.pack(len(encoded), len(fingerprints)))
+            chunks.append(encoded)
+            fingerprints = array(_FINGERPRINT_TYPE, sorted(fingerprints))
+            if sys.byteorder == "big":
+                fingerprints.byteswap()
+            chunks.append(fingerprints.tobytes())
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=".baseline-", suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(b"".join(chunks))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def filter(self, errors):
+        """ Remove the errors recorded in the baseline.
+
+        The errors removed are remembered for finding the stale entries of
+        the baseline, see ``stale``.
+
+        Parameters
+        ----------
+        errors : iterable of tuple(str, int, int, str, str, int or None)
+            Errors with their fingerprint, see ``from_errors``.
+
+        Yields
+        ------
+        error : tuple(str, int, int, str, str)
+            Filename, line number, column offset, error code and message
+            of each error not in the baseline.
+        """
+        entries = self.entries
+        # The errors of a file come together, so the path of the last file
+        # is reused.
+        filename = name = fingerprints = None
+        for error in errors:
+            fingerprint = error[5]
+            if fingerprint is not None and entries:
+                if error[0] != filename:
+                    filename = error[0]
+                    name = baseline_path(filename)
+                    fingerprints = entries.get(name)
+                if fingerprints is not None and fingerprint in fingerprints:
+                    self._matched.setdefault(name, set()).add(fingerprint)
+                    continue
+            yield error[:5]
+
+    def stale(self, filenames):
+        """ Return the number of entries that no longer match any error.
+
+        Parameters
+        ----------
+        filenames : iterable of str
+            Paths of the files whose errors were all given to ``filter``.
+            Entries of files that no longer exist are stale as well.
+
+        Returns
+        -------
+        stale : dict(str, int)
+            Mapping from the path of each file with stale entries, see
+            ``baseline_path``, to their number.
+        """
+        checked = {baseline_path(filename) for filename in filenames}
+        stale = {}
+        for name, fingerprints in sorted(self.entries.items()):
+            if name in checked:
+                n_stale = len(fingerprints - self._matched.get(name, set()))
+            elif not os.path.exists(name):
+                n_stale = len(fingerprints)
+            else:
+                continue
+            if n_stale:
+                stale[name] = n_stale
+        return stale
+
+
+def fingerprint(module_name, code, target, line):
+    """ Return the fingerprint of a violation.
+
+    Parameters
+    ----------
+    module_name : str or None
+        Module name of the file.
+    code : str
+        Error code.
+    target : str
+        Imported name.
+    line : str
+        Line of the import statement. Whitespace and comments do not
+        change the fingerprint.
+
+    Returns
+    -------
+    fingerprint : int
+        Unsigned 64-bit integer.
+    """
+    context = " ".join(line.split("#", 1)[0].split())
+    key = "\0".join([module_name or "", code, target, context])
+    digest = hashlib.blake2b(
+        key.encode("utf-8", "surrogatepass"),
+        digest_size=_FINGERPRINT_SIZE,
+    ).digest()
+    return int.from_bytes(digest, "little")
+
+
+def baseline_path(filename):
+    """ Return the path identifying a file in a baseline.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the file.
+
+    Returns
+    -------
+    path : str
+        Path relative to the current directory, with forward slashes.
+    """
+    if os.path.isabs(filename):
+        filename = os.path.relpath(filename)
+    else:
+        filename = os.path.normpath(filename)
+    return filename.replace(os.sep, "/")
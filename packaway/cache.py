@@ -0,0 +1,233 @@
+""" This module provides a persistent cache of check results, so that files
+that have not changed are not analyzed again.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+
+from packaway import __version__, stats
+from packaway.rules import engine
+
+#: Default directory of the cache.
+DEFAULT_CACHE_DIR = ".packaway_cache"
+
+#: Default maximum number of entries kept in the cache.
+DEFAULT_MAX_ENTRIES = 100000
+
+# Version of the layout of the cache. Entries of other versions are
+# ignored.
+_CACHE_VERSION = "v2"
+
+#: Fingerprint keying the imports parsed from files, apart from their
+#: errors.
+IMPORTS_FINGERPRINT = f"imports {__version__}"
+
+# Suffix of the files holding cache entries.
+_ENTRY_SUFFIX = ".json"
+
+_CACHEDIR_TAG = """\
+Signature: 8a477f597d28d172789f06886806bc55
+# This file is a cache directory tag created by packaway.
+# For information about cache directory tags, see:
+#   https://bford.info/cachedir/spec.html
+"""
+
+
+class ResultCache:
+    """ On-disk cache of the errors found in files, keyed by the content of
+    the file, its module name and the configuration of the rules.
+
+    Each entry is stored in its own file and written atomically, so that
+    several processes can use the same cache concurrently. Reading an
+    entry marks it as recently used; ``prune`` evicts the least recently
+    used entries.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Directory of the cache. It is created when the first entry is
+        written.
+    max_entries : int, optional
+        Maximum number of entries kept by ``prune``.
+    """
+
+    def __init__(
+            self, directory=DEFAULT_CACHE_DIR,
+            max_entries=DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries_dir = os.path.join(directory, _CACHE_VERSION)
+
+    def __repr__(self):
+        return (
+            f"ResultCache(directory={self.directory!r}, "
+            f"max_entries={self.max_entries!r})"
+        )
+
+    @staticmethod
+    def key(source, module_name, config_hash):
+        """ Return the key of the entry for a file.
+
+        Parameters
+        ----------
+        source : bytes or str
+            Content of the file.
+        module_name : str or None
+            Module name deduced for the file.
+        config_hash : str
+            Fingerprint of the configuration of the rules applied to the
+            file.
+
+        Returns
+        -------
+        key : str
+        """
+        if isinstance(source, str):
+            source = source.encode("utf-8", "surrogatepass")
+        digest = hashlib.blake2b(source, digest_size=20)
+        digest.update(b"\0" + repr(module_name).encode("utf-8"))
+        digest.update(b"\0" + config_hash.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """ Return the errors cached for a key.
+
+        Parameters
+        ----------
+        key : str
+            Key returned by ``key``.
+
+        Returns
+        -------
+        errors : list of tuple(int, int, str, str, str or None) or None
+            Line number, column offset, error code, message and imported
+            name of the errors, or None if the key is not in the cache.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                errors = json.load(file)
+        except (OSError, ValueError):
+            stats.count("result cache misses")
+            return None
+        stats.count("result cache hits")
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return [tuple(error) for error in errors]
+
+    def set(self, key, errors):
+        """ Store the errors found for a key.
+
+        Failures to write are ignored, the cache is only an optimization.
+
+        Parameters
+        ----------
+        key : str
+            Key returned by ``key``.
+        errors : list of tuple(int, int, str, str, str or None)
+            Line number, column offset, error code, message and imported
+            name of the errors.
+        """
+        path = self._entry_path(key)
+        try:
+            self._ensure_directory(os.path.dirname(path))
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path), suffix=".tmp",
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    json.dump(errors, file, separators=(",", ":"))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+
+    def prune(self):
+        """ Evict the least recently used entries, so that at most
+        ``max_entries`` are kept.
+
+        Returns
+        -------
+        n_removed : int
+            Number of entries removed.
+        """
+        entries = []
+        try:
+            subdirs = list(os.scandir(self._entries_dir))
+        except OSError:
+            return 0
+        for subdir in subdirs:
+            if not subdir.is_dir():
+                continue
+            try:
+                for entry in os.scandir(subdir.path):
+                    if entry.name.endswith(_ENTRY_SUFFIX):
+                        entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+
+        n_excess = len(entries) - self.max_entries
+        if n_excess <= 0:
+            return 0
+        entries.sort()
+        n_removed = 0
+        for _, path in entries[:n_excess]:
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            n_removed += 1
+        return n_removed
+
+    def _entry_path(self, key):
+        """ Return the path of the file holding an entry. """
+        return os.path.join(self._entries_dir, key[:2], key + _ENTRY_SUFFIX)
+
+    def _ensure_directory(self, path):
+        """ Create a directory of the cache if it does not exist. """
+        if os.path.isdir(path):
+            return
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, "CACHEDIR.TAG"), "w") as f:
+                f.write(_CACHEDIR_TAG)
+            with open(os.path.join(self.directory, ".gitignore"), "w") as f:
+                f.write("# Created by packaway automatically.\n*\n")
+        os.makedirs(path, exist_ok=True)
+
+
+@functools.lru_cache(maxsize=1024)
+def rules_fingerprint(disallowed_matchers, contracts=None, exports=None):
+    """ Return the fingerprint of the rules applied to a file, for use as
+    part of the key of cached results.
+
+    Parameters
+    ----------
+    disallowed_matchers : tuple of DisallowedMatcher
+        Matchers of disallowed imports applied to the file.
+    contracts : ContractMatrix or None, optional
+        Layered architecture contracts.
+    exports : ExportIndex or None, optional
+        Index of the re-exports of the project.
+
+    Returns
+    -------
+    config_hash : str
+    """
+    config = repr((
+        __version__,
+        engine.registered_codes(),
+        [matcher.patterns for matcher in disallowed_matchers],
+        () if contracts is None else contracts.contracts,
+        None if not exports else exports.fingerprint,
+    ))
+    return hashlib.blake2b(
+        config.encode("utf-8"), digest_size=20,
+    ).hexdigest()
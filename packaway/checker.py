@@ -0,0 +1,758 @@
+""" This module supports checking Python files against the import rules
+outside of flake8.
+"""
+
+import ast
+import importlib.util
+import io
+import os
+import re
+import time
+
+from packaway import stats
+from packaway.baseline import fingerprint
+from packaway.cache import IMPORTS_FINGERPRINT, rules_fingerprint
+from packaway.config import CompiledConfig
+from packaway.notebook import NOTEBOOK_EXTENSION, read_notebook
+from packaway.rules import engine
+
+# Inline comment for suppressing errors, the same as flake8.
+_NOQA_INLINE = re.compile(
+    r"# noqa(?::[\s]?(?P<codes>([A-Z]+[0-9]+(?:[,\s]+)?)+))?",
+    re.IGNORECASE,
+)
+
+# Separators between the codes of a noqa comment.
+_NOQA_CODE_SEPARATOR = re.compile(r"[,\s]+")
+
+# Suffix of the fingerprint of the rules in the keys of cache entries, if
+# all the files are parsed for reporting syntax errors.
+_SYNTAX_CHECKED = "+E999"
+
+#: Error code of the files of which only the import statements are checked,
+#: because they are over the size or time budget.
+DEGRADED_CODE = "DEP901"
+
+# Number of bytes parsed per second assumed for estimating the time of
+# parsing a file, until enough files are parsed for measuring it.
+_DEFAULT_PARSE_RATE = 1 << 20
+
+# Number of bytes parsed before the measured rate is used.
+_MIN_MEASURED_BYTES = 1 << 20
+
+
+class FileChecker:
+    """ Checker of Python files against all the registered import rules.
+
+    The configuration is compiled once, so the same checker should be used
+    for checking many files, or the same ``CompiledConfig`` shared by the
+    checkers.
+
+    Parameters
+    ----------
+    top_level_dir : str or None, optional
+        Top level directory to use when composing module names from file
+        paths.
+    deduce_path : bool, optional
+        Whether to deduce module names from file paths.
+    find_package_roots : bool, optional
+        Whether to compose module names from the roots of the packages
+        containing the files, instead of the top level directory, see
+        ``paths.ModuleNameResolver``.
+    source_roots : list of str, optional
+        Directories holding top level packages and modules. Implies
+        ``find_package_roots``.
+    disallowed_patterns : list of tuple(str, str), optional
+        Pairs of filename pattern and regular expression for disallowed
+        imports.
+    per_file_ignores : list of tuple(str, tuple of str), optional
+        Pairs of filename pattern and error codes ignored for the files.
+    contracts : list of tuple(str, tuple), optional
+        Layered architecture contracts, see ``config.parse_contracts``.
+    exports : ExportIndex or None, optional
+        Index of the re-exports of the project, for reporting the private
+        modules imported through them, see ``graph.build_export_index``.
+        Default is not to check re-exports.
+    cache : ResultCache or None, optional
+        Cache of the errors found in files. Default is not to cache.
+    prefilter : bool, optional
+        Whether to skip parsing the files in which scanning the lines shows
+        that no import violates the rules. Syntax errors in these files are
+        not reported. Default is true.
+    fingerprints : bool, optional
+        Whether to add the fingerprint of each error to the errors, for
+        matching them against a baseline, see ``baseline.Baseline``.
+        Default is false.
+    config : CompiledConfig or None, optional
+        Compiled configuration. If given, the options from
+        ``top_level_dir`` to ``contracts`` are ignored. Default is to
+        compile them.
+    max_file_size : int or None, optional
+        Size in bytes over which files are not read whole nor parsed: only
+        their import statements are found, by scanning their lines, and
+        they are reported with the DEP901 code. Default is no limit.
+    max_file_time : float or None, optional
+        Number of seconds over which parsing a file is estimated to take,
+        from its size and the rate of parsing measured so far, for
+        checking only its import statements as for ``max_file_size``.
+        Scanning the lines of a file also stops after this time. Default
+        is no limit.
+    """
+
+    def __init__(
+            self, top_level_dir=None, deduce_path=True,
+            disallowed_patterns=(), per_file_ignores=(), contracts=(),
+            cache=None, prefilter=True, fingerprints=False,
+            find_package_roots=False, source_roots=(), exports=None,
+            config=None, max_file_size=None, max_file_time=None):
+        if config is None:
+            config = CompiledConfig(
+                top_level_dir=top_level_dir,
+                deduce_path=deduce_path,
+                find_package_roots=find_package_roots,
+                source_roots=source_roots,
+                disallowed_patterns=disallowed_patterns,
+                per_file_ignores=per_file_ignores,
+                contracts=contracts,
+            )
+        self.config = config
+        self.cache = cache
+        self.prefilter = prefilter
+        self.fingerprints = fingerprints
+        self.max_file_size = max_file_size
+        self.max_file_time = max_file_time
+        self._exports = exports
+        self._parse_budget = (
+            None if max_file_time is None else _ParseBudget(max_file_time)
+        )
+        # Fingerprints of the rules, by the matchers applied to the files.
+        self._rules_fingerprints = {}
+
+    def module_name(self, filename):
+        """ Return the module name of a file.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the Python file.
+
+        Returns
+        -------
+        module_name : str or None
+            None if module names are not deduced from file paths.
+        """
+        with stats.timed("module_name"):
+            return self.config.module_name(filename)
+
+    def check(self, filename, module_name=None):
+        """ Check a Python file or Jupyter notebook.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the Python file or notebook. The code cells of
+            notebooks are checked, and the errors are reported with their
+            line in their cell, the number of the cell being appended to
+            the message.
+        module_name : str or None, optional
+            Module name of the file. Default is to deduce it from the path.
+
+        Returns
+        -------
+        errors : list of tuple(str, int, int, str, str)
+            Filename, line number, column offset, error code and message of
+            each error, ordered by position. Files that cannot be read or
+            parsed are reported with the E902 and E999 codes, as flake8
+            does, and files over the size or time budget with the DEP901
+            code. If ``fingerprints`` is true, the fingerprint of each
+            error is added, None for the errors that are not about an
+            import.
+        """
+        if filename.endswith(NOTEBOOK_EXTENSION):
+            return self._check_notebook(filename, module_name)
+        if self.max_file_size is not None:
+            try:
+                size = os.path.getsize(filename)
+            except OSError:
+                # Reported when reading the file.
+                size = 0
+            if size > self.max_file_size:
+                return self._check_large_file(filename, module_name, size)
+        try:
+            with open(filename, "rb") as file:
+                source = file.read()
+        except OSError as error:
+            return [self._read_error(filename, f"{type(error).__name__}")]
+        return self.check_source(source, filename, module_name)
+
+    def check_source(self, source, filename, module_name=None):
+        """ Check the source code of a Python file.
+
+        Parameters
+        ----------
+        source : str or bytes
+            Source code. If given as bytes, it is decoded following the
+            encoding declaration of the file, as the interpreter does.
+        filename : str
+            Path of the Python file, for deducing the module name and the
+            rules that apply.
+        module_name : str or None, optional
+            Module name of the file. Default is to deduce it from the path.
+
+        Returns
+        -------
+        errors : list of tuple(str, int, int, str, str)
+            See ``check``.
+        """
+        start = time.perf_counter()
+        errors = self._check_source(source, filename, module_name)
+        recorder = stats.current()
+        if recorder is not None:
+            recorder.add_file(filename, time.perf_counter() - start)
+        return errors
+
+    def _check_source(self, source, filename, module_name):
+        """ Check the source code of a Python file, see ``check_source``,
+        without recording the time spent.
+        """
+        if self.max_file_size is not None:
+            size = _source_size(source)
+            if size > self.max_file_size:
+                return self._check_degraded(
+                    _source_file(source), filename, module_name,
+                    self._size_message(size),
+                )
+        if module_name is None:
+            module_name = self.module_name(filename)
+        disallowed_matchers = self.config.disallowed_matchers.resolve(
+            filename
+        )
+
+        key = None
+        errors = None
+        if self.cache is not None:
+            fingerprint = self._rules_fingerprint(disallowed_matchers)
+            key = self.cache.key(source, module_name, fingerprint)
+            errors = self.cache.get(key)
+
+        if errors is None:
+            imports = None
+            if self.cache is not None and self._exports is not None:
+                # Parsed when indexing the re-exports.
+                imports = self.cache.get(
+                    self.cache.key(source, module_name, IMPORTS_FINGERPRINT)
+                )
+            errors = _collect_errors(
+                source, module_name,
+                self._build_checkers(disallowed_matchers),
+                self.prefilter,
+                imports,
+                self._parse_budget,
+            )
+            if errors is None:
+                # Not cached, as the estimated time of parsing varies.
+                return self._check_degraded(
+                    _source_file(source), filename, module_name,
+                    self._parse_budget.message(_source_size(source)),
+                )
+            if key is not None:
+                self.cache.set(key, errors)
+
+        return self._filter_errors(errors, source, filename, module_name)
+
+    def check_imports(self, imports, source, filename):
+        """ Check the imports already parsed from a Python file.
+
+        Parameters
+        ----------
+        imports : list of tuple(int, int, str)
+            Line number, column offset and imported name of each import,
+            see ``parse_imports``.
+        source : str or bytes
+            Source code, for reading noqa comments.
+        filename : str
+            Path of the Python file, for deducing the module name and the
+            rules that apply.
+
+        Returns
+        -------
+        errors : list of tuple(str, int, int, str, str)
+            See ``check``.
+        """
+        module_name = self.module_name(filename)
+        errors = _check_imports(
+            imports,
+            module_name,
+            self._build_checkers(
+                self.config.disallowed_matchers.resolve(filename)
+            ),
+        )
+        return self._filter_errors(errors, source, filename, module_name)
+
+    def _check_large_file(self, filename, module_name, size):
+        """ Check the import statements of a file over the size budget,
+        without reading it whole, see ``check``.
+        """
+        start = time.perf_counter()
+        try:
+            with open(filename, "rb") as file:
+                errors = self._check_degraded(
+                    file, filename, module_name, self._size_message(size),
+                )
+        except OSError as error:
+            return [self._read_error(filename, f"{type(error).__name__}")]
+        recorder = stats.current()
+        if recorder is not None:
+            recorder.add_file(filename, time.perf_counter() - start)
+        return errors
+
+    def _check_degraded(self, file, filename, module_name, message):
+        """ Check the import statements of a file over budget, found by
+        scanning its lines without parsing it.
+
+        Parameters
+        ----------
+        file : file object
+            The Python file, opened in binary mode.
+        filename : str
+            Path of the Python file.
+        module_name : str or None
+            Module name of the file. Default is to deduce it from the path.
+        message : str
+            Message of the DEP901 error reported for the file, explaining
+            why it is not parsed.
+
+        Returns
+        -------
+        errors : list of tuple(str, int, int, str, str)
+            See ``check``.
+        """
+        if module_name is None:
+            module_name = self.module_name(filename)
+        deadline = None
+        if self.max_file_time is not None:
+            deadline = time.perf_counter() + self.max_file_time
+        try:
+            imports, lines, stopped_at = engine.scan_file_imports(
+                file, module_name, deadline,
+            )
+        except SyntaxError as error:
+            # Invalid encoding declaration.
+            errors = [(1, 0, "E999", f"SyntaxError: {error.msg}", None)]
+            lines = {}
+        else:
+            if stopped_at is not None:
+                message += (
+                    f" The scan stopped at line {stopped_at}, over the "
+                    f"time budget."
+                )
+            errors = [(1, 0, DEGRADED_CODE, message, None)]
+            errors.extend(_check_imports(
+                imports,
+                module_name,
+                self._build_checkers(
+                    self.config.disallowed_matchers.resolve(filename)
+                ),
+            ))
+        stats.count("degraded files")
+        return self._filter_errors(
+            errors, None, filename, module_name, lines,
+        )
+
+    def _size_message(self, size):
+        """ Return the message of DEP901 for a file over the size budget.
+        """
+        return (
+            f"Only the import statements are checked: the file has {size} "
+            f"bytes, over the budget of {self.max_file_size} bytes."
+        )
+
+    def _check_notebook(self, filename, module_name):
+        """ Check the code cells of a notebook, see ``check``.
+
+        Only the code is read from the notebook, so that the results cached
+        do not depend on the outputs of the cells. Each cell is parsed on
+        its own, so that a syntax error only hides the errors of its cell.
+        """
+        start = time.perf_counter()
+        try:
+            notebook = read_notebook(filename)
+        except OSError as error:
+            return [self._read_error(filename, f"{type(error).__name__}")]
+        except ValueError as error:
+            return [
+                self._read_error(filename, f"{type(error).__name__}: {error}")
+            ]
+        if module_name is None:
+            module_name = self.module_name(filename)
+        errors = []
+        for cell_number, source in notebook.cells:
+            for error in self._check_source(source, filename, module_name):
+                errors.append(
+                    error[:4] + (f"{error[4]} (cell {cell_number})",)
+                    + error[5:]
+                )
+        recorder = stats.current()
+        if recorder is not None:
+            recorder.add_file(filename, time.perf_counter() - start)
+        return errors
+
+    def _read_error(self, filename, message):
+        """ Return the E902 error of a file that cannot be read. """
+        error = (filename, 1, 0, "E902", message)
+        if self.fingerprints:
+            error += (None,)
+        return error
+
+    def _rules_fingerprint(self, disallowed_matchers):
+        """ Return the fingerprint of the rules applied to a file, for the
+        keys of its cached results.
+
+        Parameters
+        ----------
+        disallowed_matchers : tuple of DisallowedMatcher
+            Matchers of disallowed imports applied to the file.
+
+        Returns
+        -------
+        fingerprint : str
+        """
+        # The same tuple of matchers is resolved for the files with the
+        # same rules.
+        try:
+            return self._rules_fingerprints[disallowed_matchers]
+        except KeyError:
+            pass
+        fingerprint = rules_fingerprint(
+            disallowed_matchers, self.config.contract_matrix, self._exports,
+        )
+        if not self.prefilter:
+            # Syntax errors are reported for all files.
+            fingerprint += _SYNTAX_CHECKED
+        self._rules_fingerprints[disallowed_matchers] = fingerprint
+        return fingerprint
+
+    def _build_checkers(self, disallowed_matchers):
+        """ Build the checkers of the rules applied to a file.
+
+        Parameters
+        ----------
+        disallowed_matchers : tuple of DisallowedMatcher
+            Matchers of disallowed imports applied to the file.
+
+        Returns
+        -------
+        code_to_checker : dict(str, callable(str, str) -> iterable of str)
+        """
+        return engine.build_checkers(
+            disallowed_matchers=disallowed_matchers,
+            contracts=self.config.contract_matrix,
+            exports=self._exports,
+        )
+
+    def _filter_errors(self, errors, source, filename, module_name,
+                       lines=None):
+        """ Remove the errors ignored for the file or by noqa comments.
+
+        Parameters
+        ----------
+        errors : list of tuple(int, int, str, str, str or None)
+            Line number, column offset, error code, message and imported
+            name of the errors.
+        source : str or bytes or None
+            Source code. Only used if ``lines`` is not given.
+        filename : str
+            Path of the Python file.
+        module_name : str or None
+            Module name of the file, for the fingerprints of the errors.
+        lines : dict(int, str) or None, optional
+            Lines of the errors by line number. Default is to read them
+            from the source code.
+
+        Returns
+        -------
+        errors : list of tuple(str, int, int, str, str)
+            See ``check``.
+        """
+        ignored_codes = self.config.ignored_codes.resolve(filename)
+        results = []
+        for lineno, col_offset, code, message, target in errors:
+            if _is_ignored(code, ignored_codes):
+                continue
+            if lines is None:
+                lines = dict(enumerate(_source_lines(source), 1))
+            line = lines.get(lineno, "")
+            if _is_noqa(code, line):
+                continue
+            error = (filename, lineno, col_offset, code, message)
+            if self.fingerprints:
+                if target is None:
+                    error += (None,)
+                else:
+                    error += (fingerprint(module_name, code, target, line),)
+            results.append(error)
+        return results
+
+
+class _ParseBudget:
+    """ Budget of time for parsing a file, compared with the time parsing
+    it is estimated to take from its size.
+
+    The time of parsing cannot be limited while it runs, as ``ast.parse``
+    does not let signal handlers run. It is estimated instead from the rate
+    of parsing measured on the files parsed so far by the process.
+
+    Parameters
+    ----------
+    seconds : float
+        Time allowed for parsing a file.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self._parsed_bytes = 0
+        self._parse_time = 0.0
+
+    def estimate(self, size):
+        """ Return the number of seconds parsing a file is estimated to
+        take.
+
+        Parameters
+        ----------
+        size : int
+            Size of the file, in bytes.
+        """
+        if self._parsed_bytes < _MIN_MEASURED_BYTES or not self._parse_time:
+            return size / _DEFAULT_PARSE_RATE
+        return size * self._parse_time / self._parsed_bytes
+
+    def allows(self, size):
+        """ Return whether a file of the given size can be parsed within
+        the budget.
+        """
+        return self.estimate(size) <= self.seconds
+
+    def record(self, size, seconds):
+        """ Record the time spent parsing a file of the given size. """
+        self._parsed_bytes += size
+        self._parse_time += seconds
+
+    def message(self, size):
+        """ Return the message of DEP901 for a file over the budget. """
+        return (
+            f"Only the import statements are checked: parsing the file is "
+            f"estimated to take {self.estimate(size):.1f} s, over the "
+            f"budget of {self.seconds:g} s."
+        )
+
+
+def format_error(error):
+    """ Format an error in the same way as flake8.
+
+    Parameters
+    ----------
+    error : tuple(str, int, int, str, str)
+        Filename, line number, column offset, error code and message.
+
+    Returns
+    -------
+    text : str
+    """
+    filename, lineno, col_offset, code, message = error
+    return f"{filename}:{lineno}:{col_offset + 1}: {code} {message}"
+
+
+def parse_imports(source, module_name=None):
+    """ Parse the imports in the source code of a Python file.
+
+    Parameters
+    ----------
+    source : str or bytes
+        Source code.
+    module_name : str or None, optional
+        Module name of the file, for normalizing relative imports.
+
+    Returns
+    -------
+    imports : list of tuple(int, int, str) or None
+        Line number, column offset and imported name of each import. None
+        if the source code cannot be parsed.
+    errors : list of tuple(int, int, str, str, None)
+        The E999 error if the source code cannot be parsed, otherwise
+        empty.
+    """
+    try:
+        with stats.timed("parse"):
+            tree = ast.parse(source)
+    except SyntaxError as error:
+        return None, [(
+            error.lineno or 1,
+            max((error.offset or 1) - 1, 0),
+            "E999",
+            f"SyntaxError: {error.msg}",
+            None,
+        )]
+    except ValueError as error:
+        # e.g. source code containing null bytes
+        return None, [
+            (1, 0, "E999", f"{type(error).__name__}: {error}", None),
+        ]
+    return engine.collect_imports(tree, module_name, source), []
+
+
+def _collect_errors(
+        source, module_name, code_to_checker, prefilter, imports=None,
+        budget=None):
+    """ Return the errors found in the source code of a Python file.
+
+    Parameters
+    ----------
+    source : str or bytes
+        Source code.
+    module_name : str or None
+        Module name of the file.
+    code_to_checker : dict(str, callable(str, str) -> iterable of str)
+        Checkers of the rules applied to the file, see
+        ``engine.build_checkers``.
+    prefilter : bool
+        Whether to skip parsing the file if scanning its lines shows that
+        it has no violation.
+    imports : list of tuple(int, int, str) or None, optional
+        Imports of the file if they are already parsed, see
+        ``parse_imports``.
+    budget : _ParseBudget or None, optional
+        Budget of time for parsing the file. Default is no limit.
+
+    Returns
+    -------
+    errors : list of tuple(int, int, str, str, str or None) or None
+        Line number, column offset, error code, message and imported name
+        of the errors, ordered by position. The imported name is None for
+        syntax errors. None if parsing the file is over the budget.
+    """
+    if prefilter:
+        with stats.timed("prefilter"):
+            clean = engine.is_clean(source, module_name, code_to_checker)
+        if clean:
+            stats.count("prefiltered files")
+            return []
+    if imports is None:
+        if budget is not None:
+            size = _source_size(source)
+            if not budget.allows(size):
+                return None
+            start = time.perf_counter()
+        imports, errors = parse_imports(source, module_name)
+        if budget is not None:
+            budget.record(size, time.perf_counter() - start)
+        if imports is None:
+            return errors
+    return _check_imports(imports, module_name, code_to_checker)
+
+
+def _check_imports(imports, module_name, code_to_checker):
+    """ Return the errors found in the imports of a Python file.
+
+    Parameters
+    ----------
+    imports : list of tuple(int, int, str)
+        Line number, column offset and imported name of each import.
+    module_name : str or None
+        Module name of the file.
+    code_to_checker : dict(str, callable(str, str) -> iterable of str)
+        Checkers of the rules applied to the file, see
+        ``engine.build_checkers``.
+
+    Returns
+    -------
+    errors : list of tuple(int, int, str, str, str)
+        See ``_collect_errors``.
+    """
+    errors = [
+        (
+            error.lineno, error.col_offset, error.code, error.message,
+            error.target,
+        )
+        for error in engine.iter_violations(
+            imports, module_name, code_to_checker,
+        )
+    ]
+    errors.sort(key=lambda error: error[:2])
+    return errors
+
+
+def _source_lines(source):
+    """ Return the lines of the source code.
+
+    Parameters
+    ----------
+    source : str or bytes
+        Source code. Bytes are decoded following the encoding declaration.
+
+    Returns
+    -------
+    lines : list of str
+        Empty if the source code cannot be decoded.
+    """
+    if isinstance(source, bytes):
+        try:
+            source = importlib.util.decode_source(source)
+        except (SyntaxError, UnicodeDecodeError):
+            return []
+    return source.splitlines()
+
+
+def _is_ignored(code, ignored_codes):
+    """ Return true if an error code is ignored for a file.
+
+    Parameters
+    ----------
+    code : str
+        Error code.
+    ignored_codes : iterable of tuple of str
+        Codes (or prefixes of codes) ignored for the file.
+    """
+    return any(
+        code.startswith(prefix)
+        for codes in ignored_codes
+        for prefix in codes
+    )
+
+
+def _source_size(source):
+    """ Return the size in bytes of source code given as str or bytes. """
+    if isinstance(source, str):
+        return len(source.encode("utf-8", "surrogatepass"))
+    return len(source)
+
+
+def _source_file(source):
+    """ Return a binary file object reading source code given as str or
+    bytes, for scanning its lines.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8", "surrogatepass")
+    return io.BytesIO(source)
+
+
+def _is_noqa(code, line):
+    """ Return true if an error is suppressed by a noqa comment.
+
+    Parameters
+    ----------
+    code : str
+        Error code.
+    line : str
+        Line of the error.
+    """
+    match = _NOQA_INLINE.search(line)
+    if match is None:
+        return False
+    codes = match.group("codes")
+    if codes is None:
+        return True
+    return any(
+        code.startswith(prefix)
+        for prefix in _NOQA_CODE_SEPARATOR.split(codes.strip())
+        if prefix
+    )
@@ -0,0 +1,2 @@
+""" This package provides the ``packaway`` command line interface.
+"""
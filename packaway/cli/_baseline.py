@@ -0,0 +1,85 @@
+""" This module implements the ``packaway baseline`` command.
+"""
+
+import sys
+
+from packaway.baseline import DEFAULT_BASELINE, Baseline
+from packaway.cli._check import check_files
+from packaway.cli._options import (
+    add_config_arguments,
+    add_notebooks_argument,
+    add_reexports_argument,
+    checker_options,
+    exclude_patterns,
+    export_index,
+    source_extensions,
+)
+from packaway.paths import discover_files
+
+
+def add_arguments(parser):
+    """ Add the arguments of the command.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+    """
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Files or directories to check. Default is the current "
+             "directory.",
+    )
+    add_config_arguments(parser)
+    add_reexports_argument(parser)
+    add_notebooks_argument(parser)
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes. Default is the number of CPUs.",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default=DEFAULT_BASELINE,
+        metavar="PATH",
+        help=f"Path of the baseline file. Default is {DEFAULT_BASELINE}",
+    )
+
+
+def run(args):
+    """ Run the command.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments.
+
+    Returns
+    -------
+    exit_code : int
+        0 if the baseline is written, 2 otherwise.
+    """
+    filenames = list(discover_files(
+        args.paths, exclude_patterns(args), source_extensions(args),
+    ))
+    options = checker_options(args)
+    options["fingerprints"] = True
+    options["exports"] = export_index(
+        args, options, filenames=filenames, jobs=args.jobs,
+    )
+    baseline = Baseline.from_errors(
+        check_files(filenames, options, jobs=args.jobs)
+    )
+    try:
+        baseline.save(args.output)
+    except OSError as error:
+        print(f"Cannot write the baseline: {error}", file=sys.stderr)
+        return 2
+    print(
+        f"Wrote {len(baseline)} violations in {len(baseline.entries)} "
+        f"files to {args.output}",
+        file=sys.stderr,
+    )
+    return 0
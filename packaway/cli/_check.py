@@ -0,0 +1,442 @@
+""" This module implements the ``packaway check`` command.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+import subprocess
+import sys
+
+from packaway import stats
+from packaway.baseline import Baseline
+from packaway.cache import DEFAULT_CACHE_DIR, ResultCache
+from packaway.checker import FileChecker, format_error
+from packaway.diff import changed_lines, filter_errors
+from packaway.cli._options import (
+    add_config_arguments,
+    add_notebooks_argument,
+    add_reexports_argument,
+    checker_options,
+    exclude_patterns,
+    export_index,
+    source_extensions,
+)
+from packaway.paths import discover_files, filter_files
+from packaway.results import write_results
+from packaway.shard import assign_shards, load_weights, parse_shard
+
+# Checker used by a worker process, created once by _init_worker.
+_worker_checker = None
+
+
+def add_arguments(parser):
+    """ Add the arguments of the command.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+    """
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Files or directories to check. Default is the current "
+             "directory.",
+    )
+    add_config_arguments(parser)
+    add_reexports_argument(parser)
+    add_notebooks_argument(parser)
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes. Default is the number of CPUs.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help=(
+            "Number of files sent to a worker process at a time. Default "
+            "is to split the files evenly into a few chunks per worker."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=(
+            "Directory of the cache of results of unchanged files. "
+            f"Default is {DEFAULT_CACHE_DIR}"
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Check all files without using the cache.",
+    )
+    parser.add_argument(
+        "--no-prefilter",
+        action="store_true",
+        help=(
+            "Parse all files, reporting their syntax errors, instead of "
+            "skipping the files in which scanning the lines shows that no "
+            "import violates the rules. Without it, the syntax errors "
+            "(E999) of the files skipped are not reported, unlike with "
+            "the flake8 plugin."
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Write a JSON report of the time spent and the work done by "
+            "each rule and phase, across all worker processes."
+        ),
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Print a summary of the time spent by each rule and phase.",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Do not report the violations recorded in the baseline file "
+            "written by 'packaway baseline', and report its stale entries."
+        ),
+    )
+    parser.add_argument(
+        "--shard",
+        type=_shard_argument,
+        default=None,
+        metavar="K/N",
+        help=(
+            "Only check the K-th of N shards of the files, e.g. 1/8, for "
+            "splitting the files across several runs."
+        ),
+    )
+    parser.add_argument(
+        "--shard-weights",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Balance the shards with the sizes of the files recorded by "
+            "'packaway merge --write-weights', if the file exists. Default "
+            "is to assign files to shards by a hash of their module name."
+        ),
+    )
+    parser.add_argument(
+        "--results",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Write the errors to a compact result file instead of printing "
+            "them, for combining the results of the shards with "
+            "'packaway merge', which sets the exit code."
+        ),
+    )
+    parser.add_argument(
+        "--diff",
+        default=None,
+        metavar="BASE",
+        help=(
+            "Only check the files changed since the merge base of the git "
+            "revision BASE and HEAD, including uncommitted changes of "
+            "tracked files, and only report errors on changed lines."
+        ),
+    )
+    parser.add_argument(
+        "--diff-whole-files",
+        action="store_true",
+        help="With --diff, report errors anywhere in the changed files.",
+    )
+
+
+def run(args):
+    """ Run the command.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments.
+
+    Returns
+    -------
+    exit_code : int
+        1 if any error is found, 2 if the changes cannot be read from git,
+        the baseline or shard weights cannot be read or the results cannot
+        be written, 0 otherwise. With ``--results``, errors found are not
+        reported by the exit code.
+    """
+    if args.results is not None and args.baseline is not None:
+        print(
+            "The baseline is applied to the results by 'packaway merge'.",
+            file=sys.stderr,
+        )
+        return 2
+
+    baseline = None
+    if args.baseline is not None:
+        try:
+            baseline = Baseline.load(args.baseline)
+        except (OSError, ValueError) as error:
+            print(f"Cannot read the baseline: {error}", file=sys.stderr)
+            return 2
+
+    changes = None
+    if args.diff is None:
+        filenames = list(discover_files(
+            args.paths, exclude_patterns(args), source_extensions(args),
+        ))
+    else:
+        try:
+            changes = changed_lines(args.diff, args.paths)
+        except (OSError, subprocess.CalledProcessError) as error:
+            stderr = getattr(error, "stderr", None)
+            print(
+                f"Cannot read the changes since {args.diff!r}: "
+                f"{os.fsdecode(stderr).strip() if stderr else error}",
+                file=sys.stderr,
+            )
+            return 2
+        filenames = list(filter_files(
+            changes, exclude_patterns(args), source_extensions(args),
+        ))
+
+    options = checker_options(args)
+    options["prefilter"] = not args.no_prefilter
+    options["fingerprints"] = (
+        baseline is not None or args.results is not None
+    )
+    if not args.no_cache:
+        options["cache"] = ResultCache(args.cache_dir)
+    options["exports"] = export_index(
+        args, options,
+        # Only the changed files are checked with --diff.
+        filenames=filenames if changes is None else None,
+        jobs=args.jobs,
+        cache=options.get("cache"),
+    )
+
+    keys = None
+    if args.shard is not None or args.results is not None:
+        keys = _shard_keys(filenames, options)
+    if args.shard is not None:
+        weights = None
+        if args.shard_weights is not None:
+            try:
+                weights = load_weights(args.shard_weights)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as error:
+                print(
+                    f"Cannot read the shard weights: {error}",
+                    file=sys.stderr,
+                )
+                return 2
+        index, count = args.shard
+        selected = [
+            shard == index
+            for shard in assign_shards(keys, count, weights)
+        ]
+        filenames = [
+            filename
+            for filename, is_selected in zip(filenames, selected)
+            if is_selected
+        ]
+        keys = [key for key, is_selected in zip(keys, selected) if is_selected]
+    if args.results is not None:
+        # Result files record the files in order of path.
+        files = sorted(set(zip(filenames, keys)))
+        filenames = [filename for filename, _ in files]
+        keys = [key for _, key in files]
+
+    if args.stats is not None or args.benchmark:
+        stats.enable()
+    try:
+        errors = check_files(
+            filenames,
+            options,
+            jobs=args.jobs,
+            chunk_size=args.chunk_size,
+        )
+        if baseline is not None:
+            errors = baseline.filter(errors)
+        if changes is not None and not args.diff_whole_files:
+            errors = filter_errors(errors, changes)
+        found = False
+        if args.results is not None:
+            try:
+                write_results(
+                    args.results,
+                    args.shard or (0, 1),
+                    _file_sizes(filenames, keys),
+                    errors,
+                )
+            except OSError as error:
+                print(f"Cannot write the results: {error}", file=sys.stderr)
+                return 2
+        else:
+            for error in errors:
+                found = True
+                print(format_error(error))
+        if baseline is not None:
+            for name, n_stale in baseline.stale(filenames).items():
+                print(
+                    f"{name}: {n_stale} stale baseline entries",
+                    file=sys.stderr,
+                )
+
+        collected = stats.collect()
+        if collected is not None:
+            if args.stats is not None:
+                stats.write_report(args.stats, collected)
+            if args.benchmark:
+                print("\n".join(collected.summary()), file=sys.stderr)
+    finally:
+        stats.disable()
+
+    if not args.no_cache:
+        options["cache"].prune()
+    return 1 if found else 0
+
+
+def check_files(filenames, options, jobs=None, chunk_size=None):
+    """ Check files using a pool of worker processes.
+
+    Parameters
+    ----------
+    filenames : list of str
+        Paths of the Python files.
+    options : dict
+        Keyword arguments for creating the ``FileChecker``.
+    jobs : int, optional
+        Number of worker processes. Default is the number of CPUs. If it is
+        1, files are checked in the current process.
+    chunk_size : int, optional
+        Number of files sent to a worker process at a time.
+
+    Yields
+    ------
+    error : tuple(str, int, int, str, str)
+        Errors found, in the order of the given files.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(filenames)))
+
+    if jobs == 1:
+        checker = FileChecker(**options)
+        for filename in filenames:
+            yield from checker.check(filename)
+        return
+
+    if chunk_size is None:
+        chunk_size = _default_chunk_size(len(filenames), jobs)
+
+    with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(options, stats.directory())) as executor:
+        for errors in executor.map(
+                _check_file, filenames, chunksize=chunk_size):
+            yield from errors
+
+
+def _shard_argument(text):
+    """ Parse the ``--shard`` argument, see ``parse_shard``. """
+    try:
+        return parse_shard(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+
+
+def _shard_keys(filenames, options):
+    """ Return the keys of files for assigning them to shards.
+
+    Parameters
+    ----------
+    filenames : list of str
+        Paths of the Python files.
+    options : dict
+        Options for checking files, see ``checker_options``.
+
+    Returns
+    -------
+    keys : list of str
+        Module name of each file if module names are deduced from file
+        paths, otherwise its normalized path using "/".
+    """
+    config = options["config"]
+    if config.deduce_path:
+        return [config.module_name(name) for name in filenames]
+    return [
+        os.path.normpath(name).replace(os.sep, "/") for name in filenames
+    ]
+
+
+def _file_sizes(filenames, keys):
+    """ Return the filename, key and size of files, as recorded by
+    ``write_results``. The size of files that cannot be read is 0.
+    """
+    files = []
+    for filename, key in zip(filenames, keys):
+        try:
+            size = os.path.getsize(filename)
+        except OSError:
+            size = 0
+        files.append((filename, key, size))
+    return files
+
+
+def _default_chunk_size(n_files, jobs):
+    """ Return the number of files sent to a worker at a time, such that
+    each worker receives a few chunks for balancing the load.
+
+    Parameters
+    ----------
+    n_files : int
+        Number of files to check.
+    jobs : int
+        Number of worker processes.
+
+    Returns
+    -------
+    chunk_size : int
+    """
+    return max(1, min(256, n_files // (jobs * 4)))
+
+
+def _init_worker(options, stats_directory=None):
+    """ Create the checker of a worker process.
+
+    Parameters
+    ----------
+    options : dict
+        Keyword arguments for creating the ``FileChecker``.
+    stats_directory : str or None, optional
+        Directory where the worker saves its statistics, if they are
+        enabled.
+    """
+    global _worker_checker
+    if stats_directory is not None:
+        stats.enable(stats_directory)
+    _worker_checker = FileChecker(**options)
+
+
+def _check_file(filename):
+    """ Check a file in a worker process.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the Python file.
+
+    Returns
+    -------
+    errors : list of tuple(str, int, int, str, str)
+    """
+    return _worker_checker.check(filename)
@@ -0,0 +1,186 @@
+""" This module implements the ``packaway graph`` command.
+"""
+
+import os
+import sys
+import time
+
+from packaway.cli._options import (
+    add_config_arguments,
+    checker_options,
+    exclude_patterns,
+)
+from packaway.graph import build_graph, DEFAULT_GRAPH_PATH, ModuleGraph
+from packaway.paths import discover_files
+from packaway.rules import cycle_rule
+
+
+def add_arguments(parser):
+    """ Add the arguments of the command.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+    """
+    subparsers = parser.add_subparsers(dest="graph_command")
+    subparsers.required = True
+
+    build_parser = subparsers.add_parser(
+        "build",
+        help="Build the import graph of a project and save it.",
+    )
+    build_parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Files or directories of the project. Default is the current "
+             "directory.",
+    )
+    add_config_arguments(build_parser)
+    build_parser.add_argument(
+        "--include-external",
+        action="store_true",
+        help="Include imports of modules outside of the given files.",
+    )
+    build_parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes. Default is the number of CPUs.",
+    )
+    _add_graph_argument(build_parser, help="Path of the graph to write.")
+    build_parser.set_defaults(run=_run_build)
+
+    for name, help in [
+        ("importers", "List the modules importing a module."),
+        ("dependencies", "List the modules imported by a module."),
+    ]:
+        query_parser = subparsers.add_parser(name, help=help)
+        query_parser.add_argument("module", help="Module name.")
+        query_parser.add_argument(
+            "--transitive",
+            action="store_true",
+            help="Include modules related indirectly.",
+        )
+        _add_graph_argument(query_parser, help="Path of the graph to read.")
+        query_parser.set_defaults(run=_run_query)
+
+    cycles_parser = subparsers.add_parser(
+        "cycles",
+        help=(
+            f"Report the import cycles across packages ({cycle_rule.CODE})."
+        ),
+    )
+    cycles_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Report the cycles within packages as well.",
+    )
+    _add_graph_argument(cycles_parser, help="Path of the graph to read.")
+    cycles_parser.set_defaults(run=_run_cycles)
+
+
+def _add_graph_argument(parser, help):
+    """ Add the argument for the path of the graph file. """
+    parser.add_argument(
+        "--graph",
+        default=DEFAULT_GRAPH_PATH,
+        help=f"{help} Default is {DEFAULT_GRAPH_PATH}",
+    )
+
+
+def _load_graph(path):
+    """ Load the graph, or print why it cannot be read and return None. """
+    try:
+        return ModuleGraph.load(path)
+    except (OSError, ValueError) as error:
+        print(f"Cannot read the graph: {error}", file=sys.stderr)
+        return None
+
+
+def _run_build(args):
+    """ Build the graph and save it.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments.
+
+    Returns
+    -------
+    exit_code : int
+    """
+    start = time.perf_counter()
+    filenames = list(discover_files(args.paths, exclude_patterns(args)))
+    options = checker_options(args)
+    graph = build_graph(
+        filenames,
+        include_external=args.include_external,
+        jobs=args.jobs,
+        module_names=options["config"].module_names,
+    )
+    directory = os.path.dirname(args.graph)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    graph.save(args.graph)
+    print(
+        f"Saved {len(graph)} modules and {graph.n_edges} imports to "
+        f"{args.graph} in {time.perf_counter() - start:.2f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _run_query(args):
+    """ Print the modules related to a module.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments.
+
+    Returns
+    -------
+    exit_code : int
+        2 if the graph cannot be read or the module is not in it, 0
+        otherwise.
+    """
+    graph = _load_graph(args.graph)
+    if graph is None:
+        return 2
+    if args.module not in graph:
+        print(f"Module {args.module!r} is not in the graph.", file=sys.stderr)
+        return 2
+
+    if args.graph_command == "importers":
+        names = graph.importers(args.module, transitive=args.transitive)
+    else:
+        names = graph.dependencies(args.module, transitive=args.transitive)
+    for name in names:
+        print(name)
+    return 0
+
+
+def _run_cycles(args):
+    """ Print the import cycles, with a shortest cycle of each strongly
+    connected component.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments.
+
+    Returns
+    -------
+    exit_code : int
+        2 if the graph cannot be read, 1 if any cycle is found, 0
+        otherwise.
+    """
+    graph = _load_graph(args.graph)
+    if graph is None:
+        return 2
+    cycles = cycle_rule.find_cycles(graph, across_packages=not args.all)
+    for component, cycle in cycles:
+        message = cycle_rule.cycle_message(component, cycle)
+        print(f"{cycle_rule.CODE} {message}")
+    return 1 if cycles else 0
@@ -0,0 +1,141 @@
+""" This module implements the ``packaway merge`` command.
+"""
+
+import sys
+
+from packaway.baseline import Baseline
+from packaway.checker import format_error
+from packaway.results import merge_results, read_shard
+from packaway.shard import format_shard, save_weights
+
+
+def add_arguments(parser):
+    """ Add the arguments of the command.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+    """
+    parser.add_argument(
+        "results",
+        nargs="+",
+        metavar="RESULTS",
+        help="Result files written by 'packaway check --results', one for "
+             "each shard.",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        metavar="PATH",
+        help="Only report the errors that are not recorded in the baseline "
+             "file, see 'packaway baseline'.",
+    )
+    parser.add_argument(
+        "--write-weights",
+        default=None,
+        metavar="PATH",
+        help="Write the sizes of the files checked, for balancing the shards "
+             "of later runs with 'packaway check --shard-weights'.",
+    )
+
+
+def run(args):
+    """ Run the command.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments.
+
+    Returns
+    -------
+    exit_code : int
+        1 if any error is found, 2 if the results of a shard are missing,
+        a result file or the baseline cannot be read, or the weights cannot
+        be written, 0 otherwise.
+    """
+    try:
+        shards = {path: read_shard(path) for path in args.results}
+    except (OSError, ValueError) as error:
+        print(f"Cannot read the results: {error}", file=sys.stderr)
+        return 2
+    counts = {count for _, count in shards.values()}
+    if len(counts) > 1:
+        print(
+            "The result files are of different numbers of shards: "
+            + ", ".join(str(count) for count in sorted(counts)),
+            file=sys.stderr,
+        )
+        return 2
+    missing = _missing_shards(shards.values())
+    if missing:
+        print(
+            "Missing the results of shards "
+            + ", ".join(format_shard(shard) for shard in missing),
+            file=sys.stderr,
+        )
+        return 2
+
+    baseline = None
+    if args.baseline is not None:
+        try:
+            baseline = Baseline.load(args.baseline)
+        except (OSError, ValueError) as error:
+            print(f"Cannot read the baseline: {error}", file=sys.stderr)
+            return 2
+
+    files = []
+
+    def iter_errors():
+        for result in merge_results(args.results):
+            files.append((result.filename, result.key, result.size))
+            yield from result.errors
+
+    errors = iter_errors()
+    if baseline is not None:
+        errors = baseline.filter(errors)
+    found = False
+    try:
+        for error in errors:
+            found = True
+            print(format_error(error[:5]))
+    except (OSError, ValueError) as error:
+        print(f"Cannot read the results: {error}", file=sys.stderr)
+        return 2
+
+    if baseline is not None:
+        stale = baseline.stale(filename for filename, _, _ in files)
+        for name, n_stale in stale.items():
+            print(f"{name}: {n_stale} stale baseline entries", file=sys.stderr)
+    if args.write_weights is not None:
+        try:
+            save_weights(
+                args.write_weights, ((key, size) for _, key, size in files),
+            )
+        except OSError as error:
+            print(f"Cannot write the weights: {error}", file=sys.stderr)
+            return 2
+    return 1 if found else 0
+
+
+def _missing_shards(shards):
+    """ Return the shards whose results are missing.
+
+    Parameters
+    ----------
+    shards : iterable of tuple(int, int)
+        Index and number of shards of each result file, all of the same
+        number of shards.
+
+    Returns
+    -------
+    missing : list of tuple(int, int)
+        Shards not given, in order.
+    """
+    shards = set(shards)
+    count = next(iter(shards))[1]
+    return [
+        (index, count)
+        for index in range(count)
+        if (index, count) not in shards
+    ]
@@ -0,0 +1,343 @@
+""" This module contains the options shared by the commands for reading
+the configuration.
+"""
+
+import os
+
+from packaway.config import (
+    CompiledConfig,
+    DEFAULT_EXCLUDE,
+    parse_contracts,
+    parse_disallowed_patterns,
+    parse_per_file_ignores,
+    read_config,
+)
+from packaway.graph import build_export_index
+from packaway.notebook import NOTEBOOK_EXTENSION
+from packaway.paths import discover_files
+
+# Values of boolean options considered true, as in configparser.
+_TRUE_VALUES = ("1", "yes", "true", "on")
+
+
+def add_config_arguments(parser):
+    """ Add the arguments for overriding the configuration file.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+    """
+    parser.add_argument(
+        "--config",
+        default=None,
+        help=(
+            "Path to the configuration file with a [flake8] section. "
+            "Default is to read setup.cfg, tox.ini and .flake8 in the "
+            "current directory."
+        ),
+    )
+    parser.add_argument(
+        "--no-deduce-path",
+        action="store_true",
+        default=None,
+        help="Switch off parsing file paths as module names.",
+    )
+    parser.add_argument(
+        "--top-level-dir",
+        default=None,
+        help="Top level directory for parsing file paths as module names.",
+    )
+    parser.add_argument(
+        "--find-package-roots",
+        action="store_true",
+        default=None,
+        help=(
+            "Compose module names from the first parent directory without "
+            "__init__.py, instead of the top level directory."
+        ),
+    )
+    parser.add_argument(
+        "--source-roots",
+        default=None,
+        help=(
+            "Comma separated directories holding top level packages, from "
+            "which module names are composed. Implies --find-package-roots."
+        ),
+    )
+    parser.add_argument(
+        "--disallowed",
+        default=None,
+        help=(
+            "A pairing of filenames and regular expression for matching "
+            "module names not allowed in imports."
+        ),
+    )
+    parser.add_argument(
+        "--contracts",
+        default=None,
+        help=(
+            "Layered architecture contracts between packages, one per "
+            "line: 'layers: high > middle1 | middle2 > low', "
+            "'independent: first, second' or 'allow: source -> target'."
+        ),
+    )
+    parser.add_argument(
+        "--exclude",
+        default=None,
+        help=(
+            "Comma separated patterns of files and directories to exclude. "
+            f"Default is {','.join(DEFAULT_EXCLUDE)}"
+        ),
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help=(
+            "Only check the import statements of the files larger than "
+            "this, without parsing them, and report them as DEP901."
+        ),
+    )
+    parser.add_argument(
+        "--max-file-time",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "Only check the import statements of the files estimated to "
+            "take longer than this to parse, and report them as DEP901."
+        ),
+    )
+
+
+def add_reexports_argument(parser):
+    """ Add the argument for checking the imports through re-exports.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+    """
+    parser.add_argument(
+        "--reexports",
+        action="store_true",
+        default=None,
+        help=(
+            "Index the names re-exported by all the modules first, and "
+            "report the imports of private modules through them (DEP402)."
+        ),
+    )
+
+
+def add_notebooks_argument(parser):
+    """ Add the argument for checking Jupyter notebooks.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+    """
+    parser.add_argument(
+        "--notebooks",
+        action="store_true",
+        default=None,
+        help=(
+            "Also check the code cells of the Jupyter notebooks (.ipynb) "
+            "found in directories."
+        ),
+    )
+
+
+def source_extensions(args):
+    """ Return the extensions of the files to check in directories.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Arguments added by ``add_config_arguments`` and
+        ``add_notebooks_argument``.
+
+    Returns
+    -------
+    extensions : tuple of str
+    """
+    notebooks = args.notebooks
+    if notebooks is None:
+        notebooks = (
+            read_config(args.config).get("notebooks", "").strip().lower()
+            in _TRUE_VALUES
+        )
+    if notebooks:
+        return (".py", NOTEBOOK_EXTENSION)
+    return (".py",)
+
+
+def checker_options(args):
+    """ Return the options for checking files, from the parsed arguments
+    and the configuration file.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Arguments added by ``add_config_arguments``.
+
+    Returns
+    -------
+    options : dict
+        Keyword arguments for ``FileChecker``, with the configuration
+        compiled once in ``config``, see ``CompiledConfig``, and the size
+        and time budgets of the files.
+    """
+    config = read_config(args.config)
+    if args.no_deduce_path is None:
+        no_deduce_path = (
+            config.get("no_deduce_path", "").strip().lower() in _TRUE_VALUES
+        )
+    else:
+        no_deduce_path = args.no_deduce_path
+
+    find_package_roots = args.find_package_roots
+    if find_package_roots is None:
+        find_package_roots = (
+            config.get("find_package_roots", "").strip().lower()
+            in _TRUE_VALUES
+        )
+
+    source_roots = _first_not_none(
+        args.source_roots, config.get("source_roots"), "",
+    )
+
+    disallowed = args.disallowed
+    if disallowed is None:
+        disallowed = config.get("disallowed", "")
+
+    contracts = args.contracts
+    if contracts is None:
+        contracts = config.get("contracts", "")
+
+    return dict(config=CompiledConfig(
+        top_level_dir=_first_not_none(
+            args.top_level_dir, config.get("top_level_dir")
+        ),
+        deduce_path=not no_deduce_path,
+        find_package_roots=find_package_roots,
+        source_roots=[
+            root.strip()
+            for root in source_roots.replace("\n", ",").split(",")
+            if root.strip()
+        ],
+        disallowed_patterns=parse_disallowed_patterns(disallowed),
+        per_file_ignores=parse_per_file_ignores(
+            config.get("per_file_ignores", "")
+        ),
+        contracts=parse_contracts(contracts),
+    ), max_file_size=_budget(
+        args.max_file_size, config.get("max_file_size"), int,
+        "max_file_size",
+    ), max_file_time=_budget(
+        args.max_file_time, config.get("max_file_time"), float,
+        "max_file_time",
+    ))
+
+
+def _budget(value, config_value, convert, name):
+    """ Return the value of a size or time budget, from its argument or the
+    configuration file, None if not given.
+
+    Raises
+    ------
+    ValueError
+        If the value in the configuration file is not a number.
+    """
+    if value is not None:
+        return value
+    if config_value is None or not config_value.strip():
+        return None
+    try:
+        return convert(config_value.strip())
+    except ValueError:
+        raise ValueError(
+            f"Expected a number for {name}, not {config_value.strip()!r}"
+        ) from None
+
+
+def export_index(args, options, filenames=None, jobs=None, cache=None):
+    """ Return the index of the re-exports of the project, if re-exports
+    are checked.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Arguments added by ``add_config_arguments`` and
+        ``add_reexports_argument``, and the paths of the project.
+    options : dict
+        Options for checking files, see ``checker_options``.
+    filenames : list of str or None, optional
+        Paths of all the Python files of the project, if already found,
+        possibly with notebooks, which are skipped. Default is to discover
+        them from the paths.
+    jobs : int, optional
+        Number of worker processes. Default is the number of CPUs.
+    cache : ResultCache or None, optional
+        Cache of the names bound by the files.
+
+    Returns
+    -------
+    exports : ExportIndex or None
+        None if re-exports are not checked, or module names are not
+        deduced from file paths.
+    """
+    reexports = args.reexports
+    if reexports is None:
+        reexports = (
+            read_config(args.config).get("reexports", "").strip().lower()
+            in _TRUE_VALUES
+        )
+    config = options["config"]
+    if not reexports or not config.deduce_path:
+        return None
+    if filenames is None:
+        filenames = list(discover_files(args.paths, exclude_patterns(args)))
+    else:
+        # Names cannot be imported from notebooks.
+        filenames = [
+            filename for filename in filenames
+            if not filename.endswith(NOTEBOOK_EXTENSION)
+        ]
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    return build_export_index(
+        filenames,
+        jobs=jobs,
+        module_names=config.module_names,
+        cache=cache,
+    )
+
+
+def exclude_patterns(args):
+    """ Return the patterns of files and directories to exclude.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Arguments added by ``add_config_arguments``.
+
+    Returns
+    -------
+    patterns : list of str
+    """
+    exclude = args.exclude
+    if exclude is None:
+        exclude = read_config(args.config).get("exclude")
+    if exclude is None:
+        return list(DEFAULT_EXCLUDE)
+    return [
+        pattern.strip() for pattern in exclude.split(",") if pattern.strip()
+    ]
+
+
+def _first_not_none(*values):
+    """ Return the first value that is not None, or None. """
+    for value in values:
+        if value is not None:
+            return value
+    return None
@@ -0,0 +1,127 @@
+""" This module implements the ``packaway serve`` command.
+"""
+
+import os
+import sys
+
+from packaway import server
+from packaway.cache import DEFAULT_CACHE_DIR, ResultCache
+from packaway.checker import FileChecker
+from packaway.cli._options import (
+    add_config_arguments,
+    add_reexports_argument,
+    checker_options,
+    export_index,
+)
+from packaway.config import CONFIG_FILES
+
+
+def add_arguments(parser):
+    """ Add the arguments of the command.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+    """
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Files or directories indexed for checking re-exports with "
+             "--reexports. Default is the current directory.",
+    )
+    add_config_arguments(parser)
+    add_reexports_argument(parser)
+    parser.add_argument(
+        "--socket",
+        default=server.DEFAULT_SOCKET,
+        metavar="PATH",
+        help=f"Path of the socket to listen on. Default is "
+             f"{server.DEFAULT_SOCKET}",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory of the cache of results. Default is "
+             f"{DEFAULT_CACHE_DIR}",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the cache of results.",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes for indexing the re-exports. "
+             "Default is the number of CPUs.",
+    )
+
+
+def run(args):
+    """ Run the server until it is shut down or interrupted.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments.
+
+    Returns
+    -------
+    exit_code : int
+        0 when the server stops, 2 if it cannot start.
+    """
+    if not server.is_supported():
+        print(
+            "The server requires Unix domain sockets.", file=sys.stderr,
+        )
+        return 2
+    if args.config is None:
+        config_files = list(CONFIG_FILES)
+    else:
+        config_files = [args.config]
+    try:
+        check_server = server.CheckServer(
+            args.socket,
+            lambda: load_checker(args),
+            config_files,
+        )
+    except OSError as error:
+        print(f"Cannot start the server: {error}", file=sys.stderr)
+        return 2
+    print(
+        f"Serving on {args.socket} (process {os.getpid()})",
+        file=sys.stderr,
+        flush=True,
+    )
+    try:
+        check_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        check_server.server_close()
+        if check_server.checker.cache is not None:
+            check_server.checker.cache.prune()
+    return 0
+
+
+def load_checker(args):
+    """ Read the configuration and create the checker of the server.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments.
+
+    Returns
+    -------
+    checker : FileChecker
+    """
+    options = checker_options(args)
+    if not args.no_cache:
+        options["cache"] = ResultCache(args.cache_dir)
+    options["exports"] = export_index(
+        args, options, jobs=args.jobs, cache=options.get("cache"),
+    )
+    return FileChecker(**options)
@@ -0,0 +1,102 @@
+""" This module implements the ``packaway watch`` command.
+"""
+
+import sys
+import time
+
+from packaway.checker import FileChecker, format_error
+from packaway.cli._options import (
+    add_config_arguments,
+    checker_options,
+    exclude_patterns,
+)
+from packaway.paths import FileScanner
+from packaway.watch import IncrementalChecker
+
+# Default number of seconds between scans of the files.
+DEFAULT_INTERVAL = 0.1
+
+
+def add_arguments(parser):
+    """ Add the arguments of the command.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+    """
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Files or directories to watch. Default is the current "
+             "directory.",
+    )
+    add_config_arguments(parser)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help=(
+            "Number of seconds between scans of the files. Default is "
+            f"{DEFAULT_INTERVAL}"
+        ),
+    )
+
+
+def run(args):
+    """ Run the command until interrupted.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments.
+
+    Returns
+    -------
+    exit_code : int
+    """
+    scanner = FileScanner(args.paths, exclude_patterns(args))
+    checker = IncrementalChecker(FileChecker(**checker_options(args)))
+
+    start = time.perf_counter()
+    checker.update(scanner.scan())
+    for error in checker.errors():
+        print(format_error(error))
+    _print_summary(checker, len(checker), start)
+
+    try:
+        while True:
+            time.sleep(args.interval)
+            start = time.perf_counter()
+            checked, removed = checker.update(scanner.scan())
+            if not checked and not removed:
+                continue
+            for errors in checked.values():
+                for error in errors:
+                    print(format_error(error))
+            _print_summary(checker, len(checked), start)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _print_summary(checker, n_checked, start):
+    """ Print the number of files checked and errors found.
+
+    Parameters
+    ----------
+    checker : IncrementalChecker
+        Checker of the files.
+    n_checked : int
+        Number of files checked in the last update.
+    start : float
+        Time when the update started, from ``time.perf_counter``.
+    """
+    elapsed = (time.perf_counter() - start) * 1000
+    print(
+        f"Checked {n_checked} of {len(checker)} files in {elapsed:.0f}ms, "
+        f"{len(checker.errors())} errors in total.",
+        file=sys.stderr,
+        flush=True,
+    )
+    sys.stdout.flush()
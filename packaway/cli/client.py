@@ -0,0 +1,224 @@
+""" This module contains the entry point of the ``packaway-client`` command,
+which checks files with the server started by ``packaway serve``.
+
+The client only imports the standard library and ``packaway.server``, so
+that editors and pre-commit hooks running it for every check do not pay for
+importing the checker. If no server is running, the files are checked in
+the client process instead.
+"""
+
+import argparse
+import errno
+import os
+import sys
+
+from packaway import __version__, server
+
+# Errors of connecting to a socket on which no server is listening.
+_NOT_RUNNING = (errno.ENOENT, errno.ECONNREFUSED)
+
+
+def main(argv=None):
+    """ Run the ``packaway-client`` command.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Command line arguments, excluding the program name. Default is to
+        use ``sys.argv``.
+
+    Returns
+    -------
+    exit_code : int
+        1 if any error is found, 2 if the files cannot be checked, 0
+        otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog="packaway-client",
+        description=(
+            "Check files with the server started by 'packaway serve', "
+            "reporting errors in the same format as flake8."
+        ),
+    )
+    parser.add_argument(
+        "filenames",
+        nargs="*",
+        metavar="FILENAME",
+        help="Python files to check, - for the standard input.",
+    )
+    parser.add_argument(
+        "--socket",
+        default=server.DEFAULT_SOCKET,
+        metavar="PATH",
+        help=f"Path of the socket of the server. Default is "
+             f"{server.DEFAULT_SOCKET}",
+    )
+    parser.add_argument(
+        "--stdin-display-name",
+        default="stdin",
+        metavar="NAME",
+        help="Path of the file read from the standard input, e.g. an "
+             "unsaved editor buffer, for the module name, the rules that "
+             "apply and the errors reported. Default is stdin.",
+    )
+    parser.add_argument(
+        "--module",
+        default=None,
+        help="Module name of the file checked, instead of the name "
+             "deduced from its path.",
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="Path to the configuration file, if no server is running.",
+    )
+    parser.add_argument(
+        "--no-fallback",
+        action="store_true",
+        help="Fail if no server is running, instead of checking the files "
+             "in this process.",
+    )
+    parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the server.",
+    )
+    args = parser.parse_args(argv)
+    if args.module is not None and len(args.filenames) != 1:
+        parser.error("--module requires exactly one file.")
+
+    if args.stop:
+        return _stop(args.socket)
+
+    files = []
+    for filename in args.filenames:
+        if filename == "-":
+            files.append((args.stdin_display_name, sys.stdin.read()))
+        else:
+            files.append((filename, None))
+
+    try:
+        results = _check_with_server(files, args.module, args.socket)
+    except (OSError, server.ServerError) as error:
+        if args.no_fallback:
+            print(f"Cannot check with the server: {error}", file=sys.stderr)
+            return 2
+        if getattr(error, "errno", None) not in _NOT_RUNNING:
+            print(
+                f"Checking without the server: {error}", file=sys.stderr,
+            )
+        results = _check_locally(files, args.module, args.config)
+
+    found = False
+    for (filename, _), errors in zip(files, results):
+        for lineno, col_offset, code, message in errors:
+            found = True
+            # Same format as checker.format_error.
+            print(f"{filename}:{lineno}:{col_offset + 1}: {code} {message}")
+    return 1 if found else 0
+
+
+def _check_with_server(files, module_name, socket_path):
+    """ Check files with the server.
+
+    Parameters
+    ----------
+    files : list of tuple(str, str or None)
+        Path of each file, and its source code if it is not read from the
+        path.
+    module_name : str or None
+        Module name of the file, if there is one file.
+    socket_path : str
+        Path of the socket of the server.
+
+    Returns
+    -------
+    results : list of list of tuple(int, int, str, str)
+        Line number, column offset, error code and message of the errors
+        of each file.
+
+    Raises
+    ------
+    OSError
+        If the server is not running, see ``server.request``.
+    ServerError
+        If the server cannot check the files.
+    """
+    if not server.is_supported():
+        raise server.ServerError("Unix domain sockets are not supported.")
+    requested = []
+    for filename, source in files:
+        file = {"path": os.path.abspath(filename)}
+        if source is not None:
+            file["source"] = source
+        if module_name is not None:
+            file["module"] = module_name
+        requested.append(file)
+    response = server.request(
+        socket_path,
+        {"command": "check", "version": __version__, "files": requested},
+    )
+    results = response.get("results")
+    if not isinstance(results, list) or len(results) != len(files):
+        raise server.ServerError("Invalid response from the server.")
+    return results
+
+
+def _check_locally(files, module_name, config_file):
+    """ Check files in this process, as ``packaway check`` does.
+
+    Parameters
+    ----------
+    files : list of tuple(str, str or None)
+        See ``_check_with_server``.
+    module_name : str or None
+        Module name of the file, if there is one file.
+    config_file : str or None
+        Path to the configuration file. Default is to read the files in the
+        current directory.
+
+    Returns
+    -------
+    results : list of list of tuple(int, int, str, str)
+        See ``_check_with_server``.
+    """
+    # Imported here, for starting fast when the server is running.
+    from packaway.cache import ResultCache
+    from packaway.checker import FileChecker
+    from packaway.cli._options import add_config_arguments, checker_options
+
+    parser = argparse.ArgumentParser()
+    add_config_arguments(parser)
+    config_args = parser.parse_args(
+        [] if config_file is None else ["--config", config_file]
+    )
+    checker = FileChecker(cache=ResultCache(), **checker_options(config_args))
+    results = []
+    for filename, source in files:
+        if source is None:
+            errors = checker.check(filename, module_name)
+        else:
+            errors = checker.check_source(source, filename, module_name)
+        results.append([error[1:5] for error in errors])
+    return results
+
+
+def _stop(socket_path):
+    """ Stop the server.
+
+    Parameters
+    ----------
+    socket_path : str
+        Path of the socket of the server.
+
+    Returns
+    -------
+    exit_code : int
+        0 if the server is stopped, 2 if it is not running.
+    """
+    try:
+        server.request(socket_path, {"command": "shutdown"})
+    except (OSError, server.ServerError) as error:
+        print(f"Cannot stop the server: {error}", file=sys.stderr)
+        return 2
+    return 0
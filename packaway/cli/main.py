@@ -0,0 +1,81 @@
+""" This module contains the entry point of the ``packaway`` command.
+"""
+
+import argparse
+
+from packaway import __version__
+from packaway.cli import _baseline, _check, _graph, _merge, _serve, _watch
+
+
+def main(argv=None):
+    """ Run the ``packaway`` command.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Command line arguments, excluding the program name. Default is to
+        use ``sys.argv``.
+
+    Returns
+    -------
+    exit_code : int
+    """
+    parser = argparse.ArgumentParser(
+        prog="packaway",
+        description="Static checker to enforce encapsulation in Python.",
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    check_parser = subparsers.add_parser(
+        "check",
+        help="Check files for import violations.",
+        description=(
+            "Check files for import violations. Files whose import "
+            "statements cannot violate the rules are not parsed, so their "
+            "syntax errors are not reported, unlike with the flake8 "
+            "plugin; use --no-prefilter to report them."
+        ),
+    )
+    _check.add_arguments(check_parser)
+    check_parser.set_defaults(run=_check.run)
+
+    baseline_parser = subparsers.add_parser(
+        "baseline",
+        help="Record the current import violations in a baseline file.",
+    )
+    _baseline.add_arguments(baseline_parser)
+    baseline_parser.set_defaults(run=_baseline.run)
+
+    merge_parser = subparsers.add_parser(
+        "merge",
+        help="Report the errors found by the shards of a check.",
+    )
+    _merge.add_arguments(merge_parser)
+    merge_parser.set_defaults(run=_merge.run)
+
+    graph_parser = subparsers.add_parser(
+        "graph",
+        help="Build and query the import graph of a project.",
+    )
+    _graph.add_arguments(graph_parser)
+
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Check files again whenever they change.",
+    )
+    _watch.add_arguments(watch_parser)
+    watch_parser.set_defaults(run=_watch.run)
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Check files sent by packaway-client, e.g. from editors.",
+    )
+    _serve.add_arguments(serve_parser)
+    serve_parser.set_defaults(run=_serve.run)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
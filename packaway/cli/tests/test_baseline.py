@@ -0,0 +1,80 @@
+import contextlib
+import io
+import tempfile
+import unittest
+
+from packaway.cli.tests.test_check import (
+    change_dir,
+    PROJECT_FILES,
+    run_main,
+    write_files,
+)
+
+
+class TestBaselineCommand(unittest.TestCase):
+    """ Test the ``packaway baseline`` command and checking against the
+    baseline."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        write_files(self.tmp_dir, PROJECT_FILES)
+
+    def run_main(self, argv):
+        with change_dir(self.tmp_dir), \
+                contextlib.redirect_stderr(io.StringIO()) as stderr:
+            exit_code, lines = run_main(argv)
+        return exit_code, lines, stderr.getvalue().splitlines()
+
+    def test_baseline(self):
+        exit_code, lines, messages = self.run_main(["baseline", "-j", "1"])
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(lines, [])
+        self.assertEqual(
+            messages,
+            ["Wrote 2 violations in 1 files to .packaway_baseline"],
+        )
+
+        exit_code, lines, messages = self.run_main(
+            ["check", "-j", "1", "--baseline", ".packaway_baseline"],
+        )
+        self.assertEqual((exit_code, lines, messages), (0, [], []))
+
+    def test_new_and_stale_violations(self):
+        self.run_main(["baseline", "-j", "1", "--output", "known"])
+        write_files(self.tmp_dir, {
+            "business/logic.py": """
+                # The imports moved down.
+
+                from web.api import view
+                from data import _other
+            """,
+        })
+
+        exit_code, lines, messages = self.run_main(
+            ["check", "-j", "1", "--baseline", "known"],
+        )
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(lines, [
+            "./business/logic.py:5:1: DEP401 "
+            "Importing private name 'data._other'.",
+        ])
+        self.assertEqual(
+            messages, ["business/logic.py: 1 stale baseline entries"],
+        )
+
+    def test_unreadable_baseline(self):
+        exit_code, lines, messages = self.run_main(
+            ["check", "--baseline", "missing"],
+        )
+        self.assertEqual(exit_code, 2)
+        self.assertEqual(lines, [])
+        self.assertIn("Cannot read the baseline", messages[0])
+
+        exit_code, lines, messages = self.run_main(
+            ["check", "--baseline", "setup.cfg"],
+        )
+        self.assertEqual(exit_code, 2)
+        self.assertIn("is not a packaway baseline file", messages[0])
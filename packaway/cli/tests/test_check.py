@@ -0,0 +1,342 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+
+from packaway.cli._check import check_files
+from packaway.cli.main import main
+from packaway.tests.test_diff import git
+from packaway.tests.utils import write_files
+
+
+@contextlib.contextmanager
+def change_dir(dir):
+    cwd = os.getcwd()
+    os.chdir(dir)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def run_main(argv):
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        exit_code = main(argv)
+    return exit_code, stdout.getvalue().splitlines()
+
+
+PROJECT_FILES = {
+    "setup.cfg": """
+        [flake8]
+        disallowed =
+            business/*: web.*
+        per-file-ignores =
+            ignored/*: DEP401
+    """,
+    "business/__init__.py": "",
+    "business/logic.py": """
+        from web.api import view
+        from data import _private
+    """,
+    "web/__init__.py": "",
+    "web/api.py": """
+        from web._view import view
+        from data import _private  # noqa: DEP401
+    """,
+    "ignored/module.py": "from data import _private",
+    "notes.txt": "from data import _private",
+}
+
+
+class TestCheckCommand(unittest.TestCase):
+    """ Test the ``packaway check`` command."""
+
+    def test_check_project(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, PROJECT_FILES)
+            exit_code, lines = run_main(["check", "-j", "1"])
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(
+            lines,
+            [
+                "./business/logic.py:2:1: DEP501 "
+                "Import 'web.api.view' violates pattern: 'web.*'",
+                "./business/logic.py:3:1: DEP401 "
+                "Importing private name 'data._private'.",
+            ],
+        )
+
+    def test_check_clean_files(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, PROJECT_FILES)
+            exit_code, lines = run_main(
+                ["check", "web", os.path.join("business", "__init__.py")]
+            )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(lines, [])
+
+    def test_command_line_overrides_config(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, PROJECT_FILES)
+            exit_code, lines = run_main(
+                ["check", "business", "--disallowed", "", "--no-deduce-path"]
+            )
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(
+            lines,
+            [
+                "business/logic.py:3:1: DEP401 "
+                "Importing private name 'data._private'.",
+            ],
+        )
+
+    def test_exclude(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, PROJECT_FILES)
+            exit_code, lines = run_main(["check", "--exclude", "business"])
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(lines, [])
+
+    def test_contracts(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, PROJECT_FILES)
+            exit_code, lines = run_main([
+                "check", "web", "--contracts", "independent: web, data",
+            ])
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(
+            lines,
+            [
+                "web/api.py:3:1: DEP601 Import 'data._private' between "
+                "independent packages 'web' and 'data'.",
+            ],
+        )
+
+    def test_find_package_roots(self):
+        files = {
+            "first/shop/__init__.py": "",
+            "first/shop/_orders.py": "",
+            "first/shop/api.py": "from shop._orders import create",
+            "second/src/billing/__init__.py": "",
+            "second/src/billing/api.py": "from shop._orders import create",
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, files)
+            exit_code, lines = run_main([
+                "check", "first", "second", "--no-cache",
+                "--find-package-roots",
+            ])
+            self.assertEqual(exit_code, 1)
+            self.assertEqual(lines, [
+                os.path.join("second", "src", "billing", "api.py")
+                + ":1:1: DEP401 Importing private name 'shop._orders.create'.",
+            ])
+
+            exit_code, lines = run_main([
+                "check", "first", "second", "--no-cache",
+                "--source-roots", os.path.join("second", "src"),
+            ])
+            self.assertEqual(exit_code, 1)
+            self.assertEqual(len(lines), 1)
+
+    def test_reexports(self):
+        files = {
+            "person/__init__.py": "",
+            "person/_reading.py": "def read(): pass",
+            "person/api.py": """
+                from . import _reading as reading
+                from ._reading import read
+            """,
+            "office/__init__.py": "",
+            "office/api.py": """
+                from person.api import read
+                from person.api import reading
+                from person.api import reading as person_reading
+            """,
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, files)
+            without_reexports = run_main(["check", "-j", "1"])
+            for argv in [["check", "-j", "1", "--reexports"],
+                         ["check", "-j", "2", "--reexports", "--no-cache"]]:
+                with self.subTest(argv=argv):
+                    exit_code, lines = run_main(argv)
+                    self.assertEqual(exit_code, 1)
+                    self.assertEqual(lines, [
+                        f"./office/api.py:{lineno}:1: DEP402 Importing "
+                        "private module 'person._reading' through "
+                        "'person.api.reading'."
+                        for lineno in (3, 4)
+                    ])
+
+        self.assertEqual(without_reexports, (0, []))
+
+    def test_notebooks(self):
+        notebook = json.dumps({
+            "cells": [
+                {"cell_type": "markdown", "source": ["# Title"]},
+                {
+                    "cell_type": "code",
+                    "outputs": [{"text": ["from data import _output"]}],
+                    "source": ["import os\n", "from data import _private"],
+                },
+            ],
+        })
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, {"web/analysis.ipynb": notebook})
+            without_notebooks = run_main(["check", "--no-cache"])
+            with_notebooks = run_main(["check", "--no-cache", "--notebooks"])
+            write_files(tmp_dir, {"setup.cfg": "[flake8]\nnotebooks = 1\n"})
+            from_config = run_main(["check", "--no-cache", "--reexports"])
+
+        self.assertEqual(without_notebooks, (0, []))
+        expected = (1, [
+            "./web/analysis.ipynb:2:1: DEP401 "
+            "Importing private name 'data._private'. (cell 2)",
+        ])
+        self.assertEqual(with_notebooks, expected)
+        self.assertEqual(from_config, expected)
+
+    def test_max_file_size(self):
+        files = {
+            "small.py": "import data._private\n",
+            "large.py": "import os\n" * 10 + "import data._private\n",
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, files)
+            from_option = run_main(
+                ["check", "--no-cache", "--max-file-size", "100"],
+            )
+            write_files(tmp_dir, {
+                "setup.cfg": "[flake8]\nmax-file-size = 100\n",
+            })
+            from_config = run_main(["check", "--no-cache"])
+            write_files(tmp_dir, {
+                "setup.cfg": "[flake8]\nmax-file-size = large\n",
+            })
+            with self.assertRaisesRegex(ValueError, "max_file_size"):
+                run_main(["check", "--no-cache"])
+
+        expected = (1, [
+            "./large.py:1:1: DEP901 Only the import statements are checked: "
+            "the file has 121 bytes, over the budget of 100 bytes.",
+            "./large.py:11:1: DEP401 Importing private name 'data._private'.",
+            "./small.py:1:1: DEP401 Importing private name 'data._private'.",
+        ])
+        self.assertEqual(from_option, expected)
+        self.assertEqual(from_config, expected)
+
+    def test_relative_import_too_deep(self):
+        files = {
+            "pkg/__init__.py": "",
+            "pkg/mod.py": "from ... import x\nimport os\n",
+            "pkg/other.py": "import data._private\n",
+        }
+        for args in [[], ["--no-prefilter"]]:
+            with self.subTest(args=args):
+                with tempfile.TemporaryDirectory() as tmp_dir, \
+                        change_dir(tmp_dir):
+                    write_files(tmp_dir, files)
+                    result = run_main(["check", "--no-cache"] + args)
+                self.assertEqual(result, (1, [
+                    "./pkg/other.py:1:1: DEP401 "
+                    "Importing private name 'data._private'.",
+                ]))
+
+    def test_no_prefilter(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, {"module.py": "import os\nx = (\n"})
+            prefiltered = run_main(["check", "--no-cache"])
+            parsed = run_main(["check", "--no-cache", "--no-prefilter"])
+
+        self.assertEqual(prefiltered, (0, []))
+        self.assertEqual(parsed[0], 1)
+        self.assertIn("E999", parsed[1][0])
+
+
+class TestCheckDiff(unittest.TestCase):
+    """ Test checking the changes since a git revision."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        write_files(self.tmp_dir, PROJECT_FILES)
+        try:
+            git(self.tmp_dir, "init", "-q")
+        except (OSError, subprocess.CalledProcessError):
+            self.skipTest("git is not available.")
+        git(self.tmp_dir, "add", ".")
+        git(self.tmp_dir, "commit", "-m", "Base")
+        git(self.tmp_dir, "branch", "base")
+        write_files(self.tmp_dir, {
+            "business/logic.py": """
+                from web.api import view
+                from data import _private
+                from data import _other
+            """,
+        })
+
+    def test_changed_lines(self):
+        with change_dir(self.tmp_dir):
+            exit_code, lines = run_main(["check", "--diff", "base"])
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(lines, [
+            os.path.join("business", "logic.py") + ":4:1: DEP401 "
+            "Importing private name 'data._other'.",
+        ])
+
+    def test_whole_files(self):
+        with change_dir(self.tmp_dir):
+            exit_code, lines = run_main(
+                ["check", "--diff", "base", "--diff-whole-files"]
+            )
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(len(lines), 3)
+
+    def test_unknown_revision(self):
+        with change_dir(self.tmp_dir), \
+                contextlib.redirect_stderr(io.StringIO()) as stderr:
+            exit_code, lines = run_main(["check", "--diff", "unknown"])
+
+        self.assertEqual(exit_code, 2)
+        self.assertIn("Cannot read the changes", stderr.getvalue())
+
+
+class TestCheckFiles(unittest.TestCase):
+    """ Test checking files using worker processes."""
+
+    def test_workers_same_as_in_process(self):
+        files = {
+            f"package/module{i}.py": f"from package._module{i} import name"
+            for i in range(20)
+        }
+        options = dict(
+            top_level_dir=None,
+            deduce_path=False,
+            disallowed_patterns=[("*", r".*module1.*")],
+            per_file_ignores=[],
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_files(tmp_dir, files)
+            filenames = sorted(
+                os.path.join(tmp_dir, *path.split("/")) for path in files
+            )
+            expected = list(check_files(filenames, options, jobs=1))
+            actual = list(
+                check_files(filenames, options, jobs=3, chunk_size=2)
+            )
+
+        self.assertEqual(len(expected), 31)
+        self.assertEqual(actual, expected)
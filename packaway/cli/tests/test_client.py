@@ -0,0 +1,126 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from packaway.cli import client
+from packaway.cli.main import main
+from packaway.cli.tests.test_check import (
+    change_dir,
+    PROJECT_FILES,
+    write_files,
+)
+from packaway.server import is_supported
+
+
+def run_client(argv, stdin=""):
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout), \
+            contextlib.redirect_stderr(io.StringIO()) as stderr, \
+            mock.patch("sys.stdin", io.StringIO(stdin)):
+        exit_code = client.main(argv)
+    return exit_code, stdout.getvalue().splitlines(), stderr.getvalue()
+
+
+EXPECTED = [
+    os.path.join("business", "logic.py") + ":2:1: DEP501 "
+    "Import 'web.api.view' violates pattern: 'web.*'",
+    os.path.join("business", "logic.py") + ":3:1: DEP401 "
+    "Importing private name 'data._private'.",
+]
+
+
+@unittest.skipUnless(is_supported(), "Requires Unix domain sockets")
+class TestClient(unittest.TestCase):
+    """ Test the ``packaway serve`` and ``packaway-client`` commands."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        write_files(self.tmp_dir, PROJECT_FILES)
+        self.socket_path = os.path.join(self.tmp_dir, "server.sock")
+
+    def start_server(self):
+        exit_codes = []
+
+        def serve():
+            with contextlib.redirect_stderr(io.StringIO()):
+                exit_codes.append(main([
+                    "serve", "--no-cache", "--socket", self.socket_path,
+                ]))
+
+        with change_dir(self.tmp_dir):
+            thread = threading.Thread(target=serve)
+            thread.start()
+            # The server reads the configuration in the current directory
+            # before creating the socket.
+            while not os.path.exists(self.socket_path):
+                time.sleep(0.01)
+        return thread, exit_codes
+
+    def test_check_with_server(self):
+        thread, exit_codes = self.start_server()
+        try:
+            with change_dir(self.tmp_dir):
+                result = run_client([
+                    "--socket", self.socket_path, "--no-fallback",
+                    os.path.join("business", "logic.py"),
+                    os.path.join("web", "api.py"),
+                ])
+                self.assertEqual(result, (1, EXPECTED, ""))
+
+                result = run_client(
+                    ["--socket", self.socket_path, "--no-fallback", "-",
+                     "--stdin-display-name", "web/new.py"],
+                    stdin="import data._other\nimport web._view\n",
+                )
+                self.assertEqual(result, (1, [
+                    "web/new.py:1:1: DEP401 "
+                    "Importing private name 'data._other'.",
+                ], ""))
+
+                result = run_client(
+                    ["--socket", self.socket_path, "--no-fallback", "-",
+                     "--module", "data.new"],
+                    stdin="import data._other\n",
+                )
+                self.assertEqual(result, (0, [], ""))
+        finally:
+            self.assertEqual(
+                run_client(["--socket", self.socket_path, "--stop"])[0], 0,
+            )
+            thread.join()
+        self.assertEqual(exit_codes, [0])
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_fallback(self):
+        with change_dir(self.tmp_dir):
+            self.assertEqual(
+                run_client([
+                    "--socket", self.socket_path,
+                    os.path.join("business", "logic.py"),
+                ]),
+                (1, EXPECTED, ""),
+            )
+            exit_code, lines, message = run_client([
+                "--socket", self.socket_path, "--no-fallback",
+                os.path.join("business", "logic.py"),
+            ])
+        self.assertEqual((exit_code, lines), (2, []))
+        self.assertIn("Cannot check with the server", message)
+
+    def test_stop_not_running(self):
+        exit_code, _, message = run_client(
+            ["--socket", self.socket_path, "--stop"],
+        )
+        self.assertEqual(exit_code, 2)
+        self.assertIn("Cannot stop the server", message)
+
+    def test_module_requires_one_file(self):
+        with self.assertRaises(SystemExit):
+            run_client(["--module", "a.b", "first.py", "second.py"])
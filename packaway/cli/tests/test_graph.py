@@ -0,0 +1,101 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from packaway.cli.main import main
+from packaway.cli.tests.test_check import change_dir
+from packaway.tests.utils import write_files
+
+
+def run_main(argv, stderr=None):
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout), \
+            contextlib.redirect_stderr(stderr or io.StringIO()):
+        exit_code = main(argv)
+    return exit_code, stdout.getvalue().splitlines()
+
+
+class TestGraphCommand(unittest.TestCase):
+    """ Test the ``packaway graph`` command."""
+
+    def test_build_and_query(self):
+        files = {
+            "person/__init__.py": "",
+            "person/api.py": "from ._reading import read",
+            "person/_reading.py": "",
+            "office/api.py": "from person.api import read",
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, files)
+            graph_path = os.path.join("out", "graph.bin")
+
+            exit_code, _ = run_main(
+                ["graph", "build", "--graph", graph_path, "-j", "1"]
+            )
+            self.assertEqual(exit_code, 0)
+
+            exit_code, lines = run_main(
+                ["graph", "importers", "person._reading",
+                 "--graph", graph_path, "--transitive"]
+            )
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(lines, ["office.api", "person.api"])
+
+            exit_code, lines = run_main(
+                ["graph", "dependencies", "office.api", "--graph", graph_path]
+            )
+            self.assertEqual(lines, ["person.api"])
+
+            exit_code, lines = run_main(
+                ["graph", "importers", "unknown", "--graph", graph_path]
+            )
+            self.assertEqual(exit_code, 2)
+
+    def test_query_missing_graph(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            stderr = io.StringIO()
+            exit_code, lines = run_main(["graph", "importers", "foo"], stderr)
+        self.assertEqual((exit_code, lines), (2, []))
+        self.assertTrue(stderr.getvalue().startswith("Cannot read the graph:"))
+
+    def test_cycles(self):
+        files = {
+            "shop/__init__.py": "from shop import cart",
+            "shop/cart.py": "import shop",
+            "shop/orders/__init__.py": "",
+            "shop/orders/api.py": "from shop.billing import invoices",
+            "shop/billing/__init__.py": "",
+            "shop/billing/invoices.py": "from shop.orders.api import create",
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, files)
+            run_main(["graph", "build", "-j", "1"])
+
+            exit_code, lines = run_main(["graph", "cycles"])
+            self.assertEqual(exit_code, 1)
+            self.assertEqual(lines, [
+                "DEP701 Import cycle between 2 modules: shop.billing.invoices "
+                "-> shop.orders.api -> shop.billing.invoices",
+            ])
+
+            exit_code, lines = run_main(["graph", "cycles", "--all"])
+            self.assertEqual(len(lines), 2)
+
+            write_files(
+                tmp_dir, {"shop/cart.py": "", "shop/orders/api.py": ""},
+            )
+            run_main(["graph", "build", "-j", "1"])
+            exit_code, lines = run_main(["graph", "cycles"])
+            self.assertEqual((exit_code, lines), (0, []))
+
+    def test_cycles_corrupt_graph(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, {"graph.bin": "not a graph"})
+            stderr = io.StringIO()
+            exit_code, lines = run_main(
+                ["graph", "cycles", "--graph", "graph.bin"], stderr,
+            )
+        self.assertEqual((exit_code, lines), (2, []))
+        self.assertTrue(stderr.getvalue().startswith("Cannot read the graph:"))
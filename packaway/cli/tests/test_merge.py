@@ -0,0 +1,129 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from packaway.cli.tests.test_check import (
+    change_dir,
+    PROJECT_FILES,
+    run_main,
+    write_files,
+)
+from packaway.results import iter_results
+from packaway.shard import load_weights
+
+
+class TestMergeCommand(unittest.TestCase):
+    """ Test checking shards of files and merging their results with the
+    ``packaway merge`` command."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        files = dict(PROJECT_FILES)
+        files.update({
+            f"business/module{i}.py": f"from data import _private{i}"
+            for i in range(10)
+        })
+        write_files(self.tmp_dir, files)
+
+    def run_main(self, argv):
+        with change_dir(self.tmp_dir), \
+                contextlib.redirect_stderr(io.StringIO()) as stderr:
+            exit_code, lines = run_main(argv)
+        return exit_code, lines, stderr.getvalue().splitlines()
+
+    def check_shards(self, n_shards, *options):
+        paths = []
+        for number in range(1, n_shards + 1):
+            paths.append(f"shard{number}")
+            result = self.run_main([
+                "check", "-j", "1", "--shard", f"{number}/{n_shards}",
+                "--results", paths[-1], *options,
+            ])
+            self.assertEqual(result, (0, [], []))
+        return paths
+
+    def test_same_as_check(self):
+        exit_code, expected, _ = self.run_main(["check", "-j", "1"])
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(len(expected), 12)
+
+        for n_shards in [1, 3]:
+            with self.subTest(n_shards=n_shards):
+                paths = self.check_shards(n_shards)
+                exit_code, lines, messages = self.run_main(["merge", *paths])
+                self.assertEqual(exit_code, 1)
+                self.assertEqual(messages, [])
+                self.assertEqual(sorted(lines), sorted(expected))
+
+    def test_shards_split_files(self):
+        paths = self.check_shards(4)
+        filenames = [
+            result.filename
+            for path in paths
+            for result in iter_results(os.path.join(self.tmp_dir, path))
+        ]
+        self.assertEqual(len(filenames), 15)
+        self.assertEqual(len(set(filenames)), 15)
+
+        exit_code, _, messages = self.run_main(["merge", *paths[1:]])
+        self.assertEqual(exit_code, 2)
+        self.assertEqual(messages, ["Missing the results of shards 1/4"])
+
+    def test_different_numbers_of_shards(self):
+        paths = self.check_shards(2) + self.check_shards(1)
+        exit_code, _, messages = self.run_main(["merge", *paths])
+        self.assertEqual(exit_code, 2)
+        self.assertEqual(
+            messages,
+            ["The result files are of different numbers of shards: 1, 2"],
+        )
+
+    def test_baseline(self):
+        self.run_main(["baseline", "-j", "1", "--output", "known"])
+        write_files(self.tmp_dir, {
+            "business/module0.py": "from data import _other",
+        })
+        paths = self.check_shards(2)
+
+        exit_code, lines, messages = self.run_main(
+            ["merge", *paths, "--baseline", "known"],
+        )
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(lines, [
+            "./business/module0.py:1:1: DEP401 "
+            "Importing private name 'data._other'.",
+        ])
+        self.assertEqual(messages, [
+            "business/module0.py: 1 stale baseline entries",
+        ])
+
+        exit_code, _, messages = self.run_main(
+            ["check", "--results", "out", "--baseline", "known"],
+        )
+        self.assertEqual(exit_code, 2)
+
+    def test_weights(self):
+        paths = self.check_shards(2)
+        self.run_main(["merge", *paths, "--write-weights", "weights"])
+        weights = load_weights(os.path.join(self.tmp_dir, "weights"))
+        self.assertEqual(len(weights), 15)
+        self.assertEqual(weights["business.module3"], 26)
+
+        paths = self.check_shards(2, "--shard-weights", "weights")
+        exit_code, lines, _ = self.run_main(["merge", *paths])
+        self.assertEqual((exit_code, len(lines)), (1, 12))
+
+    def test_invalid_arguments(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            for argv in [["check", "--shard", "0/2"], ["merge"]]:
+                with self.subTest(argv=argv):
+                    with self.assertRaises(SystemExit):
+                        run_main(argv)
+
+        exit_code, _, messages = self.run_main(["merge", "missing"])
+        self.assertEqual(exit_code, 2)
+        self.assertIn("Cannot read the results", messages[0])
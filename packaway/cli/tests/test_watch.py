@@ -0,0 +1,40 @@
+import contextlib
+import io
+import tempfile
+import unittest
+from unittest import mock
+
+from packaway.cli.main import main
+from packaway.cli.tests.test_check import change_dir
+from packaway.tests.utils import write_files
+
+
+class TestWatchCommand(unittest.TestCase):
+    """ Test the ``packaway watch`` command."""
+
+    def test_check_changed_files(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, change_dir(tmp_dir):
+            write_files(tmp_dir, {
+                "person/api.py": "from office._api import name",
+                "office/api.py": "",
+            })
+
+            def edit_then_stop(interval):
+                if sleep.call_count == 1:
+                    write_files(tmp_dir, {"office/api.py": "import web._a"})
+                elif sleep.call_count == 3:
+                    raise KeyboardInterrupt()
+
+            stdout = io.StringIO()
+            sleep = mock.Mock(side_effect=edit_then_stop)
+            with mock.patch("time.sleep", sleep), \
+                    contextlib.redirect_stdout(stdout), \
+                    contextlib.redirect_stderr(io.StringIO()):
+                exit_code = main(["watch"])
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout.getvalue().splitlines(), [
+            "./person/api.py:1:1: DEP401 "
+            "Importing private name 'office._api.name'.",
+            "./office/api.py:1:1: DEP401 Importing private name 'web._a'.",
+        ])
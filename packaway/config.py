@@ -0,0 +1,552 @@
+""" This module contains the configuration shared by the tools exposing
+the import rules.
+"""
+
+import configparser
+import fnmatch
+import hashlib
+import os
+import re
+
+from packaway.paths import ModuleNameResolver
+from packaway.rules import contract_rule
+from packaway.rules.regex_rule import DisallowedMatcher
+
+
+#: Configuration files read for the options in the ``[flake8]`` section,
+#: in the order flake8 reads them. Later files take precedence.
+CONFIG_FILES = ("setup.cfg", "tox.ini", ".flake8")
+
+#: Default patterns of files and directories excluded from checks, the same
+#: as flake8's default.
+DEFAULT_EXCLUDE = (
+    ".svn", "CVS", ".bzr", ".hg", ".git", "__pycache__", ".tox", ".nox",
+    ".eggs", "*.egg",
+)
+
+# Absolute name of a package in contracts.
+_PACKAGE_NAME = re.compile(
+    r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*$"
+)
+
+# Tokens of the per-file-ignores option: error codes, file patterns,
+# colons and separators.
+_PER_FILE_IGNORES_TOKEN = re.compile(
+    r"(?P<code>[A-Z]+[0-9]*(?=$|\s|,))|(?P<file>[^\s:,]+)|(?P<colon>:)"
+    r"|(?P<sep>[\s,]+)"
+)
+
+
+class FilePatternMatcher:
+    """ Resolve the configuration values that apply to a file, from values
+    associated with UNIX-style file patterns.
+
+    The patterns are translated to regular expressions and compiled once.
+    Patterns ending with a path separator followed by ``*`` (e.g.
+    ``business/*``) match depending on the directory of a file only, so
+    their result is cached per directory. Other patterns are evaluated for
+    each file with a single combined regular expression.
+
+    Parameters
+    ----------
+    items : iterable of tuple(str, object)
+        The first item in the tuple is the pattern for matching file paths
+        relative to the current directory, as in ``fnmatch.fnmatch``.
+        The second item is the value applied to the matching files.
+    """
+
+    def __init__(self, items):
+        self._values = []
+        dir_patterns = []
+        file_patterns = []
+        for index, (file_pattern, value) in enumerate(items):
+            self._values.append(value)
+            file_pattern = os.path.normcase(file_pattern)
+            translated = (index, fnmatch.translate(file_pattern))
+            if file_pattern.endswith(os.sep + "*"):
+                dir_patterns.append(translated)
+            else:
+                file_patterns.append(translated)
+
+        self._dir_matcher = _IndexedMatcher(dir_patterns)
+        self._file_matcher = _IndexedMatcher(file_patterns)
+
+        # Mapping from directory to the indices of the matching directory
+        # patterns.
+        self._dir_cache = {}
+
+        # Mapping from matching indices to the resolved values.
+        self._values_cache = {}
+
+    def resolve(self, filename):
+        """ Return the values applied to a file.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the file.
+
+        Returns
+        -------
+        values : tuple
+            Values of the matching patterns, in the order they were given.
+        """
+        rel_path = os.path.normcase(os.path.relpath(filename, os.curdir))
+        dirname, basename = os.path.split(rel_path)
+        try:
+            indices = self._dir_cache[dirname]
+        except KeyError:
+            # Any base name gives the same result for these patterns.
+            indices = self._dir_matcher.matching_indices(
+                os.path.join(dirname, "_")
+            )
+            self._dir_cache[dirname] = indices
+
+        if self._file_matcher:
+            indices = tuple(sorted(
+                indices + self._file_matcher.matching_indices(rel_path)
+            ))
+
+        try:
+            return self._values_cache[indices]
+        except KeyError:
+            values = tuple(self._values[index] for index in indices)
+            self._values_cache[indices] = values
+            return values
+
+
+class CompiledConfig:
+    """ Configuration of the checks, compiled once and immutable.
+
+    The options are normalized into tuples and compiled into the matchers
+    used for checking files. The same object can then be shared by all the
+    checkers of a run: worker processes inherit it when they are forked,
+    and receive it compiled when they are spawned, instead of compiling the
+    options again.
+
+    Parameters
+    ----------
+    top_level_dir : str or None, optional
+        Top level directory to use when composing module names from file
+        paths.
+    deduce_path : bool, optional
+        Whether to deduce module names from file paths.
+    find_package_roots : bool, optional
+        Whether to compose module names from the roots of the packages
+        containing the files, see ``paths.ModuleNameResolver``.
+    source_roots : iterable of str, optional
+        Directories holding top level packages and modules. Implies
+        ``find_package_roots``.
+    disallowed_patterns : iterable of tuple(str, str), optional
+        Pairs of filename pattern and regular expression for disallowed
+        imports, see ``parse_disallowed_patterns``.
+    per_file_ignores : iterable of tuple(str, tuple of str), optional
+        Pairs of filename pattern and error codes ignored for the files,
+        see ``parse_per_file_ignores``.
+    contracts : iterable of tuple(str, tuple), optional
+        Layered architecture contracts, see ``parse_contracts``.
+
+    Attributes
+    ----------
+    module_names : ModuleNameResolver
+        Resolver of the module names of files.
+    disallowed_matchers : FilePatternMatcher
+        Matcher resolving a filename to the ``DisallowedMatcher`` applied
+        to it.
+    ignored_codes : FilePatternMatcher
+        Matcher resolving a filename to the error codes ignored for it.
+    contract_matrix : ContractMatrix
+        Compiled contracts.
+    fingerprint : str
+        Hash of the content of the options, the same in every process.
+
+    Raises
+    ------
+    re.error
+        If a disallowed pattern is not a valid regular expression.
+    ValueError
+        If the kind of a contract is unknown.
+    """
+
+    __slots__ = (
+        "top_level_dir",
+        "deduce_path",
+        "find_package_roots",
+        "source_roots",
+        "disallowed_patterns",
+        "per_file_ignores",
+        "contracts",
+        "module_names",
+        "disallowed_matchers",
+        "ignored_codes",
+        "contract_matrix",
+        "fingerprint",
+    )
+
+    def __init__(
+            self, top_level_dir=None, deduce_path=True,
+            find_package_roots=False, source_roots=(),
+            disallowed_patterns=(), per_file_ignores=(), contracts=()):
+        options = dict(
+            top_level_dir=top_level_dir,
+            deduce_path=bool(deduce_path),
+            find_package_roots=bool(find_package_roots),
+            source_roots=tuple(source_roots),
+            disallowed_patterns=tuple(
+                (file_pattern, pattern)
+                for file_pattern, pattern in disallowed_patterns
+            ),
+            per_file_ignores=tuple(
+                (file_pattern, tuple(codes))
+                for file_pattern, codes in per_file_ignores
+            ),
+            contracts=tuple(contracts),
+        )
+        options["fingerprint"] = hashlib.blake2b(
+            repr(sorted(options.items())).encode("utf-8"), digest_size=20,
+        ).hexdigest()
+        options.update(
+            module_names=ModuleNameResolver(
+                top_level_dir, find_package_roots, options["source_roots"],
+            ),
+            disallowed_matchers=FilePatternMatcher(
+                compile_disallowed_patterns(options["disallowed_patterns"])
+            ),
+            ignored_codes=FilePatternMatcher(options["per_file_ignores"]),
+            contract_matrix=contract_rule.ContractMatrix(options["contracts"]),
+        )
+        self.__setstate__(options)
+
+    def __repr__(self):
+        return f"CompiledConfig(fingerprint={self.fingerprint!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, CompiledConfig):
+            return NotImplemented
+        return self.fingerprint == other.fingerprint
+
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name in self.__slots__:
+            object.__setattr__(self, name, state[name])
+
+    def module_name(self, filename):
+        """ Return the module name of a file.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the Python file.
+
+        Returns
+        -------
+        module_name : str or None
+            None if module names are not deduced from file paths.
+        """
+        if not self.deduce_path:
+            return None
+        return self.module_names.module_name(filename)
+
+
+def parse_disallowed_patterns(disallowed_patterns):
+    """ Parse disallowed patterns from the configuration.
+
+    Parameters
+    ----------
+    disallowed_patterns : str
+        Configuration that represents a pairing of filename pattern
+        and regular expression for disallowed import.
+        Multiple items should be separated by newlines.
+
+    Returns
+    -------
+    results : list of tuple(str, str)
+        The first item in the tuple is the pattern for matching files.
+        The second item in the tuple is the pattern for matching disallowed
+        imports.
+    """
+    results = []
+    disallowed_patterns = disallowed_patterns.replace(" ", "")
+    for rule in disallowed_patterns.splitlines():
+        if not rule:
+            continue
+        file_pattern, disallowed = rule.split(":")
+        results.append((file_pattern.strip(), disallowed.strip()))
+    return results
+
+
+def compile_disallowed_patterns(disallowed_patterns):
+    """ Compile disallowed patterns into one matcher per filename pattern.
+
+    Parameters
+    ----------
+    disallowed_patterns : list of tuple(str, str)
+        Pairs of filename pattern and regular expression for disallowed
+        imports, see ``parse_disallowed_patterns``.
+
+    Returns
+    -------
+    results : list of tuple(str, DisallowedMatcher)
+        The first item in the tuple is the pattern for matching files.
+        The second item in the tuple is the matcher for all the disallowed
+        imports configured for those files.
+    """
+    file_pattern_to_patterns = {}
+    for file_pattern, disallowed in disallowed_patterns:
+        file_pattern_to_patterns.setdefault(file_pattern, []).append(
+            disallowed
+        )
+    return [
+        (file_pattern, DisallowedMatcher(patterns))
+        for file_pattern, patterns in file_pattern_to_patterns.items()
+    ]
+
+
+def parse_contracts(contracts):
+    """ Parse layered architecture contracts from the configuration.
+
+    Each line holds a contract, one of:
+
+    - ``layers: high > middle1 | middle2 > low``: layers of packages from
+      the highest to the lowest. Packages may not import packages of
+      higher layers, nor other packages of their layer (separated by
+      ``|``).
+    - ``independent: first, second, third``: packages that may not import
+      each other.
+    - ``allow: source -> target``: imports from a package to another one
+      that are allowed even if another contract forbids them.
+
+    Contracts between subpackages take precedence over contracts between
+    their parent packages.
+
+    Parameters
+    ----------
+    contracts : str
+        Configuration with one contract per line.
+
+    Returns
+    -------
+    results : list of tuple(str, tuple)
+        Kind and packages of each contract, see
+        ``contract_rule.ContractMatrix``.
+
+    Raises
+    ------
+    ValueError
+        If a contract is malformed.
+    """
+    results = []
+    for line in contracts.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.count(":") != 1:
+            raise ValueError(f"Expected one colon in contract {line!r}")
+        kind, _, spec = line.partition(":")
+        kind = kind.strip()
+        if kind == contract_rule.LAYERS:
+            packages = tuple(
+                _parse_package_names(layer, "|", line)
+                for layer in spec.split(">")
+            )
+            if len(packages) < 2:
+                raise ValueError(
+                    f"Expected at least two layers in contract {line!r}"
+                )
+        elif kind == contract_rule.INDEPENDENT:
+            packages = _parse_package_names(spec, ",", line)
+            if len(packages) < 2:
+                raise ValueError(
+                    f"Expected at least two packages in contract {line!r}"
+                )
+        elif kind == contract_rule.ALLOW:
+            source, arrow, target = spec.partition("->")
+            if not arrow:
+                raise ValueError(
+                    f"Expected 'source -> target' in contract {line!r}"
+                )
+            packages = (
+                _parse_package_names(source, ",", line)
+                + _parse_package_names(target, ",", line)
+            )
+            if len(packages) != 2:
+                raise ValueError(
+                    f"Expected 'source -> target' in contract {line!r}"
+                )
+        else:
+            raise ValueError(
+                f"Expected a contract starting with 'layers:', "
+                f"'independent:' or 'allow:', got {line!r}"
+            )
+        results.append((kind, packages))
+    return results
+
+
+def parse_per_file_ignores(per_file_ignores):
+    """ Parse the per-file-ignores option in the same format as flake8.
+
+    Parameters
+    ----------
+    per_file_ignores : str
+        Configuration mapping lists of filename patterns to lists of
+        error codes, e.g. ``examples/*: F401,DEP401``.
+
+    Returns
+    -------
+    results : list of tuple(str, tuple of str)
+        The first item in the tuple is the pattern for matching files.
+        The second item in the tuple is the error codes ignored for those
+        files.
+
+    Raises
+    ------
+    ValueError
+        If the option is not a mapping from filenames to codes.
+    """
+    results = []
+    file_patterns = []
+    codes = []
+    seen_colon = False
+    for match in _PER_FILE_IGNORES_TOKEN.finditer(per_file_ignores):
+        kind = match.lastgroup
+        if kind == "sep":
+            continue
+        if not seen_colon:
+            if kind == "colon":
+                seen_colon = True
+            else:
+                file_patterns.append(match.group())
+        elif kind == "code":
+            codes.append(match.group())
+        elif kind == "file" and codes:
+            results.extend(
+                (file_pattern, tuple(codes)) for file_pattern in file_patterns
+            )
+            file_patterns = [match.group()]
+            codes = []
+            seen_colon = False
+        else:
+            raise ValueError(
+                "Expected per-file-ignores to be a mapping from file "
+                f"patterns to error codes, got {per_file_ignores!r}"
+            )
+    if file_patterns and not seen_colon:
+        raise ValueError(
+            "Expected per-file-ignores to be a mapping from file "
+            f"patterns to error codes, got {per_file_ignores!r}"
+        )
+    results.extend(
+        (file_pattern, tuple(codes)) for file_pattern in file_patterns
+    )
+    return results
+
+
+def read_config(config_file=None, directory=os.curdir):
+    """ Read the options of the ``[flake8]`` section of configuration files.
+
+    Parameters
+    ----------
+    config_file : str, optional
+        Path to the configuration file to read. If not given, the files in
+        ``CONFIG_FILES`` found in ``directory`` are read.
+    directory : str, optional
+        Directory in which configuration files are looked up.
+
+    Returns
+    -------
+    options : dict(str, str)
+        Raw option values keyed by the option name, with dashes replaced
+        by underscores, e.g. ``top_level_dir``.
+    """
+    if config_file is None:
+        config_files = [
+            os.path.join(directory, name) for name in CONFIG_FILES
+        ]
+    else:
+        config_files = [config_file]
+
+    parser = configparser.RawConfigParser()
+    parser.read(config_files)
+    if not parser.has_section("flake8"):
+        return {}
+    return {
+        key.replace("-", "_"): value
+        for key, value in parser.items("flake8")
+    }
+
+
+class _IndexedMatcher:
+    """ Matcher for finding which of many regular expressions match,
+    reporting their indices.
+
+    Parameters
+    ----------
+    items : list of tuple(int, str)
+        Index and regular expression.
+    """
+
+    def __init__(self, items):
+        self._pattern_to_indices = {}
+        for index, regex in items:
+            self._pattern_to_indices.setdefault(regex, []).append(index)
+        self._matcher = DisallowedMatcher(self._pattern_to_indices)
+
+    def __bool__(self):
+        return bool(self._pattern_to_indices)
+
+    def matching_indices(self, text):
+        """ Return the indices of the expressions matching the text.
+
+        Parameters
+        ----------
+        text : str
+
+        Returns
+        -------
+        indices : tuple of int
+        """
+        return tuple(sorted(
+            index
+            for regex in self._matcher.iter_matches(text)
+            for index in self._pattern_to_indices[regex]
+        ))
+
+
+def _parse_package_names(text, separator, contract):
+    """ Parse package names separated by a separator.
+
+    Parameters
+    ----------
+    text : str
+    separator : str
+    contract : str
+        The whole contract, for error messages.
+
+    Returns
+    -------
+    names : tuple of str
+
+    Raises
+    ------
+    ValueError
+        If a name is not a valid absolute package name.
+    """
+    names = tuple(name.strip() for name in text.split(separator))
+    for name in names:
+        if _PACKAGE_NAME.match(name) is None:
+            raise ValueError(
+                f"Expected package names in contract {contract!r}, "
+                f"got {name!r}"
+            )
+    return names
@@ -0,0 +1,239 @@
+""" This module supports restricting checks to the lines changed since a
+git revision.
+"""
+
+import bisect
+import codecs
+import os
+import re
+import subprocess
+
+from packaway.notebook import NOTEBOOK_EXTENSION
+
+# Header of a hunk of a unified diff, with the range of lines in the new
+# version of the file.
+_HUNK_HEADER = re.compile(
+    rb"^@@ -\d+(?:,(?P<old_count>\d+))? "
+    rb"\+(?P<start>\d+)(?:,(?P<count>\d+))? @@"
+)
+
+# Path of the new version of a deleted file in a diff.
+_DEV_NULL = b"/dev/null"
+
+# Error codes about whole files, always reported for changed files.
+_FILE_ERROR_CODES = frozenset(["E902", "E999", "DEP901"])
+
+
+class ChangedLines:
+    """ Lines of a file changed in a diff.
+
+    Parameters
+    ----------
+    ranges : iterable of tuple(int, int)
+        Ranges of line numbers, each given by its first line and the line
+        after its last line.
+    """
+
+    def __init__(self, ranges):
+        self._starts = []
+        self._stops = []
+        for start, stop in sorted(ranges):
+            if start >= stop:
+                continue
+            if self._stops and start <= self._stops[-1]:
+                self._stops[-1] = max(self._stops[-1], stop)
+            else:
+                self._starts.append(start)
+                self._stops.append(stop)
+
+    def __repr__(self):
+        return f"ChangedLines({list(zip(self._starts, self._stops))!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, ChangedLines):
+            return NotImplemented
+        return (
+            self._starts == other._starts and self._stops == other._stops
+        )
+
+    def __contains__(self, lineno):
+        index = bisect.bisect_right(self._starts, lineno) - 1
+        return index >= 0 and lineno < self._stops[index]
+
+
+def changed_lines(base, paths=(), directory=None):
+    """ Return the lines changed since a git revision.
+
+    Changes are relative to the merge base of the revision and ``HEAD``,
+    and include the changes of tracked files not yet committed, as for
+    ``git diff $(git merge-base BASE HEAD)``.
+
+    Parameters
+    ----------
+    base : str
+        Git revision, e.g. ``origin/main``.
+    paths : iterable of str, optional
+        Paths to limit the diff to. Default is the whole repository.
+    directory : str or None, optional
+        Directory inside the git repository. Default is the current
+        directory. Paths are relative to it.
+
+    Returns
+    -------
+    changes : dict(str, ChangedLines)
+        Mapping from the path of each added or modified file to its
+        changed lines.
+
+    Raises
+    ------
+    OSError
+        If git cannot be run.
+    subprocess.CalledProcessError
+        If git fails, e.g. if the revision does not exist.
+    """
+    merge_base = _run_git(
+        ["merge-base", base, "HEAD"], directory,
+    ).strip().decode("ascii")
+    output = _run_git(
+        [
+            "diff", "--unified=0", "--no-color", "--no-ext-diff",
+            "--no-renames", "--relative", "--no-prefix",
+            "--diff-filter=AM", merge_base, "--", *paths,
+        ],
+        directory,
+    )
+    return parse_diff(output)
+
+
+def parse_diff(output):
+    """ Parse the changed lines from a unified diff made with
+    ``--no-prefix``.
+
+    Parameters
+    ----------
+    output : bytes
+        Output of ``git diff``.
+
+    Returns
+    -------
+    changes : dict(str, ChangedLines)
+        Mapping from the path of each added or modified file to its
+        changed lines.
+    """
+    ranges = {}
+    current = None
+    # Number of lines of the current hunk not read yet, so that changed
+    # lines looking like headers are skipped.
+    remaining = 0
+    for line in output.splitlines():
+        if remaining:
+            if line.startswith((b"-", b"+", b" ")):
+                remaining -= 1
+            continue
+        if line.startswith(b"+++ "):
+            path = line[4:].rstrip(b"\t")
+            if path == _DEV_NULL:
+                current = None
+            else:
+                current = ranges.setdefault(_decode_path(path), [])
+        elif line.startswith(b"@@ "):
+            match = _HUNK_HEADER.match(line)
+            if match is None:
+                continue
+            old_count = _hunk_count(match.group("old_count"))
+            start = int(match.group("start"))
+            count = _hunk_count(match.group("count"))
+            remaining = old_count + count
+            if current is not None:
+                current.append((start, start + count))
+    return {
+        filename: ChangedLines(file_ranges)
+        for filename, file_ranges in ranges.items()
+    }
+
+
+def filter_errors(errors, changes):
+    """ Keep the errors on changed lines.
+
+    Errors about a whole file, e.g. syntax errors, are kept for all the
+    changed files, as well as all the errors of changed notebooks.
+
+    Parameters
+    ----------
+    errors : iterable of tuple(str, int, int, str, str)
+        Filename, line number, column offset, error code and message,
+        possibly followed by more items, e.g. the fingerprint.
+    changes : dict(str, ChangedLines)
+        Changed lines of each file, see ``changed_lines``.
+
+    Yields
+    ------
+    error : tuple(str, int, int, str, str)
+        The errors kept, as given.
+    """
+    for error in errors:
+        filename, lineno, code = error[0], error[1], error[3]
+        lines = changes.get(os.path.normpath(filename))
+        if lines is None:
+            continue
+        # The changed lines of notebooks are lines of JSON, not of their
+        # code cells.
+        if (code in _FILE_ERROR_CODES or lineno in lines
+                or filename.endswith(NOTEBOOK_EXTENSION)):
+            yield error
+
+
+def _hunk_count(count):
+    """ Return the number of lines of a hunk, which is omitted from the
+    header if it is 1.
+
+    Parameters
+    ----------
+    count : bytes or None
+
+    Returns
+    -------
+    count : int
+    """
+    return 1 if count is None else int(count)
+
+
+def _decode_path(path):
+    """ Decode a path printed by git, which is quoted if it contains
+    special characters.
+
+    Parameters
+    ----------
+    path : bytes
+
+    Returns
+    -------
+    path : str
+        Normalized path.
+    """
+    if path.startswith(b'"') and path.endswith(b'"'):
+        path, _ = codecs.escape_decode(path[1:-1])
+    return os.path.normpath(os.fsdecode(path))
+
+
+def _run_git(args, directory):
+    """ Run a git command and return its output.
+
+    Parameters
+    ----------
+    args : list of str
+        Arguments of git.
+    directory : str or None
+        Directory where git is run.
+
+    Returns
+    -------
+    output : bytes
+    """
+    return subprocess.run(
+        ["git", *args],
+        cwd=directory,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+    ).stdout
@@ -0,0 +1,828 @@
+""" This module supports building and querying the import graph between
+the modules of a project.
+"""
+
+from array import array
+import ast
+import collections
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import sys
+
+from packaway import __version__
+from packaway.cache import DEFAULT_CACHE_DIR, IMPORTS_FINGERPRINT
+from packaway.paths import deduce_module_name, ModuleNameResolver
+from packaway.rules.engine import (
+    collect_bindings,
+    collect_imports,
+    scan_import_statements,
+)
+from packaway.rules.reexport_rule import ExportIndex
+from packaway.rules.underscore_rule import check_import
+
+# First line of files holding a saved graph.
+_MAGIC = b"packaway-graph\n"
+
+# Version of the layout of saved graphs.
+_FORMAT_VERSION = 1
+
+# Type code of the arrays of module IDs, see the array module.
+_TYPECODE = "i"
+
+#: Default path of the saved graph of a project.
+DEFAULT_GRAPH_PATH = os.path.join(DEFAULT_CACHE_DIR, "graph.bin")
+
+# Last part of the module names deduced for the __init__.py of packages.
+_INIT_SUFFIX = ".__init__"
+
+# Fingerprints keying the names bound by the imports at the top level of
+# files, and the names imported by the files that are not parsed for them,
+# in a result cache.
+_BINDINGS_FINGERPRINT = f"bindings {__version__}"
+_TARGETS_FINGERPRINT = f"targets {__version__}"
+
+
+class ModuleGraph:
+    """ Directed graph of imports between modules.
+
+    Module names are interned as integer IDs and the edges are stored as
+    compressed adjacency arrays: the modules imported by the module with
+    ID ``i`` are ``targets[offsets[i]:offsets[i + 1]]``, sorted. The graph
+    with the edges reversed is computed on demand and saved along with the
+    graph, so that loaded graphs answer queries right away.
+
+    Parameters
+    ----------
+    names : list of str
+        Names of the modules, indexed by their ID.
+    offsets : array.array
+        Offsets into ``targets`` for each module, with one more item than
+        ``names``.
+    targets : array.array
+        IDs of the imported modules.
+    """
+
+    def __init__(self, names, offsets, targets):
+        if len(offsets) != len(names) + 1:
+            raise ValueError("Expected one more offset than module names.")
+        self.names = names
+        self._offsets = offsets
+        self._targets = targets
+        self._ids = {name: index for index, name in enumerate(names)}
+        self._reversed = None
+        self._component_labels = None
+
+    def __repr__(self):
+        return (
+            f"ModuleGraph(n_modules={len(self)}, n_edges={self.n_edges})"
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    @property
+    def n_edges(self):
+        """ Number of import edges in the graph. """
+        return len(self._targets)
+
+    @classmethod
+    def from_edges(cls, names, edges):
+        """ Create a graph from pairs of module names.
+
+        Parameters
+        ----------
+        names : iterable of str
+            Names of the modules. Modules found in ``edges`` are added if
+            missing.
+        edges : iterable of tuple(str, str)
+            Pairs of importing module and imported module. Duplicates and
+            self imports are ignored.
+
+        Returns
+        -------
+        graph : ModuleGraph
+        """
+        ids = {}
+        for name in names:
+            ids.setdefault(sys.intern(name), len(ids))
+
+        adjacency = collections.defaultdict(set)
+        for source, target in edges:
+            source_id = ids.setdefault(sys.intern(source), len(ids))
+            target_id = ids.setdefault(sys.intern(target), len(ids))
+            if source_id != target_id:
+                adjacency[source_id].add(target_id)
+
+        offsets = array(_TYPECODE, [0])
+        targets = array(_TYPECODE)
+        for source_id in range(len(ids)):
+            targets.extend(sorted(adjacency.get(source_id, ())))
+            offsets.append(len(targets))
+        return cls(list(ids), offsets, targets)
+
+    def module_id(self, name):
+        """ Return the ID of a module.
+
+        Parameters
+        ----------
+        name : str
+            Module name.
+
+        Returns
+        -------
+        module_id : int
+
+        Raises
+        ------
+        KeyError
+            If the module is not in the graph.
+        """
+        try:
+            return self._ids[name]
+        except KeyError:
+            raise KeyError(f"Module {name!r} is not in the graph.") from None
+
+    def edges(self):
+        """ Iterate over the import edges.
+
+        Yields
+        ------
+        edge : tuple(str, str)
+            Importing module and imported module.
+        """
+        names = self.names
+        for source_id, source in enumerate(names):
+            for target_id in self._successor_ids(source_id):
+                yield source, names[target_id]
+
+    def dependencies(self, name, transitive=False):
+        """ Return the modules imported by a module.
+
+        Parameters
+        ----------
+        name : str
+            Module name.
+        transitive : bool, optional
+            If true, include modules imported indirectly.
+
+        Returns
+        -------
+        names : list of str
+            Sorted module names.
+        """
+        return self._neighbors(
+            self.module_id(name), self._offsets, self._targets, transitive,
+        )
+
+    def importers(self, name, transitive=False):
+        """ Return the modules importing a module.
+
+        Parameters
+        ----------
+        name : str
+            Module name.
+        transitive : bool, optional
+            If true, include modules importing it indirectly.
+
+        Returns
+        -------
+        names : list of str
+            Sorted module names.
+        """
+        offsets, targets = self._reversed_arrays()
+        return self._neighbors(
+            self.module_id(name), offsets, targets, transitive,
+        )
+
+    def components(self):
+        """ Return the import cycles, as the strongly connected components
+        of the graph with more than one module.
+
+        Returns
+        -------
+        components : list of list of str
+            Sorted module names of each component, ordered by their first
+            name.
+        """
+        labels = self._labels()
+        members = collections.defaultdict(list)
+        for module_id, label in enumerate(labels):
+            members[label].append(self.names[module_id])
+        return sorted(
+            sorted(names) for names in members.values() if len(names) > 1
+        )
+
+    def shortest_cycle(self, source, target):
+        """ Return a shortest import cycle through an import.
+
+        Parameters
+        ----------
+        source : str
+            Name of the importing module.
+        target : str
+            Name of the imported module.
+
+        Returns
+        -------
+        cycle : list of str
+            Module names along the cycle, starting and ending with the
+            source and followed by the target.
+
+        Raises
+        ------
+        KeyError
+            If a module is not in the graph.
+        ValueError
+            If the source does not import the target, or the import is not
+            part of a cycle.
+        """
+        source_id = self.module_id(source)
+        target_id = self.module_id(target)
+        labels = self._labels()
+        if (labels[source_id] != labels[target_id]
+                or target_id not in self._successor_ids(source_id)):
+            raise ValueError(
+                f"The import of {target!r} by {source!r} is not part of a "
+                "cycle."
+            )
+
+        # Breadth-first search for the source from the target, within their
+        # component.
+        label = labels[source_id]
+        parents = {target_id: None}
+        queue = collections.deque([target_id])
+        while source_id not in parents:
+            current = queue.popleft()
+            for neighbor in self._successor_ids(current):
+                if labels[neighbor] == label and neighbor not in parents:
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+
+        path = []
+        module_id = source_id
+        while module_id is not None:
+            path.append(self.names[module_id])
+            module_id = parents[module_id]
+        path.append(source)
+        path.reverse()
+        return path
+
+    def save(self, path):
+        """ Save the graph to a file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file.
+        """
+        reversed_offsets, reversed_sources = self._reversed_arrays()
+        header = json.dumps({
+            "version": _FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "itemsize": self._targets.itemsize,
+            "n_edges": self.n_edges,
+            "names": self.names,
+        }, separators=(",", ":")).encode("utf-8")
+        with open(path, "wb") as file:
+            file.write(_MAGIC)
+            file.write(header + b"\n")
+            for values in (
+                    self._offsets, self._targets,
+                    reversed_offsets, reversed_sources):
+                values.tofile(file)
+
+    @classmethod
+    def load(cls, path):
+        """ Load a graph saved with ``save``.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file.
+
+        Returns
+        -------
+        graph : ModuleGraph
+
+        Raises
+        ------
+        OSError
+            If the file cannot be read.
+        ValueError
+            If the file does not hold a graph in a supported format, e.g.
+            if it is truncated.
+        """
+        with open(path, "rb") as file:
+            if file.readline() != _MAGIC:
+                raise ValueError(f"{path!r} is not a packaway graph file.")
+            try:
+                header = json.loads(file.readline().decode("utf-8"))
+                if (header["version"] != _FORMAT_VERSION
+                        or header["itemsize"] != array(_TYPECODE).itemsize):
+                    raise ValueError(
+                        f"Unsupported format of packaway graph file {path!r}."
+                    )
+                names = [sys.intern(name) for name in header["names"]]
+                arrays = []
+                for size in [len(names) + 1, header["n_edges"]] * 2:
+                    values = array(_TYPECODE)
+                    values.fromfile(file, size)
+                    if header["byteorder"] != sys.byteorder:
+                        values.byteswap()
+                    arrays.append(values)
+            except (EOFError, KeyError, TypeError) as error:
+                raise ValueError(
+                    f"Corrupt packaway graph file {path!r}: {error!r}"
+                ) from None
+
+        offsets, targets, reversed_offsets, reversed_sources = arrays
+        graph = cls(names, offsets, targets)
+        graph._reversed = (reversed_offsets, reversed_sources)
+        return graph
+
+    def _successor_ids(self, module_id):
+        """ Return the IDs of the modules imported by a module. """
+        return self._targets[
+            self._offsets[module_id]:self._offsets[module_id + 1]
+        ]
+
+    def _reversed_arrays(self):
+        """ Return the adjacency arrays of the graph with reversed edges.
+        """
+        if self._reversed is None:
+            n_modules = len(self.names)
+            counts = array(_TYPECODE, [0]) * (n_modules + 1)
+            for target_id in self._targets:
+                counts[target_id + 1] += 1
+            for index in range(n_modules):
+                counts[index + 1] += counts[index]
+
+            offsets = array(_TYPECODE, counts)
+            sources = array(_TYPECODE, [0]) * len(self._targets)
+            for source_id in range(n_modules):
+                for target_id in self._successor_ids(source_id):
+                    sources[counts[target_id]] = source_id
+                    counts[target_id] += 1
+            self._reversed = (offsets, sources)
+        return self._reversed
+
+    def _labels(self):
+        """ Return the label of the strongly connected component of each
+        module.
+
+        Components are found with Tarjan's algorithm, made iterative so
+        that long chains of imports do not exceed the recursion limit. It
+        runs in time linear in the number of modules and edges.
+
+        Returns
+        -------
+        labels : array.array
+            Label of the component of each module, indexed by module ID.
+        """
+        if self._component_labels is not None:
+            return self._component_labels
+
+        n_modules = len(self.names)
+        offsets = self._offsets
+        targets = self._targets
+        # Order of discovery of each module, -1 if not visited yet.
+        index = array(_TYPECODE, [-1]) * n_modules
+        lowlink = array(_TYPECODE, [0]) * n_modules
+        # Label of the component of each module, -1 while the module is on
+        # the stack of modules not assigned to a component yet.
+        labels = array(_TYPECODE, [-1]) * n_modules
+        stack = []
+        n_visited = 0
+        n_components = 0
+        for root in range(n_modules):
+            if index[root] != -1:
+                continue
+            index[root] = lowlink[root] = n_visited
+            n_visited += 1
+            stack.append(root)
+            # Modules being visited, with the position of the next edge to
+            # follow.
+            path = [root]
+            positions = [offsets[root]]
+            while path:
+                module_id = path[-1]
+                position = positions[-1]
+                end = offsets[module_id + 1]
+                unvisited = None
+                while position < end:
+                    neighbor = targets[position]
+                    position += 1
+                    if index[neighbor] == -1:
+                        unvisited = neighbor
+                        break
+                    if (labels[neighbor] == -1
+                            and index[neighbor] < lowlink[module_id]):
+                        lowlink[module_id] = index[neighbor]
+                positions[-1] = position
+
+                if unvisited is not None:
+                    index[unvisited] = lowlink[unvisited] = n_visited
+                    n_visited += 1
+                    stack.append(unvisited)
+                    path.append(unvisited)
+                    positions.append(offsets[unvisited])
+                    continue
+
+                path.pop()
+                positions.pop()
+                if path and lowlink[module_id] < lowlink[path[-1]]:
+                    lowlink[path[-1]] = lowlink[module_id]
+                if lowlink[module_id] == index[module_id]:
+                    while True:
+                        member = stack.pop()
+                        labels[member] = n_components
+                        if member == module_id:
+                            break
+                    n_components += 1
+
+        self._component_labels = labels
+        return labels
+
+    def _neighbors(self, module_id, offsets, targets, transitive):
+        """ Return the names of the modules adjacent to a module.
+
+        Parameters
+        ----------
+        module_id : int
+            ID of the module.
+        offsets, targets : array.array
+            Adjacency arrays of the graph to follow.
+        transitive : bool
+            If true, return all the modules reachable from the module.
+
+        Returns
+        -------
+        names : list of str
+            Sorted module names.
+        """
+        if not transitive:
+            found = targets[offsets[module_id]:offsets[module_id + 1]]
+        else:
+            visited = bytearray(len(self.names))
+            visited[module_id] = 1
+            found = []
+            queue = collections.deque([module_id])
+            while queue:
+                current = queue.popleft()
+                for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        found.append(neighbor)
+                        queue.append(neighbor)
+        return sorted(self.names[neighbor] for neighbor in found)
+
+
+class ModuleResolver:
+    """ Resolve imported names to modules of a project.
+
+    Parameters
+    ----------
+    module_names : iterable of str
+        Names of the modules (and packages) of the project.
+    """
+
+    def __init__(self, module_names):
+        self._module_names = frozenset(module_names)
+
+    def resolve(self, target):
+        """ Return the module of the project providing an imported name.
+
+        Parameters
+        ----------
+        target : str
+            Absolute imported name, e.g. ``package.module.name``.
+
+        Returns
+        -------
+        module_name : str or None
+            The longest prefix of the name that is a module of the project,
+            or None if there is none.
+        """
+        while target:
+            if target in self._module_names:
+                return target
+            target, _, _ = target.rpartition(".")
+        return None
+
+
+def build_graph(
+        filenames, top_level_dir=None, include_external=False, jobs=1,
+        module_names=None):
+    """ Build the import graph of the modules in the given files.
+
+    Imports are resolved to the longest matching module among the files,
+    e.g. ``from office._legal import api`` is an import of the module
+    ``office._legal.api`` if that module is in the files, or of the package
+    ``office._legal`` otherwise.
+
+    Parameters
+    ----------
+    filenames : list of str
+        Paths of the Python files of the project.
+    top_level_dir : str or None, optional
+        Top level directory to use when composing module names from file
+        paths.
+    include_external : bool, optional
+        If true, imports that do not resolve to a module of the project are
+        included in the graph, using the imported names.
+    jobs : int, optional
+        Number of worker processes for parsing the files.
+    module_names : ModuleNameResolver or None, optional
+        Resolver of the module names of the files. Default is to compose
+        them from the top level directory.
+
+    Returns
+    -------
+    graph : ModuleGraph
+    """
+    if module_names is None:
+        module_names = ModuleNameResolver(top_level_dir)
+    scan_args = [
+        (filename, module_names.module_name(filename))
+        for filename in filenames
+    ]
+    if jobs > 1 and len(scan_args) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            scanned = list(executor.map(
+                _scan_file, scan_args,
+                chunksize=max(1, len(scan_args) // (jobs * 4)),
+            ))
+    else:
+        scanned = [_scan_file(args) for args in scan_args]
+
+    names = [module_name for module_name, _ in scanned]
+    resolver = ModuleResolver(names)
+    edges = []
+    for module_name, targets in scanned:
+        for target in targets:
+            resolved = resolver.resolve(target)
+            if resolved is None:
+                if not include_external:
+                    continue
+                resolved = target
+            edges.append((module_name, resolved))
+    return ModuleGraph.from_edges(names, edges)
+
+
+def build_export_index(
+        filenames, top_level_dir=None, jobs=1, module_names=None,
+        cache=None):
+    """ Build the index of the names re-exported by the modules in the
+    given files.
+
+    Only the names re-exporting private modules matter, so the files are
+    parsed only if they may bind such names: if scanning their lines shows
+    an import of a private name, or of a name that the files parsed so far
+    re-export from a private module. The other files are scanned again
+    against the re-exports found, until no file is left to parse. With a
+    cache, the names bound by the files that have not changed are not
+    parsed again, and the imports of the files parsed are cached for
+    ``FileChecker``, so that checking them does not parse them again.
+
+    Parameters
+    ----------
+    filenames : list of str
+        Paths of the Python files of the project.
+    top_level_dir : str or None, optional
+        Top level directory to use when composing module names from file
+        paths.
+    jobs : int, optional
+        Number of worker processes for parsing the files.
+    module_names : ModuleNameResolver or None, optional
+        Resolver of the module names of the files. Default is to compose
+        them from the top level directory.
+    cache : ResultCache or None, optional
+        Cache of the names bound by the files and of their imports,
+        shared with the errors.
+
+    Returns
+    -------
+    exports : ExportIndex
+    """
+    if module_names is None:
+        module_names = ModuleNameResolver(top_level_dir)
+    scan_args = [
+        (filename, module_names.module_name(filename), cache, True)
+        for filename in filenames
+    ]
+    modules = []
+    bindings = []
+    # Arguments and imported names of the files not parsed yet.
+    pending = []
+    for args, (module_name, file_bindings, targets) in zip(
+            scan_args, _map_files(_scan_bindings, scan_args, jobs)):
+        modules.append(module_name)
+        if file_bindings is None:
+            pending.append((args[:3] + (False,), targets))
+        else:
+            bindings.extend(
+                (module_name, name, target) for name, target in file_bindings
+            )
+
+    exports = ExportIndex(modules, bindings)
+    while pending:
+        needed = []
+        remaining = []
+        for args, targets in pending:
+            if any(exports.reaches_private(target) for target in targets):
+                needed.append(args)
+            else:
+                remaining.append((args, targets))
+        if not needed:
+            break
+        for module_name, file_bindings, _ in _map_files(
+                _scan_bindings, needed, jobs):
+            bindings.extend(
+                (module_name, name, target) for name, target in file_bindings
+            )
+        pending = remaining
+        exports = ExportIndex(modules, bindings)
+    return exports
+
+
+def module_name_for_file(filename, top_level_dir=None):
+    """ Return the name of the module or package defined by a file.
+
+    Unlike ``deduce_module_name``, the ``__init__.py`` of a package is
+    named after the package.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the Python file.
+    top_level_dir : str or None, optional
+        Top level directory to use when composing module names from file
+        paths.
+
+    Returns
+    -------
+    module_name : str
+    """
+    return _package_name(deduce_module_name(filename, top_level_dir))
+
+
+def _package_name(module_name):
+    """ Return the name of a package for the module name deduced for its
+    ``__init__.py``, or the module name of other files.
+    """
+    if module_name.endswith(_INIT_SUFFIX):
+        module_name = module_name[:-len(_INIT_SUFFIX)]
+    return module_name
+
+
+def _scan_file(args):
+    """ Return the module name and the imported names of a file.
+
+    Parameters
+    ----------
+    args : tuple(str, str)
+        Path of the Python file and the module name deduced for it.
+
+    Returns
+    -------
+    module_name : str
+    targets : list of str
+        Imported names, normalized to absolute names. Empty if the file
+        cannot be read or parsed.
+    """
+    filename, deduced_name = args
+    source = None
+    try:
+        with open(filename, "rb") as file:
+            source = file.read()
+        tree = ast.parse(source)
+    except (OSError, SyntaxError, ValueError):
+        tree = None
+
+    module_name = _package_name(deduced_name)
+    if tree is None:
+        return module_name, []
+
+    # Relative imports in __init__.py are resolved against the deduced name
+    # with the "__init__" part.
+    imports = collect_imports(tree, deduced_name, source)
+    return sys.intern(module_name), [target for _, _, target in imports]
+
+
+def _map_files(function, args, jobs):
+    """ Apply a function to the arguments of each file, using a pool of
+    worker processes if there are several jobs.
+
+    Returns
+    -------
+    results : list
+        Results in the order of the arguments.
+    """
+    if jobs > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(
+                function, args,
+                chunksize=max(1, len(args) // (jobs * 4)),
+            ))
+    return [function(item) for item in args]
+
+
+def _scan_bindings(args):
+    """ Return the module name of a file and the names bound by the imports
+    at its top level, if they may re-export private names.
+
+    Parameters
+    ----------
+    args : tuple(str, str, ResultCache or None, bool)
+        Path of the Python file, the module name deduced for it, the cache
+        of the bindings and imports, and whether to skip parsing the file
+        if scanning its lines shows no import of a private name.
+
+    Returns
+    -------
+    module_name : str
+    bindings : list of tuple(str, str) or None
+        Bound name and imported name of each binding, see
+        ``collect_bindings``. Empty if the file cannot be read or parsed.
+        None if the file is not parsed.
+    targets : list of str or None
+        Names imported by the file, found by scanning its lines, if it is
+        not parsed.
+    """
+    filename, deduced_name, cache, scan = args
+    module_name = sys.intern(_package_name(deduced_name))
+    try:
+        with open(filename, "rb") as file:
+            source = file.read()
+    except OSError:
+        return module_name, [], None
+
+    key = None
+    if cache is not None:
+        key = cache.key(source, deduced_name, _BINDINGS_FINGERPRINT)
+        bindings = cache.get(key)
+        if bindings is not None:
+            return module_name, bindings, None
+
+    if scan:
+        targets = _unparsed_targets(source, deduced_name, cache)
+        if targets is not None:
+            return module_name, None, targets
+
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        bindings = []
+        tree = None
+    else:
+        # Relative imports in __init__.py are resolved against the deduced
+        # name with the "__init__" part.
+        bindings = collect_bindings(tree, deduced_name)
+    if key is not None:
+        cache.set(key, bindings)
+        if tree is not None:
+            cache.set(
+                cache.key(source, deduced_name, IMPORTS_FINGERPRINT),
+                collect_imports(tree, deduced_name, source),
+            )
+    return module_name, bindings, None
+
+
+def _unparsed_targets(source, deduced_name, cache):
+    """ Return the names imported by a file, if scanning its lines shows
+    that it imports no private name, so that it is not parsed yet.
+
+    Parameters
+    ----------
+    source : bytes
+        Source code.
+    deduced_name : str
+        Module name deduced for the file.
+    cache : ResultCache or None
+        Cache of the names found by scanning files.
+
+    Returns
+    -------
+    targets : list of str or None
+        None if the file must be parsed.
+    """
+    key = None
+    if cache is not None:
+        key = cache.key(source, deduced_name, _TARGETS_FINGERPRINT)
+        cached = cache.get(key)
+        if cached is not None:
+            return [target for target, in cached]
+
+    # Names bound by dynamic imports are not indexed.
+    targets = scan_import_statements(source, deduced_name)
+    if targets is None or any(
+            check_import(None, target) for target in targets):
+        return None
+    if key is not None:
+        # Entries are lists of tuples.
+        cache.set(key, [[target] for target in targets])
+    return targets
@@ -0,0 +1,362 @@
+""" This module supports checking the code cells of Jupyter notebooks.
+
+Notebooks are JSON documents, often large because of the outputs of their
+cells, e.g. plots encoded in base64. They are read as a stream: only the
+types and sources of the cells are decoded, and all the other values are
+skipped by scanning their bytes, so that memory use does not depend on the
+size of the outputs.
+
+The code cells are checked one at a time, as Python sources whose lines
+are the lines of the cells.
+"""
+
+import json
+import re
+
+#: Extension of the files of notebooks.
+NOTEBOOK_EXTENSION = ".ipynb"
+
+# Number of bytes read at a time.
+_CHUNK_SIZE = 65536
+
+_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+
+# Characters of a string up to its closing quote, or to the end of the
+# data read, which may end with a backslash.
+_STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+
+# Characters delimiting the strings, arrays and objects nested in a value.
+_STRUCTURE = re.compile(rb'["\[\]{}]')
+
+# Characters of numbers, true, false and null.
+_LITERAL = re.compile(rb"[^ \t\r\n,:\[\]{}\"]*")
+
+# Separators of the lines of a cell, the same as for Python files.
+_NEWLINE = re.compile(r"\r\n|\r|\n")
+
+# Start of the lines of IPython magics, shell commands and help requests,
+# which are not Python: ``%matplotlib inline``, ``!pip install``, the
+# assignments of their output such as ``files = !ls``, and ``obj?``.
+_MAGIC_LINE = re.compile(
+    r"^(\s*)(?:[%!?]|[\w.,\s()\[\]*]+=\s*[%!]|[\w.]+\?\??\s*$)"
+)
+
+
+class NotebookSource:
+    """ Python source of the code cells of a notebook.
+
+    Parameters
+    ----------
+    cells : iterable of tuple(int, str)
+        Number of each code cell, counting all the cells from 1, and its
+        source, see ``iter_code_cells``.
+
+    Attributes
+    ----------
+    cells : list of tuple(int, str)
+        Number and Python source of each code cell. IPython magics and
+        shell commands are replaced by ``pass`` statements, keeping the
+        line numbers, so that each cell can be parsed on its own.
+    """
+
+    __slots__ = ("cells",)
+
+    def __init__(self, cells):
+        self.cells = [
+            (number, "".join(line + "\n" for line in _python_lines(source)))
+            for number, source in cells
+        ]
+
+    def __repr__(self):
+        return f"NotebookSource({[number for number, _ in self.cells]!r})"
+
+
+def read_notebook(filename):
+    """ Read the code cells of a notebook.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the notebook.
+
+    Returns
+    -------
+    notebook : NotebookSource
+
+    Raises
+    ------
+    OSError
+        If the file cannot be read.
+    ValueError
+        If the file is not a notebook of nbformat 4.
+    """
+    with open(filename, "rb") as file:
+        return NotebookSource(iter_code_cells(file))
+
+
+def iter_code_cells(file, chunk_size=_CHUNK_SIZE):
+    """ Read the sources of the code cells of a notebook, skipping the
+    outputs and metadata.
+
+    Parameters
+    ----------
+    file : file object
+        Notebook opened in binary mode.
+    chunk_size : int, optional
+        Number of bytes read at a time.
+
+    Yields
+    ------
+    cell_number : int
+        Number of the cell, counting all the cells from 1.
+    source : str
+
+    Raises
+    ------
+    ValueError
+        If the file is not a notebook of nbformat 4.
+    """
+    stream = _JsonStream(file, chunk_size)
+    found = False
+    for key in stream.iter_object():
+        if key != "cells":
+            stream.skip_value()
+            continue
+        found = True
+        for cell_number, _ in enumerate(stream.iter_array(), 1):
+            source = _read_cell(stream)
+            if source is not None:
+                yield cell_number, source
+    if stream.peek():
+        raise stream.error("Extra data")
+    if not found:
+        # nbformat 3 notebooks have worksheets instead.
+        raise ValueError("Not a notebook of nbformat 4, without cells.")
+
+
+def _read_cell(stream):
+    """ Read a cell, returning its source if it is a code cell, else None.
+    """
+    cell_type = None
+    source = None
+    for key in stream.iter_object():
+        if key == "cell_type":
+            cell_type = stream.read_string()
+        elif key == "source" and cell_type in (None, "code"):
+            if stream.peek() == b"[":
+                source = "".join(
+                    stream.read_string() for _ in stream.iter_array()
+                )
+            else:
+                source = stream.read_string()
+        else:
+            stream.skip_value()
+    return source if cell_type == "code" else None
+
+
+def _python_lines(source):
+    """ Split the source of a code cell into lines of Python.
+
+    Parameters
+    ----------
+    source : str
+
+    Returns
+    -------
+    lines : list of str
+    """
+    lines = _NEWLINE.split(source)
+    if lines[-1] == "":
+        del lines[-1]
+    if lines and lines[0].lstrip().startswith("%%"):
+        # The whole cell is given to a cell magic, e.g. %%bash.
+        return [""] * len(lines)
+    return [_MAGIC_LINE.sub(r"\1pass  # ", line) for line in lines]
+
+
+class _JsonStream:
+    """ Reader of JSON values from a file, a chunk at a time.
+
+    Parameters
+    ----------
+    file : file object
+        File opened in binary mode.
+    chunk_size : int
+        Number of bytes read at a time.
+    """
+
+    def __init__(self, file, chunk_size):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._data = b""
+        self._pos = 0
+        # Number of bytes before the data kept, for the positions of
+        # errors.
+        self._offset = 0
+
+    def error(self, message):
+        """ Return the error to raise for invalid JSON at the current
+        position.
+        """
+        return ValueError(f"{message} at byte {self._offset + self._pos}.")
+
+    def peek(self):
+        """ Skip whitespace and return the next byte, empty at the end of
+        the file.
+        """
+        while True:
+            self._pos = _WHITESPACE.match(self._data, self._pos).end()
+            if self._pos < len(self._data):
+                return self._data[self._pos:self._pos + 1]
+            if not self._read():
+                return b""
+
+    def iter_object(self):
+        """ Iterate over the keys of an object. The value of each key must
+        be read or skipped before getting the next key.
+        """
+        self._expect(b"{")
+        if self.peek() == b"}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self._expect(b":")
+            yield key
+            if self._end_of_items(b"}"):
+                return
+
+    def iter_array(self):
+        """ Iterate over the items of an array, yielding None. Each item
+        must be read or skipped before getting the next one.
+        """
+        self._expect(b"[")
+        if self.peek() == b"]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            if self._end_of_items(b"]"):
+                return
+
+    def read_string(self):
+        """ Read a string value. """
+        self._expect(b'"')
+        parts = []
+        while True:
+            end = _STRING_BODY.match(self._data, self._pos).end()
+            parts.append(self._data[self._pos:end])
+            self._pos = end
+            if self._data[end:end + 1] == b'"':
+                self._pos += 1
+                return json.loads(b'"' + b"".join(parts) + b'"')
+            # At the end of the data, possibly after a backslash whose
+            # escaped character is in the next chunk.
+            if not self._read():
+                raise self.error("Unterminated string")
+
+    def skip_value(self):
+        """ Skip a value without decoding it. """
+        char = self.peek()
+        if char == b'"':
+            self._skip_string()
+        elif char in (b"[", b"{"):
+            self._skip_container()
+        else:
+            self._skip_literal()
+
+    def _read(self):
+        """ Read the next chunk, dropping the data already consumed. Return
+        false at the end of the file.
+        """
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            return False
+        self._offset += self._pos
+        self._data = self._data[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"Expected {char.decode()!r}")
+        self._pos += 1
+
+    def _end_of_items(self, closing):
+        """ Consume the separator after an item of an array or object,
+        returning true at the end of the container.
+        """
+        char = self.peek()
+        if char not in (b",", closing):
+            raise self.error(f"Expected ',' or {closing.decode()!r}")
+        self._pos += 1
+        return char == closing
+
+    def _skip_string(self):
+        """ Consume a string without decoding it.
+
+        Quotes are searched with ``bytes.find``, which is several times
+        faster than a regular expression on long strings, e.g. images.
+        """
+        self._expect(b'"')
+        search = self._pos
+        while True:
+            quote = self._data.find(b'"', search)
+            if quote < 0:
+                # Only an odd number of backslashes at the end of the data
+                # escapes the next character.
+                self._pos = len(self._data) - _count_backslashes(
+                    self._data, self._pos, len(self._data),
+                ) % 2
+                if not self._read():
+                    raise self.error("Unterminated string")
+                search = self._pos
+                continue
+            if _count_backslashes(self._data, self._pos, quote) % 2 == 0:
+                self._pos = quote + 1
+                return
+            search = quote + 1
+
+    def _skip_container(self):
+        """ Consume an array or object, without checking the items. """
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(self._data, self._pos)
+            if match is None:
+                self._pos = len(self._data)
+                if not self._read():
+                    raise self.error("Unterminated array or object")
+                continue
+            char = match.group()
+            if char == b'"':
+                self._pos = match.start()
+                self._skip_string()
+                continue
+            self._pos = match.end()
+            if char in (b"[", b"{"):
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _skip_literal(self):
+        """ Consume a number, true, false or null. """
+        length = 0
+        while True:
+            end = _LITERAL.match(self._data, self._pos).end()
+            length += end - self._pos
+            self._pos = end
+            if end < len(self._data) or not self._read():
+                break
+        if not length:
+            raise self.error("Expected a value")
+
+
+def _count_backslashes(data, start, end):
+    """ Return the number of backslashes before the end of a slice of data.
+    """
+    position = end
+    while position > start and data[position - 1] == 0x5C:
+        position -= 1
+    return end - position
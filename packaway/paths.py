@@ -0,0 +1,418 @@
+""" This module supports finding Python files and deducing their module
+names from file paths.
+"""
+
+import fnmatch
+import os
+import pathlib
+import sys
+import time
+
+# Files and directories modified less than this many nanoseconds before
+# being scanned may be modified again without their modification time
+# changing, depending on the resolution of the file system.
+_RACY_INTERVAL_NS = 2 * 10**9
+
+
+def deduce_module_name(filename, top_level_dir=None):
+    """ Return the module name for a Python file.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the Python file.
+    top_level_dir : str or None, optional
+        Directory from which module names are composed. If None, the path
+        is used as given.
+
+    Returns
+    -------
+    module_name : str
+        Dotted module name, e.g. ``package.module`` for
+        ``package/module.py``.
+    """
+    if top_level_dir is not None:
+        filename = os.path.relpath(filename, start=top_level_dir)
+    path = pathlib.PurePath(filename)
+    parts = list(path.parts)
+    parts[-1], _ = os.path.splitext(parts[-1])
+    return ".".join(parts)
+
+
+class ModuleNameResolver:
+    """ Resolver of the module names of Python files, caching the work done
+    for each directory.
+
+    By default, module names are composed from the path of each file as
+    given, or relative to the top level directory, as
+    ``deduce_module_name`` does. With ``find_package_roots``, they are
+    composed from the path relative to the root of the packages containing
+    the file instead: the longest source root containing the file, or
+    else the first parent directory without ``__init__.py``. This way the
+    files of several projects, or of several source roots of a project,
+    can be checked in one run.
+
+    The prefix of the module names of the files of a directory is found
+    once, so that resolving the name of another file of the directory
+    costs one dictionary lookup. Module names are interned.
+
+    Parameters
+    ----------
+    top_level_dir : str or None, optional
+        Directory from which module names are composed, if package roots
+        are not found.
+    find_package_roots : bool, optional
+        Whether to compose module names from the roots of the packages
+        containing the files.
+    source_roots : iterable of str, optional
+        Directories holding top level packages and modules, e.g. ``src``.
+        Given source roots imply ``find_package_roots``.
+    """
+
+    def __init__(
+            self, top_level_dir=None, find_package_roots=False,
+            source_roots=()):
+        self.top_level_dir = top_level_dir
+        self.source_roots = tuple(source_roots)
+        self.find_package_roots = find_package_roots or bool(
+            self.source_roots
+        )
+        self._roots = frozenset(
+            os.path.normcase(os.path.abspath(root))
+            for root in self.source_roots
+        )
+        # Mapping from directory, as given in file paths, to the prefix of
+        # the module names of its files.
+        self._prefixes = {}
+
+    def __repr__(self):
+        return (
+            f"ModuleNameResolver(top_level_dir={self.top_level_dir!r}, "
+            f"find_package_roots={self.find_package_roots!r}, "
+            f"source_roots={self.source_roots!r})"
+        )
+
+    def module_name(self, filename):
+        """ Return the module name for a Python file.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the Python file.
+
+        Returns
+        -------
+        module_name : str
+            Dotted module name, e.g. ``package.module`` for
+            ``package/module.py``.
+        """
+        directory, basename = os.path.split(filename)
+        prefix = self._prefixes.get(directory)
+        if prefix is None:
+            prefix = self._prefixes[directory] = self._prefix(directory)
+        return sys.intern(prefix + os.path.splitext(basename)[0])
+
+    def invalidate(self, directories):
+        """ Forget the prefixes of the module names found for directories
+        and their subdirectories, e.g. when an ``__init__.py`` appears or
+        disappears in them.
+
+        Parameters
+        ----------
+        directories : iterable of str
+            Paths of the directories, as given in file paths.
+        """
+        directories = set(directories)
+        subdirectory_prefixes = tuple(
+            os.path.join(directory, "") for directory in directories
+        )
+        for directory in list(self._prefixes):
+            if (directory in directories
+                    or directory.startswith(subdirectory_prefixes)):
+                del self._prefixes[directory]
+
+    def _prefix(self, directory):
+        """ Return the prefix of the module names of the files in a
+        directory, e.g. ``package.`` for ``src/package``.
+        """
+        if not self.find_package_roots:
+            path = directory or os.curdir
+            if self.top_level_dir is not None:
+                path = os.path.relpath(path, start=self.top_level_dir)
+            parts = list(pathlib.PurePath(path).parts)
+        else:
+            path = os.path.abspath(directory or os.curdir)
+            parts = self._parts_from_source_root(path)
+            if parts is None:
+                parts = []
+                while os.path.isfile(os.path.join(path, "__init__.py")):
+                    path, name = os.path.split(path)
+                    if not name:
+                        break
+                    parts.append(name)
+                parts.reverse()
+        return "".join(part + "." for part in parts)
+
+    def _parts_from_source_root(self, path):
+        """ Return the names of the directories from the longest source
+        root containing a directory to the directory.
+
+        Parameters
+        ----------
+        path : str
+            Absolute path of the directory.
+
+        Returns
+        -------
+        parts : list of str or None
+            None if no source root contains the directory.
+        """
+        if not self._roots:
+            return None
+        parts = []
+        while os.path.normcase(path) not in self._roots:
+            path, name = os.path.split(path)
+            if not name:
+                return None
+            parts.append(name)
+        parts.reverse()
+        return parts
+
+
+def discover_files(paths, exclude=(), extensions=(".py",)):
+    """ Find the Python files to be checked, in the same way as flake8.
+
+    Parameters
+    ----------
+    paths : iterable of str
+        Paths of files or directories. Directories are searched
+        recursively for files with the given extensions.
+    exclude : iterable of str, optional
+        UNIX-style patterns of files and directories to skip, matched
+        against either the base name or the full path.
+    extensions : tuple of str, optional
+        Extensions of the files searched in directories. Default is
+        ``.py``.
+
+    Yields
+    ------
+    filename : str
+        Paths of the files found, in a deterministic order.
+    """
+    exclude = list(exclude)
+    for path in paths:
+        if _is_excluded(path, exclude):
+            continue
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(
+                dirname for dirname in dirnames
+                if not _is_excluded(os.path.join(dirpath, dirname), exclude)
+            )
+            for name in sorted(filenames):
+                filename = os.path.join(dirpath, name)
+                if name.endswith(extensions) and not _is_excluded(
+                        filename, exclude):
+                    yield filename
+
+
+def filter_files(filenames, exclude=(), extensions=(".py",)):
+    """ Keep the Python files that are not excluded, nor inside excluded
+    directories.
+
+    Parameters
+    ----------
+    filenames : iterable of str
+        Paths of files.
+    exclude : iterable of str, optional
+        UNIX-style patterns of files and directories to skip.
+    extensions : tuple of str, optional
+        Extensions of the files kept. Default is ``.py``.
+
+    Yields
+    ------
+    filename : str
+    """
+    exclude = list(exclude)
+    for filename in filenames:
+        if filename.endswith(extensions) and not any(
+                _is_excluded(path, exclude)
+                for path in _self_and_parents(filename)):
+            yield filename
+
+
+def _self_and_parents(path):
+    """ Return a path followed by the paths of its parent directories.
+
+    Parameters
+    ----------
+    path : str
+        Relative or absolute path.
+
+    Returns
+    -------
+    paths : list of str
+        e.g. ``a/b/c.py``, ``a/b`` and ``a`` for ``a/b/c.py``.
+    """
+    path = os.path.normpath(path)
+    paths = []
+    while path not in ("", os.curdir) and path not in paths[-1:]:
+        paths.append(path)
+        path = os.path.dirname(path)
+    return paths
+
+
+class FileScanner:
+    """ Scanner for detecting changes of Python files by polling.
+
+    It finds the same files as ``discover_files``. The listing of a
+    directory is kept and only read again when the modification time of
+    the directory changes, i.e. when entries are added, removed or renamed,
+    so that a scan mostly costs one ``stat`` call per directory and file.
+
+    Parameters
+    ----------
+    paths : iterable of str
+        Paths of files or directories.
+    exclude : iterable of str, optional
+        UNIX-style patterns of files and directories to skip.
+    """
+
+    def __init__(self, paths, exclude=()):
+        self.paths = list(paths)
+        self.exclude = list(exclude)
+        # Mapping from directory to its modification time, sorted
+        # subdirectories and Python files.
+        self._listings = {}
+
+    def scan(self):
+        """ Return the signatures of the Python files found.
+
+        Returns
+        -------
+        signatures : dict(str, tuple(int, int) or None)
+            Mapping from path to the modification time (in nanoseconds)
+            and size of each file, in the order of ``discover_files``.
+            The signature is None for files modified too recently for
+            later modifications to be told apart by their signatures.
+        """
+        racy_time = int(time.time() * 10**9) - _RACY_INTERVAL_NS
+        signatures = {}
+        listings = {}
+        for path in self.paths:
+            if _is_excluded(path, self.exclude):
+                continue
+            if not os.path.isdir(path):
+                _add_signature(signatures, path, racy_time)
+                continue
+            stack = [path]
+            while stack:
+                dirpath = stack.pop()
+                listing = self._list_directory(dirpath, racy_time)
+                if listing is None:
+                    continue
+                listings[dirpath] = listing
+                _, dirnames, filenames = listing
+                for filename in filenames:
+                    _add_signature(signatures, filename, racy_time)
+                stack.extend(reversed(dirnames))
+        self._listings = listings
+        return signatures
+
+    def _list_directory(self, dirpath, racy_time):
+        """ Return the listing of a directory, reusing the previous one if
+        the directory has not changed.
+
+        Parameters
+        ----------
+        dirpath : str
+            Path of the directory.
+        racy_time : int
+            Time in nanoseconds after which modifications may not be
+            detected by the modification time.
+
+        Returns
+        -------
+        listing : tuple(int or None, list of str, list of str) or None
+            Modification time, subdirectories and Python files. None if
+            the directory cannot be read.
+        """
+        try:
+            mtime = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            return None
+        listing = self._listings.get(dirpath)
+        if listing is not None and listing[0] == mtime:
+            return listing
+
+        try:
+            with os.scandir(dirpath) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            return None
+        dirnames = []
+        filenames = []
+        for entry in entries:
+            if _is_excluded(entry.path, self.exclude):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                # Symbolic links to directories are not followed, as with
+                # os.walk.
+                if not entry.is_symlink():
+                    dirnames.append(entry.path)
+            elif entry.name.endswith(".py"):
+                filenames.append(entry.path)
+        # Listings of recently modified directories are read again.
+        if mtime >= racy_time:
+            mtime = None
+        return mtime, dirnames, filenames
+
+
+def _add_signature(signatures, filename, racy_time):
+    """ Add the signature of a file if it exists.
+
+    Parameters
+    ----------
+    signatures : dict(str, tuple(int, int) or None)
+        Signatures to be updated.
+    filename : str
+        Path of the file.
+    racy_time : int
+        Time in nanoseconds after which modifications may not be detected
+        by the modification time.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return
+    if stat.st_mtime_ns >= racy_time:
+        signatures[filename] = None
+    else:
+        signatures[filename] = (stat.st_mtime_ns, stat.st_size)
+
+
+def _is_excluded(path, exclude):
+    """ Return true if a path matches any of the exclude patterns.
+
+    Parameters
+    ----------
+    path : str
+        Path of a file or directory.
+    exclude : list of str
+        UNIX-style patterns.
+    """
+    if not exclude:
+        return False
+    basename = os.path.basename(os.path.normpath(path))
+    absolute_path = os.path.abspath(path)
+    return any(
+        fnmatch.fnmatch(basename, pattern)
+        or fnmatch.fnmatch(absolute_path, pattern)
+        for pattern in exclude
+    )
@@ -1,10 +1,15 @@
-import fnmatch
-from functools import partial
-import os
-import pathlib
+import atexit
+import sys
+import time
 
-from packaway import __version__
-from packaway.rules import regex_rule, underscore_rule
+from packaway import __version__, stats
+from packaway.cache import ResultCache, rules_fingerprint
+from packaway.config import (
+    CompiledConfig,
+    parse_contracts,
+    parse_disallowed_patterns,
+)
+from packaway.rules import engine
 
 
 class ImportChecker:
@@ -18,20 +23,24 @@ class ImportChecker:
     # Version of the plugin
     version = __version__
 
-    # Top level directory to use when composing module names from file paths.
-    # Used for handling absolute imports. Not used if _deduce_path is false.
-    _top_level_dir = None
+    # CompiledConfig of the options, compiled once in parse_options and
+    # inherited by the worker processes of flake8.
+    _config = CompiledConfig()
 
-    # Flag to switch off deducing module names from file paths.
-    _deduce_path = True
+    # Mapping from the DisallowedMatcher(s) applied to files to the
+    # fingerprint of the rules, for the keys of cached results.
+    _rules_fingerprints = {}
 
-    # List of tuple(str, str)
-    # For each tuple, the first item is the pattern for matching filename
-    # and the second item is the regular expression for matching disallowed
-    # imports after the import name is resolved into an absolute name.
-    _disallowed_patterns = ()
+    # ResultCache of the errors found in files, or None if not caching.
+    _cache = None
 
-    def __init__(self, tree, filename):
+    # Path of the JSON report of statistics, or None.
+    _stats_report = None
+
+    # Flag to print a summary of statistics, with flake8's --benchmark.
+    _stats_summary = False
+
+    def __init__(self, tree, filename, lines=None):
         """ Reimplemented Flake8 plugin initializer.
 
         Parameters
@@ -40,48 +49,103 @@ class ImportChecker:
             AST tree for analysis.
         filename : str
             Name of the Python file being checked.
+        lines : list of str, optional
+            Lines of the Python file. Required for caching the results.
         """
         self._tree = tree
         self._filename = filename
+        self._lines = lines
 
-        if self._deduce_path:
-            if self._top_level_dir is not None:
-                filename = os.path.relpath(filename, start=self._top_level_dir)
-            path = pathlib.PurePath(filename)
-            parts = list(path.parts)
-            parts[-1], _ = os.path.splitext(parts[-1])
-            self._module_name = ".".join(parts)
-        else:
-            self._module_name = None
+        with stats.timed("module_name"):
+            self._module_name = self._config.module_name(filename)
 
     @property
     def _code_to_checker(self):
-        """ Mapping from flake8 error code to callable(tree, module_name)
+        """ Mapping from flake8 error code to
+        callable(source_module, target_module) -> iterable of str
         """
-        rel_path = os.path.relpath(self._filename, os.curdir)
-        disallowed_patterns = []
-        for file_pattern, disallowed_pattern in self._disallowed_patterns:
-            if fnmatch.fnmatch(rel_path, file_pattern):
-                disallowed_patterns.append(disallowed_pattern)
-
-        return {
-            "DEP401": underscore_rule.collect_errors,
-            "DEP501": partial(
-                regex_rule.collect_errors,
-                disallowed_patterns=disallowed_patterns,
+        return engine.build_checkers(
+            disallowed_matchers=self._config.disallowed_matchers.resolve(
+                self._filename
             ),
-        }
+            contracts=self._config.contract_matrix,
+        )
 
     def run(self):
         """ Reimplemented Flake8 plugin run """
-        for code, rule in self._code_to_checker.items():
-            for error in rule(self._tree, self._module_name):
-                yield (
-                    error.lineno,
-                    error.col_offset,
-                    code + " " + error.message,
-                    type(self),
-                )
+        start = time.perf_counter()
+        if self._cache is None or self._lines is None:
+            errors = self._iter_errors()
+        else:
+            key = self._cache.key(
+                "".join(self._lines),
+                self._module_name,
+                self._rules_fingerprint(),
+            )
+            errors = self._cache.get(key)
+            if errors is None:
+                errors = self._collect_errors()
+                self._cache.set(key, errors)
+
+        for lineno, col_offset, code, message, _ in errors:
+            yield (
+                lineno,
+                col_offset,
+                code + " " + message,
+                type(self),
+            )
+
+        recorder = stats.current()
+        if recorder is not None:
+            recorder.add_file(self._filename, time.perf_counter() - start)
+
+    def _rules_fingerprint(self):
+        """ Return the fingerprint of the rules applied to the file.
+
+        Returns
+        -------
+        fingerprint : str
+        """
+        disallowed_matchers = self._config.disallowed_matchers.resolve(
+            self._filename
+        )
+        try:
+            return self._rules_fingerprints[disallowed_matchers]
+        except KeyError:
+            fingerprint = rules_fingerprint(
+                disallowed_matchers, self._config.contract_matrix,
+            )
+            self._rules_fingerprints[disallowed_matchers] = fingerprint
+            return fingerprint
+
+    def _iter_errors(self):
+        """ Iterate over the errors found in the file, as they are found.
+
+        Yields
+        ------
+        error : tuple(int, int, str, str, str)
+            Line number, column offset, error code, message and imported
+            name.
+        """
+        source = None if self._lines is None else "".join(self._lines)
+        for error in engine.iter_errors(
+                self._tree, self._module_name, self._code_to_checker,
+                source):
+            yield (
+                error.lineno, error.col_offset, error.code, error.message,
+                error.target,
+            )
+
+    def _collect_errors(self):
+        """ Return the errors found in the file.
+
+        Returns
+        -------
+        errors : list of tuple(int, int, str, str, str)
+            Line number, column offset, error code, message and imported
+            name of each error.
+        """
+        return list(self._iter_errors())
 
     @classmethod
     def add_options(cls, option_manager):
@@ -99,6 +163,29 @@ class ImportChecker:
             help="Top level directory for parsing file paths as module names.",
             parse_from_config=True,
         )
+        option_manager.add_option(
+            "--find-package-roots",
+            dest="find_package_roots",
+            action="store_true",
+            parse_from_config=True,
+            help=(
+                "Compose module names from the first parent directory "
+                "without __init__.py, instead of the top level directory."
+            ),
+        )
+        option_manager.add_option(
+            "--source-roots",
+            dest="source_roots",
+            default="",
+            parse_from_config=True,
+            comma_separated_list=True,
+            normalize_paths=True,
+            help=(
+                "Comma separated directories holding top level packages, "
+                "from which module names are composed. Implies "
+                "--find-package-roots."
+            ),
+        )
         option_manager.add_option(
             "--disallowed",
             dest="disallowed_patterns",
@@ -109,39 +196,77 @@ class ImportChecker:
                 "module names not allowed in imports."
             ),
         )
+        option_manager.add_option(
+            "--contracts",
+            dest="contracts",
+            default="",
+            parse_from_config=True,
+            help=(
+                "Layered architecture contracts between packages, one per "
+                "line: 'layers: high > middle1 | middle2 > low', "
+                "'independent: first, second' or 'allow: source -> target'."
+            ),
+        )
+        option_manager.add_option(
+            "--packaway-cache-dir",
+            dest="packaway_cache_dir",
+            default=None,
+            parse_from_config=True,
+            help=(
+                "Directory for caching the results of unchanged files. "
+                "Default is not to cache."
+            ),
+        )
+        option_manager.add_option(
+            "--packaway-stats",
+            dest="packaway_stats",
+            default=None,
+            help=(
+                "Path of a JSON report of the time spent and the work done "
+                "by each rule and phase of packaway. A summary is printed "
+                "with --benchmark."
+            ),
+        )
 
     @classmethod
     def parse_options(cls, options):
         """ Reimplemented Flake8 plugin parse_options """
-        cls._top_level_dir = options.top_level_dir
-        cls._deduce_path = not options.no_deduce_path
-        cls._disallowed_patterns = (
-            _parse_disallowed_patterns(options.disallowed_patterns)
+        cls._config = CompiledConfig(
+            top_level_dir=options.top_level_dir,
+            deduce_path=not options.no_deduce_path,
+            find_package_roots=options.find_package_roots,
+            source_roots=options.source_roots,
+            disallowed_patterns=parse_disallowed_patterns(
+                options.disallowed_patterns
+            ),
+            contracts=parse_contracts(options.contracts),
         )
+        cls._rules_fingerprints = {}
+        if options.packaway_cache_dir is None:
+            cls._cache = None
+        else:
+            cls._cache = ResultCache(options.packaway_cache_dir)
+            cls._cache.prune()
 
+        cls._stats_report = getattr(options, "packaway_stats", None)
+        cls._stats_summary = getattr(options, "benchmark", False)
+        atexit.unregister(cls._report_stats)
+        if cls._stats_report is not None or cls._stats_summary:
+            stats.enable()
+            atexit.register(cls._report_stats)
+        else:
+            stats.disable()
 
-def _parse_disallowed_patterns(disallowed_patterns):
-    """ Parse disallowed patterns from flake8 options.
-
-    Parameters
-    ----------
-    disallowed_patterns : str
-        Configuration that represents a pairing of filename pattern
-        and regular expression for disallowed import.
-        Multiple items should be separated by newlines.
-
-    Returns
-    -------
-    results : list of tuple(str, str)
-        The first item in the tuple is the pattern for matching files.
-        The second item in the tuple is the pattern for matching disallowed
-        imports.
-    """
-    results = []
-    disallowed_patterns = disallowed_patterns.replace(" ", "")
-    for rule in disallowed_patterns.splitlines():
-        if not rule:
-            continue
-        file_pattern, disallowed = rule.split(":")
-        results.append((file_pattern.strip(), disallowed.strip()))
-    return results
+    @classmethod
+    def _report_stats(cls):
+        """ Write or print the statistics collected from all processes,
+        when flake8 exits.
+        """
+        collected = stats.collect()
+        if collected is None:
+            return
+        if cls._stats_report is not None:
+            stats.write_report(cls._stats_report, collected)
+        if cls._stats_summary:
+            print("\n".join(collected.summary()), file=sys.stdout)
+        stats.disable()
@@ -1,17 +1,25 @@
 import ast
+import atexit
 import contextlib
+import json
 import os
 import tempfile
 import unittest
+from unittest import mock
 
 from flake8.options.manager import OptionManager
 
+from packaway import stats
 from packaway.plugins.flake8.import_checker import ImportChecker
 
 
 def get_results(source, filename="dummy.py", plugin_class=ImportChecker):
     tree = ast.parse(source)
-    plugin = plugin_class(tree=tree, filename=filename)
+    plugin = plugin_class(
+        tree=tree,
+        filename=filename,
+        lines=source.splitlines(keepends=True),
+    )
     return [
         f"{line}:{col} {msg}" for line, col, msg, _ in plugin.run()
     ]
@@ -112,6 +120,43 @@ class TestImportCheckPluginUnderscoreRule(unittest.TestCase):
             )
             self.assertEqual(results, [])
 
+    def test_dynamic_imports(self):
+        results = get_results(
+            source=(
+                "import importlib\n"
+                "def load():\n"
+                "    return importlib.import_module('..other._impl', "
+                "__package__)\n"
+            ),
+            filename=os.path.join("app", "plugins", "module.py"),
+        )
+        self.assertEqual(
+            results,
+            ["3:11 DEP401 Importing private name 'app.other._impl'."],
+        )
+
+    def test_source_roots(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                change_dir(tmp_dir):
+            os.makedirs(os.path.join("src", "package"))
+            filename = os.path.join("src", "package", "module.py")
+            plugin_class = parse_args(
+                ImportChecker, ["--source-roots", "src"],
+            )
+            results = get_results(
+                source="from package._name import api",
+                filename=filename,
+                plugin_class=plugin_class,
+            )
+            self.assertEqual(results, [])
+
+            results = get_results(
+                source="from src.package._name import api",
+                filename=filename,
+                plugin_class=plugin_class,
+            )
+            self.assertEqual(len(results), 1)
+
     def test_no_deduce_path(self):
         results = get_results(
             source="from package import _name",
@@ -151,3 +196,104 @@ class TestImportCheckPluginRegexRule(unittest.TestCase):
                 "Import 'package.gui.api.name' violates pattern: '.*gui.*'"
             ]
         )
+
+    def test_many_patterns_for_same_files(self):
+        results = get_results(
+            source="from package.gui.api import name",
+            filename=os.path.join("package", "module.py"),
+            plugin_class=parse_args(
+                ImportChecker,
+                [
+                    "--disallowed",
+                    "package/*:.*web.*\npackage/*:.*gui.*\nother/*:.*",
+                ]
+            )
+        )
+        self.assertEqual(
+            results,
+            [
+                "1:0 DEP501 "
+                "Import 'package.gui.api.name' violates pattern: '.*gui.*'"
+            ]
+        )
+
+
+class TestImportCheckPluginContractRule(unittest.TestCase):
+    """ Test the plugin with layered architecture contracts."""
+
+    def test_contracts(self):
+        plugin_class = parse_args(
+            ImportChecker,
+            ["--contracts", "layers: app.ui > app.domain"],
+        )
+        results = get_results(
+            source="from app.ui import views\nfrom app.domain import model",
+            filename=os.path.join("app", "domain", "service.py"),
+            plugin_class=plugin_class,
+        )
+        self.assertEqual(
+            results,
+            [
+                "1:0 DEP601 Import 'app.ui.views' from layer 'app.domain' "
+                "to higher layer 'app.ui'."
+            ]
+        )
+
+
+class TestImportCheckPluginCache(unittest.TestCase):
+    """ Test caching the results of the plugin."""
+
+    def test_cached_results(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plugin_class = parse_args(
+                ImportChecker, ["--packaway-cache-dir", tmp_dir]
+            )
+            results = get_results(
+                source="import package._name",
+                plugin_class=plugin_class,
+            )
+            with mock.patch.object(
+                    plugin_class, "_collect_errors") as collect_errors:
+                cached_results = get_results(
+                    source="import package._name",
+                    plugin_class=plugin_class,
+                )
+
+        self.assertEqual(collect_errors.call_count, 0)
+        self.assertEqual(cached_results, results)
+        self.assertEqual(
+            results,
+            ["1:0 DEP401 Importing private name 'package._name'."]
+        )
+
+
+class TestImportCheckPluginStats(unittest.TestCase):
+    """ Test reporting statistics of the plugin."""
+
+    def test_stats_report(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "stats.json")
+            plugin_class = parse_args(
+                ImportChecker, ["--packaway-stats", path],
+            )
+            self.addCleanup(atexit.unregister, plugin_class._report_stats)
+            self.addCleanup(stats.disable)
+            get_results(
+                source="import package._name",
+                plugin_class=plugin_class,
+            )
+            plugin_class._report_stats()
+
+            with open(path) as file:
+                report = json.load(file)
+
+        self.assertEqual(report["timers"]["DEP401"]["calls"], 1)
+        self.assertEqual(report["counters"]["imports"], 1)
+        self.assertEqual(
+            report["slowest_files"][0]["filename"], "dummy.py",
+        )
+        self.assertIsNone(stats.current())
+
+    def test_disabled_by_default(self):
+        parse_args(ImportChecker, [])
+        self.assertIsNone(stats.current())
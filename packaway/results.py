@@ -0,0 +1,338 @@
+""" This module supports recording the errors found in a shard of files in a
+result file, and merging the result files of all the shards.
+
+Result files are gzip-compressed lines of tab separated fields. The files
+checked are recorded in order of path, each one followed by its errors,
+so that the result files of several shards are merged in one streaming
+pass, whatever their size.
+"""
+
+import collections
+import gzip
+import heapq
+import os
+import tempfile
+import zlib
+
+# First line of result files, with the version of their layout.
+_MAGIC = "packaway-results 1\n"
+
+# Compression level of result files, favoring speed over size.
+_COMPRESS_LEVEL = 6
+
+# Kinds of the lines after the first one.
+_SHARD = "S"
+_FILE = "F"
+_ERROR = "E"
+
+# Fingerprint field of errors without fingerprint.
+_NO_FINGERPRINT = "-"
+
+# Characters escaped in fields, and their escape sequences.
+_ESCAPES = [("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r")]
+
+
+_FileResultFields = collections.namedtuple(
+    "_FileResultFields", ["filename", "key", "size", "errors"],
+)
+
+
+class FileResult(_FileResultFields):
+    """ The errors found in a file.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the file, as given for checking it.
+    key : str
+        Key of the file for assigning it to a shard, see
+        ``packaway.shard``.
+    size : int
+        Size of the file in bytes, for weighting it in later runs.
+    errors : list of tuple(str, int, int, str, str, int or None)
+        Filename, line number, column offset, error code, message and
+        fingerprint of each error, see ``FileChecker``.
+    """
+
+    __slots__ = ()
+
+
+def write_results(path, shard, files, errors):
+    """ Write a result file, atomically.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    shard : tuple(int, int)
+        Index of the shard, from 0, and number of shards.
+    files : list of tuple(str, str, int)
+        Filename, key and size of each file checked, sorted by filename.
+    errors : iterable of tuple(str, int, int, str, str, int or None)
+        Errors found in the files with their fingerprint, in the order of
+        the files.
+
+    Raises
+    ------
+    ValueError
+        If the files are not sorted, or the errors are not in the order of
+        the files.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=".results-", suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+                fileobj=raw, mode="wb",
+                compresslevel=_COMPRESS_LEVEL, mtime=0) as compressed:
+            _write_lines(compressed, shard, files, errors)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_shard(path):
+    """ Read the shard of a result file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+
+    Returns
+    -------
+    shard : tuple(int, int)
+        Index of the shard, from 0, and number of shards.
+
+    Raises
+    ------
+    OSError
+        If the file cannot be read.
+    ValueError
+        If the file is not a result file.
+    """
+    with _open(path) as file:
+        lines = _iter_lines(file, path)
+        return _parse_shard(next(lines, ""), path)
+
+
+def iter_results(path):
+    """ Iterate over the results of the files recorded in a result file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+
+    Yields
+    ------
+    result : FileResult
+        Results of each file, sorted by filename.
+
+    Raises
+    ------
+    OSError
+        If the file cannot be read.
+    ValueError
+        If the file is not a valid result file.
+    """
+    with _open(path) as file:
+        lines = _iter_lines(file, path)
+        _parse_shard(next(lines, ""), path)
+        result = None
+        for lineno, line in enumerate(lines, start=3):
+            try:
+                if line.startswith(_ERROR):
+                    if result is None:
+                        raise ValueError("Error before the first file.")
+                    result.errors.append(_parse_error(line, result.filename))
+                    continue
+                previous = result
+                result = _parse_file(line)
+                if previous is not None:
+                    if result.filename <= previous.filename:
+                        raise ValueError("Files are not sorted.")
+                    yield previous
+            except ValueError as error:
+                raise ValueError(
+                    f"Invalid line {lineno} of result file {path!r}: {error}"
+                ) from None
+        if result is not None:
+            yield result
+
+
+def merge_results(paths):
+    """ Merge the results of several result files, in one streaming pass.
+
+    Parameters
+    ----------
+    paths : list of str
+        Paths of the result files.
+
+    Yields
+    ------
+    result : FileResult
+        Results of each file, sorted by filename. Files recorded in several
+        result files are reported once, with their distinct errors.
+
+    Raises
+    ------
+    OSError
+        If a file cannot be read.
+    ValueError
+        If a file is not a valid result file.
+    """
+    merged = heapq.merge(
+        *(iter_results(path) for path in paths),
+        key=lambda result: result.filename,
+    )
+    current = None
+    # Only the errors of files recorded in several result files need
+    # sorting again.
+    repeated = False
+    for result in merged:
+        if current is not None and result.filename == current.filename:
+            current.errors.extend(result.errors)
+            repeated = True
+            continue
+        if current is not None:
+            yield _deduplicated(current) if repeated else current
+        current = result
+        repeated = False
+    if current is not None:
+        yield _deduplicated(current) if repeated else current
+
+
+def _write_lines(file, shard, files, errors):
+    """ Write the lines of a result file. See ``write_results``. """
+    index, count = shard
+    buffer = [_MAGIC, f"{_SHARD}\t{index}\t{count}\n"]
+    errors = iter(errors)
+    error = next(errors, None)
+    previous = None
+    for filename, key, size in files:
+        if previous is not None and filename <= previous:
+            raise ValueError("Files are not sorted.")
+        previous = filename
+        buffer.append(
+            f"{_FILE}\t{_escape(filename)}\t{_escape(key)}\t{size}\n"
+        )
+        while error is not None and error[0] == filename:
+            _, lineno, col_offset, code, message, fingerprint = error
+            fingerprint = (
+                _NO_FINGERPRINT if fingerprint is None
+                else format(fingerprint, "x")
+            )
+            buffer.append(
+                f"{_ERROR}\t{lineno}\t{col_offset}\t{code}\t{fingerprint}\t"
+                f"{_escape(message)}\n"
+            )
+            error = next(errors, None)
+        if len(buffer) >= 4096:
+            file.write("".join(buffer).encode("utf-8", "surrogateescape"))
+            buffer.clear()
+    if error is not None:
+        raise ValueError("Errors are not in the order of the files.")
+    file.write("".join(buffer).encode("utf-8", "surrogateescape"))
+
+
+def _open(path):
+    """ Open a result file for reading its compressed lines. """
+    return gzip.open(
+        path, "rt", encoding="utf-8", errors="surrogateescape", newline="\n",
+    )
+
+
+def _iter_lines(file, path):
+    """ Iterate over the lines of a result file, checking its first line.
+
+    Truncated and corrupted files raise ValueError rather than EOFError or
+    zlib.error.
+    """
+    try:
+        if file.readline() != _MAGIC:
+            raise ValueError(f"{path!r} is not a packaway result file.")
+        for line in file:
+            yield line[:-1] if line.endswith("\n") else line
+    except (EOFError, zlib.error) as error:
+        raise ValueError(
+            f"Result file {path!r} is truncated or corrupted: {error}"
+        ) from None
+
+
+def _parse_shard(line, path):
+    """ Parse the line of a result file giving its shard. """
+    fields = line.split("\t")
+    try:
+        if fields[0] != _SHARD:
+            raise ValueError
+        _, index, count = fields
+        index = int(index)
+        count = int(count)
+        if not 0 <= index < count:
+            raise ValueError
+    except ValueError:
+        raise ValueError(
+            f"Invalid shard in result file {path!r}."
+        ) from None
+    return index, count
+
+
+def _parse_file(line):
+    """ Parse the line starting the results of a file.
+
+    Returns
+    -------
+    result : FileResult
+        Results of the file, without errors.
+    """
+    kind, filename, key, size = line.split("\t")
+    if kind != _FILE:
+        raise ValueError(f"Unknown kind of line {kind!r}.")
+    return FileResult(_unescape(filename), _unescape(key), int(size), [])
+
+
+def _parse_error(line, filename):
+    """ Parse the line of an error of a file.
+
+    Returns
+    -------
+    error : tuple(str, int, int, str, str, int or None)
+    """
+    _, lineno, col_offset, code, fingerprint, message = line.split("\t")
+    return (
+        filename,
+        int(lineno),
+        int(col_offset),
+        code,
+        _unescape(message),
+        None if fingerprint == _NO_FINGERPRINT else int(fingerprint, 16),
+    )
+
+
+def _deduplicated(result):
+    """ Return the results of a file with its errors sorted by position and
+    without duplicates.
+    """
+    errors = sorted(set(result.errors), key=lambda error: error[1:5])
+    return result._replace(errors=errors)
+
+
+def _escape(text):
+    """ Escape the separators in a field. """
+    if "\\" in text or "\t" in text or "\n" in text or "\r" in text:
+        for character, sequence in _ESCAPES:
+            text = text.replace(character, sequence)
+    return text
+
+
+def _unescape(text):
+    """ Reverse ``_escape``. """
+    if "\\" not in text:
+        return text
+    parts = text.split("\\\\")
+    for character, sequence in _ESCAPES[1:]:
+        parts = [part.replace(sequence, character) for part in parts]
+    return "\\".join(parts)
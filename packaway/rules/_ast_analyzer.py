@@ -1,7 +1,18 @@
 
 import ast
 
-from packaway.violation import ImportRuleViolation
+# Fields of AST nodes that may hold a list of statements (or nodes holding
+# statements, e.g. exception handlers and match cases).
+_STATEMENT_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+# Statements whose bodies have their own scope, so that their imports do
+# not bind names of the module.
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+# Names of the functions importing modules named by a string, called as
+# plain names or attributes, e.g. importlib.import_module.
+_IMPORT_MODULE = "import_module"
+_DUNDER_IMPORT = "__import__"
 
 
 class ImportAnalyzer(ast.NodeVisitor):
@@ -12,38 +23,155 @@ class ImportAnalyzer(ast.NodeVisitor):
     module_name : str or None
         The module name (full path) associated with the Python source
         being parsed. None if this is unknown.
-    import_rules : list of callable(str, str) -> tuple(bool, str)
-        List of callables for validating the import.
-        First argument is the current module name.
-        Second argument is the (absolute) module name to be imported.
-        The callable should return (valid, reason) where the first value
-        is whether the import is valid, and the second value is the reason
-        if there is a violation (not used if the import is valid.)
+
+    Attributes
+    ----------
+    imports : list of tuple(int, int, str)
+        Imports found during the traversal, in the order of visit. Each
+        item is (lineno, col_offset, target) where target is the imported
+        name normalized to an absolute name where possible.
+
+    Notes
+    -----
+    Besides import statements, calls of ``importlib.import_module`` and
+    ``__import__`` with string literals are imports, e.g.
+    ``import_module("._impl", package=__package__)``. Calls with other
+    arguments cannot be resolved statically and are ignored.
     """
 
-    def __init__(self, module_name=None, import_rules=None):
+    def __init__(self, module_name=None):
         self.module_name = module_name
-        self.import_rules = [] if import_rules is None else import_rules
-        self._errors = []
+        self.imports = []
+
+    def iter_imports(self, tree, dynamic=True):
+        """ Iterate over the imports in the tree, entering expressions only
+        for finding dynamic imports.
+
+        Import statements can only appear as statements, so only the
+        statement bodies (module, function, class, if/try/with/for/while/
+        match blocks) are walked for them. This is much cheaper than
+        ``visit`` on modules with large expressions, e.g. generated code
+        and data tables. The expressions of the statements are walked in
+        the same traversal only if ``dynamic`` is true, see
+        ``may_import_dynamically``.
+
+        The imports are yielded as they are found and are not recorded in
+        ``imports``.
+
+        Parameters
+        ----------
+        tree : ast.AST
+            The AST tree to be analyzed.
+        dynamic : bool, optional
+            Whether to look for dynamic imports in expressions.
+
+        Yields
+        ------
+        import_ : tuple(int, int, str)
+            Line number, column offset and imported name, see ``imports``.
+        """
+        for node in iter_statements(tree):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                yield from self._node_imports(node)
+            elif dynamic:
+                for call in _iter_import_calls(node):
+                    yield from self._call_imports(call)
+
+    def visit_statements(self, tree, dynamic=True):
+        """ Record the imports in the tree in ``imports``. See
+        ``iter_imports``.
+
+        Parameters
+        ----------
+        tree : ast.AST
+            The AST tree to be analyzed.
+        dynamic : bool, optional
+            Whether to look for dynamic imports in expressions.
+        """
+        self.imports.extend(self.iter_imports(tree, dynamic))
+
+    def iter_bindings(self, tree):
+        """ Iterate over the names bound by the imports at the top level of
+        a module, i.e. the names the module exports.
+
+        Imports in functions and classes do not bind names of the module
+        and are skipped. Star imports are skipped, as the names they bind
+        are not known without the imported module. So are imports binding
+        a name to the top level package of the import, e.g.
+        ``import os.path``, which do not re-export anything.
+
+        Parameters
+        ----------
+        tree : ast.Module
+            The AST tree of the module.
+
+        Yields
+        ------
+        binding : tuple(str, str)
+            Name bound in the module and the (normalized) imported name it
+            is bound to.
+        """
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.asname is not None:
+                        yield alias.asname, alias.name
+            elif isinstance(node, ast.ImportFrom):
+                for alias in node.names:
+                    if alias.name == "*":
+                        continue
+                    if node.module is None:
+                        target = alias.name
+                    else:
+                        target = ".".join([node.module, alias.name])
+                    try:
+                        target = normalize_target_module(
+                            self.module_name, target, node.level,
+                        )
+                    except ValueError:
+                        continue
+                    yield alias.asname or alias.name, target
+            elif not isinstance(node, _SCOPE_NODES):
+                children = []
+                for field in _STATEMENT_FIELDS:
+                    value = getattr(node, field, None)
+                    if isinstance(value, list):
+                        children.extend(value)
+                stack.extend(reversed(children))
 
     def visit_Import(self, node):
         """ Reimplemented NodeVisitor.visit_Import """
-        for alias in node.names:
-            target = alias.name
-            for import_rule in self.import_rules:
-                is_valid, reason = import_rule(self.module_name, target)
-                if not is_valid:
-                    self._errors.append(
-                        ImportRuleViolation(
-                            lineno=node.lineno,
-                            col_offset=node.col_offset,
-                            message=reason,
-                        )
-                    )
-        self.generic_visit(node)
+        self.imports.extend(self._node_imports(node))
 
     def visit_ImportFrom(self, node):
         """ Reimplemented NodeVisitor.visit_ImportFrom """
+        self.imports.extend(self._node_imports(node))
+
+    def visit_Call(self, node):
+        """ Reimplemented NodeVisitor.visit_Call """
+        if _function_name(node) in (_IMPORT_MODULE, _DUNDER_IMPORT):
+            self.imports.extend(self._call_imports(node))
+        self.generic_visit(node)
+
+    def _node_imports(self, node):
+        """ Iterate over the names imported by an import statement.
+
+        Parameters
+        ----------
+        node : ast.Import or ast.ImportFrom
+            The import statement.
+
+        Yields
+        ------
+        import_ : tuple(int, int, str)
+            Line number, column offset and (normalized) imported name.
+        """
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield node.lineno, node.col_offset, alias.name
+            return
 
         for alias in node.names:
             if node.module is None:
@@ -51,23 +179,148 @@ class ImportAnalyzer(ast.NodeVisitor):
             else:
                 target = ".".join([node.module, alias.name])
 
-            target = _normalize_target_module(
-                self.module_name, target, node.level
-            )
-            for import_rule in self.import_rules:
-                is_valid, reason = import_rule(self.module_name, target)
-                if not is_valid:
-                    self._errors.append(
-                        ImportRuleViolation(
-                            lineno=node.lineno,
-                            col_offset=node.col_offset,
-                            message=reason,
-                        )
-                    )
-        self.generic_visit(node)
+            try:
+                target = normalize_target_module(
+                    self.module_name, target, node.level
+                )
+            except ValueError:
+                # Relative import beyond the top level package, which
+                # fails at runtime instead.
+                continue
+            yield node.lineno, node.col_offset, target
+
+    def _call_imports(self, node):
+        """ Iterate over the names imported by a call of
+        ``importlib.import_module`` or ``__import__``.
+
+        Parameters
+        ----------
+        node : ast.Call
+            The call, with either function name.
+
+        Yields
+        ------
+        import_ : tuple(int, int, str)
+            Line number, column offset and (normalized) imported name. No
+            name is yielded if the arguments are not literals.
+        """
+        if _function_name(node) == _IMPORT_MODULE:
+            targets = self._import_module_targets(node)
+        else:
+            targets = self._dunder_import_targets(node)
+        for target in targets:
+            yield node.lineno, node.col_offset, target
+
+    def _import_module_targets(self, node):
+        """ Return the names imported by a call of
+        ``importlib.import_module(name, package=None)``.
+        """
+        name = _literal(_argument(node, 0, "name"))
+        if not isinstance(name, str) or not name.strip("."):
+            return []
+        if not name.startswith("."):
+            return [name]
+
+        package_node = _argument(node, 1, "package")
+        if (isinstance(package_node, ast.Name)
+                and package_node.id == "__package__"):
+            if self.module_name is None:
+                return []
+            package = self.module_name.rpartition(".")[0]
+        else:
+            package = _literal(package_node)
+        if not isinstance(package, str) or not package:
+            return []
+
+        # Same resolution as importlib.util.resolve_name.
+        level = len(name) - len(name.lstrip("."))
+        bits = package.rsplit(".", level - 1)
+        if len(bits) < level:
+            return []
+        return [f"{bits[0]}.{name[level:]}"]
+
+    def _dunder_import_targets(self, node):
+        """ Return the names imported by a call of
+        ``__import__(name, globals, locals, fromlist, level)``.
+        """
+        name = _literal(_argument(node, 0, "name"))
+        if not isinstance(name, str) or not name:
+            return []
+        level = _literal(_argument(node, 4, "level")) or 0
+        if not isinstance(level, int) or level < 0:
+            return []
+
+        fromlist_node = _argument(node, 3, "fromlist")
+        if isinstance(fromlist_node, (ast.List, ast.Tuple)):
+            fromlist = [_literal(item) for item in fromlist_node.elts]
+            targets = [
+                f"{name}.{item}" for item in fromlist
+                if isinstance(item, str) and item != "*"
+            ]
+        else:
+            targets = []
+        if not targets:
+            targets = [name]
 
+        try:
+            return [
+                normalize_target_module(self.module_name, target, level)
+                for target in targets
+            ]
+        except ValueError:
+            return []
 
-def _normalize_target_module(source_module, target_module, level):
+
+def may_import_dynamically(source):
+    """ Return whether source code may import modules named by strings,
+    with ``importlib.import_module`` or ``__import__``.
+
+    This is a cheap test for skipping the search of dynamic imports in
+    the expressions of files that certainly have none.
+
+    Parameters
+    ----------
+    source : str or bytes
+        Source code.
+
+    Returns
+    -------
+    may_import : bool
+    """
+    # Substring tests are much faster than searching a regular expression.
+    if isinstance(source, bytes):
+        return b"import_module" in source or b"__import__" in source
+    return "import_module" in source or "__import__" in source
+
+
+def iter_statements(tree):
+    """ Iterate over the statements in the tree in source order, without
+    entering expressions.
+
+    Parameters
+    ----------
+    tree : ast.AST
+        The AST tree to walk.
+
+    Yields
+    ------
+    node : ast.AST
+        Statement nodes, and the exception handlers and match cases
+        containing statements.
+    """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        yield node
+        children = []
+        for field in _STATEMENT_FIELDS:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                children.extend(value)
+        stack.extend(reversed(children))
+
+
+def normalize_target_module(source_module, target_module, level):
     """ Normalize relative import, to absolute import if possible.
 
     Parameters
@@ -99,3 +352,80 @@ def _normalize_target_module(source_module, target_module, level):
         raise ValueError("Level is too deep.")
     target_parts = source_parts[:-level] + target_module.split(".")
     return ".".join(target_parts)
+
+
+def _iter_import_calls(statement):
+    """ Iterate over the calls of functions named like the functions
+    importing modules, in the expressions of a statement.
+
+    The statements nested in the statement are not entered, they are
+    walked by ``iter_statements``.
+
+    Parameters
+    ----------
+    statement : ast.AST
+        Statement, exception handler or match case.
+
+    Yields
+    ------
+    call : ast.Call
+    """
+    # Values are pushed in reverse, so that calls are found in source
+    # order. Fields are read directly rather than with ast.iter_fields,
+    # which is several times slower on large expressions.
+    stack = [
+        getattr(statement, field, None)
+        for field in reversed(statement._fields)
+        if field not in _STATEMENT_FIELDS
+    ]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, list):
+            stack.extend(reversed(value))
+        elif isinstance(value, ast.AST):
+            if (type(value) is ast.Call and _function_name(value) in (
+                    _IMPORT_MODULE, _DUNDER_IMPORT)):
+                yield value
+            for field in reversed(value._fields):
+                stack.append(getattr(value, field, None))
+
+
+def _function_name(node):
+    """ Return the name of the function called, e.g. ``import_module`` for
+    ``importlib.import_module(name)``, or None if it is not a name.
+    """
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def _argument(node, position, keyword):
+    """ Return the node of an argument of a call, given by position or
+    keyword, or None if it is not given.
+    """
+    if len(node.args) > position:
+        argument = node.args[position]
+        if not isinstance(argument, ast.Starred):
+            return argument
+        return None
+    for item in node.keywords:
+        if item.arg == keyword:
+            return item.value
+    return None
+
+
+def _literal(node):
+    """ Return the value of a string or number literal, or None if the
+    node is not one.
+    """
+    if isinstance(node, ast.Constant):
+        return node.value
+    # Python < 3.8 parses literals as ast.Str and ast.Num.
+    if type(node).__name__ == "Str":
+        return node.s
+    if type(node).__name__ == "Num":
+        return node.n
+    return None
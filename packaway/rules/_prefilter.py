@@ -0,0 +1,228 @@
+""" This module finds the imported names of a Python file by scanning its
+lines, for deciding that a file is clean without parsing it.
+
+The scan is conservative: every import statement of the file must be
+recognized, otherwise the scan gives up. Lines that only look like
+import statements, e.g. in strings, may add names that are not imported,
+which can only make a clean file look unclean.
+"""
+
+import codecs
+import re
+
+from packaway.rules._ast_analyzer import (
+    may_import_dynamically,
+    normalize_target_module,
+)
+
+# The import keyword. Any import statement has it on the line where the
+# statement starts, or on a continuation line.
+_IMPORT_WORD = re.compile(rb"\bimport\b")
+
+# Encoding declaration in the first two lines, see PEP 263.
+_CODING_COOKIE = re.compile(
+    rb"^[ \t\f]*#.*?coding[:=][ \t]*([-\w.]+)", re.MULTILINE,
+)
+
+# Encodings in which the ASCII characters of the source code are encoded
+# as ASCII bytes, so that the import statements can be found in bytes.
+_ASCII_COMPATIBLE_ENCODINGS = frozenset([
+    "ascii", "cp1252", "iso8859-1", "iso8859-15", "utf-8", "utf-8-sig",
+])
+
+_WS = rb"[ \t\f]"
+_NAME = rb"[A-Za-z_][A-Za-z0-9_]*"
+_DOTTED_NAME = _NAME + rb"(?:\." + _NAME + rb")*"
+_END = _WS + rb"*(?:#[^\r\n]*)?\r?$"
+
+_IMPORT_ALIAS = _DOTTED_NAME + rb"(?:" + _WS + rb"+as" + _WS + rb"+" + _NAME \
+    + rb")?"
+_FROM_ALIAS = rb"(?:" + _NAME + rb"|\*)(?:" + _WS + rb"+as" + _WS + rb"+" \
+    + _NAME + rb")?"
+_FROM_ALIASES = _FROM_ALIAS + rb"(?:" + _WS + rb"*," + _WS + rb"*" \
+    + _FROM_ALIAS + rb")*"
+
+# Statement "import a.b as c, d".
+_IMPORT_STATEMENT = re.compile(
+    _WS + rb"*import" + _WS + rb"+(?P<aliases>" + _IMPORT_ALIAS
+    + rb"(?:" + _WS + rb"*," + _WS + rb"*" + _IMPORT_ALIAS + rb")*)" + _END,
+)
+
+# Statement "from ..a.b import c as d, e", possibly with the names in
+# parentheses continued on the next lines.
+_FROM_STATEMENT = re.compile(
+    _WS + rb"*from" + _WS + rb"+(?P<dots>\.*)" + _WS
+    + rb"*(?P<module>" + _DOTTED_NAME + rb")?" + _WS + rb"+import(?:"
+    + _WS + rb"+(?P<aliases>" + _FROM_ALIASES + rb")" + _END
+    + rb"|" + _WS + rb"*\((?P<rest>[^\r\n]*\r?)$)",
+)
+
+# Line of names in parentheses, possibly closing them.
+_PARENTHESIZED_ALIASES = re.compile(
+    _WS + rb"*(?P<aliases>" + _FROM_ALIASES + rb")?" + _WS + rb"*,?"
+    + _WS + rb"*(?P<close>\))?" + _END,
+)
+
+# Separator of aliases.
+_COMMA = re.compile(_WS + rb"*," + _WS + rb"*")
+
+
+def scan_imports(source, module_name=None, dynamic=True):
+    """ Return the names imported by a Python file, if they can be found
+    without parsing it.
+
+    Parameters
+    ----------
+    source : str or bytes
+        Source code.
+    module_name : str or None, optional
+        Module name of the file, for normalizing relative imports as
+        ``ImportAnalyzer`` does.
+    dynamic : bool, optional
+        Whether dynamic imports are imports. If false, the names imported
+        with ``importlib.import_module`` or ``__import__`` are not found,
+        as when only the import statements matter.
+
+    Returns
+    -------
+    targets : list of str or None
+        Imported names, including the names of all the import statements
+        of the file and possibly more. None if the file must be parsed to
+        find them, e.g. for imports after a semicolon or continued with a
+        backslash, or for dynamic imports with ``importlib.import_module``
+        or ``__import__`` if ``dynamic`` is true.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8", "surrogatepass")
+    elif not _is_ascii_compatible(source):
+        return None
+    if dynamic and may_import_dynamically(source):
+        return None
+
+    targets = []
+    # Position after the last line of the last statement scanned.
+    position = 0
+    for match in _IMPORT_WORD.finditer(source):
+        if match.start() < position:
+            continue
+        line_start = source.rfind(b"\n", 0, match.start()) + 1
+        if _is_continued(source, line_start):
+            return None
+        position = _scan_statement(source, line_start, module_name, targets)
+        if position is None:
+            return None
+    return targets
+
+
+def _scan_statement(source, start, module_name, targets):
+    """ Scan the import statement starting a line.
+
+    Parameters
+    ----------
+    source : bytes
+        Source code.
+    start : int
+        Position of the line in the source code.
+    module_name : str or None
+        Module name of the file.
+    targets : list of str
+        Imported names, extended with the names of the statement.
+
+    Returns
+    -------
+    position : int or None
+        Position after the last line of the statement. None if the line
+        does not start a recognized import statement, nor is a comment.
+    """
+    stop = _line_end(source, start)
+    line = source[start:stop]
+    if line.lstrip(b" \t\f").startswith(b"#"):
+        # The keyword is in a comment, or in a string if the line continues
+        # one. A quote may end that string and be followed by code.
+        if b"'" in line or b'"' in line:
+            return None
+        return stop
+
+    match = _IMPORT_STATEMENT.match(line)
+    if match is not None:
+        for alias in _COMMA.split(match.group("aliases")):
+            targets.append(_decode(alias.split()[0]))
+        return stop
+
+    match = _FROM_STATEMENT.match(line)
+    if match is None:
+        return None
+    level = len(match.group("dots"))
+    module = match.group("module")
+    module = None if module is None else _decode(module)
+
+    names = []
+    if match.group("aliases") is not None:
+        names.append(match.group("aliases"))
+    else:
+        rest = match.group("rest")
+        while True:
+            match = _PARENTHESIZED_ALIASES.match(rest)
+            if match is None:
+                return None
+            if match.group("aliases") is not None:
+                names.append(match.group("aliases"))
+            if match.group("close") is not None:
+                break
+            if stop >= len(source):
+                return None
+            start = stop
+            stop = _line_end(source, start)
+            rest = source[start:stop]
+
+    for aliases in names:
+        for alias in _COMMA.split(aliases):
+            name = _decode(alias.split()[0])
+            target = name if module is None else f"{module}.{name}"
+            try:
+                targets.append(
+                    normalize_target_module(module_name, target, level)
+                )
+            except ValueError:
+                return None
+    return stop
+
+
+def _line_end(source, start):
+    """ Return the position after the line starting at a position, and its
+    line feed.
+    """
+    stop = source.find(b"\n", start)
+    return len(source) if stop == -1 else stop + 1
+
+
+def _is_continued(source, line_start):
+    """ Return whether the line starting at a position may continue the
+    previous line with a backslash.
+    """
+    if line_start == 0:
+        return False
+    previous = source[source.rfind(b"\n", 0, line_start - 1) + 1:line_start]
+    return previous.rstrip(b"\r\n").endswith(b"\\")
+
+
+def _is_ascii_compatible(source):
+    """ Return whether the encoding declared by the source code encodes
+    ASCII characters as ASCII bytes.
+    """
+    first = source.find(b"\n")
+    second = -1 if first == -1 else source.find(b"\n", first + 1)
+    head = source if second == -1 else source[:second]
+    match = _CODING_COOKIE.search(head)
+    if match is None:
+        return True
+    try:
+        name = codecs.lookup(match.group(1).decode("ascii")).name
+    except LookupError:
+        return False
+    return name in _ASCII_COMPATIBLE_ENCODINGS
+
+
+def _decode(name):
+    """ Decode an identifier matched in the source code. """
+    return name.decode("ascii")
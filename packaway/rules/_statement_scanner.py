@@ -0,0 +1,462 @@
+""" This module finds the import statements of a Python file without
+parsing it, reading it a chunk at a time.
+
+Only the lines that may start or end a triple-quoted string, continue a
+string with a backslash, or contain the ``import`` keyword, are looked at:
+they are found by searching the chunks, and their strings and comments are
+skipped with a regular expression. The lines of the statements with the
+``import`` keyword outside strings and comments are tokenized. This keeps
+the time and memory spent on large generated modules small, compared with
+building their AST.
+
+Unlike ``_prefilter``, the scan never gives up: it is the fallback for the
+files too large to be parsed. Dynamic imports are not found. Otherwise the
+imports of valid Python files are the same as in their AST, but the
+imports after a syntax error, e.g. an unterminated string, may be lost.
+"""
+
+import re
+import time
+import tokenize
+
+from packaway.rules._ast_analyzer import normalize_target_module
+
+# Number of bytes read at a time, extended to the end of a line.
+_CHUNK_SIZE = 1 << 20
+
+# Parts of the lines which may contain an import statement, start or end a
+# triple-quoted string, or continue a single-quoted string on the next line
+# with a backslash. The file is searched for each of them.
+_CANDIDATES = (b"import", b"'''", b'"""', b"\\\n", b"\\\r\n")
+
+# Delimiters of strings and comments, escaped characters, and the import
+# keyword, in the order they appear in a line.
+_LEXEME = re.compile(
+    rb"""\\.|'''|\"\"\"|['"#]|\bimport\b""", re.DOTALL,
+)
+
+# Tokens without meaning for the import statements.
+_SKIPPED_TOKENS = frozenset([
+    tokenize.COMMENT, tokenize.NL, tokenize.INDENT, tokenize.DEDENT,
+])
+
+
+def scan_import_lines(file, module_name=None, deadline=None):
+    """ Find the import statements of a Python file, reading it a chunk at
+    a time.
+
+    Parameters
+    ----------
+    file : file object
+        Python file opened in binary mode.
+    module_name : str or None, optional
+        Module name of the file, for normalizing relative imports as
+        ``ImportAnalyzer`` does.
+    deadline : float or None, optional
+        Value of ``time.perf_counter()`` after which the scan stops.
+        Default is to scan the whole file.
+
+    Returns
+    -------
+    imports : list of tuple(int, int, str)
+        Line number, column offset and imported name of each import, as
+        ``collect_imports`` finds them for the import statements.
+    lines : dict(int, str)
+        The line of each import, for reading its noqa comment.
+    stopped_at : int or None
+        Number of the line where the scan stopped at the deadline, None if
+        the whole file is scanned.
+
+    Raises
+    ------
+    SyntaxError
+        If the encoding declaration of the file is invalid.
+    """
+    encoding, first_lines = tokenize.detect_encoding(file.readline)
+    buffer = _Buffer(file, b"".join(first_lines))
+    imports = []
+    lines = {}
+    # Quote of the string continued on the current line, if any.
+    quote = None
+    while True:
+        if deadline is not None and time.perf_counter() > deadline:
+            return imports, lines, buffer.lineno
+        line = buffer.next_line(quote)
+        if not line:
+            return imports, lines, None
+        quote, has_import, code_start = _scan_line(line, quote)
+        if not has_import:
+            buffer.readline()
+            continue
+        statement_lines = buffer.continued_lines()
+        first_lineno = buffer.lineno - len(statement_lines)
+        buffer.readline()
+        if code_start:
+            # The line starts in a string, blanked for the tokenizer.
+            line = b" " * code_start + line[code_start:]
+        # The lines of the statement are read up to its end, including any
+        # string it starts.
+        statement_lines.append(line)
+        _scan_statement(
+            buffer, statement_lines, first_lineno, encoding, module_name,
+            imports, lines,
+        )
+        quote = None
+
+
+class _Buffer:
+    """ Lines of a file, read a chunk at a time so that the lines without
+    import statements are skipped without iterating over them.
+
+    Parameters
+    ----------
+    file : file object
+        File opened in binary mode.
+    data : bytes
+        Lines already read from the file.
+
+    Attributes
+    ----------
+    lineno : int
+        Number of the current line.
+    """
+
+    def __init__(self, file, data):
+        self._file = file
+        self._data = data
+        # Position of the current line.
+        self._pos = 0
+        self.lineno = 1
+        # Position of the next occurrence of each candidate, -1 if it does
+        # not occur in the rest of the data, None if not searched yet.
+        self._next = [None] * len(_CANDIDATES)
+
+    def next_line(self, quote):
+        """ Move to the next line which may be of interest, and return it.
+
+        Parameters
+        ----------
+        quote : bytes or None
+            Quote of the string continued on the current line, if any. The
+            next line closing the string is then returned.
+
+        Returns
+        -------
+        line : bytes
+            Empty at the end of the file.
+        """
+        while True:
+            if quote is None:
+                found = self._find_candidate()
+            else:
+                found = self._data.find(quote, self._pos)
+            if found >= 0:
+                break
+            if not self._read():
+                return b""
+        start = self._data.rfind(b"\n", self._pos, found) + 1
+        if start > self._pos:
+            self.lineno += self._data.count(b"\n", self._pos, start)
+            self._pos = start
+        return self._data[self._pos:self._line_end(self._pos)]
+
+    def readline(self):
+        """ Return the current line and move to the next one, empty at the
+        end of the file.
+        """
+        if self._pos >= len(self._data) and not self._read():
+            return b""
+        end = self._line_end(self._pos)
+        line = self._data[self._pos:end]
+        self._pos = end
+        self.lineno += 1
+        return line
+
+    def continued_lines(self):
+        """ Return the lines before the current line continued by a
+        backslash, which may start its statement.
+        """
+        start = _continued_start(self._data, self._pos)
+        return self._data[start:self._pos].splitlines(keepends=True)
+
+    def _find_candidate(self):
+        """ Return the position of the next candidate, -1 if there is none
+        in the rest of the data.
+        """
+        found = -1
+        for index, candidate in enumerate(_CANDIDATES):
+            position = self._next[index]
+            if position is None or 0 <= position < self._pos:
+                position = self._data.find(candidate, self._pos)
+                self._next[index] = position
+            if position >= 0 and (found < 0 or position < found):
+                found = position
+        return found
+
+    def _read(self):
+        """ Move to the end of the data and read the next chunk, keeping the
+        last lines if they are continued by a backslash. Return false at
+        the end of the file.
+        """
+        chunk = self._file.read(_CHUNK_SIZE)
+        if not chunk:
+            return False
+        if not chunk.endswith(b"\n"):
+            chunk += self._file.readline()
+        end = len(self._data)
+        self.lineno += self._data.count(b"\n", self._pos, end)
+        keep = _continued_start(self._data, end)
+        self._data = self._data[keep:] + chunk
+        self._pos = end - keep
+        self._next = [None] * len(_CANDIDATES)
+        return True
+
+    def _line_end(self, start):
+        """ Return the position after the line starting at a position. """
+        end = self._data.find(b"\n", start)
+        return len(self._data) if end < 0 else end + 1
+
+
+def _continued_start(data, start):
+    """ Return the position of the first of the lines before a position
+    continued by a backslash.
+    """
+    while start > 0:
+        previous = data.rfind(b"\n", 0, start - 1) + 1
+        if not _ends_with_backslash(data[previous:start]):
+            break
+        start = previous
+    return start
+
+
+def _scan_line(line, quote):
+    """ Skip the strings and comments of a line.
+
+    Parameters
+    ----------
+    line : bytes
+    quote : bytes or None
+        Quote of the string continued from the previous line, if any.
+
+    Returns
+    -------
+    quote : bytes or None
+        Quote of the string continued on the next line, if any.
+    has_import : bool
+        Whether the import keyword is found outside strings and comments.
+    code_start : int
+        Position after the end of the string continued from the previous
+        line, 0 if there is none.
+    """
+    has_import = False
+    code_start = 0
+    continued_quote = quote
+    for match in _LEXEME.finditer(line):
+        lexeme = match.group()
+        if quote is None:
+            if lexeme == b"#":
+                break
+            if lexeme[:1] in (b"'", b'"'):
+                quote = lexeme
+            elif lexeme == b"import":
+                has_import = True
+            continue
+        if lexeme == quote or (len(quote) == 1 and lexeme == quote * 3):
+            # In the second case, the quote closing the string is followed
+            # by an empty string.
+            quote = None
+            if continued_quote is not None:
+                code_start = match.end()
+                continued_quote = None
+    if quote is not None and len(quote) == 1 and not _ends_with_backslash(
+            line):
+        # Unterminated string, which is a syntax error.
+        quote = None
+    return quote, has_import, code_start
+
+
+def _scan_statement(buffer, first_lines, first_lineno, encoding,
+                    module_name, imports, lines):
+    """ Tokenize the logical line of an import statement, reading the
+    lines it continues on, and add its imports.
+
+    Parameters
+    ----------
+    buffer : _Buffer
+        Buffer of the next lines of the file.
+    first_lines : list of bytes
+        Lines of the statement already read.
+    first_lineno : int
+        Number of the first of these lines.
+    encoding : str
+        Encoding of the file.
+    module_name : str or None
+        Module name of the file.
+    imports : list of tuple(int, int, str)
+        Imports, extended with the imports of the statement.
+    lines : dict(int, str)
+        Lines of the imports, updated for the imports of the statement.
+    """
+    pending = list(first_lines)
+    # Lines given to the tokenizer, by row.
+    read = []
+
+    def readline():
+        line = pending.pop(0) if pending else buffer.readline()
+        read.append(line.decode(encoding, "replace"))
+        return read[-1]
+
+    tokens = []
+    try:
+        for token in tokenize.generate_tokens(readline):
+            if token.type in (tokenize.NEWLINE, tokenize.ENDMARKER):
+                break
+            if token.type not in _SKIPPED_TOKENS:
+                tokens.append(token)
+    except (tokenize.TokenError, SyntaxError):
+        # e.g. the end of the file inside parentheses.
+        pass
+
+    for token, target in _iter_statement_imports(tokens, module_name):
+        row, col = token.start
+        line = read[row - 1].rstrip("\r\n")
+        lineno = first_lineno + row - 1
+        # Column offsets are counted in bytes, as in the AST.
+        imports.append((lineno, len(line[:col].encode("utf-8")), target))
+        lines[lineno] = line
+
+
+def _iter_statement_imports(tokens, module_name):
+    """ Iterate over the names imported by the import statements of the
+    tokens of a logical line.
+
+    Parameters
+    ----------
+    tokens : list of tokenize.TokenInfo
+        Tokens, without comments and non-logical newlines.
+    module_name : str or None
+        Module name of the file.
+
+    Yields
+    ------
+    token : tokenize.TokenInfo
+        First token of the statement.
+    target : str
+        Imported name.
+    """
+    index = 0
+    depth = 0
+    # Whether the token starts a statement, e.g. after a semicolon or
+    # after the colon of "if condition: import module".
+    is_start = True
+    while index < len(tokens):
+        token = tokens[index]
+        if is_start and token.type == tokenize.NAME:
+            if token.string == "import":
+                index = yield from _import_names(tokens, index)
+                continue
+            if token.string == "from":
+                index = yield from _from_names(tokens, index, module_name)
+                continue
+        is_start = False
+        if token.type == tokenize.OP:
+            if token.string in "([{":
+                depth += 1
+            elif token.string in ")]}":
+                depth -= 1
+            elif token.string == ";" or (token.string == ":" and depth <= 0):
+                is_start = True
+        index += 1
+
+
+def _import_names(tokens, index):
+    """ Yield the names of the statement "import a.b as c, d" starting at a
+    token, and return the index of the token after it.
+    """
+    statement = tokens[index]
+    index += 1
+    while True:
+        name, index = _dotted_name(tokens, index)
+        if not name:
+            return index
+        yield statement, name
+        index = _skip_alias(tokens, index)
+        if not _is_op(tokens, index, ","):
+            return index
+        index += 1
+
+
+def _from_names(tokens, index, module_name):
+    """ Yield the names of the statement "from ..a import b as c, d"
+    starting at a token, and return the index of the token after it.
+    """
+    statement = tokens[index]
+    index += 1
+    level = 0
+    while index < len(tokens) and tokens[index].string in (".", "..."):
+        level += len(tokens[index].string)
+        index += 1
+    module, index = _dotted_name(tokens, index)
+    if not (index < len(tokens) and tokens[index].string == "import"):
+        return index
+    index += 1
+    parenthesized = _is_op(tokens, index, "(")
+    if parenthesized:
+        index += 1
+    while index < len(tokens):
+        token = tokens[index]
+        if token.type == tokenize.NAME or token.string == "*":
+            index = _skip_alias(tokens, index + 1)
+            target = token.string if not module else (
+                f"{module}.{token.string}"
+            )
+            try:
+                yield statement, normalize_target_module(
+                    module_name, target, level,
+                )
+            except ValueError:
+                pass
+        if not _is_op(tokens, index, ","):
+            break
+        index += 1
+    if parenthesized and _is_op(tokens, index, ")"):
+        index += 1
+    return index
+
+
+def _dotted_name(tokens, index):
+    """ Return the dotted name starting at a token, empty if there is none,
+    and the index of the token after it.
+    """
+    parts = []
+    while (index < len(tokens) and tokens[index].type == tokenize.NAME
+            and tokens[index].string != "import"):
+        parts.append(tokens[index].string)
+        index += 1
+        if not _is_op(tokens, index, "."):
+            break
+        index += 1
+    return ".".join(parts), index
+
+
+def _skip_alias(tokens, index):
+    """ Return the index of the token after "as name", if it starts at a
+    token.
+    """
+    if index < len(tokens) and tokens[index].string == "as":
+        return index + 2
+    return index
+
+
+def _is_op(tokens, index, string):
+    """ Return whether the token at an index is the given operator. """
+    return (
+        index < len(tokens)
+        and tokens[index].type == tokenize.OP
+        and tokens[index].string == string
+    )
+
+
+def _ends_with_backslash(line):
+    """ Return whether a line is continued by a backslash. """
+    return line.rstrip(b"\r\n").endswith(b"\\")
@@ -0,0 +1,290 @@
+""" This module supports layered architecture contracts between packages.
+"""
+from array import array
+
+#: Error code reported for violations of this rule.
+CODE = "DEP601"
+
+#: Kind of contract ordering layers of packages, from the highest to the
+#: lowest. Lower layers may not import higher layers, and the packages of
+#: a layer may not import each other.
+LAYERS = "layers"
+
+#: Kind of contract listing packages that may not import each other.
+INDEPENDENT = "independent"
+
+#: Kind of contract allowing the imports from a package to another one,
+#: even if other contracts between them or their parent packages forbid
+#: them.
+ALLOW = "allow"
+
+
+class ContractMatrix:
+    """ Contracts compiled into a matrix of the imports allowed between
+    packages.
+
+    Each package named by the contracts is given an ID. A module belongs
+    to the package with the longest name that is a prefix of its name,
+    found in a trie of name parts. Whether a package may import another one
+    is then looked up in a matrix indexed by their IDs, which is filled
+    once for all the pairs of packages.
+
+    Parameters
+    ----------
+    contracts : iterable of tuple(str, tuple)
+        Kind and packages of each contract:
+
+        - (``LAYERS``, layers): layers is a tuple of layers from the
+          highest to the lowest, each one a tuple of package names.
+        - (``INDEPENDENT``, packages): packages is a tuple of package
+          names.
+        - (``ALLOW``, (source, target)): imports from the package source
+          to the package target are allowed.
+
+    Raises
+    ------
+    ValueError
+        If the kind of a contract is unknown.
+    """
+
+    def __init__(self, contracts):
+        self.contracts = tuple(contracts)
+
+        # Mapping from (source package, target package) to the template of
+        # the reason, for the pairs forbidden by the contracts. The first
+        # contract forbidding a pair gives the reason.
+        forbidden = {}
+        # Pairs allowed by the order of layers, and explicitly.
+        permitted = set()
+        allowed = set()
+        names = set()
+        for kind, packages in self.contracts:
+            if kind == LAYERS:
+                for index, layer in enumerate(packages):
+                    names.update(layer)
+                    _forbid_between(forbidden, layer)
+                    for lower_layer in packages[index + 1:]:
+                        for source in lower_layer:
+                            for target in layer:
+                                forbidden.setdefault(
+                                    (source, target),
+                                    f"Import {{!r}} from layer {source!r} "
+                                    f"to higher layer {target!r}.",
+                                )
+                                permitted.add((target, source))
+            elif kind == INDEPENDENT:
+                names.update(packages)
+                _forbid_between(forbidden, packages)
+            elif kind == ALLOW:
+                names.update(packages)
+                allowed.add(tuple(packages))
+            else:
+                raise ValueError(f"Unknown kind of contract: {kind!r}")
+
+        self._names = sorted(names)
+        self._n_packages = len(self._names)
+
+        # Trie of name parts. Each node maps a part to a list of the ID of
+        # the package named by the parts so far (or None) and the children
+        # of the node.
+        self._trie = {}
+        for package_id, name in enumerate(self._names):
+            children = self._trie
+            for part in name.split("."):
+                node = children.setdefault(part, [None, {}])
+                children = node[1]
+            node[0] = package_id
+
+        # Templates of the reasons, indexed by the values of the matrix. The
+        # first value means that the import is allowed.
+        self._reasons = [None]
+        reason_indices = {}
+        self._matrix = array("I", [0]) * self._n_packages ** 2
+        ancestors = [self._ancestors(name) for name in self._names]
+        for source_id, source_ancestors in enumerate(ancestors):
+            for target_id, target_ancestors in enumerate(ancestors):
+                if source_id == target_id:
+                    continue
+                reason = _decide(
+                    source_ancestors, target_ancestors,
+                    forbidden, permitted, allowed,
+                )
+                if reason is None:
+                    continue
+                index = reason_indices.get(reason)
+                if index is None:
+                    index = reason_indices[reason] = len(self._reasons)
+                    self._reasons.append(reason)
+                self._matrix[source_id * self._n_packages + target_id] = (
+                    index
+                )
+        # Narrowed to the smallest items holding the indices, for the memory
+        # and the pickles of compiled configurations.
+        for typecode in ("B", "H"):
+            if len(self._reasons) <= 1 << (8 * array(typecode).itemsize):
+                self._matrix = array(typecode, self._matrix)
+                break
+
+    def __repr__(self):
+        return f"ContractMatrix({list(self.contracts)!r})"
+
+    def __bool__(self):
+        return bool(self.contracts)
+
+    def package_id(self, module_name):
+        """ Return the ID of the package a module belongs to.
+
+        Parameters
+        ----------
+        module_name : str
+            Absolute module name, or any name within a module.
+
+        Returns
+        -------
+        package_id : int or None
+            ID of the package named by the contracts with the longest name
+            that is a prefix of the module name. None if the module does
+            not belong to any of them.
+        """
+        package_id = None
+        children = self._trie
+        for part in module_name.split("."):
+            node = children.get(part)
+            if node is None:
+                break
+            if node[0] is not None:
+                package_id = node[0]
+            children = node[1]
+        return package_id
+
+    def check(self, source_module, target_module):
+        """ Return the reasons why an import violates the contracts.
+
+        Parameters
+        ----------
+        source_module : str or None
+            Name of the module where the import is written. Imports from
+            unknown modules are not checked.
+        target_module : str
+            Name of the module being imported, as an absolute name.
+
+        Returns
+        -------
+        reasons : tuple of str
+            Empty if the import is valid.
+        """
+        if source_module is None:
+            return ()
+        source_id = self.package_id(source_module)
+        if source_id is None:
+            return ()
+        target_id = self.package_id(target_module)
+        if target_id is None:
+            return ()
+        index = self._matrix[source_id * self._n_packages + target_id]
+        if index == 0:
+            return ()
+        return (self._reasons[index].format(target_module),)
+
+    def _ancestors(self, name):
+        """ Return the names of the packages named by the contracts that
+        contain a package (including itself), the nearest first.
+
+        Parameters
+        ----------
+        name : str
+            Name of a package named by the contracts.
+
+        Returns
+        -------
+        names : list of str
+        """
+        parts = name.split(".")
+        names = []
+        children = self._trie
+        for index, part in enumerate(parts):
+            node = children[part]
+            if node[0] is not None:
+                names.append(".".join(parts[:index + 1]))
+            children = node[1]
+        names.reverse()
+        return names
+
+
+def build_checker(contracts=None, **options):
+    """ Return the import checker for this rule.
+
+    Parameters
+    ----------
+    contracts : ContractMatrix or None, optional
+        Compiled contracts. If None or empty, the rule is disabled.
+    **options
+        Other rule options, ignored.
+
+    Returns
+    -------
+    checker : callable(str, str) -> iterable of str, or None
+    """
+    if not contracts:
+        return None
+    return contracts.check
+
+
+def _forbid_between(forbidden, packages):
+    """ Forbid the imports between packages.
+
+    Parameters
+    ----------
+    forbidden : dict(tuple(str, str), str)
+        Templates of the reasons of the forbidden pairs, updated in place.
+    packages : tuple of str
+        Names of packages that may not import each other.
+    """
+    for source in packages:
+        for target in packages:
+            if source != target:
+                forbidden.setdefault(
+                    (source, target),
+                    f"Import {{!r}} between independent packages "
+                    f"{source!r} and {target!r}.",
+                )
+
+
+def _decide(
+        source_ancestors, target_ancestors, forbidden, permitted, allowed):
+    """ Decide whether a package may import another one.
+
+    The pairs of packages containing them are considered from the most
+    specific one, and the first pair the contracts decide for is used.
+    This way, contracts between subpackages take precedence over
+    contracts between their parent packages.
+
+    Parameters
+    ----------
+    source_ancestors, target_ancestors : list of str
+        Names of the packages named by the contracts containing the
+        importing and imported packages, the nearest first.
+    forbidden : dict(tuple(str, str), str)
+        Templates of the reasons of the forbidden pairs.
+    permitted : set of tuple(str, str)
+        Pairs allowed by the order of layers.
+    allowed : set of tuple(str, str)
+        Pairs allowed explicitly, taking precedence over the forbidden
+        ones.
+
+    Returns
+    -------
+    reason : str or None
+        Template of the reason if the import is forbidden.
+    """
+    for source in source_ancestors:
+        for target in target_ancestors:
+            pair = (source, target)
+            if pair in allowed:
+                return None
+            reason = forbidden.get(pair)
+            if reason is not None:
+                return reason
+            if pair in permitted:
+                return None
+    return None
@@ -0,0 +1,115 @@
+""" This module supports finding import cycles across packages in the import
+graph of a project.
+
+Unlike the other rules, this rule applies to a whole project at once, so
+it is not registered in ``packaway.rules.engine``.
+"""
+
+#: Error code reported for violations of this rule.
+CODE = "DEP701"
+
+
+def find_cycles(graph, across_packages=True):
+    """ Find the import cycles of a project.
+
+    A cycle is across packages if it contains an import between modules
+    of two packages neither of which contains the other, e.g. between
+    ``shop.orders`` and ``shop.billing.invoices``. Cycles between the
+    modules of a package, or between a package and its subpackages, are
+    common and not reported by default.
+
+    Parameters
+    ----------
+    graph : ModuleGraph
+        Import graph of the project.
+    across_packages : bool, optional
+        If false, report all the cycles.
+
+    Returns
+    -------
+    cycles : list of tuple(list of str, list of str)
+        Sorted module names of each strongly connected component with a
+        cycle, and a witness cycle: a shortest cycle through an import
+        across packages, or through any import of the component if
+        ``across_packages`` is false. Among the shortest cycles, the
+        witness is the first one in the order of the module names.
+    """
+    packages = set()
+    for name in graph.names:
+        parts = name.split(".")
+        for index in range(1, len(parts)):
+            packages.add(".".join(parts[:index]))
+
+    cycles = []
+    for component in graph.components():
+        members = set(component)
+        witness = None
+        for source in component:
+            for target in graph.dependencies(source):
+                if target not in members:
+                    continue
+                if across_packages and not _is_across_packages(
+                        _package_of(source, packages),
+                        _package_of(target, packages)):
+                    continue
+                cycle = graph.shortest_cycle(source, target)
+                if witness is None or (len(cycle), cycle) < (
+                        len(witness), witness):
+                    witness = cycle
+        if witness is not None:
+            cycles.append((component, witness))
+    return cycles
+
+
+def cycle_message(component, cycle):
+    """ Return the message reporting an import cycle.
+
+    Parameters
+    ----------
+    component : list of str
+        Module names of the strongly connected component.
+    cycle : list of str
+        Module names along the witness cycle.
+
+    Returns
+    -------
+    message : str
+    """
+    return (
+        f"Import cycle between {len(component)} modules: "
+        f"{' -> '.join(cycle)}"
+    )
+
+
+def _package_of(name, packages):
+    """ Return the name of the package a module belongs to.
+
+    Parameters
+    ----------
+    name : str
+        Module name.
+    packages : set of str
+        Names of the packages of the project, i.e. the names with
+        submodules.
+
+    Returns
+    -------
+    package : str
+        The name itself for packages and top level modules, otherwise the
+        name of the parent package.
+    """
+    if name in packages or "." not in name:
+        return name
+    return name.rpartition(".")[0]
+
+
+def _is_across_packages(first, second):
+    """ Return whether neither of two packages contains the other. """
+    return not (
+        _contains(first, second) or _contains(second, first)
+    )
+
+
+def _contains(package, name):
+    """ Return whether a name is within a package or is the package. """
+    return name == package or name.startswith(package + ".")
@@ -0,0 +1,371 @@
+""" This module evaluates all the registered import rules over a single
+traversal of the AST.
+"""
+
+from packaway import stats
+from packaway.rules import (
+    contract_rule,
+    reexport_rule,
+    regex_rule,
+    underscore_rule,
+)
+from packaway.rules._ast_analyzer import (
+    ImportAnalyzer,
+    may_import_dynamically,
+)
+from packaway.rules._prefilter import scan_imports
+from packaway.rules._statement_scanner import scan_import_lines
+from packaway.violation import ImportRuleViolation
+
+# Mapping from error code to callable(**options) -> checker or None.
+# A checker is a callable(str, str) -> iterable of str that receives the
+# current module name and the (absolute) module name being imported, and
+# returns the reasons of any violation.
+_RULE_FACTORIES = {
+    underscore_rule.CODE: underscore_rule.build_checker,
+    reexport_rule.CODE: reexport_rule.build_checker,
+    regex_rule.CODE: regex_rule.build_checker,
+    contract_rule.CODE: contract_rule.build_checker,
+}
+
+
+def register_rule(code, factory):
+    """ Register an import rule to be evaluated by the engine.
+
+    Parameters
+    ----------
+    code : str
+        Error code reported for violations of the rule, e.g. "DEP401".
+    factory : callable(**options) -> checker or None
+        Callable for building the checker from rule options. It should
+        accept arbitrary keyword arguments and ignore the ones it does
+        not use. If it returns None, the rule is skipped.
+
+    Raises
+    ------
+    ValueError
+        If a rule is already registered with the given code.
+    """
+    if code in _RULE_FACTORIES:
+        raise ValueError(f"Rule {code!r} is already registered.")
+    _RULE_FACTORIES[code] = factory
+
+
+def registered_codes():
+    """ Return the error codes of all registered rules.
+
+    Returns
+    -------
+    codes : list of str
+    """
+    return list(_RULE_FACTORIES)
+
+
+def build_checkers(**options):
+    """ Build the checkers of all registered rules.
+
+    Parameters
+    ----------
+    **options
+        Rule options passed to every rule factory, e.g.
+        ``disallowed_patterns``.
+
+    Returns
+    -------
+    code_to_checker : dict(str, callable(str, str) -> iterable of str)
+        Mapping from error code to checker, for the rules that are enabled
+        with the given options.
+    """
+    code_to_checker = {}
+    for code, factory in _RULE_FACTORIES.items():
+        checker = factory(**options)
+        if checker is not None:
+            code_to_checker[code] = checker
+    return code_to_checker
+
+
+def collect_imports(tree, module_name=None, source=None):
+    """ Return the imports in the tree.
+
+    Parameters
+    ----------
+    tree : ast.AST
+        The AST tree to be analyzed.
+    module_name : str or None
+        The absolute module name from which the source represents.
+        Default is None which means unknown. If given, relative imports
+        are normalized to absolute names.
+    source : str or bytes or None, optional
+        Source code of the tree. If given, the expressions are only walked
+        for dynamic imports if the source code mentions the functions
+        importing modules, see ``ImportAnalyzer``.
+
+    Returns
+    -------
+    imports : list of tuple(int, int, str)
+        Line number, column offset and imported name of each import.
+    """
+    analyzer = ImportAnalyzer(module_name=module_name)
+    with stats.timed("collect_imports"):
+        analyzer.visit_statements(tree, _is_dynamic(source))
+    return analyzer.imports
+
+
+def collect_bindings(tree, module_name=None):
+    """ Return the names bound by the imports at the top level of a module.
+
+    Parameters
+    ----------
+    tree : ast.AST
+        The AST tree of the module.
+    module_name : str or None
+        The absolute module name from which the source represents.
+        Default is None which means unknown. If given, relative imports
+        are normalized to absolute names.
+
+    Returns
+    -------
+    bindings : list of tuple(str, str)
+        Bound name and imported name of each binding, see
+        ``ImportAnalyzer.iter_bindings``.
+    """
+    analyzer = ImportAnalyzer(module_name=module_name)
+    with stats.timed("collect_bindings"):
+        return list(analyzer.iter_bindings(tree))
+
+
+def scan_import_statements(source, module_name=None):
+    """ Return the names imported by the import statements of a file, if
+    they can be found by scanning its lines, without parsing it.
+
+    Parameters
+    ----------
+    source : str or bytes
+        Source code.
+    module_name : str or None, optional
+        The absolute module name from which the source represents, for
+        normalizing relative imports.
+
+    Returns
+    -------
+    targets : list of str or None
+        Imported names, including the names of all the import statements
+        and possibly more. None if the file must be parsed to find them.
+        Dynamic imports are ignored.
+    """
+    return scan_imports(source, module_name, dynamic=False)
+
+
+def scan_file_imports(file, module_name=None, deadline=None):
+    """ Return the imports of the import statements of a file, found by
+    scanning its lines a chunk at a time, without parsing it.
+
+    This is the fallback for the files too large to be parsed: the time
+    and memory spent do not grow with the size of their AST, but dynamic
+    imports are not found.
+
+    Parameters
+    ----------
+    file : file object
+        Python file opened in binary mode.
+    module_name : str or None, optional
+        The absolute module name from which the source represents, for
+        normalizing relative imports.
+    deadline : float or None, optional
+        Value of ``time.perf_counter()`` after which the scan stops.
+        Default is to scan the whole file.
+
+    Returns
+    -------
+    imports : list of tuple(int, int, str)
+        Line number, column offset and imported name of each import, see
+        ``collect_imports``.
+    lines : dict(int, str)
+        The line of each import, for reading its noqa comment.
+    stopped_at : int or None
+        Number of the line where the scan stopped at the deadline, None if
+        the whole file is scanned.
+
+    Raises
+    ------
+    SyntaxError
+        If the encoding declaration of the file is invalid.
+    """
+    with stats.timed("scan_statements"):
+        return scan_import_lines(file, module_name, deadline)
+
+
+def is_clean(source, module_name=None, code_to_checker=None):
+    """ Return whether the source code of a file certainly has no
+    violation, without parsing it.
+
+    The import statements are found by scanning the lines of the source
+    code. The rules are not evaluated if some statements cannot be
+    recognized without parsing, e.g. imports after a semicolon.
+
+    Parameters
+    ----------
+    source : str or bytes
+        Source code.
+    module_name : str or None
+        The absolute module name from which the source represents.
+        Default is None which means unknown.
+    code_to_checker : dict(str, callable(str, str) -> iterable of str)
+        Mapping from error code to checker, see ``build_checkers``.
+
+    Returns
+    -------
+    clean : bool
+        True if no import violates the rules. False if an import may
+        violate them, or if the source code must be parsed to tell.
+        Syntax errors are not detected.
+    """
+    if not code_to_checker:
+        return True
+    targets = scan_imports(source, module_name)
+    if targets is None:
+        return False
+    checkers = list(code_to_checker.values())
+    for target in targets:
+        for checker in checkers:
+            if any(True for _ in checker(module_name, target)):
+                return False
+    return True
+
+
+def iter_errors(tree, module_name=None, code_to_checker=None, source=None):
+    """ Iterate over the violations of several import rules in one
+    traversal, as they are found.
+
+    Parameters
+    ----------
+    tree : ast.AST
+        The AST tree to be analyzed.
+    module_name : str or None
+        The absolute module name from which the source represents.
+        Default is None which means unknown.
+    code_to_checker : dict(str, callable(str, str) -> iterable of str)
+        Mapping from error code to checker, see ``build_checkers``.
+    source : str or bytes or None, optional
+        Source code of the tree, for skipping the search of dynamic
+        imports, see ``collect_imports``.
+
+    Yields
+    ------
+    error : ImportRuleViolation
+        Occurrence of import violation, with its error code and imported
+        name.
+    """
+    if not code_to_checker:
+        return
+    if stats.current() is None:
+        imports = ImportAnalyzer(module_name=module_name).iter_imports(
+            tree, _is_dynamic(source),
+        )
+    else:
+        # The traversal is timed on its own, apart from the rules.
+        imports = collect_imports(tree, module_name, source)
+    yield from iter_violations(imports, module_name, code_to_checker)
+
+
+def iter_violations(imports, module_name=None, code_to_checker=None):
+    """ Iterate over the violations of several import rules in collected
+    imports, as they are found.
+
+    Parameters
+    ----------
+    imports : iterable of tuple(int, int, str)
+        Line number, column offset and imported name of each import, see
+        ``collect_imports``.
+    module_name : str or None
+        The absolute module name from which the imports are made.
+        Default is None which means unknown.
+    code_to_checker : dict(str, callable(str, str) -> iterable of str)
+        Mapping from error code to checker, see ``build_checkers``.
+
+    Yields
+    ------
+    error : ImportRuleViolation
+        Occurrence of import violation, with its error code and imported
+        name.
+    """
+    if not code_to_checker:
+        return
+
+    checkers = list(code_to_checker.items())
+    recorder = stats.current()
+    if recorder is not None:
+        checkers = [
+            (code, recorder.timed_checker(code, checker))
+            for code, checker in checkers
+        ]
+    n_imports = 0
+    try:
+        for lineno, col_offset, target in imports:
+            n_imports += 1
+            for code, checker in checkers:
+                for reason in checker(module_name, target):
+                    yield ImportRuleViolation(
+                        lineno, col_offset, reason, code=code, target=target,
+                    )
+    finally:
+        if recorder is not None:
+            recorder.count("imports", n_imports)
+
+
+def collect_errors(tree, module_name=None, code_to_checker=None):
+    """ Detect violations of several import rules in one traversal.
+
+    Parameters
+    ----------
+    tree : ast.AST
+        The AST tree to be analyzed.
+    module_name : str or None
+        The absolute module name from which the source represents.
+        Default is None which means unknown.
+    code_to_checker : dict(str, callable(str, str) -> iterable of str)
+        Mapping from error code to checker, see ``build_checkers``.
+
+    Returns
+    -------
+    errors : list of tuple(str, ImportRuleViolation)
+        Error codes and occurrences of import violation. See
+        ``iter_errors`` for not holding them all in memory.
+    """
+    return [
+        (error.code, error)
+        for error in iter_errors(tree, module_name, code_to_checker)
+    ]
+
+
+def check_imports(imports, module_name=None, code_to_checker=None):
+    """ Detect violations of several import rules in collected imports.
+
+    Parameters
+    ----------
+    imports : iterable of tuple(int, int, str)
+        Line number, column offset and imported name of each import, see
+        ``collect_imports``.
+    module_name : str or None
+        The absolute module name from which the imports are made.
+        Default is None which means unknown.
+    code_to_checker : dict(str, callable(str, str) -> iterable of str)
+        Mapping from error code to checker, see ``build_checkers``.
+
+    Returns
+    -------
+    errors : list of tuple(str, ImportRuleViolation)
+        Error codes and occurrences of import violation. See
+        ``iter_violations`` for not holding them all in memory.
+    """
+    return [
+        (error.code, error)
+        for error in iter_violations(imports, module_name, code_to_checker)
+    ]
+
+
+def _is_dynamic(source):
+    """ Return whether to search the expressions of a tree for dynamic
+    imports, given its source code if known.
+    """
+    return source is None or may_import_dynamically(source)
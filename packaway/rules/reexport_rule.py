@@ -0,0 +1,188 @@
+""" This module supports disallowing imports of private modules re-exported
+by public names, e.g. ``from person.api import reading`` where
+``person/api.py`` has ``from person import _reading as reading``.
+
+Whether a name is re-exported depends on the other modules of the project,
+so the rule is enabled by an index of the re-exports of all the modules,
+built before checking the files.
+"""
+import hashlib
+import sys
+
+from packaway.rules.underscore_rule import check_import
+
+#: Error code reported for violations of this rule.
+CODE = "DEP402"
+
+
+class ExportIndex:
+    """ Index of the names re-exported by the modules of a project.
+
+    Each name bound by an import at the top level of a module, e.g.
+    ``reading`` in ``person.api``, is resolved through the chain of
+    re-exports to its origin, e.g. the module ``person._reading``. Only
+    the names whose origin is a module of the project are kept, mapped
+    from their qualified name straight to their origin, with the names
+    interned.
+
+    Parameters
+    ----------
+    modules : iterable of str
+        Names of the modules (and packages) of the project.
+    bindings : iterable of tuple(str, str, str)
+        Module name, bound name and imported name of each name bound by
+        an import at the top level of a module, see
+        ``engine.collect_bindings``.
+    """
+
+    def __init__(self, modules, bindings=()):
+        self.modules = frozenset(sys.intern(name) for name in modules)
+        self._roots = None
+        self._origins = {}
+        for module, name, target in bindings:
+            qualified_name = f"{module}.{name}"
+            if target != qualified_name:
+                self._origins[qualified_name] = target
+
+        # The chains are followed once for all the names, so that checking
+        # an import follows at most one link per module of its name.
+        origins = {}
+        for name in self._origins:
+            origin = self.resolve(name)
+            if origin != name and origin in self.modules:
+                origins[sys.intern(name)] = sys.intern(origin)
+        self._origins = origins
+        # First parts of the re-exported names, for skipping the imports
+        # from other packages at once.
+        self._roots = frozenset(
+            name.partition(".")[0] for name in self._origins
+        )
+        self._fingerprint = None
+
+    def __repr__(self):
+        return (
+            f"ExportIndex(n_modules={len(self.modules)}, "
+            f"n_exports={len(self)})"
+        )
+
+    def __len__(self):
+        return len(self._origins)
+
+    def __bool__(self):
+        return bool(self._origins)
+
+    @property
+    def fingerprint(self):
+        """ Digest of the re-exports, for keying cached results. """
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=20)
+            for name, origin in sorted(self._origins.items()):
+                digest.update(f"{name}\0{origin}\n".encode("utf-8"))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def resolve(self, name):
+        """ Return the origin of an imported name.
+
+        The longest prefix of the name that is a module of the project is
+        found, as the interpreter imports it. If the next part of the name
+        is re-exported by the module, it is replaced by its origin and the
+        resolution continues from there. Only the names re-exporting
+        modules are indexed, so the names of other objects are not
+        resolved.
+
+        Parameters
+        ----------
+        name : str
+            Absolute imported name, e.g. ``office.api.reading.read``.
+
+        Returns
+        -------
+        origin : str
+            The name itself if it is not re-exported, e.g.
+            ``person._reading.read``.
+        """
+        if (self._roots is not None
+                and name.partition(".")[0] not in self._roots):
+            return name
+        visited = set()
+        while name not in visited:
+            visited.add(name)
+            parts = name.split(".")
+            index = len(parts)
+            while index > 0 and ".".join(parts[:index]) not in self.modules:
+                index -= 1
+            if index in (0, len(parts)):
+                # Modules are imported as such, even if their package binds
+                # their name to something else.
+                break
+            origin = self._origins.get(".".join(parts[:index + 1]))
+            if origin is None:
+                break
+            name = ".".join([origin] + parts[index + 1:])
+        return name
+
+    def reaches_private(self, name):
+        """ Return whether an imported name resolves to a name that is
+        private to some modules.
+
+        Parameters
+        ----------
+        name : str
+            Absolute imported name.
+
+        Returns
+        -------
+        private : bool
+        """
+        return bool(check_import(None, self.resolve(name)))
+
+    def check(self, source_module, target_module):
+        """ Return the reasons why an import reaches a private module
+        through a re-export.
+
+        Imports of private names are reported by the underscore rule
+        already and not reported again.
+
+        Parameters
+        ----------
+        source_module : str or None
+            Name of the module where the import is written.
+        target_module : str
+            Name of the module being imported, as an absolute name.
+
+        Returns
+        -------
+        reasons : tuple of str
+            Empty if the import is valid.
+        """
+        origin = self.resolve(target_module)
+        if (origin == target_module
+                or origin not in self.modules
+                or not check_import(source_module, origin)
+                or check_import(source_module, target_module)):
+            return ()
+        return (
+            f"Importing private module {origin!r} through "
+            f"{target_module!r}.",
+        )
+
+
+def build_checker(exports=None, **options):
+    """ Return the import checker for this rule.
+
+    Parameters
+    ----------
+    exports : ExportIndex or None, optional
+        Index of the re-exports of the project. If None or empty, the
+        rule is disabled.
+    **options
+        Other rule options, ignored.
+
+    Returns
+    -------
+    checker : callable(str, str) -> iterable of str, or None
+    """
+    if not exports:
+        return None
+    return exports.check
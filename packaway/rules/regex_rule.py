@@ -1,10 +1,181 @@
 """ This module supports disallowing imports using regular expressions.
 """
 
-from functools import partial
+import functools
 import re
+import weakref
 
 from packaway.rules._ast_analyzer import ImportAnalyzer
+from packaway.violation import ImportRuleViolation
+
+#: Error code reported for violations of this rule.
+CODE = "DEP501"
+
+# Maximum number of imported names for which a DisallowedMatcher memoizes
+# the matching patterns.
+_MATCHES_CACHE_SIZE = 65536
+
+# Matchers created by this process, for the statistics of their memoized
+# matches.
+_matchers = weakref.WeakSet()
+
+# Constructs that refer to groups by number, which would be shifted when
+# patterns are combined into one expression.
+_NUMBERED_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?\(\d")
+
+
+class DisallowedMatcher:
+    """ Matcher for finding which of many disallowed patterns match an
+    import.
+
+    The patterns are combined into a single alternation of named groups
+    so that an import matching none of them is rejected with one scan.
+    If the patterns cannot be combined faithfully (e.g. they use inline
+    flags or numbered back references), each pattern is matched in turn.
+
+    Parameters
+    ----------
+    patterns : iterable of str
+        Regular expression patterns of disallowed imports. A pattern is
+        matched at the beginning of the imported name, as with
+        ``re.match``.
+
+    Raises
+    ------
+    re.error
+        If any of the pattern is not a valid regular expression.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        self._compiled = [re.compile(pattern) for pattern in self.patterns]
+        self._combined = _combine_patterns(self.patterns, self._compiled)
+        self._cached_matches = functools.lru_cache(
+            maxsize=_MATCHES_CACHE_SIZE,
+        )(self._find_matches)
+        _matchers.add(self)
+
+    def __repr__(self):
+        return f"DisallowedMatcher({list(self.patterns)!r})"
+
+    def __getstate__(self):
+        # Compiled patterns and caches are rebuilt after unpickling.
+        return {"patterns": self.patterns}
+
+    def __setstate__(self, state):
+        self.__init__(state["patterns"])
+
+    def matches(self, target_module):
+        """ Return the patterns matching an imported name.
+
+        The result is memoized, as the same names are typically imported by
+        many modules.
+
+        Parameters
+        ----------
+        target_module : str
+            Name being imported.
+
+        Returns
+        -------
+        patterns : tuple of str
+            Matching patterns, in the order they were given.
+        """
+        return self._cached_matches(target_module)
+
+    def cache_info(self):
+        """ Return the statistics of the memoized matches.
+
+        Returns
+        -------
+        info : functools._CacheInfo
+            Named tuple with the ``hits``, ``misses``, ``maxsize`` and
+            ``currsize`` of the cache.
+        """
+        return self._cached_matches.cache_info()
+
+    def _find_matches(self, target_module):
+        """ Return the matching patterns without memoization. """
+        return tuple(self.iter_matches(target_module))
+
+    def iter_matches(self, target_module):
+        """ Iterate over the patterns matching an imported name.
+
+        Parameters
+        ----------
+        target_module : str
+            Name being imported.
+
+        Yields
+        ------
+        pattern : str
+            Matching patterns, in the order they were given.
+        """
+        start = 0
+        if self._combined is not None:
+            match = self._combined.match(target_module)
+            if match is None:
+                return
+            # Alternatives are attempted in order, so the patterns before
+            # the one that fired do not match.
+            start = int(match.lastgroup[len("_p"):])
+            yield self.patterns[start]
+            start += 1
+
+        for pattern, compiled in zip(
+                self.patterns[start:], self._compiled[start:]):
+            if compiled.match(target_module):
+                yield pattern
+
+
+def _combine_patterns(patterns, compiled_patterns):
+    """ Combine patterns into a single alternation of named groups.
+
+    Parameters
+    ----------
+    patterns : tuple of str
+        Patterns to be combined.
+    compiled_patterns : list of re.Pattern
+        The same patterns, compiled individually.
+
+    Returns
+    -------
+    combined : re.Pattern or None
+        None if the patterns cannot be combined without changing their
+        meaning.
+    """
+    if not patterns:
+        return None
+    default_flags = re.compile("").flags
+    for pattern, compiled in zip(patterns, compiled_patterns):
+        if compiled.flags != default_flags:
+            return None
+        if _NUMBERED_GROUP_REFERENCE.search(pattern):
+            return None
+    try:
+        return re.compile("|".join(
+            f"(?P<_p{index}>{pattern})"
+            for index, pattern in enumerate(patterns)
+        ))
+    except re.error:
+        return None
+
+
+def _format_reason(target_module, disallowed):
+    """ Return the violation message for a disallowed import.
+
+    Parameters
+    ----------
+    target_module : str
+        Name being imported.
+    disallowed : str
+        Pattern matching the name.
+
+    Returns
+    -------
+    reason : str
+    """
+    return f"Import {target_module!r} violates pattern: {disallowed!r}"
 
 
 def _is_valid_import(source_module, target_module, disallowed):
@@ -26,10 +197,95 @@ def _is_valid_import(source_module, target_module, disallowed):
     """
     return (
         not re.match(disallowed, target_module),
-        f"Import {target_module!r} violates pattern: {disallowed!r}",
+        _format_reason(target_module, disallowed),
+    )
+
+
+def match_cache_info():
+    """ Return the statistics of the memoized matches of all the matchers
+    of the process.
+
+    Returns
+    -------
+    info : functools._CacheInfo
+        Named tuple with the total ``hits``, ``misses``, ``maxsize`` and
+        ``currsize`` of the caches.
+    """
+    infos = [matcher.cache_info() for matcher in list(_matchers)]
+    return functools._CacheInfo(
+        sum(info.hits for info in infos),
+        sum(info.misses for info in infos),
+        sum(info.maxsize for info in infos),
+        sum(info.currsize for info in infos),
     )
 
 
+def build_checker(
+        disallowed_patterns=None, disallowed_matchers=None, **options):
+    """ Return the import checker for the given disallowed patterns.
+
+    Parameters
+    ----------
+    disallowed_patterns : list of str
+        Regex patterns of imports to be banned.
+    disallowed_matchers : list of DisallowedMatcher
+        Precompiled matchers of imports to be banned, checked in addition
+        to ``disallowed_patterns``.
+    **options
+        Other rule options, ignored by this rule.
+
+    Returns
+    -------
+    checker : callable(str, str) -> iterable of str, or None
+        None if there are no patterns to check.
+    """
+    matchers = list(disallowed_matchers or ())
+    if disallowed_patterns:
+        matchers.append(DisallowedMatcher(disallowed_patterns))
+    if not matchers:
+        return None
+
+    def checker(source_module, target_module):
+        return [
+            _format_reason(target_module, pattern)
+            for matcher in matchers
+            for pattern in matcher.matches(target_module)
+        ]
+
+    return checker
+
+
+def iter_errors(tree, module_name=None, disallowed_patterns=None):
+    """ Iterate over the violations of the rule, as they are found.
+
+    Parameters
+    ----------
+    tree : ast.AST
+        The AST tree to be analyzed.
+    module_name : str or None
+        The absolute module name from which the source represents.
+        Default is None which means unknown. If given, it can be used
+        to analyze absolute imports.
+    disallowed_patterns : list of str
+        Regex patterns of imports to be banned.
+
+    Yields
+    ------
+    error : ImportRuleViolation
+        Occurrence of import violation.
+    """
+    checker = build_checker(disallowed_patterns=disallowed_patterns)
+    if checker is None:
+        return
+
+    analyzer = ImportAnalyzer(module_name=module_name)
+    for lineno, col_offset, target in analyzer.iter_imports(tree):
+        for reason in checker(module_name, target):
+            yield ImportRuleViolation(
+                lineno, col_offset, reason, code=CODE, target=target,
+            )
+
+
 def collect_errors(tree, module_name=None, disallowed_patterns=None):
     """ Top level function to detect violation of import rules.
 
@@ -47,17 +303,7 @@ def collect_errors(tree, module_name=None, disallowed_patterns=None):
     Returns
     -------
     errors : list of ImportRuleViolation
-        Occurrences of import violation.
+        Occurrences of import violation. See ``iter_errors`` for not
+        holding them all in memory.
     """
-    if not disallowed_patterns:
-        return []
-
-    analyzer = ImportAnalyzer(
-        module_name=module_name,
-        import_rules=[
-            partial(_is_valid_import, disallowed=pattern)
-            for pattern in disallowed_patterns
-        ],
-    )
-    analyzer.visit(tree)
-    return analyzer._errors
+    return list(iter_errors(tree, module_name, disallowed_patterns))
@@ -0,0 +1,206 @@
+import ast
+import sys
+import textwrap
+import unittest
+
+from packaway.rules._ast_analyzer import (
+    ImportAnalyzer,
+    iter_statements,
+    may_import_dynamically,
+)
+
+
+SOURCE_WITH_NESTED_IMPORTS = textwrap.dedent("""
+    import a
+    def f():
+        import b
+        class C:
+            import c
+    if x:
+        import d
+    else:
+        import e
+    try:
+        import f
+    except ImportError:
+        import g
+    else:
+        import h
+    finally:
+        import i
+    with x:
+        import j
+    for x in y:
+        import k
+    else:
+        import l
+    while x:
+        import m
+    async def g():
+        async with x:
+            import n
+        async for x in y:
+            import o
+    DATA = [func(x) for x in range(10)] + {"key": (lambda: 1)()}
+""")
+
+
+class TestImportAnalyzer(unittest.TestCase):
+    """ Test traversals of the ImportAnalyzer."""
+
+    def test_visit_statements_finds_nested_imports(self):
+        analyzer = ImportAnalyzer()
+        analyzer.visit_statements(ast.parse(SOURCE_WITH_NESTED_IMPORTS))
+        self.assertEqual(
+            [target for _, _, target in analyzer.imports],
+            list("abcdefghijklmno"),
+        )
+
+    def test_visit_statements_same_as_visit(self):
+        tree = ast.parse(SOURCE_WITH_NESTED_IMPORTS)
+        expected = ImportAnalyzer()
+        expected.visit(tree)
+
+        actual = ImportAnalyzer()
+        actual.visit_statements(tree)
+
+        self.assertEqual(actual.imports, expected.imports)
+
+    def test_relative_import_too_deep_skipped(self):
+        analyzer = ImportAnalyzer("pkg.mod")
+        analyzer.visit_statements(
+            ast.parse("from ... import x\nfrom . import y\n")
+        )
+        self.assertEqual(analyzer.imports, [(2, 0, "pkg.y")])
+
+    @unittest.skipIf(sys.version_info < (3, 10), "Requires match statement")
+    def test_visit_statements_match_block(self):
+        source = textwrap.dedent("""
+            match x:
+                case 1:
+                    import a
+                case _:
+                    import b
+        """)
+        analyzer = ImportAnalyzer()
+        analyzer.visit_statements(ast.parse(source))
+        self.assertEqual(
+            [target for _, _, target in analyzer.imports], ["a", "b"],
+        )
+
+    def test_iter_bindings(self):
+        source = textwrap.dedent("""
+            import os.path
+            import person._reading as reading
+            from . import _hours
+            from ._legal import api as legal_api, _compliance
+            from .... import too_deep
+            from helpers import *
+            try:
+                from fast import dumps
+            except ImportError:
+                from slow import dumps
+            def f():
+                from person import _greeting
+            class C:
+                from person import api
+        """)
+        analyzer = ImportAnalyzer("office.api")
+        self.assertEqual(
+            list(analyzer.iter_bindings(ast.parse(source))),
+            [
+                ("reading", "person._reading"),
+                ("_hours", "office._hours"),
+                ("legal_api", "office._legal.api"),
+                ("_compliance", "office._legal._compliance"),
+                ("dumps", "fast.dumps"),
+                ("dumps", "slow.dumps"),
+            ],
+        )
+        self.assertEqual(analyzer.imports, [])
+
+
+SOURCE_WITH_DYNAMIC_IMPORTS = textwrap.dedent("""
+    import importlib
+    from importlib import import_module
+    PLUGIN = importlib.import_module("plugins._impl")
+    def load(name):
+        import_module(name)
+        return import_module("._impl", package=__package__)
+    @decorate(lambda: __import__("a._b"))
+    class C:
+        x = import_module("..base", "app.core.sub")
+    __import__("base", globals(), None, ["_x", "*"], 1)
+    __import__("os.path", fromlist=("path",))
+    import_module(".missing")
+    import_module("...too.deep", "app")
+""")
+
+
+class TestDynamicImports(unittest.TestCase):
+    """ Test finding imports of modules named by strings."""
+
+    def test_iter_imports(self):
+        analyzer = ImportAnalyzer("app.loader")
+        imports = analyzer.iter_imports(ast.parse(SOURCE_WITH_DYNAMIC_IMPORTS))
+        self.assertEqual(
+            list(imports),
+            [
+                (2, 0, "importlib"),
+                (3, 0, "importlib.import_module"),
+                (4, 9, "plugins._impl"),
+                (7, 11, "app._impl"),
+                (8, 18, "a._b"),
+                (10, 8, "app.core.base"),
+                (11, 0, "app.base._x"),
+                (12, 0, "os.path.path"),
+            ],
+        )
+
+    def test_relative_imports_of_unknown_module(self):
+        analyzer = ImportAnalyzer()
+        analyzer.visit_statements(ast.parse(SOURCE_WITH_DYNAMIC_IMPORTS))
+        targets = [target for _, _, target in analyzer.imports]
+        self.assertNotIn("app._impl", targets)
+        self.assertIn("base._x", targets)
+
+    def test_not_dynamic(self):
+        analyzer = ImportAnalyzer("app.loader")
+        imports = analyzer.iter_imports(
+            ast.parse(SOURCE_WITH_DYNAMIC_IMPORTS), dynamic=False,
+        )
+        self.assertEqual(
+            [target for _, _, target in imports],
+            ["importlib", "importlib.import_module"],
+        )
+
+    def test_visit_same_as_visit_statements(self):
+        tree = ast.parse(SOURCE_WITH_DYNAMIC_IMPORTS)
+        expected = ImportAnalyzer("app.loader")
+        expected.visit(tree)
+        actual = ImportAnalyzer("app.loader")
+        actual.visit_statements(tree)
+        self.assertEqual(sorted(actual.imports), sorted(expected.imports))
+
+    def test_may_import_dynamically(self):
+        self.assertTrue(may_import_dynamically("importlib.import_module(x)"))
+        self.assertTrue(may_import_dynamically(b"__import__(x)"))
+        self.assertFalse(may_import_dynamically("import importlib"))
+
+
+class TestIterStatements(unittest.TestCase):
+    """ Test walking statement bodies only."""
+
+    def test_expressions_not_entered(self):
+        tree = ast.parse(SOURCE_WITH_NESTED_IMPORTS)
+        for node in iter_statements(tree):
+            with self.subTest(node=node):
+                self.assertNotIsInstance(node, ast.expr)
+
+    def test_fewer_nodes_visited(self):
+        source = "TABLE = [\n" + "    (1, 'a', {'b': 2.0}),\n" * 100 + "]"
+        tree = ast.parse(source)
+        n_statements = sum(1 for _ in iter_statements(tree))
+        n_nodes = sum(1 for _ in ast.walk(tree))
+        self.assertEqual(n_statements, 2)
+        self.assertGreater(n_nodes, 500)
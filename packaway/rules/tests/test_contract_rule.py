@@ -0,0 +1,87 @@
+import unittest
+
+from packaway.rules.contract_rule import (
+    ALLOW,
+    build_checker,
+    ContractMatrix,
+    INDEPENDENT,
+    LAYERS,
+)
+
+
+class TestContractMatrix(unittest.TestCase):
+    """ Test checking imports against layered architecture contracts."""
+
+    def setUp(self):
+        self.contracts = ContractMatrix([
+            (LAYERS, (("app.ui",), ("app.services", "app.jobs"), ("app",))),
+            (INDEPENDENT, ("billing", "shipping")),
+            (ALLOW, ("app.events", "app.ui.signals")),
+        ])
+
+    def test_allowed_imports(self):
+        imports = [
+            ("app.ui.views", "app.services.users"),
+            ("app.ui.views", "app.model"),
+            ("app.services.users", "app.model.User"),
+            ("app.ui.views", "app.ui.forms"),
+            ("app.events.user", "app.ui.signals.changed"),
+            ("billing.invoice", "app.ui"),
+            ("scripts.run", "app.ui.views"),
+            ("app.services.users", "os.path"),
+        ]
+        for source, target in imports:
+            with self.subTest(source=source, target=target):
+                self.assertEqual(self.contracts.check(source, target), ())
+
+    def test_forbidden_imports(self):
+        imports = [
+            (
+                "app.model", "app.ui.views",
+                "Import 'app.ui.views' from layer 'app' to higher layer "
+                "'app.ui'.",
+            ),
+            (
+                "app.events.user", "app.ui.views",
+                "Import 'app.ui.views' from layer 'app' to higher layer "
+                "'app.ui'.",
+            ),
+            (
+                "app.jobs.sync", "app.services.users",
+                "Import 'app.services.users' between independent packages "
+                "'app.jobs' and 'app.services'.",
+            ),
+            (
+                "shipping", "billing.invoice",
+                "Import 'billing.invoice' between independent packages "
+                "'shipping' and 'billing'.",
+            ),
+        ]
+        for source, target, reason in imports:
+            with self.subTest(source=source, target=target):
+                self.assertEqual(
+                    self.contracts.check(source, target), (reason,),
+                )
+
+    def test_longest_prefix(self):
+        self.assertEqual(
+            self.contracts.package_id("app.ui.signals.changed"),
+            self.contracts.package_id("app.ui.signals"),
+        )
+        self.assertNotEqual(
+            self.contracts.package_id("app.ui.views"),
+            self.contracts.package_id("app.views"),
+        )
+        self.assertIsNone(self.contracts.package_id("application.ui"))
+
+    def test_unknown_source_module(self):
+        self.assertEqual(self.contracts.check(None, "app.ui"), ())
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            ContractMatrix([("forbid", ("a", "b"))])
+
+    def test_build_checker(self):
+        self.assertIsNone(build_checker())
+        self.assertIsNone(build_checker(contracts=ContractMatrix([])))
+        self.assertIsNotNone(build_checker(contracts=self.contracts))
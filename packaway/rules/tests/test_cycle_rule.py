@@ -0,0 +1,86 @@
+import unittest
+
+from packaway.graph import ModuleGraph
+from packaway.rules.cycle_rule import cycle_message, find_cycles
+
+
+class TestFindCycles(unittest.TestCase):
+    """ Test finding import cycles across packages."""
+
+    def setUp(self):
+        self.graph = ModuleGraph.from_edges(
+            ["shop", "shop.orders", "shop.billing", "shop.billing.invoices"],
+            [
+                # Across the packages shop.orders and shop.billing.
+                ("shop.orders.api", "shop.billing.invoices"),
+                ("shop.billing.invoices", "shop.billing.taxes"),
+                ("shop.billing.taxes", "shop.orders.models"),
+                ("shop.orders.models", "shop.orders.api"),
+                ("shop.billing.invoices", "shop.orders.api"),
+                # Between a package and its modules.
+                ("shop", "shop.cart"),
+                ("shop.cart", "shop"),
+                # Between top level modules.
+                ("settings", "logs"),
+                ("logs", "settings"),
+            ],
+        )
+
+    def test_across_packages(self):
+        self.assertEqual(
+            find_cycles(self.graph),
+            [
+                (
+                    ["logs", "settings"],
+                    ["logs", "settings", "logs"],
+                ),
+                (
+                    [
+                        "shop.billing.invoices", "shop.billing.taxes",
+                        "shop.orders.api", "shop.orders.models",
+                    ],
+                    [
+                        "shop.billing.invoices", "shop.orders.api",
+                        "shop.billing.invoices",
+                    ],
+                ),
+            ],
+        )
+
+    def test_all_cycles(self):
+        cycles = find_cycles(self.graph, across_packages=False)
+        self.assertEqual(
+            [component for component, _ in cycles],
+            [
+                ["logs", "settings"],
+                ["shop", "shop.cart"],
+                [
+                    "shop.billing.invoices", "shop.billing.taxes",
+                    "shop.orders.api", "shop.orders.models",
+                ],
+            ],
+        )
+        self.assertEqual(cycles[1][1], ["shop", "shop.cart", "shop"])
+
+    def test_shortest_witness(self):
+        graph = ModuleGraph.from_edges([], [
+            ("a.x", "b.y"),
+            ("b.y", "c.z"),
+            ("c.z", "a.x"),
+            ("c.z", "d.w"),
+            ("d.w", "c.z"),
+        ])
+        self.assertEqual(
+            find_cycles(graph),
+            [(["a.x", "b.y", "c.z", "d.w"], ["c.z", "d.w", "c.z"])],
+        )
+
+    def test_no_cycle(self):
+        graph = ModuleGraph.from_edges([], [("a.b", "c.d"), ("a.b", "a.c")])
+        self.assertEqual(find_cycles(graph, across_packages=False), [])
+
+    def test_cycle_message(self):
+        self.assertEqual(
+            cycle_message(["a", "b", "c"], ["a", "b", "a"]),
+            "Import cycle between 3 modules: a -> b -> a",
+        )
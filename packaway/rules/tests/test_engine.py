@@ -0,0 +1,178 @@
+import ast
+import unittest
+from unittest import mock
+
+from packaway.rules import _ast_analyzer, engine
+from packaway.rules.engine import (
+    build_checkers,
+    collect_errors,
+    is_clean,
+    iter_errors,
+    register_rule,
+    registered_codes,
+)
+
+
+class TestRuleRegistry(unittest.TestCase):
+    """ Test registering rules to the engine."""
+
+    def test_builtin_rules_registered(self):
+        self.assertEqual(
+            registered_codes(), ["DEP401", "DEP402", "DEP501", "DEP601"],
+        )
+
+    def test_regex_rule_disabled_without_patterns(self):
+        code_to_checker = build_checkers()
+        self.assertEqual(list(code_to_checker), ["DEP401"])
+
+    def test_register_rule(self):
+
+        def factory(**options):
+            def checker(source_module, target_module):
+                if target_module == "banned":
+                    return ["Banned."]
+                return []
+            return checker
+
+        with mock.patch.dict(engine._RULE_FACTORIES):
+            register_rule("DEP999", factory)
+            errors = collect_errors(
+                ast.parse("import banned"),
+                code_to_checker=build_checkers(),
+            )
+
+        self.assertEqual(
+            [(code, error.message) for code, error in errors],
+            [("DEP999", "Banned.")],
+        )
+        self.assertNotIn("DEP999", registered_codes())
+
+    def test_register_rule_twice(self):
+        with self.assertRaises(ValueError):
+            register_rule("DEP401", lambda **options: None)
+
+
+class TestCollectErrors(unittest.TestCase):
+    """ Test evaluating all rules in one traversal."""
+
+    def test_all_rules_evaluated(self):
+        source = "\n".join([
+            "from package.gui import _name",
+            "import package.api",
+        ])
+        errors = collect_errors(
+            ast.parse(source),
+            module_name=None,
+            code_to_checker=build_checkers(
+                disallowed_patterns=[r".*\.gui\..*"],
+            ),
+        )
+        self.assertEqual(
+            [(code, error.lineno, error.message) for code, error in errors],
+            [
+                (
+                    "DEP401", 1,
+                    "Importing private name 'package.gui._name'.",
+                ),
+                (
+                    "DEP501", 1,
+                    "Import 'package.gui._name' violates pattern: "
+                    "'.*\\\\.gui\\\\..*'",
+                ),
+            ],
+        )
+
+    def test_tree_traversed_once(self):
+        tree = ast.parse("from package.gui import _name")
+        code_to_checker = build_checkers(disallowed_patterns=[r".*gui.*"])
+
+        with mock.patch.object(
+                engine.ImportAnalyzer, "_node_imports",
+                autospec=True,
+                side_effect=engine.ImportAnalyzer._node_imports) as visit:
+            errors = collect_errors(tree, None, code_to_checker)
+
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(visit.call_count, 1)
+
+    def test_no_checkers(self):
+        errors = collect_errors(ast.parse("import _private"))
+        self.assertEqual(errors, [])
+
+    def test_iter_errors_records(self):
+        tree = ast.parse("from ..gui import _name")
+        code_to_checker = build_checkers(disallowed_patterns=[r".*gui.*"])
+
+        errors = list(iter_errors(tree, "package.app.main", code_to_checker))
+
+        self.assertEqual(
+            [(error.code, error.target) for error in errors],
+            [
+                ("DEP401", "package.gui._name"),
+                ("DEP501", "package.gui._name"),
+            ],
+        )
+
+    def test_iter_errors_lazy(self):
+        tree = ast.parse("import _first\nimport _second\n")
+        checked = []
+
+        def checker(source_module, target_module):
+            checked.append(target_module)
+            return ["Checked."]
+
+        errors = iter_errors(tree, None, {"DEP999": checker})
+
+        self.assertEqual(checked, [])
+        self.assertEqual(next(errors).target, "_first")
+        self.assertEqual(checked, ["_first"])
+
+    def test_iter_errors_dynamic_imports(self):
+        source = "import importlib\nimportlib.import_module('._gui', 'a.b')\n"
+        code_to_checker = build_checkers()
+        for given_source in [None, source]:
+            with self.subTest(source=given_source):
+                errors = list(iter_errors(
+                    ast.parse(source), None, code_to_checker, given_source,
+                ))
+                self.assertEqual(
+                    [(error.lineno, error.target) for error in errors],
+                    [(2, "a.b._gui")],
+                )
+
+    def test_expressions_skipped_without_dynamic_imports(self):
+        source = "import os\nx = [f(y) for y in z]\n"
+        for given_source, expected_walks in [
+                (source, 0), (source + "# __import__\n", 2)]:
+            with self.subTest(source=given_source), mock.patch.object(
+                    _ast_analyzer, "_iter_import_calls",
+                    wraps=_ast_analyzer._iter_import_calls) as walk:
+                errors = list(iter_errors(
+                    ast.parse(source), None, build_checkers(), given_source,
+                ))
+            self.assertEqual(errors, [])
+            self.assertEqual(walk.call_count, expected_walks)
+
+
+class TestIsClean(unittest.TestCase):
+    """ Test deciding that a file is clean without parsing it."""
+
+    def test_is_clean(self):
+        code_to_checker = build_checkers(disallowed_patterns=[r".*gui.*"])
+        examples = [
+            ("import os\nfrom package.api import name\n", True),
+            ("import other._name\n", False),
+            ("from package import gui\n", False),
+            ("x = 1; import os\n", False),
+            ('x = """\n# """; import other._name\n', False),
+        ]
+        for source, expected in examples:
+            with self.subTest(source=source):
+                self.assertEqual(
+                    is_clean(source, "package.module", code_to_checker),
+                    expected,
+                )
+
+    def test_names_in_strings_not_clean(self):
+        source = 'TEXT = """\nimport package._name\n"""\n'
+        self.assertFalse(is_clean(source, None, build_checkers()))
@@ -0,0 +1,57 @@
+import unittest
+
+from packaway.rules._prefilter import scan_imports
+
+
+class TestScanImports(unittest.TestCase):
+    """ Test finding the imported names without parsing."""
+
+    def test_recognized_statements(self):
+        examples = [
+            ("import os\nimport a.b as c, d\n", ["os", "a.b", "d"]),
+            ("from a import (b,\n    c as d,  # comment\n)\n", ["a.b", "a.c"]),
+            ("from a import(b)\n", ["a.b"]),
+            ("from a import *\n", ["a.*"]),
+            ("import a\r\n", ["a"]),
+            ("# import a\nDATA = [1, 2]\n", []),
+            ("", []),
+        ]
+        for source, expected in examples:
+            with self.subTest(source=source):
+                self.assertEqual(scan_imports(source.encode()), expected)
+
+    def test_relative_imports_normalized(self):
+        self.assertEqual(
+            scan_imports(b"from . import x\nfrom ..a import b\n", "p.q.m"),
+            ["p.q.x", "p.a.b"],
+        )
+
+    def test_relative_import_too_deep(self):
+        self.assertIsNone(scan_imports(b"from ... import x\n", "p.m"))
+
+    def test_unsure(self):
+        sources = [
+            "x = 1; import y\n",
+            "if x: import y\n",
+            "from a \\\n    import b\n",
+            "from a import (\n    b\n",
+            "from a import (b,\n    c); import d\n",
+            "import a\rimport _b\n",
+            '"""We import things."""\n',
+            "# -*- coding: cp037 -*-\n",
+            "x = importlib.import_module('a._b')\n",
+            "x = __import__('a._b')\n",
+            'x = """\n# """; import a._b\n',
+            "x = '''\n# '''; import a._b\n",
+            'x = """\n# """; from a import _b\n',
+        ]
+        for source in sources:
+            with self.subTest(source=source):
+                self.assertIsNone(scan_imports(source.encode()))
+
+    def test_dynamic_imports_ignored(self):
+        source = b"import a\nx = importlib.import_module('a._b')\n"
+        self.assertEqual(scan_imports(source, dynamic=False), ["a"])
+
+    def test_str_source(self):
+        self.assertEqual(scan_imports("import os\n"), ["os"])
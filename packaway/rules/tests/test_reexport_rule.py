@@ -0,0 +1,103 @@
+import pickle
+import unittest
+
+from packaway.rules.reexport_rule import build_checker, ExportIndex
+
+
+class TestExportIndex(unittest.TestCase):
+    """ Test resolving re-exported names to their origin."""
+
+    def setUp(self):
+        self.index = ExportIndex(
+            [
+                "person", "person.api", "person._reading",
+                "person._reading.books",
+                "office", "office.api",
+            ],
+            [
+                ("person.api", "reading", "person._reading"),
+                ("person.api", "read", "person._reading.read"),
+                ("person.api", "books", "person._reading.books"),
+                ("office.api", "person_api", "person.api"),
+                ("office.api", "reading", "person.api.reading"),
+                # A module bound in its package under its own name.
+                ("person", "api", "person.api"),
+                # A package binding the name of its module to something
+                # else.
+                ("person", "_reading", "os.path"),
+                # Cycles of names that are never defined.
+                ("office.api", "first", "office.api.second"),
+                ("office.api", "second", "office.api.first"),
+            ],
+        )
+
+    def test_resolve(self):
+        for name, expected in [
+                ("person.api.reading", "person._reading"),
+                ("person.api.reading.read", "person._reading.read"),
+                # Only the re-exports of modules are indexed.
+                ("person.api.read", "person.api.read"),
+                ("office.api.reading", "person._reading"),
+                ("office.api.person_api.reading", "person._reading"),
+                ("office.api.person_api.books", "person._reading.books"),
+                ("person._reading", "person._reading"),
+                ("person.api.other", "person.api.other"),
+                ("office.api.first", "office.api.first"),
+                ("os.path", "os.path")]:
+            with self.subTest(name=name):
+                self.assertEqual(self.index.resolve(name), expected)
+
+    def test_only_modules_kept(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(
+            repr(self.index), "ExportIndex(n_modules=6, n_exports=4)",
+        )
+
+    def test_check(self):
+        for source, target, expected in [
+                ("office.api", "person.api.reading", (
+                    "Importing private module 'person._reading' through "
+                    "'person.api.reading'.",
+                )),
+                ("office.api", "person.api.books", (
+                    "Importing private module 'person._reading.books' "
+                    "through 'person.api.books'.",
+                )),
+                (None, "office.api.person_api.reading", (
+                    "Importing private module 'person._reading' through "
+                    "'office.api.person_api.reading'.",
+                )),
+                # Objects defined in private modules may be re-exported.
+                ("office.api", "person.api.read", ()),
+                # The modules of the package may import its private modules.
+                ("person.other", "person.api.reading", ()),
+                # Private names are reported by the underscore rule.
+                ("office.api", "person._reading", ()),
+                ("office.api", "office.api.first", ())]:
+            with self.subTest(source=source, target=target):
+                self.assertEqual(
+                    tuple(self.index.check(source, target)), expected,
+                )
+
+    def test_fingerprint(self):
+        same = ExportIndex(
+            ["person", "person.api", "person._reading"],
+            [("person.api", "reading", "person._reading")],
+        )
+        other = ExportIndex(
+            ["person", "person.api", "person._reading"],
+            [("person.api", "reader", "person._reading")],
+        )
+        self.assertNotEqual(self.index.fingerprint, same.fingerprint)
+        self.assertNotEqual(same.fingerprint, other.fingerprint)
+        self.assertEqual(
+            pickle.loads(pickle.dumps(same)).fingerprint, same.fingerprint,
+        )
+
+    def test_build_checker(self):
+        self.assertIsNone(build_checker())
+        self.assertIsNone(build_checker(exports=ExportIndex([])))
+        self.assertEqual(
+            build_checker(exports=self.index, contracts=None),
+            self.index.check,
+        )
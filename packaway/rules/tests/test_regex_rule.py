@@ -1,7 +1,9 @@
 import ast
+import pickle
+import re
 import unittest
 
-from packaway.rules.regex_rule import collect_errors
+from packaway.rules.regex_rule import collect_errors, DisallowedMatcher
 
 
 class TestRegexRule(unittest.TestCase):
@@ -82,3 +84,61 @@ class TestRegexRule(unittest.TestCase):
                     disallowed_patterns=disallowed_patterns,
                 )
                 self.assertEqual(len(errors), 0)
+
+
+class TestDisallowedMatcher(unittest.TestCase):
+    """ Test matching many disallowed patterns at once."""
+
+    def test_no_match(self):
+        matcher = DisallowedMatcher([r"web\.", r"gui\."])
+        self.assertEqual(list(matcher.iter_matches("data.api")), [])
+
+    def test_all_matches_reported_in_order(self):
+        patterns = [r"data\.", r"web\.", r".*api", r"web"]
+        matcher = DisallowedMatcher(patterns)
+        self.assertEqual(
+            list(matcher.iter_matches("web.api")),
+            [r"web\.", r".*api", r"web"],
+        )
+
+    def test_patterns_with_groups(self):
+        matcher = DisallowedMatcher([r"(?P<name>web)\.(gui)", r"(web)"])
+        self.assertEqual(
+            list(matcher.iter_matches("web.gui")),
+            [r"(?P<name>web)\.(gui)", r"(web)"],
+        )
+
+    def test_patterns_not_combinable(self):
+        patterns = [
+            r"(a)\1",
+            r"(?i)WEB",
+            r"(?P<dup>x)",
+            r"(?P<dup>y)",
+        ]
+        matcher = DisallowedMatcher(patterns)
+        self.assertEqual(list(matcher.iter_matches("aa")), [r"(a)\1"])
+        self.assertEqual(list(matcher.iter_matches("web")), [r"(?i)WEB"])
+        self.assertEqual(list(matcher.iter_matches("y")), [r"(?P<dup>y)"])
+
+    def test_invalid_pattern(self):
+        with self.assertRaises(re.error):
+            DisallowedMatcher(["web("])
+
+    def test_matches_memoized(self):
+        matcher = DisallowedMatcher([r"web\.", r".*api"])
+        self.assertEqual(matcher.matches("web.api"), (r"web\.", r".*api"))
+        self.assertEqual(matcher.matches("web.api"), (r"web\.", r".*api"))
+        self.assertEqual(matcher.matches("data"), ())
+
+        info = matcher.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 2))
+
+    def test_pickle(self):
+        matcher = DisallowedMatcher([r"web\.", r".*api"])
+        matcher.matches("web.api")
+
+        unpickled = pickle.loads(pickle.dumps(matcher))
+
+        self.assertEqual(unpickled.patterns, matcher.patterns)
+        self.assertEqual(unpickled.matches("web.api"), (r"web\.", r".*api"))
+        self.assertEqual(unpickled.cache_info().misses, 1)
@@ -0,0 +1,97 @@
+import ast
+import io
+import time
+import unittest
+from unittest import mock
+
+from packaway.rules import _statement_scanner
+from packaway.rules._statement_scanner import scan_import_lines
+from packaway.rules.engine import collect_imports
+
+SOURCE = '''"""Doc with
+import fake
+"""
+import os, a.b as c
+from . import x  # noqa
+from ..p import (q as r,
+    s,
+)
+x = 'import no'  # import no
+if True: import y; from z import *
+y = """ \'\'\' import no """
+from a \\
+    import b
+s = f"{1}" ; import t
+z = """
+import inner
+""" ; import after
+import w; q = """
+import inside
+"""
+def f():
+    import é
+    return r\'\'\'
+import raw \\\'\'\'
+\'\'\'
+import last
+'''
+
+
+def scan(source, module_name=None, deadline=None):
+    file = io.BytesIO(source.encode("utf-8"))
+    return scan_import_lines(file, module_name, deadline)
+
+
+class TestScanImportLines(unittest.TestCase):
+    """ Test finding the import statements without parsing."""
+
+    def test_same_as_ast(self):
+        expected = collect_imports(ast.parse(SOURCE), "pkg.sub.mod")
+        for chunk_size in [1, 2, 7, 64, 1 << 20]:
+            with self.subTest(chunk_size=chunk_size):
+                with mock.patch.object(
+                        _statement_scanner, "_CHUNK_SIZE", chunk_size):
+                    imports, _, stopped_at = scan(SOURCE, "pkg.sub.mod")
+                self.assertEqual(imports, expected)
+                self.assertIsNone(stopped_at)
+
+    def test_string_continued_by_backslash(self):
+        source = "x = r'\"a\\\n\"\"\"'\nimport data._private\n"
+        for newline in ["\n", "\r\n"]:
+            with self.subTest(newline=newline):
+                imports, _, _ = scan(source.replace("\n", newline))
+                self.assertEqual(imports, [(3, 0, "data._private")])
+
+    def test_lines(self):
+        imports, lines, _ = scan(SOURCE, "pkg.sub.mod")
+        self.assertEqual(lines[5], "from . import x  # noqa")
+        self.assertEqual(lines[12], "from a \\")
+        self.assertEqual(
+            {lineno for lineno, _, _ in imports}, set(lines),
+        )
+
+    def test_column_offsets_in_bytes(self):
+        imports, _, _ = scan("x = 'é'; import a\n")
+        self.assertEqual(imports, [(1, 10, "a")])
+
+    def test_relative_import_too_deep(self):
+        imports, _, _ = scan("from ... import x\nimport y\n", "p.m")
+        self.assertEqual(imports, [(2, 0, "y")])
+
+    def test_invalid_statements_skipped(self):
+        imports, _, _ = scan("import (a\nimport b\nimport c; )\nimport d\n")
+        self.assertEqual(imports[-1], (4, 0, "d"))
+
+    def test_encoding(self):
+        # Column offsets are in UTF-8 bytes, as for the AST.
+        file = io.BytesIO(
+            "# -*- coding: latin-1 -*-\nx = 'é'; import a\n".encode("latin-1")
+        )
+        self.assertEqual(scan_import_lines(file)[0], [(2, 10, "a")])
+        with self.assertRaises(SyntaxError):
+            scan_import_lines(io.BytesIO(b"# coding: unknown\nimport a\n"))
+
+    def test_deadline(self):
+        imports, _, stopped_at = scan(SOURCE, deadline=time.perf_counter())
+        self.assertEqual(imports, [])
+        self.assertEqual(stopped_at, 1)
@@ -1,8 +1,14 @@
 import ast
+import itertools
 import unittest
 
+from packaway.rules import underscore_rule
 from packaway.rules.underscore_rule import (
+    check_import,
+    clear_decision_cache,
     collect_errors,
+    decision_cache_info,
+    iter_errors,
 )
 
 
@@ -74,3 +80,56 @@ class TestAnalyzerAPI(unittest.TestCase):
                     module_name=module_name,
                 )
                 self.assertEqual(len(errors), 1)
+
+
+class TestMemoizedDecisions(unittest.TestCase):
+    """ Test memoizing the decisions of the rule."""
+
+    def setUp(self):
+        clear_decision_cache()
+        self.addCleanup(clear_decision_cache)
+
+    def test_same_as_unmemoized(self):
+        names = [
+            "a", "_a", "b",
+            "a.b", "a._b", "a.b.c", "a.b._c", "a._b.c", "a.b.c._d",
+            "a.c._d", "b._c",
+        ]
+        source_modules = [None] + names
+        for source_module, target_module in itertools.product(
+                source_modules, names):
+            with self.subTest(source=source_module, target=target_module):
+                is_valid, reason = underscore_rule._is_valid_import(
+                    source_module, target_module
+                )
+                expected = () if is_valid else (reason,)
+                self.assertEqual(
+                    check_import(source_module, target_module), expected
+                )
+
+    def test_decisions_shared_within_package(self):
+        for module in ["module1", "module2", "module3"]:
+            check_import(f"company.office.{module}", "company.core._api")
+            check_import(f"company.office.{module}", "company.core.api")
+
+        info = decision_cache_info()
+        self.assertEqual((info.hits, info.misses), (4, 2))
+
+
+class TestIterErrors(unittest.TestCase):
+    """ Test iterating over the violations of the rule."""
+
+    def test_violations_carry_code_and_target(self):
+        tree = ast.parse("import os\nfrom package import _name\n")
+
+        errors = iter_errors(tree, module_name="other.module")
+
+        self.assertEqual(
+            list(errors),
+            [
+                (
+                    2, 0, "Importing private name 'package._name'.",
+                    "DEP401", "package._name",
+                ),
+            ],
+        )
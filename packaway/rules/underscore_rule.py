@@ -2,9 +2,17 @@
 """ This module supports disallowing imports using leading underscores and
 packaging structures.
 """
+import functools
 import re
 
 from packaway.rules._ast_analyzer import ImportAnalyzer
+from packaway.violation import ImportRuleViolation
+
+#: Error code reported for violations of this rule.
+CODE = "DEP401"
+
+# Maximum number of decisions memoized by check_import.
+_DECISION_CACHE_SIZE = 65536
 
 
 def _is_private_name(name):
@@ -61,6 +69,118 @@ def _is_valid_import(source_module, target_module):
         return True, ""
 
 
+def check_import(source_module, target_module):
+    """ Return the reasons why an import violates the underscore rule.
+
+    Parameters
+    ----------
+    source_module : str or None
+        Name of the module where the import is written.
+    target_module : str
+        Name of the module being imported, as an absolute name.
+
+    Returns
+    -------
+    reasons : tuple of str
+        Empty if the import is valid.
+    """
+    if source_module is None:
+        return _check_import_from_package(None, target_module)
+
+    if (target_module == source_module
+            or target_module.startswith(source_module + ".")):
+        # The last part of the module name matters only when the target
+        # is within the module itself.
+        is_valid, reason = _is_valid_import(source_module, target_module)
+        return () if is_valid else (reason,)
+
+    source_package, _, _ = source_module.rpartition(".")
+    return _check_import_from_package(source_package or None, target_module)
+
+
+@functools.lru_cache(maxsize=_DECISION_CACHE_SIZE)
+def _check_import_from_package(source_package, target_module):
+    """ Memoized check of an import from any module in a package.
+
+    Whether an import is valid depends on the package of the module where
+    it is written and not on the module itself, unless the import target
+    is within the module. Keying on the package lets all the modules of a
+    package share the decisions.
+
+    Parameters
+    ----------
+    source_package : str or None
+        Name of the package of the module where the import is written.
+        None for top-level modules or if the module is unknown.
+    target_module : str
+        Name of the module being imported, as an absolute name.
+
+    Returns
+    -------
+    reasons : tuple of str
+        Empty if the import is valid.
+    """
+    is_valid, reason = _is_valid_import(source_package, target_module)
+    return () if is_valid else (reason,)
+
+
+def decision_cache_info():
+    """ Return the statistics of the memoized decisions of the rule.
+
+    Returns
+    -------
+    info : functools._CacheInfo
+        Named tuple with the ``hits``, ``misses``, ``maxsize`` and
+        ``currsize`` of the cache.
+    """
+    return _check_import_from_package.cache_info()
+
+
+def clear_decision_cache():
+    """ Clear the memoized decisions of the rule and their statistics. """
+    _check_import_from_package.cache_clear()
+
+
+def build_checker(**options):
+    """ Return the import checker for this rule.
+
+    Parameters
+    ----------
+    **options
+        Rule options. This rule is not configurable and ignores them.
+
+    Returns
+    -------
+    checker : callable(str, str) -> iterable of str
+    """
+    return check_import
+
+
+def iter_errors(tree, module_name=None):
+    """ Iterate over the violations of the rule, as they are found.
+
+    Parameters
+    ----------
+    tree : ast.AST
+        The AST tree to be analyzed.
+    module_name : str or None
+        The absolute module name from which the source represents.
+        Default is None which means unknown. If given, it can be used
+        to analyze absolute imports.
+
+    Yields
+    ------
+    error : ImportRuleViolation
+        Occurrence of import violation.
+    """
+    analyzer = ImportAnalyzer(module_name=module_name)
+    for lineno, col_offset, target in analyzer.iter_imports(tree):
+        for reason in check_import(module_name, target):
+            yield ImportRuleViolation(
+                lineno, col_offset, reason, code=CODE, target=target,
+            )
+
+
 def collect_errors(tree, module_name=None):
     """ Top level function to detect violation of import rules.
 
@@ -76,11 +196,7 @@ def collect_errors(tree, module_name=None):
     Returns
     -------
     errors : list of ImportRuleViolation
-        Occurrences of import violation.
+        Occurrences of import violation. See ``iter_errors`` for not
+        holding them all in memory.
     """
-    analyzer = ImportAnalyzer(
-        module_name=module_name,
-        import_rules=[_is_valid_import],
-    )
-    analyzer.visit(tree)
-    return analyzer._errors
+    return list(iter_errors(tree, module_name))
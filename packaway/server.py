@@ -0,0 +1,305 @@
+""" This module supports checking files in a long-lived server process, so
+that editors and pre-commit hooks do not pay for starting Python, importing
+the checker and compiling the configuration on every check.
+
+The server listens on a Unix domain socket. Clients send requests as JSON
+objects, one per line, and receive one JSON object per line in response:
+
+``{"command": "check", "version": ..., "files": [...]}``
+    Check files. Each file is given as an object with its absolute
+    ``path``, and optionally its ``source`` code (e.g. the unsaved buffer
+    of an editor) and its ``module`` name overriding the one deduced from
+    its path. The response is ``{"results": [...]}`` with the errors of
+    each file, as lists of line number, column offset, error code and
+    message.
+``{"command": "ping"}``
+    Respond with the version, process ID and directory of the server.
+``{"command": "reload"}``
+    Load the configuration again, e.g. after adding re-exports.
+``{"command": "shutdown"}``
+    Stop the server.
+
+Failed requests are answered with ``{"error": message}``. The server loads
+the configuration again by itself when its configuration files change.
+
+Only the standard library is imported here, so that clients start fast.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+
+from packaway import __version__
+
+#: Default path of the socket of the server, relative to the project.
+DEFAULT_SOCKET = os.path.join(".packaway_cache", "server.sock")
+
+# Maximum number of bytes read at a time from the socket.
+_BUFFER_SIZE = 65536
+
+
+class ServerError(Exception):
+    """ Raised when the server cannot answer a request."""
+
+
+def is_supported():
+    """ Return true if Unix domain sockets are supported, e.g. not on
+    Windows.
+    """
+    return hasattr(socket, "AF_UNIX")
+
+
+def request(socket_path, message, timeout=None):
+    """ Send a request to the server and return its response.
+
+    Parameters
+    ----------
+    socket_path : str
+        Path of the socket of the server.
+    message : dict
+        Request, see the module documentation.
+    timeout : float or None, optional
+        Number of seconds to wait for connecting to the server and for
+        each read. Default is to wait indefinitely.
+
+    Returns
+    -------
+    response : dict
+
+    Raises
+    ------
+    OSError
+        If no server is listening on the socket, e.g. FileNotFoundError or
+        ConnectionRefusedError.
+    ServerError
+        If the server answers with an error or an invalid response.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(_encode(message))
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = client.recv(_BUFFER_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    try:
+        response = json.loads(b"".join(chunks).decode("utf-8"))
+    except ValueError:
+        raise ServerError("Invalid response from the server.") from None
+    if not isinstance(response, dict):
+        raise ServerError("Invalid response from the server.")
+    if "error" in response:
+        raise ServerError(response["error"])
+    return response
+
+
+def _encode(message):
+    """ Encode a request or response as a line of JSON. """
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """ Handler of the requests of a connection, until it is closed."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                message = json.loads(line.decode("utf-8"))
+                if not isinstance(message, dict):
+                    raise ValueError("Expected a JSON object.")
+                response = self.server.respond(message)
+            except (ServerError, ValueError, TypeError, KeyError) as error:
+                response = {"error": f"{type(error).__name__}: {error}"}
+            self.wfile.write(_encode(response))
+            self.wfile.flush()
+            if response.get("shutdown"):
+                # shutdown waits for serve_forever, which runs in another
+                # thread.
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+if is_supported():
+
+    class CheckServer(socketserver.ThreadingMixIn,
+                      socketserver.UnixStreamServer):
+        """ Server checking files with a checker kept in memory.
+
+        Connections are handled in threads, and files are checked one at a
+        time.
+
+        Parameters
+        ----------
+        socket_path : str
+            Path of the socket to listen on. A socket left by a server that
+            no longer runs is replaced.
+        load_checker : callable() -> FileChecker
+            Function loading the configuration and creating the checker,
+            called again when the configuration changes.
+        config_files : iterable of str, optional
+            Paths of the configuration files, whose changes are detected
+            by their modification time and size.
+
+        Raises
+        ------
+        OSError
+            If another server is listening on the socket.
+        """
+
+        daemon_threads = True
+
+        def __init__(self, socket_path, load_checker, config_files=()):
+            self._load_checker = load_checker
+            self._config_files = tuple(
+                os.path.abspath(path) for path in config_files
+            )
+            self._lock = threading.Lock()
+            self._bound = False
+            self._directory = os.getcwd()
+            self._signature = _signature(self._config_files)
+            self.checker = load_checker()
+            directory = os.path.dirname(socket_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            super().__init__(socket_path, _RequestHandler)
+
+        def server_bind(self):
+            if os.path.exists(self.server_address):
+                try:
+                    request(self.server_address, {"command": "ping"}, 1)
+                except (OSError, ServerError):
+                    os.unlink(self.server_address)
+                else:
+                    raise OSError(
+                        f"A server is already listening on "
+                        f"{self.server_address!r}."
+                    )
+            # Only the user may send files to check: the socket is created
+            # without permissions for others, so that no one else can
+            # connect before its mode is set.
+            umask = os.umask(0o077)
+            try:
+                super().server_bind()
+            finally:
+                os.umask(umask)
+            self._bound = True
+            os.chmod(self.server_address, 0o600)
+
+        def server_close(self):
+            super().server_close()
+            # Also called when binding fails, e.g. because another server
+            # listens on the socket.
+            if not self._bound:
+                return
+            self._bound = False
+            try:
+                os.unlink(self.server_address)
+            except FileNotFoundError:
+                pass
+
+        def respond(self, message):
+            """ Answer a request, see the module documentation.
+
+            Parameters
+            ----------
+            message : dict
+                Request.
+
+            Returns
+            -------
+            response : dict
+            """
+            command = message.get("command", "check")
+            if command == "check":
+                version = message.get("version", __version__)
+                if version != __version__:
+                    raise ServerError(
+                        f"The server runs version {__version__}, not "
+                        f"{version}."
+                    )
+                with self._lock:
+                    self._reload_if_changed()
+                    return {
+                        "results": [
+                            self._check(file) for file in message["files"]
+                        ],
+                    }
+            if command == "ping":
+                return {
+                    "version": __version__,
+                    "pid": os.getpid(),
+                    "directory": self._directory,
+                }
+            if command == "reload":
+                with self._lock:
+                    self.checker = self._load_checker()
+                    self._signature = _signature(self._config_files)
+                return {}
+            if command == "shutdown":
+                return {"shutdown": True}
+            raise ServerError(f"Unknown command {command!r}.")
+
+        def _reload_if_changed(self):
+            """ Load the configuration again if a configuration file
+            changed.
+            """
+            signature = _signature(self._config_files)
+            if signature != self._signature:
+                self.checker = self._load_checker()
+                self._signature = signature
+
+        def _check(self, file):
+            """ Check a file of a request.
+
+            Parameters
+            ----------
+            file : dict
+                Path, and optionally source code and module name, of the
+                file.
+
+            Returns
+            -------
+            errors : list of tuple(int, int, str, str)
+                Line number, column offset, error code and message of each
+                error.
+            """
+            filename = _relative_path(file["path"], self._directory)
+            module_name = file.get("module")
+            source = file.get("source")
+            if source is None:
+                errors = self.checker.check(filename, module_name)
+            else:
+                errors = self.checker.check_source(
+                    source, filename, module_name,
+                )
+            return [error[1:5] for error in errors]
+
+
+def _signature(paths):
+    """ Return the modification time and size of files, None for the files
+    that do not exist.
+    """
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return signature
+
+
+def _relative_path(path, directory):
+    """ Return the path of a file relative to the directory of the server,
+    from which module names are deduced, if the file is in it.
+    """
+    relative = os.path.relpath(path, directory)
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        return path
+    return relative
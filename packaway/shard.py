@@ -0,0 +1,186 @@
+""" This module supports splitting the files of a project into shards checked
+by separate runs, e.g. on several CI machines.
+
+Every run computes the same assignment of files to shards from the same
+files, so that each file is checked by exactly one shard. Files are
+identified by a key that does not depend on the machine: their module name
+if module names are deduced, otherwise their path.
+"""
+
+import hashlib
+import heapq
+import os
+import tempfile
+
+# First line of weights files, with the version of their layout.
+_WEIGHTS_MAGIC = "packaway-weights 1\n"
+
+
+def parse_shard(text):
+    """ Parse a shard given as ``K/N``.
+
+    Parameters
+    ----------
+    text : str
+        Shard number K, from 1, and number of shards N, e.g. "3/8".
+
+    Returns
+    -------
+    shard : tuple(int, int)
+        Index of the shard, from 0, and number of shards.
+
+    Raises
+    ------
+    ValueError
+        If the text is not a valid shard.
+    """
+    number, separator, count = text.partition("/")
+    try:
+        if not separator:
+            raise ValueError
+        number = int(number)
+        count = int(count)
+    except ValueError:
+        raise ValueError(
+            f"Invalid shard {text!r}, expected K/N, e.g. 1/4."
+        ) from None
+    if not 1 <= number <= count:
+        raise ValueError(
+            f"Invalid shard {text!r}, K must be between 1 and N."
+        )
+    return number - 1, count
+
+
+def format_shard(shard):
+    """ Format a shard as ``K/N``, the inverse of ``parse_shard``. """
+    index, count = shard
+    return f"{index + 1}/{count}"
+
+
+def stable_hash(key):
+    """ Return a hash of a key that is the same in every process.
+
+    Parameters
+    ----------
+    key : str
+
+    Returns
+    -------
+    value : int
+        Unsigned 64-bit integer.
+    """
+    digest = hashlib.blake2b(
+        key.encode("utf-8", "surrogatepass"), digest_size=8,
+    ).digest()
+    return int.from_bytes(digest, "little")
+
+
+def assign_shards(keys, n_shards, weights=None):
+    """ Assign files to shards.
+
+    Without weights, a file is assigned by the stable hash of its key, so
+    that files keep their shard when others are added or removed. With
+    weights, e.g. the sizes of the files in a previous run, the files are
+    assigned from the heaviest to the shard with the least total weight so
+    far (longest processing time first), so that the total weights of the
+    shards differ by at most the weight of the heaviest file. Files without
+    a weight are given the mean weight.
+
+    Parameters
+    ----------
+    keys : list of str
+        Key of each file.
+    n_shards : int
+        Number of shards.
+    weights : dict(str, int) or None, optional
+        Weight of the files, by key.
+
+    Returns
+    -------
+    shards : list of int
+        Index of the shard of each file.
+    """
+    hashes = [stable_hash(key) for key in keys]
+    if not weights:
+        return [value % n_shards for value in hashes]
+
+    default = sum(weights.values()) / len(weights)
+    # Ties are broken by hash and key, so that the order does not depend on
+    # the order of the files.
+    order = sorted(
+        range(len(keys)),
+        key=lambda index: (
+            -weights.get(keys[index], default), hashes[index], keys[index],
+        ),
+    )
+    loads = [(0, shard) for shard in range(n_shards)]
+    shards = [0] * len(keys)
+    for index in order:
+        load, shard = heapq.heappop(loads)
+        shards[index] = shard
+        heapq.heappush(
+            loads, (load + weights.get(keys[index], default), shard),
+        )
+    return shards
+
+
+def load_weights(path):
+    """ Read a weights file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, see ``save_weights``.
+
+    Returns
+    -------
+    weights : dict(str, int)
+        Weight of the files, by key.
+
+    Raises
+    ------
+    OSError
+        If the file cannot be read.
+    ValueError
+        If the file is not a weights file.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        if file.readline() != _WEIGHTS_MAGIC:
+            raise ValueError(f"{path!r} is not a packaway weights file.")
+        weights = {}
+        for lineno, line in enumerate(file, start=2):
+            key, separator, weight = line.rstrip("\n").rpartition("\t")
+            try:
+                if not separator:
+                    raise ValueError
+                weights[key] = int(weight)
+            except ValueError:
+                raise ValueError(
+                    f"Invalid line {lineno} of weights file {path!r}."
+                ) from None
+    return weights
+
+
+def save_weights(path, weights):
+    """ Write a weights file, atomically.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    weights : iterable of tuple(str, int)
+        Key and weight of each file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=".weights-", suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(_WEIGHTS_MAGIC)
+            for key, weight in weights:
+                file.write(f"{key}\t{weight}\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,483 @@
+""" This module supports opt-in instrumentation of the time spent and the
+work done by each rule and each phase of checking files.
+
+Statistics are recorded by the process that enabled them and by the
+worker processes it starts. Each worker saves its statistics to a shared
+directory when it exits, and ``collect`` merges them together.
+"""
+
+import heapq
+import json
+import multiprocessing.util
+import os
+import shutil
+import tempfile
+import time
+
+from packaway.rules import regex_rule, underscore_rule
+
+#: Default number of slowest files kept in the statistics.
+DEFAULT_N_SLOWEST_FILES = 10
+
+
+# Priority of saving the statistics of a worker process when it exits.
+_EXIT_PRIORITY = 10
+
+# Suffix of the files holding the statistics of worker processes.
+_WORKER_SUFFIX = ".json"
+
+# Statistics of the current process, or None if disabled.
+_current = None
+
+# ID of the process owning _current.
+_current_pid = None
+
+# Directory where worker processes save their statistics.
+_directory = None
+
+# Whether the current process created _directory.
+_owns_directory = False
+
+# Statistics of the memoized decisions of the rules when recording started.
+_memo_baseline = None
+
+
+class Stats:
+    """ Statistics of checking files.
+
+    Parameters
+    ----------
+    n_slowest_files : int, optional
+        Number of slowest files kept.
+    """
+
+    def __init__(self, n_slowest_files=DEFAULT_N_SLOWEST_FILES):
+        self.n_slowest_files = n_slowest_files
+        # Mapping from name to [number of calls, seconds].
+        self.timers = {}
+        # Mapping from name to count.
+        self.counters = {}
+        # Heap of (seconds, filename) of the slowest files.
+        self.slowest_files = []
+        self.n_processes = 1
+
+    def __repr__(self):
+        return (
+            f"Stats(timers={self.timers!r}, counters={self.counters!r})"
+        )
+
+    def add_time(self, name, seconds, calls=1):
+        """ Record time spent.
+
+        Parameters
+        ----------
+        name : str
+            Name of the rule or phase, e.g. "DEP401" or "parse".
+        seconds : float
+            Time spent.
+        calls : int, optional
+            Number of calls the time was spent in.
+        """
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = [0, 0.0]
+        timer[0] += calls
+        timer[1] += seconds
+
+    def count(self, name, value=1):
+        """ Increment a counter.
+
+        Parameters
+        ----------
+        name : str
+            Name of the counter, e.g. "imports".
+        value : int, optional
+            Increment.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_file(self, filename, seconds):
+        """ Record the time spent checking a file.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the file.
+        seconds : float
+            Time spent.
+        """
+        self.add_time("file", seconds)
+        self._add_slowest_file(seconds, filename)
+
+    def timed(self, name):
+        """ Return a context manager recording the time spent in it.
+
+        Parameters
+        ----------
+        name : str
+            Name of the rule or phase.
+        """
+        return _Timer(self, name)
+
+    def timed_checker(self, code, checker):
+        """ Wrap a rule checker for recording the time spent in it.
+
+        Parameters
+        ----------
+        code : str
+            Error code of the rule.
+        checker : callable(str, str) -> iterable of str
+            Rule checker, see ``engine.build_checkers``.
+
+        Returns
+        -------
+        checker : callable(str, str) -> list of str
+        """
+        timer = self.timers.get(code)
+        if timer is None:
+            timer = self.timers[code] = [0, 0.0]
+        perf_counter = time.perf_counter
+
+        def timed_checker(source_module, target_module):
+            start = perf_counter()
+            try:
+                return list(checker(source_module, target_module))
+            finally:
+                timer[0] += 1
+                timer[1] += perf_counter() - start
+
+        return timed_checker
+
+    def merge(self, other):
+        """ Add the statistics of another process.
+
+        Parameters
+        ----------
+        other : Stats
+        """
+        for name, (calls, seconds) in other.timers.items():
+            self.add_time(name, seconds, calls)
+        for name, value in other.counters.items():
+            self.count(name, value)
+        for seconds, filename in other.slowest_files:
+            self._add_slowest_file(seconds, filename)
+        self.n_processes += other.n_processes
+
+    def _add_slowest_file(self, seconds, filename):
+        """ Keep a file if it is among the slowest ones. """
+        item = (seconds, filename)
+        if len(self.slowest_files) < self.n_slowest_files:
+            heapq.heappush(self.slowest_files, item)
+        elif item > self.slowest_files[0]:
+            heapq.heapreplace(self.slowest_files, item)
+
+    def to_dict(self):
+        """ Return the statistics as a JSON-serializable dictionary.
+
+        Returns
+        -------
+        data : dict
+        """
+        return {
+            "processes": self.n_processes,
+            "timers": {
+                name: {"calls": calls, "seconds": seconds}
+                for name, (calls, seconds) in sorted(self.timers.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "slowest_files": [
+                {"filename": filename, "seconds": seconds}
+                for seconds, filename in sorted(
+                    self.slowest_files, reverse=True,
+                )
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """ Create statistics from the output of ``to_dict``.
+
+        Parameters
+        ----------
+        data : dict
+
+        Returns
+        -------
+        stats : Stats
+        """
+        stats = cls()
+        stats.n_processes = data["processes"]
+        stats.timers = {
+            name: [timer["calls"], timer["seconds"]]
+            for name, timer in data["timers"].items()
+        }
+        stats.counters = dict(data["counters"])
+        stats.slowest_files = [
+            (item["seconds"], item["filename"])
+            for item in data["slowest_files"]
+        ]
+        heapq.heapify(stats.slowest_files)
+        return stats
+
+    def summary(self):
+        """ Return a human readable summary.
+
+        Returns
+        -------
+        lines : list of str
+        """
+        lines = [
+            f"{'packaway':<30} {'calls':>10} {'seconds':>10}",
+        ]
+        for name, (calls, seconds) in sorted(self.timers.items()):
+            lines.append(f"{name:<30} {calls:>10} {seconds:>10.3f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<30} {value:>10}")
+        lines.append(f"{'processes':<30} {self.n_processes:>10}")
+        for seconds, filename in sorted(self.slowest_files, reverse=True):
+            lines.append(f"{'slowest file':<30} {seconds:>21.3f} {filename}")
+        return lines
+
+
+class _NullTimer:
+    """ Context manager doing nothing, used when statistics are disabled.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+# Shared instance of _NullTimer.
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """ Context manager recording the time spent in it. """
+
+    __slots__ = ("_stats", "_name", "_start")
+
+    def __init__(self, stats, name):
+        self._stats = stats
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stats.add_time(self._name, time.perf_counter() - self._start)
+
+
+def enable(directory=None):
+    """ Start recording statistics in the current process.
+
+    Parameters
+    ----------
+    directory : str or None, optional
+        Directory where the statistics of worker processes are saved, as
+        returned by ``directory``. If None, a new directory is created and
+        the current process collects the statistics of its workers. If
+        given, the current process is a worker saving its statistics there
+        when it exits.
+    """
+    global _current, _current_pid, _directory, _owns_directory
+    global _memo_baseline
+    disable()
+    if directory is None:
+        _directory = tempfile.mkdtemp(prefix="packaway-stats-")
+        _owns_directory = True
+        _current = Stats()
+        _current_pid = os.getpid()
+        _memo_baseline = _memo_infos()
+    else:
+        _directory = directory
+        _owns_directory = False
+        _start_worker()
+
+
+def disable():
+    """ Stop recording statistics and discard them. """
+    global _current, _current_pid, _directory, _owns_directory
+    global _memo_baseline
+    if _owns_directory and _current_pid == os.getpid():
+        shutil.rmtree(_directory, ignore_errors=True)
+    _current = None
+    _current_pid = None
+    _directory = None
+    _owns_directory = False
+    _memo_baseline = None
+
+
+def current():
+    """ Return the statistics of the current process.
+
+    Returns
+    -------
+    stats : Stats or None
+        None if statistics are not enabled.
+    """
+    if _current is None:
+        return None
+    if _current_pid != os.getpid():
+        # A worker process forked from the process recording statistics.
+        _start_worker()
+    return _current
+
+
+def directory():
+    """ Return the directory where worker processes save their statistics.
+
+    Returns
+    -------
+    directory : str or None
+        None if statistics are not enabled.
+    """
+    return _directory
+
+
+def timed(name):
+    """ Return a context manager recording the time spent in it, if
+    statistics are enabled.
+
+    Parameters
+    ----------
+    name : str
+        Name of the rule or phase.
+    """
+    stats = current()
+    if stats is None:
+        return _NULL_TIMER
+    return stats.timed(name)
+
+
+def count(name, value=1):
+    """ Increment a counter, if statistics are enabled.
+
+    Parameters
+    ----------
+    name : str
+        Name of the counter.
+    value : int, optional
+        Increment.
+    """
+    stats = current()
+    if stats is not None:
+        stats.count(name, value)
+
+
+def collect():
+    """ Return the statistics of the current process merged with the ones
+    saved by worker processes that have exited.
+
+    Returns
+    -------
+    stats : Stats or None
+        None if statistics are not enabled.
+    """
+    stats = current()
+    if stats is None:
+        return None
+    collected = Stats(stats.n_slowest_files)
+    collected.n_processes = 0
+    collected.merge(_snapshot(stats, _memo_baseline))
+    for name in sorted(os.listdir(_directory)):
+        if not name.endswith(_WORKER_SUFFIX):
+            continue
+        try:
+            with open(os.path.join(_directory, name)) as file:
+                collected.merge(Stats.from_dict(json.load(file)))
+        except (OSError, ValueError, KeyError):
+            continue
+    return collected
+
+
+def write_report(path, stats):
+    """ Write statistics to a JSON file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    stats : Stats
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(stats.to_dict(), file, indent=2)
+        file.write("\n")
+
+
+def _start_worker():
+    """ Start new statistics for a worker process, saved when the process
+    exits.
+    """
+    global _current, _current_pid, _memo_baseline
+    _current = Stats()
+    _current_pid = os.getpid()
+    _memo_baseline = _memo_infos()
+    multiprocessing.util.Finalize(
+        None, _save_worker, args=(_current, _directory, _memo_baseline),
+        exitpriority=_EXIT_PRIORITY,
+    )
+
+
+def _save_worker(stats, directory, memo_baseline):
+    """ Save the statistics of a worker process.
+
+    Parameters
+    ----------
+    stats : Stats
+    directory : str
+        Directory shared with the process collecting the statistics.
+    memo_baseline : dict(str, functools._CacheInfo)
+        Statistics of the memoized decisions of the rules when recording
+        started, see ``_memo_infos``.
+    """
+    path = os.path.join(directory, f"{os.getpid()}{_WORKER_SUFFIX}")
+    try:
+        write_report(path, _snapshot(stats, memo_baseline))
+    except OSError:
+        pass
+
+
+def _snapshot(stats, memo_baseline):
+    """ Return the statistics with the counters of memoized decisions.
+
+    Parameters
+    ----------
+    stats : Stats
+    memo_baseline : dict(str, functools._CacheInfo)
+        Statistics of the memoized decisions of the rules when recording
+        started, see ``_memo_infos``.
+
+    Returns
+    -------
+    stats : Stats
+        A copy of the statistics.
+    """
+    snapshot = Stats.from_dict(stats.to_dict())
+    for code, info in _memo_infos().items():
+        baseline = memo_baseline[code]
+        snapshot.count(f"{code} memo hits", info.hits - baseline.hits)
+        snapshot.count(
+            f"{code} memo misses", info.misses - baseline.misses,
+        )
+    return snapshot
+
+
+def _memo_infos():
+    """ Return the statistics of the memoized decisions of the rules.
+
+    Returns
+    -------
+    infos : dict(str, functools._CacheInfo)
+        Statistics by error code: the DEP401 decisions, and the DEP501
+        matches of the disallowed patterns.
+    """
+    return {
+        underscore_rule.CODE: underscore_rule.decision_cache_info(),
+        regex_rule.CODE: regex_rule.match_cache_info(),
+    }
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from packaway.baseline import Baseline, baseline_path, fingerprint
+
+
+class TestFingerprint(unittest.TestCase):
+    """ Test the fingerprints of violations."""
+
+    def test_normalized_line(self):
+        expected = fingerprint("package", "DEP401", "a._b", "import a._b")
+        for line in [
+                "import a._b",
+                "  import   a._b  ",
+                "import a._b  # comment",
+                "import a._b\n"]:
+            with self.subTest(line=line):
+                self.assertEqual(
+                    fingerprint("package", "DEP401", "a._b", line), expected,
+                )
+
+    def test_distinct(self):
+        expected = fingerprint("package", "DEP401", "a._b", "import a._b")
+        for args in [
+                (None, "DEP401", "a._b", "import a._b"),
+                ("other", "DEP401", "a._b", "import a._b"),
+                ("package", "DEP501", "a._b", "import a._b"),
+                ("package", "DEP401", "a._c", "import a._b"),
+                ("package", "DEP401", "a._b", "import a._b, a._c")]:
+            with self.subTest(args=args):
+                self.assertNotEqual(fingerprint(*args), expected)
+
+    def test_range(self):
+        value = fingerprint("package", "DEP401", "a._b", "import a._b")
+        self.assertTrue(0 <= value < 2 ** 64)
+
+
+class TestBaseline(unittest.TestCase):
+    """ Test recording and matching violations in a baseline."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "baseline")
+        self.errors = [
+            ("./package/a.py", 1, 0, "DEP401", "Message.", 1),
+            ("./package/a.py", 2, 0, "DEP401", "Message.", 2 ** 64 - 1),
+            ("./package/a.py", 3, 0, "E999", "SyntaxError", None),
+            ("package/b.py", 1, 0, "DEP501", "Message.", 3),
+        ]
+
+    def test_from_errors(self):
+        baseline = Baseline.from_errors(self.errors)
+        self.assertEqual(
+            baseline.entries,
+            {"package/a.py": {1, 2 ** 64 - 1}, "package/b.py": {3}},
+        )
+        self.assertEqual(len(baseline), 3)
+
+    def test_save_load(self):
+        Baseline.from_errors(self.errors).save(self.path)
+        baseline = Baseline.load(self.path)
+        self.assertEqual(
+            baseline.entries,
+            {"package/a.py": {1, 2 ** 64 - 1}, "package/b.py": {3}},
+        )
+
+    def test_load_empty(self):
+        Baseline().save(self.path)
+        self.assertEqual(Baseline.load(self.path).entries, {})
+
+    def test_load_invalid(self):
+        Baseline.from_errors(self.errors).save(self.path)
+        with open(self.path, "rb") as file:
+            data = file.read()
+        for content in [b"", b"not a baseline", data[:-1], data[:-9]]:
+            with self.subTest(content=content):
+                with open(self.path, "wb") as file:
+                    file.write(content)
+                with self.assertRaises(ValueError):
+                    Baseline.load(self.path)
+
+    def test_filter(self):
+        baseline = Baseline({"package/a.py": {1, 4}, "package/c.py": {5}})
+        errors = list(baseline.filter(self.errors))
+        self.assertEqual(
+            errors,
+            [error[:5] for error in self.errors[1:]],
+        )
+
+    def test_stale(self):
+        baseline = Baseline({
+            "package/a.py": {1, 4, 6},
+            "package/b.py": {3},
+            "missing/c.py": {5},
+            os.path.relpath(__file__).replace(os.sep, "/"): {7},
+        })
+        list(baseline.filter(self.errors))
+        self.assertEqual(
+            baseline.stale(["package/a.py", "package/b.py"]),
+            {"missing/c.py": 1, "package/a.py": 2},
+        )
+
+    def test_baseline_path(self):
+        self.assertEqual(
+            baseline_path(os.path.join(".", "package", "a.py")),
+            "package/a.py",
+        )
+        self.assertEqual(
+            baseline_path(os.path.abspath(os.path.join("package", "a.py"))),
+            "package/a.py",
+        )
@@ -0,0 +1,99 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import tempfile
+import unittest
+
+from packaway.cache import ResultCache, rules_fingerprint
+from packaway.rules.regex_rule import DisallowedMatcher
+
+
+def _write_entry(directory, key, index):
+    ResultCache(directory).set(key, [(index, 0, "DEP401", "Message.")])
+
+
+class TestResultCache(unittest.TestCase):
+    """ Test the persistent cache of errors."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.directory = os.path.join(tmp_dir.name, "cache")
+
+    def test_get_set(self):
+        cache = ResultCache(self.directory)
+        key = cache.key(b"import _a", "package.module", "config")
+        self.assertIsNone(cache.get(key))
+
+        cache.set(key, [(1, 0, "DEP401", "Message.")])
+
+        self.assertEqual(cache.get(key), [(1, 0, "DEP401", "Message.")])
+        self.assertEqual(
+            ResultCache(self.directory).get(key),
+            [(1, 0, "DEP401", "Message.")],
+        )
+        self.assertTrue(
+            os.path.exists(os.path.join(self.directory, "CACHEDIR.TAG"))
+        )
+
+    def test_key(self):
+        key = ResultCache.key(b"import a", "module", "config")
+        self.assertEqual(key, ResultCache.key("import a", "module", "config"))
+        self.assertNotEqual(
+            key, ResultCache.key(b"import b", "module", "config")
+        )
+        self.assertNotEqual(key, ResultCache.key(b"import a", None, "config"))
+        self.assertNotEqual(key, ResultCache.key(b"import a", "module", "x"))
+
+    def test_unwritable_directory_ignored(self):
+        with tempfile.NamedTemporaryFile() as file:
+            cache = ResultCache(os.path.join(file.name, "cache"))
+            cache.set("key", [])
+            self.assertIsNone(cache.get("key"))
+
+    def test_prune_least_recently_used(self):
+        cache = ResultCache(self.directory, max_entries=2)
+        keys = [cache.key(f"{i}", None, "") for i in range(4)]
+        for mtime, key in enumerate(keys):
+            cache.set(key, [])
+            os.utime(cache._entry_path(key), (mtime, mtime))
+        # Reading an entry marks it as recently used.
+        cache.get(keys[0])
+
+        self.assertEqual(cache.prune(), 2)
+
+        self.assertEqual(cache.get(keys[0]), [])
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNone(cache.get(keys[2]))
+        self.assertEqual(cache.get(keys[3]), [])
+
+    def test_prune_missing_directory(self):
+        self.assertEqual(ResultCache(self.directory).prune(), 0)
+
+    def test_concurrent_writes(self):
+        key = ResultCache.key(b"", None, "")
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(
+                _write_entry,
+                [self.directory] * 20, [key] * 20, range(20),
+            ))
+
+        errors = ResultCache(self.directory).get(key)
+        self.assertEqual(len(errors), 1)
+        entries_dir = os.path.dirname(
+            ResultCache(self.directory)._entry_path(key)
+        )
+        self.assertEqual(os.listdir(entries_dir), [key + ".json"])
+
+
+class TestRulesFingerprint(unittest.TestCase):
+    """ Test the fingerprint of the rules used in cache keys."""
+
+    def test_depends_on_patterns(self):
+        fingerprint = rules_fingerprint((DisallowedMatcher(["web"]),))
+        self.assertEqual(
+            fingerprint, rules_fingerprint((DisallowedMatcher(["web"]),))
+        )
+        self.assertNotEqual(
+            fingerprint, rules_fingerprint((DisallowedMatcher(["gui"]),))
+        )
+        self.assertNotEqual(fingerprint, rules_fingerprint(()))
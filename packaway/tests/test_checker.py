@@ -0,0 +1,257 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from packaway import checker as checker_module
+from packaway.cache import ResultCache
+from packaway.checker import FileChecker, format_error
+from packaway.config import CompiledConfig
+
+
+class TestFileChecker(unittest.TestCase):
+    """ Test checking Python files outside of flake8."""
+
+    def test_check_source(self):
+        checker = FileChecker(
+            disallowed_patterns=[("package/*", r".*gui.*")],
+        )
+        source = "\n".join([
+            "from package.gui import _name",
+            "import package.api",
+        ])
+        errors = checker.check_source(
+            source, os.path.join("package", "module.py")
+        )
+        self.assertEqual(
+            [error[1:4] for error in errors],
+            [(1, 0, "DEP401"), (1, 0, "DEP501")],
+        )
+
+    def test_rules_depend_on_filename(self):
+        checker = FileChecker(
+            disallowed_patterns=[("package/*", r".*gui.*")],
+        )
+        errors = checker.check_source("import gui", "module.py")
+        self.assertEqual(errors, [])
+
+    def test_module_name(self):
+        checker = FileChecker(top_level_dir="src")
+        self.assertEqual(
+            checker.module_name(os.path.join("src", "package", "module.py")),
+            "package.module",
+        )
+        checker = FileChecker(deduce_path=False)
+        self.assertIsNone(checker.module_name("module.py"))
+
+    def test_shared_config(self):
+        config = CompiledConfig(
+            disallowed_patterns=[("package/*", r".*gui.*")],
+        )
+        first = FileChecker(config=config)
+        second = FileChecker(config=config, disallowed_patterns=[])
+        self.assertIs(second.config, first.config)
+        self.assertEqual(
+            second.check_source("import gui", "package/module.py"),
+            first.check_source("import gui", "package/module.py"),
+        )
+        self.assertEqual(
+            len(first.check_source("import gui", "package/module.py")), 1,
+        )
+
+    def test_module_name_given(self):
+        errors = FileChecker().check_source(
+            "from package import _name", "other/module.py", "package.module",
+        )
+        self.assertEqual(errors, [])
+
+    def test_noqa(self):
+        checker = FileChecker(disallowed_patterns=[("*", "web")])
+        sources = [
+            "import web._api  # noqa",
+            "import web._api  # noqa: DEP401,DEP501",
+            "import web._api  # NOQA:DEP",
+        ]
+        for source in sources:
+            with self.subTest(source=source):
+                errors = checker.check_source(source, "module.py")
+                self.assertEqual(errors, [])
+
+        errors = checker.check_source(
+            "import web._api  # noqa: DEP401", "module.py"
+        )
+        self.assertEqual([error[3] for error in errors], ["DEP501"])
+
+    def test_per_file_ignores(self):
+        checker = FileChecker(
+            per_file_ignores=[("tests/*", ("DEP4",))],
+        )
+        errors = checker.check_source(
+            "import package._name", os.path.join("tests", "test.py")
+        )
+        self.assertEqual(errors, [])
+
+    def test_syntax_error(self):
+        checker = FileChecker()
+        errors = checker.check_source("import (", "module.py")
+        self.assertEqual([error[3] for error in errors], ["E999"])
+
+    def test_prefilter(self):
+        source = "import os\nfrom package.api import name\nx = (\n"
+        with mock.patch.object(
+                checker_module, "parse_imports",
+                wraps=checker_module.parse_imports) as parse_imports:
+            errors = FileChecker().check_source(source, "module.py")
+            self.assertEqual(parse_imports.call_count, 0)
+        self.assertEqual(errors, [])
+
+        errors = FileChecker(prefilter=False).check_source(
+            source, "module.py"
+        )
+        self.assertEqual([error[3] for error in errors], ["E999"])
+
+    def test_prefilter_falls_back_to_parsing(self):
+        source = "import os; import package._name\n"
+        errors = FileChecker().check_source(source, "module.py")
+        self.assertEqual([error[1:4] for error in errors], [(1, 11, "DEP401")])
+
+    def test_check_missing_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "missing.py")
+            errors = FileChecker().check(filename)
+        self.assertEqual([error[3] for error in errors], ["E902"])
+
+    def test_cached_results(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checker = FileChecker(cache=ResultCache(tmp_dir))
+            source = b"import a._b\nimport c._d  # noqa\n"
+            expected = checker.check_source(source, "module.py")
+
+            with mock.patch.object(
+                    checker_module, "_collect_errors",
+                    wraps=checker_module._collect_errors) as collect_errors:
+                actual = checker.check_source(source, "module.py")
+                self.assertEqual(collect_errors.call_count, 0)
+
+                checker.check_source(source + b"\n", "module.py")
+                self.assertEqual(collect_errors.call_count, 1)
+
+        self.assertEqual(actual, expected)
+        self.assertEqual([error[1] for error in actual], [1])
+
+    def test_fingerprints(self):
+        checker = FileChecker(fingerprints=True)
+        errors = checker.check_source(
+            "import a._b\nimport c._d  # comment\nx = (\n",
+            os.path.join("package", "module.py"),
+        )
+        self.assertEqual([len(error) for error in errors], [6])
+        self.assertEqual(errors[0][3], "E999")
+        self.assertIsNone(errors[0][5])
+
+        errors = checker.check_source(
+            "import a._b\nimport c._d  # comment\n",
+            os.path.join("package", "module.py"),
+        )
+        shifted = checker.check_source(
+            "import os\n\nimport a._b\nimport  c._d\n",
+            os.path.join("package", "module.py"),
+        )
+        self.assertEqual(
+            [error[5] for error in errors],
+            [error[5] for error in shifted],
+        )
+        self.assertNotEqual(errors[0][5], errors[1][5])
+        self.assertEqual(
+            len(FileChecker().check_source("import a._b", "module.py")[0]),
+            5,
+        )
+
+    def test_max_file_size(self):
+        source = "import os\nimport a._b\nimport c._d  # noqa\n"
+        expected = FileChecker(fingerprints=True).check_source(
+            source, "module.py",
+        )
+        checker = FileChecker(max_file_size=10, fingerprints=True)
+        with mock.patch.object(
+                checker_module, "parse_imports",
+                wraps=checker_module.parse_imports) as parse_imports:
+            errors = checker.check_source(source, "module.py")
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                filename = os.path.join(tmp_dir, "module.py")
+                with open(filename, "w") as file:
+                    file.write(source)
+                self.assertEqual(
+                    [error[:5] for error in checker.check(filename)[1:]],
+                    [(filename,) + error[1:5] for error in expected],
+                )
+            self.assertEqual(parse_imports.call_count, 0)
+
+        self.assertEqual(errors[1:], expected)
+        self.assertEqual(errors[0][1:4], (1, 0, "DEP901"))
+        self.assertEqual(
+            errors[0][4],
+            "Only the import statements are checked: the file has 42 "
+            "bytes, over the budget of 10 bytes.",
+        )
+        self.assertEqual(
+            FileChecker(max_file_size=42).check_source(source, "module.py"),
+            [error[:5] for error in expected],
+        )
+
+    def test_max_file_size_ignored(self):
+        checker = FileChecker(
+            max_file_size=0, per_file_ignores=[("*", ("DEP9",))],
+        )
+        errors = checker.check_source("import a._b\n", "module.py")
+        self.assertEqual([error[3] for error in errors], ["DEP401"])
+
+        errors = FileChecker(max_file_size=0).check_source(
+            b"# coding: unknown\nimport a._b\n", "module.py",
+        )
+        self.assertEqual([error[3] for error in errors], ["E999"])
+
+    def test_max_file_time(self):
+        source = "import a._b\n" * 100
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.object(
+                checker_module, "_DEFAULT_PARSE_RATE", 1000):
+            checker = FileChecker(max_file_time=1, cache=ResultCache(tmp_dir))
+            errors = checker.check_source(source, "module.py")
+            self.assertEqual(len(errors), 101)
+            self.assertEqual(
+                errors[0][4],
+                "Only the import statements are checked: parsing the file "
+                "is estimated to take 1.2 s, over the budget of 1 s.",
+            )
+            self.assertEqual(
+                len(checker.check_source(source[:960], "module.py")), 80,
+            )
+            # Not cached.
+            self.assertEqual(
+                checker.check_source(source, "module.py"), errors,
+            )
+
+    def test_max_file_time_measured(self):
+        checker = FileChecker(max_file_time=1.0)
+        with mock.patch.object(checker_module, "_MIN_MEASURED_BYTES", 10):
+            checker.check_source("import a._b\n", "module.py")
+            self.assertLess(checker._parse_budget.estimate(100), 0.01)
+        budget = checker_module._ParseBudget(1.0)
+        budget.record(1 << 20, 2.0)
+        self.assertEqual(budget.estimate(1 << 19), 1.0)
+        self.assertTrue(budget.allows(1 << 19))
+        self.assertFalse(budget.allows(1 << 20))
+
+    def test_scan_stopped(self):
+        checker = FileChecker(max_file_size=0, max_file_time=0)
+        errors = checker.check_source("import a._b\n", "module.py")
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0][4].endswith(
+            " The scan stopped at line 1, over the time budget."
+        ))
+
+    def test_format_error(self):
+        self.assertEqual(
+            format_error(("module.py", 1, 0, "DEP401", "Message.")),
+            "module.py:1:1: DEP401 Message.",
+        )
@@ -0,0 +1,275 @@
+import fnmatch
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from packaway.config import (
+    CompiledConfig,
+    compile_disallowed_patterns,
+    FilePatternMatcher,
+    parse_contracts,
+    parse_disallowed_patterns,
+    parse_per_file_ignores,
+    read_config,
+)
+
+
+class TestFilePatternMatcher(unittest.TestCase):
+    """ Test resolving values applied to files using file patterns."""
+
+    def test_same_as_fnmatch(self):
+        file_patterns = [
+            "business/*",
+            "business/subpackage/*",
+            "*/api.py",
+            "*.py",
+            "bus*",
+            "data/[ab]*/*",
+            "data/?/*",
+            "web/api.py",
+            "business/*",
+        ]
+        paths = [
+            "business/module.py",
+            "business/subpackage/module.py",
+            "business/subpackage/deep/api.py",
+            "business.py",
+            "web/api.py",
+            "web/view.py",
+            "data/a/module.py",
+            "data/b/c/module.py",
+            "data/c/module.py",
+            "data/module.py",
+            "module.py",
+            "setup.cfg",
+        ]
+        matcher = FilePatternMatcher(
+            (file_pattern, index)
+            for index, file_pattern in enumerate(file_patterns)
+        )
+        for path in paths:
+            path = os.path.join(*path.split("/"))
+            with self.subTest(path=path):
+                expected = tuple(
+                    index
+                    for index, file_pattern in enumerate(file_patterns)
+                    if fnmatch.fnmatch(path, file_pattern)
+                )
+                self.assertEqual(matcher.resolve(path), expected)
+
+    def test_cached_per_directory(self):
+        matcher = FilePatternMatcher([("package/*", "value")])
+        for name in ["a.py", "b.py", "c.py"]:
+            self.assertEqual(
+                matcher.resolve(os.path.join("package", name)), ("value",)
+            )
+        self.assertEqual(matcher.resolve("module.py"), ())
+        self.assertEqual(len(matcher._dir_cache), 2)
+
+    def test_no_patterns(self):
+        matcher = FilePatternMatcher([])
+        self.assertEqual(matcher.resolve("module.py"), ())
+
+
+class TestCompiledConfig(unittest.TestCase):
+    """ Test the configuration compiled once and shared by checkers."""
+
+    def setUp(self):
+        self.options = dict(
+            top_level_dir="src",
+            disallowed_patterns=[("business/*", "web.*")],
+            per_file_ignores=[("tests/*", ["DEP401"])],
+            contracts=[("independent", ("shop", "billing"))],
+        )
+        self.config = CompiledConfig(**self.options)
+
+    def test_compiled(self):
+        config = self.config
+        self.assertEqual(config.module_name("src/shop/api.py"), "shop.api")
+        self.assertEqual(
+            [
+                matcher.patterns
+                for matcher in config.disallowed_matchers.resolve(
+                    os.path.join("business", "logic.py")
+                )
+            ],
+            [("web.*",)],
+        )
+        self.assertEqual(
+            config.ignored_codes.resolve(os.path.join("tests", "test.py")),
+            (("DEP401",),),
+        )
+        self.assertEqual(
+            len(config.contract_matrix.check("shop", "billing")), 1,
+        )
+        self.assertIsNone(
+            CompiledConfig(deduce_path=False).module_name("shop/api.py")
+        )
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.config.deduce_path = False
+        with self.assertRaises(AttributeError):
+            del self.config.fingerprint
+        self.assertEqual(
+            self.config.per_file_ignores, (("tests/*", ("DEP401",)),),
+        )
+
+    def test_fingerprint(self):
+        self.assertEqual(CompiledConfig(**self.options), self.config)
+        self.assertEqual(
+            hash(CompiledConfig(**self.options)), hash(self.config),
+        )
+        for name, value in [
+                ("top_level_dir", None),
+                ("deduce_path", False),
+                ("find_package_roots", True),
+                ("source_roots", ["src"]),
+                ("disallowed_patterns", [("business/*", "data.*")]),
+                ("per_file_ignores", []),
+                ("contracts", [])]:
+            with self.subTest(name=name):
+                options = dict(self.options, **{name: value})
+                self.assertNotEqual(
+                    CompiledConfig(**options).fingerprint,
+                    self.config.fingerprint,
+                )
+
+    def test_fingerprint_same_in_other_process(self):
+        code = (
+            "from packaway.config import CompiledConfig; "
+            f"print(CompiledConfig(**{self.options!r}).fingerprint)"
+        )
+        output = subprocess.check_output(
+            [sys.executable, "-c", code], universal_newlines=True,
+        )
+        self.assertEqual(output.strip(), self.config.fingerprint)
+
+    def test_pickle(self):
+        self.config.disallowed_matchers.resolve("business/logic.py")
+        unpickled = pickle.loads(pickle.dumps(self.config))
+        self.assertEqual(unpickled, self.config)
+        self.assertEqual(
+            unpickled.__getstate__().keys(), self.config.__getstate__().keys(),
+        )
+        self.assertEqual(unpickled.disallowed_patterns, (
+            ("business/*", "web.*"),
+        ))
+        for filename in ["business/logic.py", "tests/test.py"]:
+            with self.subTest(filename=filename):
+                self.assertEqual(
+                    repr(unpickled.disallowed_matchers.resolve(filename)),
+                    repr(self.config.disallowed_matchers.resolve(filename)),
+                )
+                self.assertEqual(
+                    unpickled.ignored_codes.resolve(filename),
+                    self.config.ignored_codes.resolve(filename),
+                )
+        self.assertEqual(
+            unpickled.contract_matrix.check("shop", "billing"),
+            self.config.contract_matrix.check("shop", "billing"),
+        )
+        with self.assertRaises(AttributeError):
+            unpickled.deduce_path = False
+
+
+class TestParseOptions(unittest.TestCase):
+    """ Test parsing options from configuration."""
+
+    def test_parse_disallowed_patterns(self):
+        self.assertEqual(
+            parse_disallowed_patterns("\nbusiness/*: web.*\n\ndata/*:gui\n"),
+            [("business/*", "web.*"), ("data/*", "gui")],
+        )
+
+    def test_compile_disallowed_patterns(self):
+        results = compile_disallowed_patterns(
+            [("business/*", "web"), ("data/*", "gui"), ("business/*", "data")]
+        )
+        self.assertEqual(
+            [(pattern, matcher.patterns) for pattern, matcher in results],
+            [("business/*", ("web", "data")), ("data/*", ("gui",))],
+        )
+
+    def test_parse_per_file_ignores(self):
+        self.assertEqual(
+            parse_per_file_ignores(
+                "\nexamples/*/*: F401,DEP401\na.py b.py:E1 c.py: W2\n"
+            ),
+            [
+                ("examples/*/*", ("F401", "DEP401")),
+                ("a.py", ("E1",)),
+                ("b.py", ("E1",)),
+                ("c.py", ("W2",)),
+            ],
+        )
+
+    def test_parse_per_file_ignores_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_per_file_ignores("a.py E1")
+
+    def test_parse_contracts(self):
+        self.assertEqual(
+            parse_contracts(
+                "\nlayers: app.ui > app.services | app.jobs > app\n"
+                "independent: billing, shipping\n"
+                "allow: app.events -> app.ui.signals\n"
+            ),
+            [
+                (
+                    "layers",
+                    (("app.ui",), ("app.services", "app.jobs"), ("app",)),
+                ),
+                ("independent", ("billing", "shipping")),
+                ("allow", ("app.events", "app.ui.signals")),
+            ],
+        )
+
+    def test_parse_contracts_invalid(self):
+        invalid = [
+            "layers: app",
+            "independent: app",
+            "allow: app.ui",
+            "allow: a -> b, c",
+            "layers: app > app/ui",
+            "forbid: a, b",
+            "independent a, b",
+        ]
+        for contracts in invalid:
+            with self.subTest(contracts=contracts):
+                with self.assertRaises(ValueError):
+                    parse_contracts(contracts)
+
+    def test_parse_contracts_colons(self):
+        for contracts in [
+                "a:b:c",
+                "layers: app.ui > app: services",
+                "independent: a, b:",
+                "layers app.ui > app"]:
+            with self.subTest(contracts=contracts):
+                with self.assertRaisesRegex(ValueError, "Expected one colon"):
+                    parse_contracts(contracts)
+
+    def test_read_config(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "setup.cfg"), "w") as file:
+                file.write(
+                    "[flake8]\ntop-level-dir = src\ndisallowed = a/*: b\n"
+                )
+            with open(os.path.join(tmp_dir, "tox.ini"), "w") as file:
+                file.write("[flake8]\ntop-level-dir = lib\n")
+
+            options = read_config(directory=tmp_dir)
+            self.assertEqual(
+                options, {"top_level_dir": "lib", "disallowed": "a/*: b"}
+            )
+
+            options = read_config(os.path.join(tmp_dir, "setup.cfg"))
+            self.assertEqual(options["top_level_dir"], "src")
+
+    def test_read_config_missing(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.assertEqual(read_config(directory=tmp_dir), {})
@@ -0,0 +1,146 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from packaway.diff import (
+    changed_lines,
+    ChangedLines,
+    filter_errors,
+    parse_diff,
+)
+from packaway.tests.utils import write_files
+
+
+def git(directory, *args):
+    subprocess.run(
+        [
+            "git", "-c", "user.name=packaway", "-c", "user.email=packaway@",
+            "-c", "commit.gpgsign=false", *args,
+        ],
+        cwd=directory,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    )
+
+
+class TestChangedLines(unittest.TestCase):
+    """ Test looking up changed lines."""
+
+    def test_contains(self):
+        lines = ChangedLines([(10, 12), (3, 4), (11, 15), (20, 20)])
+        self.assertEqual(lines, ChangedLines([(3, 4), (10, 15)]))
+        self.assertEqual(
+            [lineno for lineno in range(25) if lineno in lines],
+            [3, 10, 11, 12, 13, 14],
+        )
+
+
+class TestParseDiff(unittest.TestCase):
+    """ Test parsing changed lines from git diff output."""
+
+    def test_parse_diff(self):
+        output = b"\n".join([
+            b"diff --git package/module.py package/module.py",
+            b"index 1234567..89abcde 100644",
+            b"--- package/module.py",
+            b"+++ package/module.py",
+            b"@@ -1,0 +2,4 @@ import os",
+            b"+import a",
+            b"+import b",
+            b"+import c",
+            b"+++ not_a_file.py",
+            b"@@ -10 +12 @@",
+            b"-import d",
+            b"+import e",
+            b"@@ -20,2 +22,0 @@",
+            b"-import f",
+            b"-import g",
+            b"diff --git new.py new.py",
+            b"new file mode 100644",
+            b"--- /dev/null",
+            b"+++ new.py",
+            b"@@ -0,0 +1 @@",
+            b"+import h",
+            b'--- "caf\\303\\251.py"',
+            b'+++ "caf\\303\\251.py"',
+            b"@@ -1 +1 @@",
+        ])
+        self.assertEqual(parse_diff(output), {
+            os.path.join("package", "module.py"): ChangedLines(
+                [(2, 6), (12, 13)],
+            ),
+            "new.py": ChangedLines([(1, 2)]),
+            "café.py": ChangedLines([(1, 2)]),
+        })
+
+    def test_deleted_file(self):
+        output = b"\n".join([
+            b"--- module.py",
+            b"+++ /dev/null",
+            b"@@ -1 +0,0 @@",
+        ])
+        self.assertEqual(parse_diff(output), {})
+
+
+class TestFilterErrors(unittest.TestCase):
+    """ Test keeping the errors on changed lines."""
+
+    def test_filter_errors(self):
+        changes = {
+            "module.py": ChangedLines([(2, 3)]),
+            "notebook.ipynb": ChangedLines([(40, 41)]),
+        }
+        errors = [
+            ("./module.py", 1, 0, "DEP401", "Importing private name"),
+            ("./module.py", 2, 0, "DEP401", "Importing private name"),
+            ("./module.py", 5, 0, "E999", "SyntaxError: invalid syntax"),
+            ("./notebook.ipynb", 1, 0, "DEP401", "Importing private name"),
+            ("./other.py", 2, 0, "DEP401", "Importing private name"),
+        ]
+        self.assertEqual(
+            list(filter_errors(errors, changes)), errors[1:4],
+        )
+
+
+class TestChangedLinesFromGit(unittest.TestCase):
+    """ Test reading the changed lines from a git repository."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        try:
+            git(self.tmp_dir, "init", "-q")
+        except OSError:
+            self.skipTest("git is not available.")
+
+    def test_changed_lines(self):
+        write_files(self.tmp_dir, {
+            "src/module.py": "import a\nimport b\n",
+            "src/removed.py": "import a\n",
+            "other.py": "import a\n",
+        })
+        git(self.tmp_dir, "add", ".")
+        git(self.tmp_dir, "commit", "-m", "Base")
+        git(self.tmp_dir, "branch", "base")
+        write_files(self.tmp_dir, {"src/module.py": "import a\nimport c\n"})
+        git(self.tmp_dir, "rm", "-q", os.path.join("src", "removed.py"))
+        git(self.tmp_dir, "commit", "-m", "Change")
+        # Uncommitted changes are included.
+        write_files(self.tmp_dir, {"src/new.py": "import d\n"})
+        git(self.tmp_dir, "add", ".")
+
+        changes = changed_lines(
+            "base", directory=os.path.join(self.tmp_dir, "src"),
+        )
+
+        self.assertEqual(changes, {
+            "module.py": ChangedLines([(2, 3)]),
+            "new.py": ChangedLines([(1, 2)]),
+        })
+
+    def test_unknown_revision(self):
+        with self.assertRaises(subprocess.CalledProcessError):
+            changed_lines("unknown", directory=self.tmp_dir)
@@ -0,0 +1,252 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from packaway.cache import ResultCache
+from packaway.graph import (
+    build_export_index,
+    build_graph,
+    module_name_for_file,
+    ModuleGraph,
+    ModuleResolver,
+)
+from packaway.tests.utils import write_files
+
+
+class TestModuleGraph(unittest.TestCase):
+    """ Test querying the import graph."""
+
+    def setUp(self):
+        self.graph = ModuleGraph.from_edges(
+            ["a", "b", "c", "d", "e"],
+            [
+                ("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"),
+                ("a", "b"), ("a", "a"), ("x", "a"),
+            ],
+        )
+
+    def test_size(self):
+        self.assertEqual(len(self.graph), 6)
+        self.assertEqual(self.graph.n_edges, 5)
+        self.assertIn("x", self.graph)
+        self.assertNotIn("y", self.graph)
+
+    def test_edges(self):
+        self.assertEqual(
+            sorted(self.graph.edges()),
+            [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("x", "a")],
+        )
+
+    def test_dependencies(self):
+        self.assertEqual(self.graph.dependencies("c"), ["a", "d"])
+        self.assertEqual(self.graph.dependencies("e"), [])
+        self.assertEqual(
+            self.graph.dependencies("a", transitive=True),
+            ["b", "c", "d"],
+        )
+
+    def test_components(self):
+        self.assertEqual(self.graph.components(), [["a", "b", "c"]])
+
+    def test_shortest_cycle(self):
+        graph = ModuleGraph.from_edges([], [
+            ("a", "b"), ("b", "c"), ("c", "d"), ("d", "a"), ("b", "d"),
+            ("c", "e"),
+        ])
+        self.assertEqual(graph.shortest_cycle("a", "b"), ["a", "b", "d", "a"])
+        self.assertEqual(
+            graph.shortest_cycle("c", "d"), ["c", "d", "a", "b", "c"],
+        )
+        with self.assertRaises(ValueError):
+            graph.shortest_cycle("c", "e")
+        with self.assertRaises(ValueError):
+            graph.shortest_cycle("a", "c")
+
+    def test_components_of_long_chain(self):
+        # Deeper than the recursion limit.
+        names = [f"m{index}" for index in range(20000)]
+        edges = list(zip(names, names[1:])) + [(names[-1], names[0])]
+        graph = ModuleGraph.from_edges(names, edges)
+        components = graph.components()
+        self.assertEqual([len(component) for component in components], [20000])
+        self.assertEqual(len(graph.shortest_cycle(names[-1], names[0])), 20001)
+
+    def test_importers(self):
+        self.assertEqual(self.graph.importers("a"), ["c", "x"])
+        self.assertEqual(self.graph.importers("x"), [])
+        self.assertEqual(
+            self.graph.importers("d", transitive=True),
+            ["a", "b", "c", "x"],
+        )
+
+    def test_unknown_module(self):
+        with self.assertRaises(KeyError):
+            self.graph.importers("y")
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "graph.bin")
+            self.graph.save(path)
+            graph = ModuleGraph.load(path)
+
+        self.assertEqual(graph.names, self.graph.names)
+        self.assertEqual(sorted(graph.edges()), sorted(self.graph.edges()))
+        self.assertEqual(graph.importers("a"), ["c", "x"])
+
+    def test_load_invalid_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "graph.bin")
+            with open(path, "wb") as file:
+                file.write(b"not a graph\n")
+            with self.assertRaises(ValueError):
+                ModuleGraph.load(path)
+
+    def test_load_truncated_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "graph.bin")
+            self.graph.save(path)
+            with open(path, "rb") as file:
+                data = file.read()
+            with open(path, "wb") as file:
+                file.write(data[:-1])
+            with self.assertRaises(ValueError):
+                ModuleGraph.load(path)
+
+
+class TestBuildGraph(unittest.TestCase):
+    """ Test building the import graph of a project."""
+
+    def test_build_graph(self):
+        files = {
+            "person/__init__.py": "from . import api",
+            "person/api.py": "from ._reading import read",
+            "person/_reading.py": "import os",
+            "office/__init__.py": "",
+            "office/api.py": """
+                from person.api import read
+                from ..person import _reading
+                import office
+                def f():
+                    import os.path
+            """,
+            "broken.py": "import (",
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_files(tmp_dir, files)
+            filenames = [
+                os.path.join(tmp_dir, *path.split("/")) for path in files
+            ]
+            graph = build_graph(filenames, top_level_dir=tmp_dir)
+            graph_with_external = build_graph(
+                filenames, top_level_dir=tmp_dir, include_external=True,
+            )
+
+        self.assertEqual(
+            sorted(graph.edges()),
+            [
+                ("office.api", "office"),
+                ("office.api", "person._reading"),
+                ("office.api", "person.api"),
+                ("person", "person.api"),
+                ("person.api", "person._reading"),
+            ],
+        )
+        self.assertIn("broken", graph)
+        self.assertEqual(graph_with_external.importers("os"), [
+            "person._reading",
+        ])
+        self.assertEqual(graph_with_external.importers("os.path"), [
+            "office.api",
+        ])
+
+    def test_relative_import_too_deep(self):
+        files = {
+            "person/__init__.py": "",
+            "person/api.py": "from ... import x\nfrom . import _reading\n",
+            "person/_reading.py": "",
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_files(tmp_dir, files)
+            filenames = [
+                os.path.join(tmp_dir, *path.split("/")) for path in files
+            ]
+            graph = build_graph(filenames, top_level_dir=tmp_dir)
+            index = build_export_index(
+                filenames, top_level_dir=tmp_dir,
+                cache=ResultCache(os.path.join(tmp_dir, "cache")),
+            )
+
+        self.assertEqual(
+            list(graph.edges()), [("person.api", "person._reading")],
+        )
+        self.assertIn("person.api", index.modules)
+
+
+class TestBuildExportIndex(unittest.TestCase):
+    """ Test indexing the re-exports of a project."""
+
+    def test_build_export_index(self):
+        files = {
+            "person/__init__.py": "from . import api",
+            "person/api.py": """
+                from . import _reading as reading
+                from ._reading import read
+            """,
+            "person/_reading.py": "def read(): pass",
+            "office/__init__.py": "",
+            "office/api.py": "from person.api import reading",
+            "shop/__init__.py": "",
+            "shop/api.py": "from office.api import reading as office_reading",
+            "broken.py": "import (",
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_files(tmp_dir, files)
+            filenames = [
+                os.path.join(tmp_dir, *path.split("/")) for path in files
+            ]
+            cache = ResultCache(os.path.join(tmp_dir, "cache"))
+            index = build_export_index(
+                filenames, top_level_dir=tmp_dir, cache=cache,
+            )
+            # The bindings of the files are cached, even if empty.
+            with mock.patch("ast.parse", side_effect=SyntaxError):
+                cached_index = build_export_index(
+                    filenames, top_level_dir=tmp_dir, cache=cache,
+                )
+
+        for exports in [index, cached_index]:
+            with self.subTest(exports=exports):
+                self.assertEqual(len(exports), 3)
+                self.assertEqual(
+                    exports.resolve("shop.api.office_reading.read"),
+                    "person._reading.read",
+                )
+        self.assertIn("person", index.modules)
+        self.assertIn("broken", index.modules)
+
+
+class TestModuleResolver(unittest.TestCase):
+    """ Test resolving imported names to modules."""
+
+    def test_resolve(self):
+        resolver = ModuleResolver(["office", "office._legal.api"])
+        self.assertEqual(
+            resolver.resolve("office._legal.api.name"), "office._legal.api"
+        )
+        self.assertEqual(resolver.resolve("office._legal"), "office")
+        self.assertIsNone(resolver.resolve("person"))
+
+
+class TestModuleNameForFile(unittest.TestCase):
+    """ Test naming modules after their files."""
+
+    def test_package(self):
+        self.assertEqual(
+            module_name_for_file(os.path.join("package", "__init__.py")),
+            "package",
+        )
+        self.assertEqual(
+            module_name_for_file(os.path.join("package", "module.py")),
+            "package.module",
+        )
@@ -0,0 +1,210 @@
+import io
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+from packaway.checker import FileChecker
+from packaway.notebook import iter_code_cells, NotebookSource, read_notebook
+
+
+def notebook_json(cells, **kwargs):
+    """ Return the JSON document of a notebook of nbformat 4.
+
+    Parameters
+    ----------
+    cells : list of tuple(str, str or list of str)
+        Type and source of each cell.
+    **kwargs
+        Indentation and separators, passed to ``json.dumps``.
+    """
+    return json.dumps({
+        "cells": [
+            {
+                "cell_type": cell_type,
+                "execution_count": None,
+                "metadata": {"tags": ["[{", "\\"]},
+                "outputs": [] if cell_type != "code" else [{
+                    "data": {"image/png": "iVBORw0KGgo\\AAAA\"" * 100},
+                    "output_type": "display_data",
+                }],
+                "source": source,
+            }
+            for cell_type, source in cells
+        ],
+        "metadata": {"kernelspec": {"name": "python3"}},
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }, **kwargs).encode("utf-8")
+
+
+CELLS = [
+    ("markdown", "# Title\nimport data._markdown\n"),
+    ("code", ["import os\n", "from data import _private\n"]),
+    ("code", ""),
+    ("raw", "import data._raw"),
+    ("code", (
+        "%matplotlib inline\nfor name in []:\n"
+        "    !ls \"é\\\nimport data._other"
+    )),
+    ("code", "%%bash\nimport data._shell\n"),
+]
+
+
+class TestReadNotebook(unittest.TestCase):
+    """ Test reading the code cells of notebooks."""
+
+    def test_code_cells(self):
+        expected = [
+            (2, "import os\nfrom data import _private\n"),
+            (3, ""),
+            (5, CELLS[4][1]),
+            (6, "%%bash\nimport data._shell\n"),
+        ]
+        for indent in [None, 1]:
+            document = notebook_json(CELLS, indent=indent)
+            for chunk_size in [1, 2, 3, 7, 4096]:
+                with self.subTest(indent=indent, chunk_size=chunk_size):
+                    cells = list(
+                        iter_code_cells(io.BytesIO(document), chunk_size)
+                    )
+                    self.assertEqual(cells, expected)
+
+    def test_source(self):
+        notebook = NotebookSource(iter_code_cells(io.BytesIO(
+            notebook_json(CELLS)
+        )))
+        self.assertEqual(notebook.cells, [
+            (2, "import os\nfrom data import _private\n"),
+            (3, ""),
+            (5, "".join([
+                "pass  # matplotlib inline\n",
+                "for name in []:\n",
+                "    pass  # ls \"é\\\n",
+                "import data._other\n",
+            ])),
+            (6, "\n\n"),
+        ])
+
+    def test_magics(self):
+        notebook = NotebookSource([(1, "\n".join([
+            "files = !ls",
+            "t, u = %time f()",
+            "data.frame??",
+            "    obj?",
+            "x = a != b",
+            "y = '=!'",
+            "z = 10 % 3",
+        ]))])
+        self.assertEqual(notebook.cells[0][1], "\n".join([
+            "pass  # ls",
+            "pass  # time f()",
+            "pass  # ",
+            "    pass  # ",
+            "x = a != b",
+            "y = '=!'",
+            "z = 10 % 3",
+        ]) + "\n")
+
+    def test_no_code_cells(self):
+        notebook = NotebookSource(iter_code_cells(io.BytesIO(
+            notebook_json([("markdown", "Text")])
+        )))
+        self.assertEqual(notebook.cells, [])
+
+    def test_invalid(self):
+        for document in [
+                b"",
+                b"[]",
+                b'{"cells": [',
+                b'{"cells": [{"source": "x}',
+                b'{"cells": [{"outputs": [{"a": "]"}}]',
+                b'{"cells": [] "nbformat": 4}',
+                b'{"cells": [{"source": 1}]}',
+                b'{"cells": [{"cell_type": "code", "source": "\\x"}]}',
+                b'{"cells": [], "nbformat": }',
+                b'{"cells": []} {}',
+                b'{"worksheets": [], "nbformat": 3}']:
+            with self.subTest(document=document):
+                with self.assertRaises(ValueError):
+                    list(iter_code_cells(io.BytesIO(document), 4))
+
+    def test_outputs_not_read_into_memory(self):
+        output = json.dumps(
+            ("A" * 1000 + "\\\"[{") * 8192
+        ).encode("ascii")
+        document = notebook_json([
+            ("code", "import data._private"),
+        ]).replace(b'"outputs": [', b'"outputs": [' + output + b", ")
+
+        tracemalloc.start()
+        try:
+            cells = list(iter_code_cells(io.BytesIO(document)))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(cells, [(1, "import data._private")])
+        self.assertLess(peak, len(document) // 16)
+
+
+class TestCheckNotebook(unittest.TestCase):
+    """ Test checking notebooks with ``FileChecker``."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def test_check(self):
+        path = self.write("analysis.ipynb", notebook_json(CELLS))
+        checker = FileChecker(
+            disallowed_patterns=[("*", r"os")], fingerprints=True,
+        )
+        errors = checker.check(path)
+        self.assertEqual([error[1:5] for error in errors], [
+            (1, 0, "DEP501", "Import 'os' violates pattern: 'os' (cell 2)"),
+            (2, 0, "DEP401",
+             "Importing private name 'data._private'. (cell 2)"),
+            (4, 0, "DEP401", "Importing private name 'data._other'. (cell 5)"),
+        ])
+        self.assertTrue(all(error[5] for error in errors))
+        self.assertEqual(
+            [number for number, _ in read_notebook(path).cells], [2, 3, 5, 6],
+        )
+
+    def test_syntax_error_in_one_cell(self):
+        path = self.write("analysis.ipynb", notebook_json([
+            ("code", "import data._private\n"),
+            ("code", "files = !ls\nx = (\n"),
+            ("code", "from data import _other\n"),
+        ]))
+        errors = FileChecker(prefilter=False).check(path)
+        self.assertEqual(
+            [(error[1], error[3]) for error in errors],
+            [(1, "DEP401"), (2, "E999"), (1, "DEP401")],
+        )
+        self.assertEqual(
+            [error[4][-8:] for error in errors],
+            ["(cell 1)", "(cell 2)", "(cell 3)"],
+        )
+
+    def test_invalid(self):
+        checker = FileChecker()
+        self.assertEqual(
+            checker.check(self.write("invalid.ipynb", b'{"cells": [')),
+            [(
+                os.path.join(self.tmp_dir, "invalid.ipynb"), 1, 0, "E902",
+                "ValueError: Expected '{' at byte 11.",
+            )],
+        )
+        self.assertEqual(
+            checker.check(os.path.join(self.tmp_dir, "missing.ipynb"))[0][3:],
+            ("E902", "FileNotFoundError"),
+        )
@@ -0,0 +1,262 @@
+import os
+import tempfile
+import unittest
+
+from packaway.paths import (
+    deduce_module_name,
+    discover_files,
+    FileScanner,
+    filter_files,
+    ModuleNameResolver,
+)
+
+
+def touch(dir, paths, mtime=None):
+    """ Create empty files, optionally with the given modification time,
+    and return their paths.
+    """
+    filenames = []
+    for path in paths:
+        path = os.path.join(dir, *path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w"):
+            pass
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        filenames.append(path)
+    return filenames
+
+
+class TestDeduceModuleName(unittest.TestCase):
+    """ Test deducing module names from file paths."""
+
+    def test_relative_path(self):
+        self.assertEqual(
+            deduce_module_name(os.path.join(".", "package", "module.py")),
+            "package.module",
+        )
+
+    def test_top_level_dir(self):
+        self.assertEqual(
+            deduce_module_name(
+                os.path.join("src", "package", "module.py"),
+                top_level_dir="src",
+            ),
+            "package.module",
+        )
+
+
+class TestModuleNameResolver(unittest.TestCase):
+    """ Test resolving module names with caching per directory."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        touch(self.tmp_dir, [
+            "first/src/shop/__init__.py",
+            "first/src/shop/orders/__init__.py",
+            "first/src/shop/orders/api.py",
+            "first/src/shop/namespace/module.py",
+            "first/setup.py",
+            "second/billing/__init__.py",
+            "second/billing/invoices.py",
+        ])
+
+    def path(self, path):
+        return os.path.join(self.tmp_dir, *path.split("/"))
+
+    def test_same_as_deduce_module_name(self):
+        paths = [
+            "module.py",
+            os.path.join(".", "package", "module.py"),
+            os.path.join("package", "__init__.py"),
+            os.path.join("src", "package", "module.py"),
+            os.path.join("..", "other", "module.py"),
+            os.path.abspath(os.path.join("package", "module.py")),
+        ]
+        for top_level_dir in [None, "src", os.path.abspath("src")]:
+            resolver = ModuleNameResolver(top_level_dir)
+            for path in paths:
+                with self.subTest(path=path, top_level_dir=top_level_dir):
+                    self.assertEqual(
+                        resolver.module_name(path),
+                        deduce_module_name(path, top_level_dir),
+                    )
+
+    def test_find_package_roots(self):
+        resolver = ModuleNameResolver(find_package_roots=True)
+        for path, expected in [
+                ("first/src/shop/orders/api.py", "shop.orders.api"),
+                ("first/src/shop/__init__.py", "shop.__init__"),
+                ("first/src/shop/namespace/module.py", "module"),
+                ("first/setup.py", "setup"),
+                ("second/billing/invoices.py", "billing.invoices")]:
+            with self.subTest(path=path):
+                self.assertEqual(
+                    resolver.module_name(self.path(path)), expected,
+                )
+
+    def test_source_roots(self):
+        resolver = ModuleNameResolver(
+            source_roots=[self.path("first/src"), self.path("first")],
+        )
+        for path, expected in [
+                ("first/src/shop/orders/api.py", "shop.orders.api"),
+                ("first/src/shop/namespace/module.py",
+                 "shop.namespace.module"),
+                ("first/setup.py", "setup"),
+                ("second/billing/invoices.py", "billing.invoices")]:
+            with self.subTest(path=path):
+                self.assertEqual(
+                    resolver.module_name(self.path(path)), expected,
+                )
+
+    def test_cached_per_directory(self):
+        resolver = ModuleNameResolver(find_package_roots=True)
+        first = resolver.module_name(self.path("first/src/shop/orders/api.py"))
+        os.remove(self.path("first/src/shop/__init__.py"))
+        second = resolver.module_name(
+            self.path("first/src/shop/orders/__init__.py")
+        )
+        self.assertEqual(first, "shop.orders.api")
+        self.assertEqual(second, "shop.orders.__init__")
+        self.assertIs(
+            resolver.module_name(self.path("first/src/shop/orders/api.py")),
+            first,
+        )
+
+    def test_invalidate(self):
+        resolver = ModuleNameResolver(find_package_roots=True)
+        api = self.path("first/src/shop/orders/api.py")
+        invoices = self.path("second/billing/invoices.py")
+        resolver.module_name(api)
+        resolver.module_name(invoices)
+        os.remove(self.path("first/src/shop/__init__.py"))
+        os.remove(self.path("second/billing/__init__.py"))
+
+        resolver.invalidate([self.path("first/src/shop")])
+        self.assertEqual(resolver.module_name(api), "orders.api")
+        self.assertEqual(resolver.module_name(invoices), "billing.invoices")
+
+
+class TestDiscoverFiles(unittest.TestCase):
+    """ Test finding Python files to check."""
+
+    def test_discover_files(self):
+        paths = [
+            "package/__init__.py",
+            "package/module.py",
+            "package/data.txt",
+            "package/__pycache__/module.py",
+            "package/sub/module.py",
+            "setup.py",
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            touch(tmp_dir, paths)
+            filenames = list(
+                discover_files([tmp_dir], exclude=["__pycache__", "sub"])
+            )
+
+            self.assertEqual(
+                [os.path.relpath(name, tmp_dir) for name in filenames],
+                [
+                    "setup.py",
+                    os.path.join("package", "__init__.py"),
+                    os.path.join("package", "module.py"),
+                ],
+            )
+
+    def test_discover_notebooks(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            touch(tmp_dir, ["module.py", "notebook.ipynb", "data.json"])
+            filenames = list(
+                discover_files([tmp_dir], extensions=(".py", ".ipynb"))
+            )
+
+            self.assertEqual(
+                [os.path.relpath(name, tmp_dir) for name in filenames],
+                ["module.py", "notebook.ipynb"],
+            )
+
+    def test_explicit_file_always_included(self):
+        self.assertEqual(
+            list(discover_files(["module.txt"], exclude=["*.py"])),
+            ["module.txt"],
+        )
+
+
+class TestFilterFiles(unittest.TestCase):
+    """ Test selecting Python files from given paths."""
+
+    def test_filter_files(self):
+        filenames = [
+            "setup.py",
+            os.path.join("build", "lib", "module.py"),
+            os.path.join("package", "module.py"),
+            os.path.join("package", "data.txt"),
+            os.path.join("package", "ignored.py"),
+        ]
+        self.assertEqual(
+            list(filter_files(filenames, ["build", "ignored.py"])),
+            ["setup.py", os.path.join("package", "module.py")],
+        )
+        self.assertEqual(
+            list(filter_files(
+                filenames + ["analysis.ipynb"], ["build"], (".ipynb",),
+            )),
+            ["analysis.ipynb"],
+        )
+
+
+class TestFileScanner(unittest.TestCase):
+    """ Test scanning Python files for changes."""
+
+    def test_same_files_as_discover_files(self):
+        paths = [
+            "package/__init__.py",
+            "package/module.py",
+            "package/data.txt",
+            "package/__pycache__/module.py",
+            "package/sub/module.py",
+            "package/sub2/module.py",
+            "setup.py",
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            touch(tmp_dir, paths)
+            roots = [tmp_dir, os.path.join(tmp_dir, "missing.py")]
+            signatures = FileScanner(roots, ["sub"]).scan()
+            self.assertEqual(
+                list(signatures), list(discover_files(roots, ["sub"]))[:-1],
+            )
+
+    def test_signatures(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            old, = touch(tmp_dir, ["old.py"], mtime=1000)
+            new, = touch(tmp_dir, ["new.py"])
+            stat = os.stat(old)
+            signatures = FileScanner([tmp_dir]).scan()
+
+        # Recently modified files may be modified again unnoticed.
+        self.assertEqual(
+            signatures, {old: (stat.st_mtime_ns, 0), new: None},
+        )
+
+    def test_directory_listed_again_when_modified(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dir = os.path.join(tmp_dir, "package")
+            first, = touch(tmp_dir, ["package/first.py"], mtime=1000)
+            os.utime(dir, (1000, 1000))
+            scanner = FileScanner([tmp_dir])
+            self.assertEqual(list(scanner.scan()), [first])
+
+            # The listing is reused while the directory is unmodified.
+            second, = touch(tmp_dir, ["package/second.py"], mtime=1000)
+            os.utime(dir, (1000, 1000))
+            self.assertEqual(list(scanner.scan()), [first])
+
+            os.utime(dir, (2000, 2000))
+            self.assertEqual(list(scanner.scan()), [first, second])
+
+            os.remove(first)
+            self.assertEqual(list(scanner.scan()), [second])
@@ -0,0 +1,123 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from packaway.results import (
+    FileResult,
+    iter_results,
+    merge_results,
+    read_shard,
+    write_results,
+)
+
+
+FILES = [
+    ("a/first.py", "a.first", 10),
+    ("a/second.py", "a.second", 20),
+    ("b\tweird\\name.py", "b\tweird\\name", 0),
+]
+
+ERRORS = [
+    ("a/first.py", 1, 0, "DEP401", "Importing private name 'x._y'.", 255),
+    ("a/first.py", 2, 4, "E999", "SyntaxError: tab\there\nand line", None),
+    ("b\tweird\\name.py", 3, 0, "DEP501", "Message with \\t", 1),
+]
+
+
+class TestResultFiles(unittest.TestCase):
+    """ Test writing and reading result files."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+
+    def test_round_trip(self):
+        write_results(self.path("results"), (1, 3), FILES, ERRORS)
+
+        self.assertEqual(read_shard(self.path("results")), (1, 3))
+        self.assertEqual(list(iter_results(self.path("results"))), [
+            FileResult(*FILES[0], ERRORS[:2]),
+            FileResult(*FILES[1], []),
+            FileResult(*FILES[2], ERRORS[2:]),
+        ])
+        self.assertEqual(os.listdir(self.tmp_dir), ["results"])
+
+    def test_reproducible(self):
+        write_results(self.path("first"), (0, 1), FILES, ERRORS)
+        write_results(self.path("second"), (0, 1), FILES, ERRORS)
+        with open(self.path("first"), "rb") as first, \
+                open(self.path("second"), "rb") as second:
+            self.assertEqual(first.read(), second.read())
+
+    def test_unsorted(self):
+        for files, errors in [
+                (FILES[::-1], []),
+                (FILES[:2], ERRORS),
+                (FILES, ERRORS[::-1])]:
+            with self.subTest(files=files, errors=errors):
+                with self.assertRaises(ValueError):
+                    write_results(self.path("results"), (0, 1), files, errors)
+                self.assertEqual(os.listdir(self.tmp_dir), [])
+
+    def test_invalid(self):
+        write_results(self.path("valid"), (0, 1), FILES, ERRORS)
+        with open(self.path("valid"), "rb") as file:
+            content = file.read()
+        for name, data in [
+                ("empty", b""),
+                ("not_gzip", b"packaway-results 1\n"),
+                ("truncated", content[:len(content) // 2]),
+                ("other", gzip.compress(b"other\n")),
+                ("no_shard", gzip.compress(b"packaway-results 1\n")),
+                ("bad_shard", gzip.compress(b"packaway-results 1\nS\t2\t2\n")),
+                ("bad_line", gzip.compress(
+                    b"packaway-results 1\nS\t0\t1\nE\t1\t0\tDEP401\t-\tm\n"
+                ))]:
+            with self.subTest(name=name):
+                with open(self.path(name), "wb") as file:
+                    file.write(data)
+                # Files that are not compressed are not readable.
+                with self.assertRaises((OSError, ValueError)):
+                    list(iter_results(self.path(name)))
+
+    def test_merge(self):
+        write_results(
+            self.path("first"), (0, 2), [FILES[0], FILES[2]],
+            [ERRORS[0], ERRORS[2]],
+        )
+        write_results(
+            self.path("second"), (1, 2), FILES[:2], ERRORS[:2][::-1],
+        )
+        merged = list(
+            merge_results([self.path("first"), self.path("second")])
+        )
+        self.assertEqual(merged, [
+            FileResult(*FILES[0], ERRORS[:2]),
+            FileResult(*FILES[1], []),
+            FileResult(*FILES[2], ERRORS[2:]),
+        ])
+
+    def test_merge_many_files(self):
+        paths = []
+        for shard in range(4):
+            files = [
+                (f"module{i:05}.py", f"module{i:05}", i)
+                for i in range(shard, 2000, 4)
+            ]
+            errors = [
+                (filename, 1, 0, "DEP401", "message", size)
+                for filename, _, size in files
+            ]
+            paths.append(self.path(f"shard{shard}"))
+            write_results(paths[-1], (shard, 4), files, errors)
+
+        merged = list(merge_results(paths))
+        self.assertEqual(
+            [result.size for result in merged], list(range(2000)),
+        )
+        self.assertTrue(all(len(result.errors) == 1 for result in merged))
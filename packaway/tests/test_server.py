@@ -0,0 +1,178 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from packaway import __version__
+from packaway.checker import FileChecker
+from packaway.config import parse_disallowed_patterns, read_config
+from packaway.server import is_supported, request, ServerError
+
+if is_supported():
+    from packaway.server import CheckServer
+
+
+def load_checker():
+    return FileChecker(
+        disallowed_patterns=parse_disallowed_patterns(
+            read_config().get("disallowed", "")
+        ),
+    )
+
+
+@unittest.skipUnless(is_supported(), "Requires Unix domain sockets")
+class TestCheckServer(unittest.TestCase):
+    """ Test checking files with the server."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir)
+        self.addCleanup(os.chdir, cwd)
+        os.mkdir("business")
+        self.write("business/logic.py", "from data import _private\n")
+        self.write("setup.cfg", "[flake8]\n")
+        self.socket_path = os.path.join(self.tmp_dir, "server.sock")
+
+    def write(self, path, content):
+        with open(os.path.join(self.tmp_dir, path), "w") as file:
+            file.write(content)
+
+    def start_server(self):
+        server = CheckServer(self.socket_path, load_checker, ["setup.cfg"])
+        thread = threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.01},
+        )
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def check(self, *files):
+        response = request(
+            self.socket_path,
+            {"command": "check", "version": __version__, "files": files},
+        )
+        return response["results"]
+
+    def test_check(self):
+        self.start_server()
+        path = os.path.join(self.tmp_dir, "business", "logic.py")
+        results = self.check(
+            {"path": path},
+            {"path": path, "source": "import os\nimport data._other\n"},
+            {"path": path, "source": "import data._other", "module": "data"},
+            {"path": os.path.join(self.tmp_dir, "missing.py")},
+        )
+        self.assertEqual(results, [
+            [[1, 0, "DEP401", "Importing private name 'data._private'."]],
+            [[2, 0, "DEP401", "Importing private name 'data._other'."]],
+            [],
+            [[1, 0, "E902", "FileNotFoundError"]],
+        ])
+
+    def test_reload_on_config_change(self):
+        self.start_server()
+        path = os.path.join(self.tmp_dir, "business", "logic.py")
+        self.assertEqual(len(self.check({"path": path})[0]), 1)
+
+        self.write(
+            "setup.cfg", "[flake8]\ndisallowed =\n    business/*: data.*\n",
+        )
+        self.assertEqual(
+            [error[2] for error in self.check({"path": path})[0]],
+            ["DEP401", "DEP501"],
+        )
+
+    def test_commands(self):
+        self.start_server()
+        self.assertEqual(
+            request(self.socket_path, {"command": "ping"}),
+            {
+                "version": __version__,
+                "pid": os.getpid(),
+                "directory": os.getcwd(),
+            },
+        )
+        self.assertEqual(request(self.socket_path, {"command": "reload"}), {})
+        for message, expected in [
+                ({"command": "unknown"}, "Unknown command 'unknown'"),
+                ({"command": "check", "version": "0.0"}, "runs version"),
+                ({"command": "check"}, "KeyError"),
+                ({"command": "check", "files": [{}]}, "KeyError")]:
+            with self.subTest(message=message):
+                with self.assertRaisesRegex(ServerError, expected):
+                    request(self.socket_path, message)
+
+    def test_several_requests_per_connection(self):
+        self.start_server()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.socket_path)
+            stream = client.makefile("rwb")
+            for line in [b"[]\n", b'{"command": "ping"}\n', b"{\n"]:
+                stream.write(line)
+                stream.flush()
+                response = json.loads(stream.readline())
+                self.assertEqual(
+                    "error" in response, line != b'{"command": "ping"}\n',
+                )
+
+    def test_shutdown(self):
+        server = CheckServer(self.socket_path, load_checker)
+        thread = threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.01},
+        )
+        thread.start()
+        self.assertEqual(
+            request(self.socket_path, {"command": "shutdown"}),
+            {"shutdown": True},
+        )
+        thread.join()
+        server.server_close()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_socket_in_use(self):
+        self.start_server()
+        with self.assertRaisesRegex(OSError, "already listening"):
+            CheckServer(self.socket_path, load_checker)
+        self.assertEqual(
+            request(self.socket_path, {"command": "reload"}), {},
+        )
+
+    def test_stale_socket_replaced(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+        self.assertTrue(os.path.exists(self.socket_path))
+
+        self.start_server()
+        self.assertEqual(
+            request(self.socket_path, {"command": "reload"}), {},
+        )
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+    def test_socket_created_private(self):
+        modes = []
+        bind = socket.socket.bind
+
+        def record_mode(sock, address):
+            bind(sock, address)
+            modes.append(os.stat(address).st_mode & 0o777)
+
+        umask = os.umask(0o022)
+        os.umask(umask)
+        with mock.patch.object(socket.socket, "bind", record_mode):
+            self.start_server()
+        self.assertEqual(modes, [0o700])
+        # The umask of the process is restored.
+        self.assertEqual(os.umask(umask), umask)
+
+    def test_not_running(self):
+        with self.assertRaises(FileNotFoundError):
+            request(self.socket_path, {"command": "ping"})
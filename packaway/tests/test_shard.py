@@ -0,0 +1,92 @@
+import os
+import random
+import tempfile
+import unittest
+
+from packaway.shard import (
+    assign_shards,
+    format_shard,
+    load_weights,
+    parse_shard,
+    save_weights,
+    stable_hash,
+)
+
+
+class TestParseShard(unittest.TestCase):
+    """ Test parsing shards given as K/N."""
+
+    def test_valid(self):
+        self.assertEqual(parse_shard("1/4"), (0, 4))
+        self.assertEqual(parse_shard("4/4"), (3, 4))
+        self.assertEqual(format_shard(parse_shard("3/8")), "3/8")
+
+    def test_invalid(self):
+        for text in ["", "1", "0/4", "5/4", "a/4", "1/b", "1/0", "1/4/2"]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_shard(text)
+
+
+class TestAssignShards(unittest.TestCase):
+    """ Test assigning files to shards."""
+
+    def setUp(self):
+        self.keys = [f"package.module{i}" for i in range(1000)]
+
+    def test_stable_hash(self):
+        self.assertEqual(stable_hash("package.module"), 0x837fbeaeb98128a)
+
+    def test_hashed(self):
+        shards = assign_shards(self.keys, 4)
+        self.assertEqual(set(shards), {0, 1, 2, 3})
+        for shard in range(4):
+            self.assertGreater(shards.count(shard), 200)
+        # Files keep their shard when others are removed.
+        self.assertEqual(assign_shards(self.keys[::2], 4), shards[::2])
+
+    def test_weighted(self):
+        rng = random.Random(0)
+        weights = {key: rng.randint(1, 10000) for key in self.keys}
+        shards = assign_shards(self.keys, 8, weights)
+        loads = [0] * 8
+        for key, shard in zip(self.keys, shards):
+            loads[shard] += weights[key]
+        self.assertLessEqual(max(loads) - min(loads), max(weights.values()))
+
+    def test_weighted_independent_of_order(self):
+        weights = {key: len(key) for key in self.keys}
+        shards = dict(zip(self.keys, assign_shards(self.keys, 3, weights)))
+        keys = list(reversed(self.keys))
+        self.assertEqual(
+            dict(zip(keys, assign_shards(keys, 3, weights))), shards,
+        )
+
+    def test_missing_weights(self):
+        weights = {"a": 10, "b": 30}
+        self.assertEqual(
+            assign_shards(["a", "b", "c"], 2, weights), [1, 0, 1],
+        )
+
+
+class TestWeights(unittest.TestCase):
+    """ Test reading and writing weights files."""
+
+    def test_round_trip(self):
+        weights = {"package.module": 120, "path/with space.py": 0}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "weights")
+            save_weights(path, weights.items())
+            self.assertEqual(load_weights(path), weights)
+            self.assertEqual(os.listdir(tmp_dir), ["weights"])
+
+    def test_invalid(self):
+        for content in ["", "other\n", "packaway-weights 1\nkey\n",
+                        "packaway-weights 1\nkey\tten\n"]:
+            with self.subTest(content=content), \
+                    tempfile.TemporaryDirectory() as tmp_dir:
+                path = os.path.join(tmp_dir, "weights")
+                with open(path, "w") as file:
+                    file.write(content)
+                with self.assertRaises(ValueError):
+                    load_weights(path)
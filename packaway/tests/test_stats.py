@@ -0,0 +1,140 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from packaway import stats
+from packaway.checker import FileChecker
+from packaway.cli.main import main
+from packaway.tests.utils import write_files
+
+
+class TestStats(unittest.TestCase):
+    """ Test recording statistics."""
+
+    def test_timers_and_counters(self):
+        recorded = stats.Stats()
+        with recorded.timed("parse"):
+            pass
+        recorded.add_time("parse", 1.5, calls=2)
+        recorded.count("imports", 3)
+        recorded.count("imports")
+
+        calls, seconds = recorded.timers["parse"]
+        self.assertEqual(calls, 3)
+        self.assertGreaterEqual(seconds, 1.5)
+        self.assertEqual(recorded.counters, {"imports": 4})
+
+    def test_timed_checker(self):
+        recorded = stats.Stats()
+        checker = recorded.timed_checker(
+            "DEP401", lambda source, target: iter(["reason"]),
+        )
+        self.assertEqual(checker("a", "b"), ["reason"])
+        self.assertEqual(checker("a", "c"), ["reason"])
+        self.assertEqual(recorded.timers["DEP401"][0], 2)
+
+    def test_slowest_files(self):
+        recorded = stats.Stats(n_slowest_files=2)
+        for index, seconds in enumerate([0.3, 0.1, 0.5, 0.2]):
+            recorded.add_file(f"module{index}.py", seconds)
+
+        data = recorded.to_dict()
+        self.assertEqual(data["timers"]["file"]["calls"], 4)
+        self.assertEqual(data["slowest_files"], [
+            {"filename": "module2.py", "seconds": 0.5},
+            {"filename": "module0.py", "seconds": 0.3},
+        ])
+
+    def test_merge(self):
+        first = stats.Stats(n_slowest_files=2)
+        first.add_file("a.py", 0.1)
+        first.count("imports", 2)
+        second = stats.Stats()
+        second.add_file("b.py", 0.3)
+        second.add_file("c.py", 0.2)
+        second.count("imports", 5)
+
+        first.merge(stats.Stats.from_dict(second.to_dict()))
+
+        self.assertEqual(first.n_processes, 2)
+        self.assertEqual(first.counters, {"imports": 7})
+        self.assertEqual(first.timers["file"][0], 3)
+        self.assertEqual(
+            sorted(first.slowest_files), [(0.2, "c.py"), (0.3, "b.py")],
+        )
+
+    def test_summary(self):
+        recorded = stats.Stats()
+        recorded.add_file("module.py", 0.25)
+        recorded.count("imports", 2)
+        lines = recorded.summary()
+        self.assertEqual(len(lines), 5)
+        self.assertIn("module.py", lines[-1])
+
+
+class TestEnabledStats(unittest.TestCase):
+    """ Test recording statistics of checking files."""
+
+    def setUp(self):
+        self.addCleanup(stats.disable)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(stats.current())
+        self.assertIsNone(stats.collect())
+        with stats.timed("parse"):
+            pass
+        stats.count("imports")
+
+    def test_check_source(self):
+        stats.enable()
+        checker = FileChecker(disallowed_patterns=[("*", "web")])
+        checker.check_source("import web._api\nimport os", "module.py")
+
+        collected = stats.collect()
+        for name in ["parse", "collect_imports", "DEP401", "DEP501"]:
+            self.assertIn(name, collected.timers)
+        self.assertEqual(collected.timers["DEP401"][0], 2)
+        self.assertEqual(collected.counters["imports"], 2)
+        self.assertEqual(collected.slowest_files[0][1], "module.py")
+
+    def test_memo_counters(self):
+        checker = FileChecker(disallowed_patterns=[("*", "web")])
+        checker.check_source("import web._api", "module.py")
+        stats.enable()
+        for _ in range(2):
+            checker.check_source("import web._api\nimport os", "module.py")
+
+        counters = stats.collect().counters
+        self.assertEqual(counters["DEP501 memo hits"], 3)
+        self.assertEqual(counters["DEP501 memo misses"], 1)
+        self.assertIn("DEP401 memo hits", counters)
+        self.assertIn("DEP401 memo misses", counters)
+
+    def test_disable_removes_directory(self):
+        stats.enable()
+        directory = stats.directory()
+        self.assertTrue(os.path.isdir(directory))
+        stats.disable()
+        self.assertFalse(os.path.exists(directory))
+
+    def test_aggregate_worker_processes(self):
+        files = {f"module{index}.py": "import os" for index in range(6)}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_files(tmp_dir, files)
+            path = os.path.join(tmp_dir, "stats.json")
+            with contextlib.redirect_stderr(io.StringIO()) as stderr:
+                main([
+                    "check", tmp_dir, "--no-cache", "--jobs", "2",
+                    "--chunk-size", "1", "--stats", path, "--benchmark",
+                ])
+            with open(path) as file:
+                report = json.load(file)
+
+        self.assertEqual(report["processes"], 3)
+        self.assertEqual(report["timers"]["file"]["calls"], 6)
+        self.assertEqual(report["counters"]["prefiltered files"], 6)
+        self.assertIn("slowest file", stderr.getvalue())
+        self.assertIsNone(stats.current())
@@ -0,0 +1,31 @@
+import pickle
+import unittest
+
+from packaway.violation import ImportRuleViolation
+
+
+class TestImportRuleViolation(unittest.TestCase):
+    """ Test the record of an import violation."""
+
+    def test_fields(self):
+        violation = ImportRuleViolation(
+            3, 4, "Reason.", code="DEP401", target="package._name",
+        )
+        self.assertEqual(violation.lineno, 3)
+        self.assertEqual(violation.col_offset, 4)
+        self.assertEqual(violation.message, "Reason.")
+        self.assertEqual(violation.code, "DEP401")
+        self.assertEqual(violation.target, "package._name")
+
+    def test_optional_fields(self):
+        violation = ImportRuleViolation(lineno=1, col_offset=0, message="R")
+        self.assertIsNone(violation.code)
+        self.assertIsNone(violation.target)
+
+    def test_no_instance_dict(self):
+        violation = ImportRuleViolation(1, 0, "Reason.")
+        self.assertFalse(hasattr(violation, "__dict__"))
+
+    def test_pickle(self):
+        violation = ImportRuleViolation(1, 0, "Reason.", "DEP401", "_name")
+        self.assertEqual(pickle.loads(pickle.dumps(violation)), violation)
@@ -0,0 +1,144 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from packaway.checker import FileChecker
+from packaway.paths import FileScanner
+from packaway.tests.utils import write_files
+from packaway.watch import IncrementalChecker
+
+
+class TestIncrementalChecker(unittest.TestCase):
+    """ Test checking files again as they change."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        write_files(self.tmp_dir, {
+            "person/__init__.py": "",
+            "person/api.py": "from person._reading import read",
+            "person/_reading.py": "",
+            "office/__init__.py": "",
+            "office/api.py": "from person._reading import read",
+            "office/report.py": "import person.api",
+        })
+        self.checker = IncrementalChecker(
+            FileChecker(top_level_dir=self.tmp_dir),
+        )
+        self.scanner = FileScanner([self.tmp_dir])
+
+    def path(self, path):
+        return os.path.join(self.tmp_dir, *path.split("/"))
+
+    def update(self):
+        checked, removed = self.checker.update(self.scanner.scan())
+        return (
+            sorted(os.path.relpath(name, self.tmp_dir) for name in checked),
+            sorted(os.path.relpath(name, self.tmp_dir) for name in removed),
+        )
+
+    def error_files(self):
+        return [
+            os.path.relpath(error[0], self.tmp_dir)
+            for error in self.checker.errors()
+        ]
+
+    def test_initial_update(self):
+        checked, removed = self.update()
+        self.assertEqual(len(checked), 6)
+        self.assertEqual(removed, [])
+        self.assertEqual(
+            self.error_files(), [os.path.join("office", "api.py")],
+        )
+
+    def test_unchanged_files_not_checked_again(self):
+        self.update()
+        self.assertEqual(self.update(), ([], []))
+
+    def test_modified_file(self):
+        self.update()
+        write_files(self.tmp_dir, {"office/api.py": "import person.api"})
+
+        self.assertEqual(
+            self.update(), ([os.path.join("office", "api.py")], []),
+        )
+        self.assertEqual(self.error_files(), [])
+
+    def test_removed_file(self):
+        self.update()
+        os.remove(self.path("office/api.py"))
+
+        self.assertEqual(
+            self.update(), ([], [os.path.join("office", "api.py")]),
+        )
+        self.assertEqual(self.error_files(), [])
+
+    def test_renamed_package(self):
+        self.update()
+        os.rename(self.path("person"), self.path("people"))
+
+        checked, removed = self.update()
+
+        # Importers of the package are checked again, without parsing them.
+        self.assertEqual(checked, sorted([
+            os.path.join("office", "api.py"),
+            os.path.join("office", "report.py"),
+            os.path.join("people", "__init__.py"),
+            os.path.join("people", "api.py"),
+            os.path.join("people", "_reading.py"),
+        ]))
+        self.assertEqual(len(removed), 3)
+
+    def test_importers_checked_with_parsed_imports(self):
+        self.update()
+        os.remove(self.path("person/_reading.py"))
+
+        with mock.patch(
+                "packaway.watch.parse_imports",
+                side_effect=AssertionError("Parsed again")):
+            checked, _ = self.update()
+
+        self.assertEqual(checked, [
+            os.path.join("office", "api.py"),
+            os.path.join("person", "api.py"),
+        ])
+
+    def test_module_name_changes(self):
+        self.update()
+        module_names = {
+            self.path("office/api.py"): "office.api",
+            self.path("office/report.py"): "company.report",
+        }
+        with mock.patch.object(
+                FileChecker, "module_name",
+                side_effect=lambda filename: module_names.get(filename)):
+            os.remove(self.path("office/__init__.py"))
+            checked, _ = self.update()
+
+        self.assertEqual(checked, [os.path.join("office", "report.py")])
+
+    def test_package_added_with_package_roots(self):
+        write_files(self.tmp_dir, {
+            "root/app/__init__.py": "",
+            "root/app/_x/__init__.py": "",
+            "root/app/_x/y.py": "",
+            "root/app/sub/m.py": "import app._x.y",
+        })
+        checker = IncrementalChecker(FileChecker(find_package_roots=True))
+        scanner = FileScanner([self.path("root")])
+        checker.update(scanner.scan())
+        self.assertEqual(
+            [error[0] for error in checker.errors()],
+            [self.path("root/app/sub/m.py")],
+        )
+
+        write_files(self.tmp_dir, {"root/app/sub/__init__.py": ""})
+        checked, _ = checker.update(scanner.scan())
+
+        self.assertEqual(sorted(checked), [
+            self.path("root/app/sub/__init__.py"),
+            self.path("root/app/sub/m.py"),
+        ])
+        self.assertEqual(checker.errors(), [])
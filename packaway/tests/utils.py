@@ -0,0 +1,21 @@
+""" Helpers shared by the tests. """
+
+import os
+import textwrap
+
+
+def write_files(dir, files):
+    """ Write files in a directory.
+
+    Parameters
+    ----------
+    dir : str
+        Directory where files are written.
+    files : dict(str, str)
+        Mapping from relative path (using "/") to file content, dedented.
+    """
+    for path, content in files.items():
+        path = os.path.join(dir, *path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(textwrap.dedent(content))
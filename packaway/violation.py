@@ -1,20 +1,47 @@
 """ This module contains violation data classes.
 """
+import collections
 
+_ViolationFields = collections.namedtuple(
+    "_ViolationFields",
+    ["lineno", "col_offset", "message", "code", "target"],
+)
 
-class ImportRuleViolation:
-    """ An object to represent an import violation."""
 
-    def __init__(self, lineno, col_offset, message):
-        self.lineno = lineno
-        self.col_offset = col_offset
-        self.message = message
+class ImportRuleViolation(_ViolationFields):
+    """ An object to represent an import violation.
+
+    Violations are tuples without a per-instance dictionary, so that many
+    of them can be produced cheaply.
+
+    Parameters
+    ----------
+    lineno : int
+        Line number of the import statement.
+    col_offset : int
+        Column offset of the import statement.
+    message : str
+        Reason of the violation.
+    code : str or None, optional
+        Error code of the violated rule, e.g. "DEP401".
+    target : str or None, optional
+        Imported name, normalized to an absolute name where possible.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, lineno, col_offset, message, code=None, target=None):
+        return super().__new__(
+            cls, lineno, col_offset, message, code, target,
+        )
 
     def __repr__(self):
         return (
             "ImportRuleViolation("
             f"lineno={self.lineno}, "
             f"col_offset={self.col_offset}, "
-            f"message={self.message}"
+            f"message={self.message}, "
+            f"code={self.code}, "
+            f"target={self.target}"
             ")"
         )
@@ -0,0 +1,287 @@
+""" This module supports checking a project incrementally as its files
+change.
+"""
+
+import collections
+import os
+
+from packaway.checker import parse_imports
+
+# Base name of the files making directories packages.
+_INIT_FILENAME = "__init__.py"
+
+# Last part of the module names deduced for the __init__.py of packages.
+_INIT_MODULE = "__init__"
+
+
+class _FileState:
+    """ What is known about a file being watched.
+
+    Parameters
+    ----------
+    signature : tuple(int, int) or None
+        Modification time and size of the file when it was read.
+    source : bytes
+        Source code.
+    module_name : str or None
+        Module name of the file.
+    imports : list of tuple(int, int, str) or None
+        Imports parsed from the source code, None if it cannot be parsed.
+    errors : list of tuple(str, int, int, str, str)
+        Errors found in the file.
+    """
+
+    __slots__ = ("signature", "source", "module_name", "imports", "errors")
+
+    def __init__(self, signature, source, module_name, imports, errors):
+        self.signature = signature
+        self.source = source
+        self.module_name = module_name
+        self.imports = imports
+        self.errors = errors
+
+
+class IncrementalChecker:
+    """ Checker keeping the imports of a project in memory, for checking
+    again only what is affected by changes of files.
+
+    A modified file is parsed and checked again. When a module or package
+    appears or disappears (e.g. it is added, removed or renamed), the files
+    importing from it are checked again using their parsed imports, and
+    the files whose module names change are parsed again.
+
+    Parameters
+    ----------
+    checker : FileChecker
+        Checker of the files.
+    """
+
+    def __init__(self, checker):
+        self.checker = checker
+        self._files = {}
+        # Mapping from imported name, and each of its parent names, to the
+        # files importing it.
+        self._importers = collections.defaultdict(set)
+        # Mapping from the name of each module and package to the number of
+        # files defining it or inside it.
+        self._defined_names = collections.Counter()
+
+    def __len__(self):
+        return len(self._files)
+
+    def errors(self):
+        """ Return the errors found in all the files.
+
+        Returns
+        -------
+        errors : list of tuple(str, int, int, str, str)
+            Errors ordered by file.
+        """
+        return [
+            error
+            for state in self._files.values()
+            for error in state.errors
+        ]
+
+    def update(self, signatures):
+        """ Check the files affected by changes.
+
+        Parameters
+        ----------
+        signatures : dict(str, tuple(int, int) or None)
+            Current signatures of all the files, see
+            ``FileScanner.scan``. Files with a signature different from
+            the previous one are read again; files with the signature None
+            are always read again.
+
+        Returns
+        -------
+        checked : dict(str, list of tuple(str, int, int, str, str))
+            Mapping from path to the errors of the files checked again.
+        removed : list of str
+            Paths of the files no longer found.
+        """
+        # Whether each module or package affected by the changes existed
+        # before.
+        existed = {}
+        removed = [
+            filename for filename in self._files
+            if filename not in signatures
+        ]
+        for filename in removed:
+            self._unindex(self._files.pop(filename), filename, existed)
+
+        checked = {}
+        changed_dirs = set()
+        for filename, signature in signatures.items():
+            state = self._files.get(filename)
+            if (state is not None and signature is not None
+                    and state.signature == signature):
+                continue
+            try:
+                with open(filename, "rb") as file:
+                    source = file.read()
+            except OSError:
+                if state is not None:
+                    self._unindex(self._files.pop(filename), filename, existed)
+                    removed.append(filename)
+                continue
+            if state is None:
+                if os.path.basename(filename) == _INIT_FILENAME:
+                    changed_dirs.add(os.path.dirname(filename))
+            elif state.source == source:
+                state.signature = signature
+                continue
+            else:
+                self._unindex(state, filename, existed)
+            self._analyze(filename, signature, source, existed)
+            checked[filename] = self._files[filename].errors
+
+        # Module names may depend on which directories are packages.
+        changed_dirs.update(
+            os.path.dirname(filename) for filename in removed
+            if os.path.basename(filename) == _INIT_FILENAME
+        )
+        if changed_dirs:
+            self.checker.config.module_names.invalidate(changed_dirs)
+            for filename in self._files_in(changed_dirs):
+                if filename in checked:
+                    continue
+                state = self._files[filename]
+                if state.module_name != self.checker.module_name(filename):
+                    self._unindex(state, filename, existed)
+                    self._analyze(
+                        filename, state.signature, state.source, existed,
+                    )
+                    checked[filename] = self._files[filename].errors
+
+        changed_names = [
+            name for name, was_present in existed.items()
+            if was_present != (name in self._defined_names)
+        ]
+        for name in changed_names:
+            for filename in list(self._importers.get(name, ())):
+                if filename in checked:
+                    continue
+                state = self._files[filename]
+                state.errors = self.checker.check_imports(
+                    state.imports, state.source, filename,
+                )
+                checked[filename] = state.errors
+        return checked, removed
+
+    def _analyze(self, filename, signature, source, existed):
+        """ Parse and check a file, and index it.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the file.
+        signature : tuple(int, int) or None
+            Signature of the file.
+        source : bytes
+            Source code.
+        existed : dict(str, bool)
+            Whether modules and packages existed before the update,
+            updated for the names defined by the file.
+        """
+        module_name = self.checker.module_name(filename)
+        imports, _ = parse_imports(source, module_name)
+        if imports is None:
+            errors = self.checker.check_source(source, filename)
+        else:
+            errors = self.checker.check_imports(imports, source, filename)
+        self._files[filename] = _FileState(
+            signature, source, module_name, imports, errors,
+        )
+        for name in _imported_names(imports):
+            self._importers[name].add(filename)
+        for name in _defined_names(module_name):
+            existed.setdefault(name, name in self._defined_names)
+            self._defined_names[name] += 1
+
+    def _unindex(self, state, filename, existed):
+        """ Remove a file from the indexes.
+
+        Parameters
+        ----------
+        state : _FileState
+            What was known about the file.
+        filename : str
+            Path of the file.
+        existed : dict(str, bool)
+            Whether modules and packages existed before the update,
+            updated for the names defined by the file.
+        """
+        for name in _imported_names(state.imports):
+            importers = self._importers[name]
+            importers.discard(filename)
+            if not importers:
+                del self._importers[name]
+        for name in _defined_names(state.module_name):
+            existed.setdefault(name, name in self._defined_names)
+            self._defined_names[name] -= 1
+            if not self._defined_names[name]:
+                del self._defined_names[name]
+
+    def _files_in(self, dirs):
+        """ Return the files watched inside any of the directories.
+
+        Parameters
+        ----------
+        dirs : set of str
+            Paths of directories.
+
+        Returns
+        -------
+        filenames : list of str
+        """
+        prefixes = tuple(os.path.join(dirpath, "") for dirpath in dirs)
+        return [
+            filename for filename in self._files
+            if filename.startswith(prefixes)
+        ]
+
+
+def _imported_names(imports):
+    """ Return the imported names and all their parent names.
+
+    Parameters
+    ----------
+    imports : list of tuple(int, int, str) or None
+        Parsed imports.
+
+    Returns
+    -------
+    names : set of str
+        e.g. ``a``, ``a.b`` and ``a.b.c`` for an import of ``a.b.c``.
+    """
+    names = set()
+    for _, _, target in imports or ():
+        while target and target not in names:
+            names.add(target)
+            target, _, _ = target.rpartition(".")
+    return names
+
+
+def _defined_names(module_name):
+    """ Return the names of the module and packages defined by a file.
+
+    Parameters
+    ----------
+    module_name : str or None
+        Module name of the file.
+
+    Returns
+    -------
+    names : list of str
+        e.g. ``a``, ``a.b`` and ``a.b.c`` for ``a/b/c.py``, and ``a`` and
+        ``a.b`` for ``a/b/__init__.py``. Empty if the module name is
+        unknown.
+    """
+    if module_name is None:
+        return []
+    parts = module_name.split(".")
+    if parts[-1] == _INIT_MODULE:
+        del parts[-1]
+    return [".".join(parts[:index]) for index in range(1, len(parts) + 1)]
@@ -23,6 +23,10 @@ setuptools.setup(
         "flake8.extension": [
             'DEP = packaway.plugins.flake8.import_checker:ImportChecker',
         ],
+        "console_scripts": [
+            "packaway = packaway.cli.main:main",
+            "packaway-client = packaway.cli.client:main",
+        ],
     },
     install_requires=[],
     extras_require={